@@ -1,8 +1,10 @@
+from django import forms
 from django.contrib import admin
 from django.core.exceptions import FieldDoesNotExist
 from django.forms.models import BaseInlineFormSet
 
-from .models import OneToOneMeeting, OneToOneObjective
+from .models import ArgonosModule, OneToOneMeeting, OneToOneObjective
+from .services.module_graph import would_create_cycle
 
 
 def _has_field(model, field_name: str) -> bool:
@@ -74,4 +76,27 @@ class OneToOneObjectiveAdmin(admin.ModelAdmin):
         return tuple()
 
     search_fields = ("title", "meeting__trainer__first_name", "meeting__trainer__last_name")
-    ordering = ("-id",)
\ No newline at end of file
+    ordering = ("-id",)
+
+
+class ArgonosModuleAdminForm(forms.ModelForm):
+    class Meta:
+        model = ArgonosModule
+        fields = "__all__"
+
+    def clean_prerequisites(self):
+        prerequisites = self.cleaned_data.get("prerequisites")
+        # module pas encore créé : aucun autre module ne peut encore dépendre de lui
+        if prerequisites and self.instance.pk:
+            if would_create_cycle(self.instance.pk, [m.pk for m in prerequisites]):
+                raise forms.ValidationError("Dépendance circulaire entre modules ArgonOS.")
+        return prerequisites
+
+
+@admin.register(ArgonosModule)
+class ArgonosModuleAdmin(admin.ModelAdmin):
+    form = ArgonosModuleAdminForm
+    list_display = ("name", "kind", "level", "major_version", "current_patch", "is_active")
+    list_filter = ("kind", "level", "is_active")
+    search_fields = ("name",)
+    filter_horizontal = ("prerequisites",)
@@ -0,0 +1,237 @@
+# argonteam/services/module_graph.py
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from argonteam.models import ArgonosModule, ArgonosTrackStep, TrainerModuleMastery
+
+
+CACHE_KEY = "argonteam:module_graph"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Un module est considéré maîtrisé si validé par le manager, certifié,
+# ou si une version validée est renseignée.
+MASTERED_Q = (
+    Q(manager_status=TrainerModuleMastery.STATUS_OK)
+    | Q(cert_status=TrainerModuleMastery.STATUS_OK)
+    | Q(validated_major__isnull=False)
+)
+
+
+# =========================================================
+# Graphe des pré-requis
+# =========================================================
+
+@dataclass(frozen=True)
+class ModuleGraph:
+    # modules actifs : id -> nom
+    names: dict[int, str]
+    # pré-requis directs / transitifs (modules actifs uniquement : préparation)
+    direct: dict[int, frozenset[int]]
+    closure: dict[int, frozenset[int]]
+    # pré-requis transitifs sur tous les modules, inactifs compris : un cycle
+    # qui passe par un module désactivé réapparaît à sa réactivation
+    full_closure: dict[int, frozenset[int]] = field(default_factory=dict)
+    # cycles détectés sur tous les modules (listes d'ids), vide si le graphe est un DAG
+    cycles: tuple[tuple[int, ...], ...] = ()
+
+    @property
+    def is_dag(self) -> bool:
+        return not self.cycles
+
+    def prerequisites_of(self, module_id: int) -> frozenset[int]:
+        return self.closure.get(module_id, frozenset())
+
+
+def _find_cycles(direct: dict[int, frozenset[int]]) -> list[tuple[int, ...]]:
+    """DFS itératif (blanc / gris / noir) : retourne un cycle par arc retour trouvé."""
+    white, grey, black = 0, 1, 2
+    color = {node: white for node in direct}
+    cycles = []
+
+    for root in sorted(direct):
+        if color[root] != white:
+            continue
+        path = [root]
+        stack = [iter(sorted(direct[root]))]
+        color[root] = grey
+        while stack:
+            nxt = next(stack[-1], None)
+            if nxt is None:
+                color[path.pop()] = black
+                stack.pop()
+                continue
+            if nxt not in color:
+                continue
+            if color[nxt] == grey:
+                cycles.append(tuple(path[path.index(nxt):]))
+            elif color[nxt] == white:
+                color[nxt] = grey
+                path.append(nxt)
+                stack.append(iter(sorted(direct[nxt])))
+
+    return cycles
+
+
+def _transitive_closure(direct: dict[int, frozenset[int]]) -> dict[int, frozenset[int]]:
+    closure = {}
+    for node in direct:
+        seen = set()
+        todo = list(direct[node])
+        while todo:
+            current = todo.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            todo.extend(direct.get(current, ()))
+        seen.discard(node)
+        closure[node] = frozenset(seen)
+    return closure
+
+
+def build_module_graph() -> ModuleGraph:
+    """Charge le graphe depuis la base (2 requêtes)."""
+    modules = list(ArgonosModule.objects.values_list("id", "name", "is_active"))
+    names = {module_id: name for module_id, name, is_active in modules if is_active}
+
+    edges = defaultdict(set)
+    for module_id, prerequisite_id in (
+        ArgonosModule.prerequisites.through.objects
+        .values_list("from_argonosmodule_id", "to_argonosmodule_id")
+    ):
+        edges[module_id].add(prerequisite_id)
+
+    full_direct = {module_id: frozenset(edges.get(module_id, ())) for module_id, _, _ in modules}
+    direct = {module_id: frozenset(p for p in full_direct[module_id] if p in names) for module_id in names}
+
+    return ModuleGraph(
+        names=names,
+        direct=direct,
+        closure=_transitive_closure(direct),
+        full_closure=_transitive_closure(full_direct),
+        cycles=tuple(_find_cycles(full_direct)),
+    )
+
+
+def get_module_graph() -> ModuleGraph:
+    """Graphe mis en cache ; invalidé par les signaux de argonteam.signals."""
+    graph = cache.get(CACHE_KEY)
+    if graph is None:
+        graph = build_module_graph()
+        cache.set(CACHE_KEY, graph, CACHE_TIMEOUT)
+    return graph
+
+
+def invalidate_module_graph() -> None:
+    cache.delete(CACHE_KEY)
+
+
+def would_create_cycle(module_id: int, prerequisite_ids: Iterable[int]) -> bool:
+    """True si ajouter ces pré-requis à `module_id` crée une dépendance circulaire."""
+    graph = get_module_graph()
+    for prerequisite_id in prerequisite_ids:
+        if prerequisite_id == module_id:
+            return True
+        if module_id in graph.full_closure.get(prerequisite_id, ()):
+            return True
+    return False
+
+
+# =========================================================
+# Préparation formateurs × modules / parcours
+# =========================================================
+
+@dataclass(frozen=True)
+class ModuleReadiness:
+    module_id: int
+    mastered: bool
+    # tous les pré-requis (transitifs) sont maîtrisés
+    unlocked: bool
+    missing: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class TrackReadiness:
+    track_id: int
+    required_total: int
+    required_mastered: int
+    # premier module requis (dans l'ordre du parcours) non maîtrisé
+    next_module_id: int | None = None
+
+    @property
+    def is_complete(self) -> bool:
+        return self.required_mastered >= self.required_total
+
+
+@dataclass
+class ReadinessMatrix:
+    graph: ModuleGraph
+    modules: dict[int, dict[int, ModuleReadiness]] = field(default_factory=dict)
+    tracks: dict[int, dict[int, TrackReadiness]] = field(default_factory=dict)
+
+    def for_trainer(self, trainer_id: int) -> dict[int, ModuleReadiness]:
+        return self.modules.get(trainer_id, {})
+
+
+def mastered_modules_by_trainer(trainer_ids: Iterable[int]) -> dict[int, set[int]]:
+    mastered = defaultdict(set)
+    for trainer_id, module_id in (
+        TrainerModuleMastery.objects
+        .filter(MASTERED_Q, trainer_id__in=list(trainer_ids))
+        .values_list("trainer_id", "module_id")
+    ):
+        mastered[trainer_id].add(module_id)
+    return mastered
+
+
+def compute_readiness(trainer_ids: Iterable[int], *, with_tracks: bool = True) -> ReadinessMatrix:
+    """
+    Matrice formateurs × modules (et parcours) en un appel :
+    graphe en cache + 1 requête maîtrises (+ 1 requête étapes de parcours).
+    """
+    trainer_ids = list(trainer_ids)
+    graph = get_module_graph()
+    mastered = mastered_modules_by_trainer(trainer_ids)
+    matrix = ReadinessMatrix(graph=graph)
+
+    for trainer_id in trainer_ids:
+        done = mastered.get(trainer_id, set())
+        row = {}
+        for module_id in graph.names:
+            missing_ids = graph.prerequisites_of(module_id) - done
+            row[module_id] = ModuleReadiness(
+                module_id=module_id,
+                mastered=module_id in done,
+                unlocked=not missing_ids,
+                missing=tuple(sorted(graph.names[m] for m in missing_ids)),
+            )
+        matrix.modules[trainer_id] = row
+
+    if with_tracks and trainer_ids:
+        steps_by_track = defaultdict(list)
+        for track_id, module_id in (
+            ArgonosTrackStep.objects
+            .filter(required=True, track__is_active=True)
+            .order_by("track_id", "order")
+            .values_list("track_id", "module_id")
+        ):
+            steps_by_track[track_id].append(module_id)
+
+        for trainer_id in trainer_ids:
+            done = mastered.get(trainer_id, set())
+            matrix.tracks[trainer_id] = {
+                track_id: TrackReadiness(
+                    track_id=track_id,
+                    required_total=len(module_ids),
+                    required_mastered=sum(1 for m in module_ids if m in done),
+                    next_module_id=next((m for m in module_ids if m not in done), None),
+                )
+                for track_id, module_ids in steps_by_track.items()
+            }
+
+    return matrix
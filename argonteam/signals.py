@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import IntegrityError
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from .models import OneToOneMeeting, OneToOneStatus, OneToOneObjective, ObjectiveStatus
+from .models import ArgonosModule, OneToOneMeeting, OneToOneStatus, OneToOneObjective, ObjectiveStatus
+from .services.module_graph import invalidate_module_graph, would_create_cycle
 
 # Import Projects (optionnel)
 try:
@@ -55,7 +57,7 @@ def _create_task(project, objective, meeting):
 
     # status (adapte si ton Task.status n'est pas TODO)
     if hasattr(Task, "status"):
-        data["status"] = "TODO"
+        data["status"] = Task.Status.TODO
 
     # due date
     if getattr(objective, "due_date", None):
@@ -131,4 +133,28 @@ if Task is not None:
             .filter(created_task_id=instance.id)
             .exclude(status=ObjectiveStatus.DONE)
             .update(status=ObjectiveStatus.DONE)
-        )
\ No newline at end of file
+        )
+
+
+# =========================================================
+# Graphe des modules : cohérence + invalidation du cache
+# =========================================================
+
+@receiver(m2m_changed, sender=ArgonosModule.prerequisites.through)
+def module_prerequisites_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_add" and pk_set:
+        # reverse=True : on ajoute `instance` comme pré-requis des modules pk_set
+        pairs = [(pk, {instance.pk}) for pk in pk_set] if reverse else [(instance.pk, pk_set)]
+        for module_id, prerequisite_ids in pairs:
+            # dernier garde-fou : le formulaire admin (ArgonosModuleAdminForm) refuse le cycle avant
+            if would_create_cycle(module_id, prerequisite_ids):
+                raise IntegrityError("Dépendance circulaire entre modules ArgonOS.")
+
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_module_graph()
+
+
+@receiver(post_save, sender=ArgonosModule)
+@receiver(post_delete, sender=ArgonosModule)
+def module_changed(sender, **kwargs):
+    invalidate_module_graph()
@@ -1,3 +1,34 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .admin import ArgonosModuleAdminForm
+from .models import ArgonosModule
+from .services.module_graph import get_module_graph, invalidate_module_graph, would_create_cycle
+
+
+class ModuleGraphCycleTests(TestCase):
+    """Cycles de pré-requis : vérifiés sur tous les modules, actifs ou non."""
+
+    def setUp(self):
+        invalidate_module_graph()
+        # A dépend de B (désactivé), qui dépend de C
+        self.a, self.b, self.c = (ArgonosModule.objects.create(name=name) for name in "ABC")
+        self.a.prerequisites.add(self.b)
+        self.b.prerequisites.add(self.c)
+        self.b.is_active = False
+        self.b.save()
+
+    def test_cycle_through_inactive_module_is_detected(self):
+        self.assertTrue(would_create_cycle(self.c.pk, [self.a.pk]))
+        self.assertFalse(would_create_cycle(self.a.pk, [self.c.pk]))
+
+        form = ArgonosModuleAdminForm(
+            data={"name": "C", "prerequisites": [self.a.pk]}, instance=self.c,
+        )
+        form.is_valid()
+        self.assertIn("prerequisites", form.errors)
+
+    def test_readiness_ignores_inactive_modules(self):
+        graph = get_module_graph()
+        self.assertNotIn(self.b.pk, graph.names)
+        self.assertEqual(graph.prerequisites_of(self.a.pk), frozenset())
+        self.assertEqual(graph.full_closure[self.a.pk], frozenset({self.b.pk, self.c.pk}))
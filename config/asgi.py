@@ -3,6 +3,12 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serveur ASGI (ex. ``uvicorn config.asgi:application --workers 2``) : les vues
+async (sessions_json, clients_list_json, trainers_list_json,
+trainings_by_type_json, api_prereq_initiation) tournent dans la boucle, les
+vues classiques dans un thread par requête. Comparaison avec le chemin WSGI :
+``manage.py benchmark_concurrency``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
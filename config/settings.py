@@ -10,6 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,6 +55,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # en tête de liste : les requêtes SQL des autres middlewares (session, auth) sont comptées
+    'trainings.middleware.RequestProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,17 +91,142 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Serveur ASGI (uvicorn / daphne) : config.asgi:application. Les endpoints JSON de
+# l'agenda et des formulaires sont des vues async, servies en parallèle des
+# rendus de dashboards par un seul processus.
+ASGI_APPLICATION = 'config.asgi.application'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# Profil choisi par variables d'environnement :
+# - ARGON_DB_ENGINE=sqlite (défaut) : fichier ARGON_SQLITE_PATH (défaut db.sqlite3),
+#   journal WAL + attente des verrous (plusieurs gestionnaires en même temps
+#   sans "database is locked")
+# - ARGON_DB_ENGINE=postgresql : ARGON_DB_NAME / USER / PASSWORD / HOST / PORT,
+#   connexions persistantes (ARGON_DB_CONN_MAX_AGE secondes, défaut 60)
+# ARGON_SQLITE_SOURCE : ancien fichier SQLite exposé sous l'alias "sqlite_source"
+# pour la commande migrate_sqlite_to_postgres.
+
+def _sqlite_database(path):
+    return {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': path,
+        'OPTIONS': {
+            # attente max (secondes) d'un verrou avant "database is locked"
+            'timeout': int(os.environ.get('ARGON_SQLITE_TIMEOUT', '20')),
+            # écritures : verrou pris dès le BEGIN, pas au milieu de la transaction
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA busy_timeout=%d;'
+                'PRAGMA temp_store=MEMORY;'
+            ) % (int(os.environ.get('ARGON_SQLITE_TIMEOUT', '20')) * 1000),
+        },
+    }
+
+
+DB_ENGINE = os.environ.get('ARGON_DB_ENGINE', 'sqlite').lower()
+
+if DB_ENGINE in ('postgres', 'postgresql'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('ARGON_DB_NAME', 'argon_training'),
+            'USER': os.environ.get('ARGON_DB_USER', 'argon'),
+            'PASSWORD': os.environ.get('ARGON_DB_PASSWORD', ''),
+            'HOST': os.environ.get('ARGON_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('ARGON_DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('ARGON_DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': _sqlite_database(os.environ.get('ARGON_SQLITE_PATH') or BASE_DIR / 'db.sqlite3'),
+    }
+
+if os.environ.get('ARGON_SQLITE_SOURCE'):
+    DATABASES['sqlite_source'] = _sqlite_database(os.environ['ARGON_SQLITE_SOURCE'])
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Mémoire locale : suffisant pour un seul processus. Si le serveur tourne avec
+# plusieurs workers, passer sur FileBasedCache (partagé entre processus), sinon
+# les invalidations faites par un worker ne sont pas vues par les autres.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "argon-training",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 2000},
     }
 }
 
+# Durée de vie des blocs de dashboards (trainings.services.dashboard_cache).
+# Les blocs sont invalidés par génération de modèle ; ce délai borne seulement la mémoire.
+DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 6
+
+# Recalcul des scores de grille quand un critère change (trainer_eval.signals) :
+# dans un thread après le commit ; False = tout de suite, dans la requête.
+RUBRIC_RECOMPUTE_IN_BACKGROUND = True
+
+# Listes admin volumineuses (trainings.paginators.EstimatedCountPaginator) :
+# au-delà de ce nombre de lignes, une liste non filtrée affiche le nombre estimé
+# par les statistiques du moteur au lieu d'un COUNT(*) exact.
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 50_000
+
+
+# Profilage des requêtes (trainings.middleware.RequestProfilingMiddleware)
+# - en-tête Server-Timing (SQL, templates, total) : staff connecté, ou DEBUG
+# - journal JSONL (logs/requests.jsonl, rotation) : toutes les requêtes plus lentes
+#   que REQUEST_PROFILING_SLOW_MS, plus un échantillon des autres
+# - ?_profile=1 (staff) : résumé cProfile de la vue
+# `manage.py test` : désactivé par défaut et journal hors du dépôt
+TESTING = sys.argv[1:2] == ['test']
+REQUEST_PROFILING_ENABLED = os.environ.get('ARGON_PROFILING', '0' if TESTING else '1') != '0'
+REQUEST_PROFILING_SAMPLE_RATE = float(os.environ.get('ARGON_PROFILING_SAMPLE_RATE', '0.05'))
+REQUEST_PROFILING_SLOW_MS = int(os.environ.get('ARGON_PROFILING_SLOW_MS', '500'))
+REQUEST_PROFILING_TOP_QUERIES = 5
+REQUEST_PROFILING_SERVER_TIMING = True
+
+# dossier créé à la première écriture du journal (trainings.log_handlers)
+LOG_DIR = Path(
+    os.environ.get('ARGON_LOG_DIR')
+    or (Path(tempfile.gettempdir()) / 'argon-test-logs' if TESTING else BASE_DIR / 'logs')
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        # le message est déjà une ligne JSON
+        'jsonl': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'requests_file': {
+            'class': 'trainings.log_handlers.LazyRotatingFileHandler',
+            'filename': LOG_DIR / 'requests.jsonl',
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'jsonl',
+        },
+    },
+    'loggers': {
+        'argon.requests': {
+            'handlers': ['requests_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -154,4 +284,15 @@ EMAIL_HOST_PASSWORD = "TON_MOT_DE_PASSE_OU_APP_PASSWORD"
 
 DEFAULT_FROM_EMAIL = "training.argonos@chapsvision.com"
 
+# File d'envoi des emails (trainings.services.mailer, commande send_queued_emails)
+# un lot = une connexion SMTP ; Office 365 limite à 30 messages / minute
+EMAIL_QUEUE_BATCH_SIZE = 100
+EMAIL_QUEUE_RATE_PER_MINUTE = 30
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_RETRY_BASE_SECONDS = 60
+
+# Flux iCalendar (.ics) formateurs / salles / clients : fenêtre de sessions publiée
+ICS_FEED_PAST_DAYS = 90
+ICS_FEED_FUTURE_DAYS = 365
+
 WKHTMLTOPDF_CMD = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django import forms
 
+from trainings.paginators import EstimatedCountPaginator
+
 from .models import (
     ProjectCategory,
     Project,
@@ -115,6 +117,9 @@ class TaskAssignmentAdmin(admin.ModelAdmin):
     )
     autocomplete_fields = ("task", "trainer")
     ordering = ("start_date", "end_date", "task__project__name", "task__title")
+    list_select_related = ("task", "trainer")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 # ---- Étapes projet ----
@@ -8,4 +8,5 @@ class ProjectsConfig(AppConfig):
     def ready(self):
         # Force l'import des modèles au démarrage de Django
         from . import models  # noqa: F401
+        from . import signals  # noqa: F401
 
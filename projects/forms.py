@@ -11,7 +11,6 @@ class TaskForm(forms.ModelForm):
             "title",
             "description",
             "status",
-            "order",
             "priority",
             "assignee",
             "due_date",
@@ -23,7 +22,6 @@ class TaskForm(forms.ModelForm):
             "title": "Titre",
             "description": "Description",
             "status": "Statut",
-            "order": "Ordre",
             "priority": "Priorité",
             "assignee": "Assigné à",
             "due_date": "Échéance",
@@ -35,7 +33,6 @@ class TaskForm(forms.ModelForm):
             "description": forms.Textarea(attrs={"rows": 4}),
             "due_date": forms.DateInput(attrs={"type": "date"}),
             "planned_start_date": forms.DateInput(attrs={"type": "date"}),
-            "order": forms.NumberInput(attrs={"min": 0}),
             "priority": forms.NumberInput(attrs={"min": 1, "max": 3}),
             "estimated_days": forms.NumberInput(attrs={"min": 0, "step": "0.1"}),
         }
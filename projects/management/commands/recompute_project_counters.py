@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from projects.models import Project
+from projects.services.task_counters import (
+    STATUS_COUNTER_FIELDS,
+    real_counter_annotations,
+    refresh_project_counters,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule les compteurs de tâches (todo/doing/blocked/done) de tous les projets "
+        "à partir des tâches (un seul UPDATE corrélé)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Applique réellement la correction. Sans --apply, affiche seulement les écarts.",
+        )
+
+    def handle(self, *args, **options):
+        apply_changes = options["apply"]
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Recompute project task counters ==="))
+        self.stdout.write(f"Mode: {'APPLY' if apply_changes else 'DRY-RUN'}")
+        self.stdout.write("")
+
+        in_sync = {field: F(f"real_{field}") for field in STATUS_COUNTER_FIELDS.values()}
+        drifted = (
+            Project.objects
+            .annotate(**real_counter_annotations())
+            .exclude(**in_sync)
+            .count()
+        )
+        self.stdout.write(f"Projects with drifted counters: {drifted}")
+
+        if not apply_changes:
+            self.stdout.write(
+                self.style.WARNING("Simulation only. Re-run with --apply to fix the counters.")
+            )
+            return
+
+        updated = refresh_project_counters()
+        self.stdout.write(self.style.SUCCESS(f"Projects updated: {updated}"))
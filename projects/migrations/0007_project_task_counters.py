@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:12
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+KNOWN_STATUSES = ("todo", "doing", "blocked", "done")
+
+
+def forwards(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Task = apps.get_model("projects", "Task")
+
+    def count_of(condition):
+        return Coalesce(
+            Subquery(
+                Task.objects.filter(condition, project_id=OuterRef("pk"))
+                .order_by()
+                .values("project_id")
+                .annotate(n=Count("pk"))
+                .values("n"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    # un statut inconnu (ex. "TODO" en majuscules) compte comme TODO
+    Project.objects.update(
+        todo_count=count_of(Q(status="todo") | ~Q(status__in=KNOWN_STATUSES)),
+        doing_count=count_of(Q(status="doing")),
+        blocked_count=count_of(Q(status="blocked")),
+        done_count=count_of(Q(status="done")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_alter_project_options_alter_task_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='blocked_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Tâches bloquées'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='doing_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Tâches en cours'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='done_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Tâches terminées'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Tâches TODO'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
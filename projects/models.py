@@ -5,6 +5,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from trainings.mixins import ChangeTrackingMixin
+
 
 class ProjectCategory(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -62,6 +64,16 @@ class Project(models.Model):
         related_name="owned_projects",
     )
 
+    # =========================
+    # COMPTEURS DE TÂCHES (dénormalisés)
+    # Maintenus par Task.save / suppression (projects.services.task_counters),
+    # réparables via `manage.py recompute_project_counters --apply`.
+    # =========================
+    todo_count = models.PositiveIntegerField("Tâches TODO", default=0, editable=False)
+    doing_count = models.PositiveIntegerField("Tâches en cours", default=0, editable=False)
+    blocked_count = models.PositiveIntegerField("Tâches bloquées", default=0, editable=False)
+    done_count = models.PositiveIntegerField("Tâches terminées", default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -73,23 +85,43 @@ class Project(models.Model):
     def __str__(self):
         return self.name
 
+    COUNTER_FIELDS = ("todo_count", "doing_count", "blocked_count", "done_count")
+
+    def save(self, *args, **kwargs):
+        # compteurs maintenus en F() par Task.save : un save complet du projet
+        # (formulaire, admin) ne doit pas réécrire les valeurs lues en mémoire
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def open_count(self):
+        return self.todo_count + self.doing_count + self.blocked_count
+
+    @property
+    def total_count(self):
+        return self.open_count + self.done_count
+
     @property
     def tasks_total(self):
-        return self.tasks.count()
+        return self.total_count
 
     @property
     def tasks_done(self):
-        return self.tasks.filter(status=Task.Status.DONE).count()
+        return self.done_count
 
     @property
     def progress_percent(self):
-        total = self.tasks_total
+        total = self.total_count
         if total == 0:
             return 0
-        return int((self.tasks_done / total) * 100)
+        return int((self.done_count / total) * 100)
 
 
-class Task(models.Model):
+class Task(ChangeTrackingMixin, models.Model):
     class Status(models.TextChoices):
         TODO = "todo", "TODO"
         DOING = "doing", "En cours"
@@ -133,12 +165,34 @@ class Task(models.Model):
 
     class Meta:
         ordering = ["project", "order", "id"]
+        indexes = [
+            # colonne Kanban : projet + statut, triée par rang
+            models.Index(fields=["project", "status", "order"], name="task_column_rank_idx"),
+        ]
         verbose_name = "Tâche"
         verbose_name_plural = "Tâches"
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        from .services.task_counters import move_task_counter
+
+        adding = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        counted = update_fields is None or bool({"status", "project"} & set(update_fields))
+
+        previous = None
+        if not adding and counted and self.has_changed("status", "project"):
+            previous = (self.initial_value("project"), self.initial_value("status"))
+
+        super().save(*args, **kwargs)
+
+        if adding:
+            move_task_counter(None, None, self.project_id, self.status)
+        elif previous:
+            move_task_counter(previous[0], previous[1], self.project_id, self.status)
+
     @property
     def assignments_total(self):
         return self.assignments.count()
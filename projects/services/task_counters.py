@@ -0,0 +1,122 @@
+# projects/services/task_counters.py
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from projects.models import Project, Task
+
+
+# Statut de tâche -> compteur sur Project.
+# Un statut inconnu (ancienne donnée, "TODO" en majuscules...) compte comme TODO,
+# comme dans le Kanban.
+STATUS_COUNTER_FIELDS = {
+    Task.Status.TODO: "todo_count",
+    Task.Status.DOING: "doing_count",
+    Task.Status.BLOCKED: "blocked_count",
+    Task.Status.DONE: "done_count",
+}
+
+KNOWN_STATUSES = list(STATUS_COUNTER_FIELDS)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def counter_field(status: str | None) -> str:
+    return STATUS_COUNTER_FIELDS.get(status, "todo_count")
+
+
+def status_q(status: str, prefix: str = "") -> Q:
+    """Filtre des tâches d'une colonne (TODO inclut les statuts inconnus)."""
+    q = Q(**{f"{prefix}status": status})
+    if status == Task.Status.TODO:
+        q |= ~Q(**{f"{prefix}status__in": KNOWN_STATUSES})
+    return q
+
+
+# =========================================================
+# Mise à jour incrémentale (Task.save / suppression)
+# =========================================================
+
+def _shift(project_id: int | None, status: str | None, delta: int) -> None:
+    if not project_id:
+        return
+    field = counter_field(status)
+    qs = Project.objects.filter(pk=project_id)
+    if delta < 0:
+        # jamais négatif, même si les compteurs ont dérivé
+        qs = qs.filter(**{f"{field}__gte": -delta})
+    qs.update(**{field: F(field) + delta})
+
+
+def move_task_counter(
+    old_project_id: int | None,
+    old_status: str | None,
+    new_project_id: int | None,
+    new_status: str | None,
+) -> None:
+    """
+    Déplace une tâche d'un compteur à l'autre (UPDATE ... SET x = x ± 1).
+    - création   : old_project_id=None
+    - suppression: new_project_id=None
+    """
+    if old_project_id == new_project_id and counter_field(old_status) == counter_field(new_status):
+        return
+    _shift(old_project_id, old_status, -1)
+    _shift(new_project_id, new_status, +1)
+
+
+# =========================================================
+# Recalcul complet (commande de réparation)
+# =========================================================
+
+def _count_subquery(condition: Q) -> Coalesce:
+    subquery = (
+        Task.objects
+        .filter(condition, project_id=OuterRef("pk"))
+        .order_by()
+        .values("project_id")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def project_counter_expressions() -> dict:
+    """Expressions SQL des compteurs (sous-requêtes corrélées), pour un UPDATE en masse."""
+    return {
+        field: _count_subquery(status_q(status))
+        for status, field in STATUS_COUNTER_FIELDS.items()
+    }
+
+
+def real_counter_annotations(prefix: str = "tasks__") -> dict:
+    """Annotations `real_<compteur>` pour comparer les compteurs stockés aux tâches."""
+    return {
+        f"real_{field}": Count("tasks", filter=status_q(status, prefix))
+        for status, field in STATUS_COUNTER_FIELDS.items()
+    }
+
+
+def refresh_project_counters(
+    project_ids: Iterable[int] | None = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Recalcule les compteurs depuis les tâches :
+    - project_ids=None : tous les projets en un seul UPDATE corrélé
+    - sinon : un UPDATE par lot de `batch_size` projets
+    Retourne le nombre de projets mis à jour.
+    """
+    if project_ids is None:
+        return Project.objects.update(**project_counter_expressions())
+
+    ids = sorted({pid for pid in project_ids if pid})
+    updated = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        updated += Project.objects.filter(pk__in=chunk).update(**project_counter_expressions())
+    return updated
@@ -0,0 +1,131 @@
+# projects/services/task_ranking.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import Max, Min
+
+from projects.models import Task
+from projects.services.task_counters import status_q
+
+
+# Rangs "creux" : les tâches d'une colonne sont espacées de RANK_STEP,
+# on insère entre deux voisines en prenant le milieu (une seule ligne modifiée).
+# Quand il n'y a plus de place entre deux rangs, la colonne est renumérotée.
+RANK_STEP = 1024
+
+
+@dataclass(frozen=True)
+class MoveResult:
+    task: Task
+    rebalanced: bool = False
+
+
+def column_tasks(project_id: int, status: str):
+    """Tâches d'une colonne (projet + statut), dans l'ordre du Kanban."""
+    return Task.objects.filter(status_q(status), project_id=project_id).order_by("order", "id")
+
+
+def rebalance_column(project_id: int, status: str) -> int:
+    """Renumérote une colonne (RANK_STEP, 2×RANK_STEP, ...). Retourne le nombre de tâches modifiées."""
+    tasks = list(column_tasks(project_id, status).only("id", "order"))
+    changed = []
+    for index, task in enumerate(tasks, start=1):
+        rank = index * RANK_STEP
+        if task.order != rank:
+            task.order = rank
+            changed.append(task)
+    if changed:
+        Task.objects.bulk_update(changed, ["order"], batch_size=500)
+    return len(changed)
+
+
+def next_rank(project_id: int, status: str, *, exclude_pk: int | None = None) -> int:
+    """Rang d'une tâche ajoutée en fin de colonne."""
+    qs = column_tasks(project_id, status)
+    if exclude_pk:
+        qs = qs.exclude(pk=exclude_pk)
+    return (qs.aggregate(m=Max("order"))["m"] or 0) + RANK_STEP
+
+
+def _neighbour_ranks(task: Task, status: str, after_id, before_id) -> tuple[int | None, int | None]:
+    """
+    (rang au-dessus, rang en dessous) de la place visée.
+    Avec une seule voisine, l'autre est relue en base : la colonne est paginée,
+    les cartes suivantes ne sont pas forcément affichées.
+    """
+    ids = [pk for pk in (after_id, before_id) if pk and pk != task.pk]
+    ranks = {}
+    if ids:
+        ranks = dict(
+            column_tasks(task.project_id, status)
+            .filter(pk__in=ids)
+            .values_list("id", "order")
+        )
+
+    low, high = ranks.get(after_id), ranks.get(before_id)
+    if low is not None and high is None:
+        high = _adjacent_rank(task, status, after=low)
+    elif high is not None and low is None:
+        low = _adjacent_rank(task, status, before=high)
+    return low, high
+
+
+def _adjacent_rank(task: Task, status: str, *, after: int | None = None, before: int | None = None):
+    """Rang de la tâche qui suit `after` (ou précède `before`) dans la colonne, hors `task`."""
+    qs = column_tasks(task.project_id, status).exclude(pk=task.pk)
+    if after is not None:
+        return qs.filter(order__gt=after).aggregate(r=Min("order"))["r"]
+    return qs.filter(order__lt=before).aggregate(r=Max("order"))["r"]
+
+
+def _rank_between(low: int | None, high: int | None) -> int | None:
+    """Rang libre entre deux voisines (None = pas de place, il faut renuméroter)."""
+    if low is None and high is None:
+        return None
+    if high is None:
+        return low + RANK_STEP
+    if low is None:
+        return high - RANK_STEP
+    if high - low < 2:
+        return None
+    return (low + high) // 2
+
+
+def move_task(
+    task: Task,
+    status: str,
+    *,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> MoveResult:
+    """
+    Place `task` dans la colonne `status` de son projet :
+    - after_id  : tâche juste au-dessus
+    - before_id : tâche juste en dessous
+    Les voisines qui ne sont pas dans cette colonne sont ignorées ;
+    sans voisine, la tâche va en fin de colonne.
+    """
+    with transaction.atomic():
+        low, high = _neighbour_ranks(task, status, after_id, before_id)
+        rebalanced = False
+
+        if low is None and high is None:
+            rank = next_rank(task.project_id, status, exclude_pk=task.pk)
+        else:
+            rank = _rank_between(low, high)
+            if rank is None:
+                rebalance_column(task.project_id, status)
+                rebalanced = True
+                low, high = _neighbour_ranks(task, status, after_id, before_id)
+                # voisines inversées (tableau pas à jour côté navigateur) : on se place après `low`
+                rank = _rank_between(low, high)
+                if rank is None:
+                    rank = low + 1
+
+        task.status = status
+        task.order = rank
+        task.save(update_fields=["status", "order", "updated_at"])
+
+    return MoveResult(task=task, rebalanced=rebalanced)
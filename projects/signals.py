@@ -0,0 +1,20 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Project, Task
+from .services.task_counters import move_task_counter
+
+
+# Les compteurs de tâches de Project sont maintenus par Task.save() ;
+# la suppression passe ici pour couvrir aussi queryset.delete() et l'admin.
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    # suppression en cascade depuis le projet : plus rien à décompter
+    if isinstance(origin, Project) or (
+        isinstance(origin, QuerySet) and origin.model is Project
+    ):
+        return
+
+    move_task_counter(instance.project_id, instance.status, None, None)
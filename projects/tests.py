@@ -1,3 +1,197 @@
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from trainings.models import Trainer
+
+from .forms import TaskForm
+from .models import Project, Task, TaskAssignment
+from .services.task_counters import refresh_project_counters
+from .services.task_ranking import RANK_STEP, column_tasks, move_task, next_rank
+
+
+class TaskAssignmentAdminQueryCountTests(TestCase):
+    """La liste admin des affectations ne doit pas faire de requête par ligne."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pwd")
+        cls.project = Project.objects.create(name="Projet")
+        cls.url = reverse("admin:projects_taskassignment_changelist")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.counter = 0
+
+    def _add_assignments(self, count: int) -> None:
+        for _ in range(count):
+            self.counter += 1
+            task = Task.objects.create(project=self.project, title=f"Tâche {self.counter}")
+            trainer = Trainer.objects.create(first_name="F", last_name=f"Formateur {self.counter}")
+            TaskAssignment.objects.create(task=task, trainer=trainer)
+
+    def test_query_count_is_constant(self):
+        self._add_assignments(1)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        self._add_assignments(6)
+        with self.assertNumQueries(len(queries)):
+            self.client.get(self.url)
+
+
+class TaskRankingTests(TestCase):
+    """Rangs creux du Kanban : insertion au milieu, fin de colonne, renumérotation."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("user")
+        cls.project = Project.objects.create(name="Projet")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def column(self, status=Task.Status.TODO):
+        return list(column_tasks(self.project.pk, status).values_list("title", flat=True))
+
+    def add(self, title, status=Task.Status.TODO):
+        task = Task(project=self.project, title=title, status=status)
+        task.order = next_rank(self.project.pk, status)
+        task.save()
+        return task
+
+    def test_created_tasks_go_to_column_end(self):
+        url = reverse("projects:task_create")
+        for title in ("A", "B"):
+            self.client.post(url, {"project": self.project.pk, "title": title, "status": "todo", "priority": 2,
+                                   "estimated_days": "0"})
+        ranks = list(Task.objects.order_by("id").values_list("order", flat=True))
+        self.assertEqual(ranks, [RANK_STEP, 2 * RANK_STEP])
+        self.assertNotIn("order", TaskForm().fields)
+
+    def test_insert_between_neighbours_changes_one_row(self):
+        a, b = self.add("A"), self.add("B")
+        c = self.add("C", Task.Status.DOING)
+
+        result = move_task(c, Task.Status.TODO, after_id=a.pk, before_id=b.pk)
+
+        self.assertFalse(result.rebalanced)
+        self.assertEqual(c.order, (a.order + b.order) // 2)
+        # voisines inchangées
+        self.assertEqual(
+            list(Task.objects.filter(pk__in=[a.pk, b.pk]).order_by("pk").values_list("order", flat=True)),
+            [a.order, b.order],
+        )
+        self.assertEqual(self.column(), ["A", "C", "B"])
+        self.assertEqual(self.column(Task.Status.DOING), [])
+
+    def test_single_neighbour_reads_the_other_from_db(self):
+        a, b = self.add("A"), self.add("B")
+        c = self.add("C")
+        # seule la voisine du dessous est connue (colonne paginée côté navigateur)
+        move_task(c, Task.Status.TODO, before_id=b.pk)
+        self.assertEqual(self.column(), ["A", "C", "B"])
+        move_task(a, Task.Status.TODO, after_id=b.pk)
+        self.assertEqual(self.column(), ["C", "B", "A"])
+
+    def test_full_gap_rebalances_column(self):
+        a, b = self.add("A"), self.add("B")
+        Task.objects.filter(pk=b.pk).update(order=a.order + 1)
+        c = self.add("C")
+
+        result = move_task(c, Task.Status.TODO, after_id=a.pk, before_id=b.pk)
+
+        self.assertTrue(result.rebalanced)
+        self.assertEqual(self.column(), ["A", "C", "B"])
+        ranks = list(column_tasks(self.project.pk, Task.Status.TODO).values_list("order", flat=True))
+        self.assertEqual(len(set(ranks)), 3)
+
+    def test_inverted_neighbours_place_after_low(self):
+        a, b = self.add("A"), self.add("B")
+        c = self.add("C")
+        move_task(c, Task.Status.TODO, after_id=b.pk, before_id=a.pk)
+        self.assertEqual(self.column(), ["A", "B", "C"])
+
+    def test_arrow_move_appends_to_next_column(self):
+        self.add("D1", Task.Status.DOING)
+        task = self.add("T")
+        task.order = 1
+        task.save(update_fields=["order"])
+
+        self.client.post(reverse("projects:task_move", args=[task.pk]), {"direction": "right"})
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DOING)
+        self.assertEqual(self.column(Task.Status.DOING), ["D1", "T"])
+
+
+class ProjectTaskCounterTests(TestCase):
+    """Compteurs de tâches par statut tenus par Task.save / post_delete."""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="Projet")
+        self.other = Project.objects.create(name="Autre")
+
+    def counts(self, project=None):
+        project = project or self.project
+        project.refresh_from_db()
+        return tuple(getattr(project, field) for field in Project.COUNTER_FIELDS)
+
+    def test_create_move_and_delete(self):
+        task = Task.objects.create(project=self.project, title="T")
+        Task.objects.create(project=self.project, title="U", status=Task.Status.DONE)
+        self.assertEqual(self.counts(), (1, 0, 0, 1))
+
+        task.status = Task.Status.BLOCKED
+        task.save()
+        self.assertEqual(self.counts(), (0, 0, 1, 1))
+
+        task.project = self.other
+        task.save()
+        self.assertEqual((self.counts(), self.counts(self.other)), ((0, 0, 0, 1), (0, 0, 1, 0)))
+
+        task.delete()
+        Task.objects.filter(project=self.project).delete()
+        self.assertEqual((self.counts(), self.counts(self.other)), ((0, 0, 0, 0), (0, 0, 0, 0)))
+
+    def test_save_limited_to_other_fields_keeps_counters(self):
+        task = Task.objects.create(project=self.project, title="T")
+        task.status = Task.Status.DOING
+        task.save(update_fields=["title"])
+        self.assertEqual(self.counts(), (1, 0, 0, 0))
+
+    def test_unknown_status_counts_as_todo(self):
+        task = Task.objects.create(project=self.project, title="T", status="TODO")
+        self.assertEqual(self.counts(), (1, 0, 0, 0))
+        task.status = Task.Status.TODO
+        task.save()
+        self.assertEqual(self.counts(), (1, 0, 0, 0))
+
+    def test_project_cascade_skips_decrements(self):
+        Task.objects.create(project=self.project, title="T")
+        with CaptureQueriesContext(connection) as queries:
+            self.project.delete()
+        self.assertFalse(any('UPDATE "projects_project"' in q["sql"] for q in queries.captured_queries))
+
+    def test_full_project_save_does_not_overwrite_counters(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        Task.objects.create(project=self.project, title="T")
+        stale.name = "Renommé"
+        stale.save()
+        self.assertEqual(self.counts(), (1, 0, 0, 0))
+        self.assertEqual(self.project.name, "Renommé")
+
+    def test_counters_never_go_negative_and_can_be_repaired(self):
+        task = Task.objects.create(project=self.project, title="T")
+        Project.objects.filter(pk=self.project.pk).update(todo_count=0)
+        task.delete()
+        self.assertEqual(self.counts(), (0, 0, 0, 0))
+
+        Task.objects.bulk_create(
+            [Task(project=self.project, title=f"B{i}", status=Task.Status.DOING) for i in range(3)]
+        )
+        self.assertEqual(refresh_project_counters([self.project.pk, self.other.pk], batch_size=1), 2)
+        self.assertEqual(self.counts(), (0, 3, 0, 0))
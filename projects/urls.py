@@ -8,6 +8,7 @@ urlpatterns = [
     # Kanban TÂCHES
     # =========================================================
     path("", views.projects_home, name="projects_home"),
+    path("kanban/column/<str:status>/", views.kanban_column, name="kanban_column"),
 
     # =========================================================
     # Kanban PROJETS
@@ -30,6 +31,7 @@ urlpatterns = [
     path("tasks/new/", views.task_create, name="task_create"),
     path("tasks/<int:task_id>/edit/", views.task_edit, name="task_edit"),
     path("tasks/<int:task_id>/move/", views.task_move, name="task_move"),
+    path("tasks/<int:task_id>/reorder/", views.task_reorder, name="task_reorder"),
     path("tasks/<int:task_id>/delete/", views.task_delete, name="task_delete"),
     path("tasks/<int:task_id>/quick/", views.task_quick, name="task_quick"),
 
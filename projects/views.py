@@ -1,12 +1,15 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Count, Q
+from django.db.models import Count
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.views.decorators.http import require_POST, require_GET
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 
 from .models import Project, Task, ProjectCategory, TaskAssignment
 from .forms import TaskForm, TaskAssignmentForm, ProjectForm
+from .services.task_counters import status_q
+from .services.task_ranking import move_task, next_rank
 
 
 # =========================================================
@@ -20,6 +23,131 @@ KANBAN_STATUSES = [
     ("done", "Terminé"),
 ]
 
+# Nombre de cartes chargées par colonne (puis "Charger plus")
+KANBAN_PAGE_SIZE = 20
+
+KANBAN_CARD_TEMPLATES = {
+    "home": "projects/_home_task_cards.html",
+    "project": "projects/_project_task_cards.html",
+}
+
+
+# =========================================================
+# Kanban - colonnes paginées
+# =========================================================
+
+def _home_tasks_qs(params):
+    """Tâches du Kanban global selon les filtres (q, priority, project, cat)."""
+    q = (params.get("q") or "").strip()
+    priority = (params.get("priority") or "").strip()
+    project_id = (params.get("project") or "").strip()
+    cat_id = (params.get("cat") or "").strip()
+
+    tasks_qs = Task.objects.select_related("project", "assignee")
+
+    if cat_id:
+        tasks_qs = tasks_qs.filter(project__category_id=cat_id)
+
+    if project_id:
+        tasks_qs = tasks_qs.filter(project_id=project_id)
+
+    if q:
+        tasks_qs = tasks_qs.filter(title__icontains=q)
+
+    if priority:
+        try:
+            tasks_qs = tasks_qs.filter(priority=int(priority))
+        except Exception:
+            pass
+
+    return tasks_qs.order_by("project__name", "order", "id")
+
+
+def _project_tasks_qs(project_id):
+    return (
+        Task.objects
+        .select_related("project", "assignee")
+        .prefetch_related("assignments__trainer")
+        .filter(project_id=project_id)
+        .order_by("order", "id")
+    )
+
+
+def _column_counts(tasks_qs) -> dict:
+    """Nombre de tâches par colonne, en une seule requête d'agrégat."""
+    return tasks_qs.order_by().aggregate(**{
+        key: Count("id", filter=status_q(key))
+        for key, _ in KANBAN_STATUSES
+    })
+
+
+def _column_page(tasks_qs, status: str, offset: int = 0, limit: int = KANBAN_PAGE_SIZE):
+    """(tâches de la page, il en reste d'autres ?) — une requête, limit + 1 lignes."""
+    rows = list(tasks_qs.filter(status_q(status))[offset:offset + limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def _kanban_columns(tasks_qs) -> list[dict]:
+    counts = _column_counts(tasks_qs)
+    columns = []
+    for key, label in KANBAN_STATUSES:
+        tasks, has_more = _column_page(tasks_qs, key)
+        columns.append({
+            "key": key,
+            "label": label,
+            "tasks": tasks,
+            "count": counts.get(key) or 0,
+            "has_more": has_more,
+            "next_offset": len(tasks),
+        })
+    return columns
+
+
+@require_GET
+@login_required
+def kanban_column(request, status: str):
+    """
+    Page suivante d'une colonne Kanban (HTML des cartes en JSON) :
+    ?scope=home&q=&priority=&project=&cat=&offset=20
+    ?scope=project&project=12&offset=20
+    """
+    if status not in dict(KANBAN_STATUSES):
+        raise Http404("Colonne inconnue.")
+
+    scope = (request.GET.get("scope") or "home").strip()
+    if scope not in KANBAN_CARD_TEMPLATES:
+        raise Http404("Vue inconnue.")
+
+    try:
+        offset = max(0, int(request.GET.get("offset") or 0))
+    except ValueError:
+        offset = 0
+
+    if scope == "project":
+        project_id = (request.GET.get("project") or "").strip()
+        if not project_id.isdigit():
+            raise Http404("Projet manquant.")
+        project = get_object_or_404(Project, id=int(project_id))
+        tasks_qs = _project_tasks_qs(project.id)
+    else:
+        tasks_qs = _home_tasks_qs(request.GET)
+
+    tasks, has_more = _column_page(tasks_qs, status, offset)
+
+    html = render_to_string(
+        KANBAN_CARD_TEMPLATES[scope],
+        {"tasks": tasks},
+        request=request,
+    )
+
+    return JsonResponse({
+        "status": status,
+        "html": html,
+        "count": len(tasks),
+        "has_more": has_more,
+        "next_offset": offset + len(tasks),
+    })
+
 
 # =========================================================
 # Vue globale des tâches
@@ -37,39 +165,13 @@ def projects_home(request):
     projects_qs = (
         Project.objects
         .select_related("category")
-        .annotate(
-            todo_count=Count("tasks", filter=Q(tasks__status="todo")),
-            doing_count=Count("tasks", filter=Q(tasks__status="doing")),
-            blocked_count=Count("tasks", filter=Q(tasks__status="blocked")),
-            done_count=Count("tasks", filter=Q(tasks__status="done")),
-            total_count=Count("tasks"),
-        )
         .order_by("name")
     )
 
-    tasks_qs = Task.objects.select_related("project", "project__category", "assignee").all()
-
     if cat_id:
         projects_qs = projects_qs.filter(category_id=cat_id)
-        tasks_qs = tasks_qs.filter(project__category_id=cat_id)
-
-    if project_id:
-        tasks_qs = tasks_qs.filter(project_id=project_id)
-
-    if q:
-        tasks_qs = tasks_qs.filter(title__icontains=q)
-
-    if priority:
-        try:
-            tasks_qs = tasks_qs.filter(priority=int(priority))
-        except Exception:
-            pass
 
-    columns = {key: [] for key, _ in KANBAN_STATUSES}
-    for t in tasks_qs.order_by("project__name", "order", "id"):
-        columns.get(t.status, columns["todo"]).append(t)
-
-    kanban_cols = [(key, label, columns.get(key, [])) for key, label in KANBAN_STATUSES]
+    kanban_cols = _kanban_columns(_home_tasks_qs(request.GET))
 
     selected_project = None
     if project_id.isdigit():
@@ -102,13 +204,6 @@ def projects_kanban(request):
     projects_qs = (
         Project.objects
         .select_related("category", "owner")
-        .annotate(
-            todo_count=Count("tasks", filter=Q(tasks__status="todo")),
-            doing_count=Count("tasks", filter=Q(tasks__status="doing")),
-            blocked_count=Count("tasks", filter=Q(tasks__status="blocked")),
-            done_count=Count("tasks", filter=Q(tasks__status="done")),
-            total_count=Count("tasks"),
-        )
         .order_by("category__name", "name")
     )
 
@@ -146,24 +241,12 @@ def project_detail(request, project_id: int):
         id=project_id,
     )
 
-    tasks_qs = (
-        Task.objects
-        .select_related("project", "assignee")
-        .prefetch_related("assignments__trainer")
-        .filter(project=project)
-        .order_by("order", "id")
-    )
-
-    columns = {key: [] for key, _ in KANBAN_STATUSES}
-    for t in tasks_qs:
-        columns.get(t.status, columns["todo"]).append(t)
-
-    kanban_cols = [(key, label, columns.get(key, [])) for key, label in KANBAN_STATUSES]
+    kanban_cols = _kanban_columns(_project_tasks_qs(project.id))
 
     return render(request, "projects/project_detail.html", {
         "project": project,
-        "tasks": tasks_qs,
         "kanban_cols": kanban_cols,
+        "column_counts": {col["key"]: col["count"] for col in kanban_cols},
     })
 
 
@@ -241,7 +324,11 @@ def task_create(request):
     if request.method == "POST":
         form = TaskForm(request.POST)
         if form.is_valid():
-            task = form.save()
+            # rang attribué par le Kanban : nouvelle tâche en fin de colonne
+            task = form.save(commit=False)
+            task.order = next_rank(task.project_id, task.status)
+            task.save()
+            form.save_m2m()
 
             next_url = request.POST.get("next_url", "").strip()
             if next_url:
@@ -265,7 +352,12 @@ def task_edit(request, task_id):
     if request.method == "POST":
         form = TaskForm(request.POST, instance=task)
         if form.is_valid():
-            task = form.save()
+            task = form.save(commit=False)
+            # changement de colonne depuis le formulaire : en fin de la nouvelle colonne
+            if task.has_changed("project", "status"):
+                task.order = next_rank(task.project_id, task.status, exclude_pk=task.pk)
+            task.save()
+            form.save_m2m()
 
             next_url = request.POST.get("next_url", "").strip()
             if next_url:
@@ -302,8 +394,9 @@ def task_move(request, task_id):
     elif direction == "right":
         idx = min(len(order) - 1, idx + 1)
 
-    task.status = order[idx]
-    task.save(update_fields=["status", "updated_at"])
+    # flèches : la tâche passe en fin de la colonne voisine (rangs du Kanban)
+    if order[idx] != task.status:
+        move_task(task, order[idx])
 
     if source == "project_detail":
         return redirect("projects:project_detail", project_id=task.project_id)
@@ -416,6 +509,41 @@ def task_assignment_delete(request, assignment_id: int):
     return redirect("projects:project_detail", project_id=project_id)
 
 
+def _task_id_or_none(value):
+    value = (value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+@require_POST
+@login_required
+def task_reorder(request, task_id: int):
+    """
+    Glisser-déposer d'une carte : POST status=&after=<id>&before=<id>
+    (after = carte juste au-dessus, before = carte juste en dessous).
+    Répond en JSON, sans recharger le tableau.
+    """
+    task = get_object_or_404(Task, id=task_id)
+
+    status = (request.POST.get("status") or task.status).strip()
+    if status not in dict(KANBAN_STATUSES):
+        return JsonResponse({"ok": False, "error": "Statut inconnu."}, status=400)
+
+    result = move_task(
+        task,
+        status,
+        after_id=_task_id_or_none(request.POST.get("after")),
+        before_id=_task_id_or_none(request.POST.get("before")),
+    )
+
+    return JsonResponse({
+        "ok": True,
+        "id": task.id,
+        "status": task.status,
+        "order": task.order,
+        "rebalanced": result.rebalanced,
+    })
+
+
 @require_GET
 @login_required
 def task_quick(request, task_id: int):
@@ -64,8 +64,8 @@ if StrategicContribution:
 if TrainerAlert:
     @admin.register(TrainerAlert)
     class TrainerAlertAdmin(admin.ModelAdmin):
-        list_display = ("triggered_on", "trainer", "training", "severity", "category", "status")
-        list_filter = ("severity", "category", "status", "training")
+        list_display = ("triggered_on", "trainer", "training", "severity", "category", "status", "rule")
+        list_filter = ("severity", "category", "status", "rule", "training")
         search_fields = ("trainer__first_name", "trainer__last_name", "metric", "value", "manager_comment")
 
 
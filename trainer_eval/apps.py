@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class TrainerEvalConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "trainer_eval"
\ No newline at end of file
+    name = "trainer_eval"
+
+    def ready(self):
+        from . import signals  # noqa: F401
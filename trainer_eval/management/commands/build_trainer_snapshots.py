@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from trainer_eval.services.snapshots import (
+    add_months,
+    build_month,
+    first_activity_month,
+    month_range,
+    month_start,
+    rebuild_pairs,
+    stale_pairs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcule les snapshots mensuels d'évaluation des formateurs "
+        "(sessions, satisfaction, scores de grille, contributions). "
+        "Par défaut : mois marqués à recalculer + mois courant et précédent."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=2,
+            help="Nombre de mois récents recalculés en entier (défaut : 2, mois courant inclus).",
+        )
+        parser.add_argument(
+            "--since",
+            help="Recalcule tous les mois à partir de ce mois (AAAA-MM).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recalcule tout l'historique depuis la première activité.",
+        )
+
+    def handle(self, *args, **options):
+        current = month_start(timezone.localdate())
+
+        if options["full"]:
+            first = first_activity_month() or current
+        elif options["since"]:
+            try:
+                first = date.fromisoformat(f"{options['since']}-01")
+            except ValueError:
+                raise CommandError("--since doit être au format AAAA-MM.")
+        else:
+            if options["months"] < 0:
+                raise CommandError("--months doit être positif.")
+            first = add_months(current, -(options["months"] - 1)) if options["months"] else None
+
+        months = month_range(first, current) if first else []
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Build trainer snapshots ==="))
+        if months:
+            self.stdout.write(f"Months: {months[0]:%Y-%m} -> {months[-1]:%Y-%m} ({len(months)})")
+        self.stdout.write("")
+
+        written = 0
+        for month in months:
+            written += build_month(month)
+
+        # mois plus anciens modifiés depuis le dernier passage
+        pairs = {(trainer_id, month) for trainer_id, month in stale_pairs() if month not in months}
+        if pairs:
+            written += rebuild_pairs(pairs)
+
+        self.stdout.write(f"Full months rebuilt: {len(months)}")
+        self.stdout.write(f"Stale trainer-months rebuilt: {len(pairs)}")
+        self.stdout.write(self.style.SUCCESS(f"Snapshots written: {written}"))
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trainer_eval.services.alert_rules import RULES_BY_CODE, generate_alerts
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère les alertes formateurs à partir des règles (évaluations, satisfaction, "
+        "charge, objectifs 1to1) : crée, met à jour ou clôture les alertes automatiques."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Écrit réellement les alertes. Sans --apply, affiche seulement le bilan.",
+        )
+        parser.add_argument(
+            "--rule",
+            action="append",
+            dest="rules",
+            choices=list(RULES_BY_CODE),
+            help="Code de règle (répétable). Par défaut : toutes les règles.",
+        )
+        parser.add_argument(
+            "--date",
+            help="Date de référence (AAAA-MM-JJ). Par défaut : aujourd'hui.",
+        )
+
+    def handle(self, *args, **options):
+        apply_changes = options["apply"]
+
+        today = None
+        if options["date"]:
+            try:
+                today = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("--date doit être au format AAAA-MM-JJ.")
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Generate trainer alerts ==="))
+        self.stdout.write(f"Mode: {'APPLY' if apply_changes else 'DRY-RUN'}")
+        self.stdout.write("")
+
+        results = generate_alerts(options["rules"], today=today, dry_run=not apply_changes)
+        for r in results:
+            self.stdout.write(
+                f"[{r.rule}] matched: {r.matched}, created: {r.created}, "
+                f"updated: {r.updated}, resolved: {r.resolved}"
+            )
+
+        if not apply_changes:
+            self.stdout.write(
+                self.style.WARNING("Simulation only. Re-run with --apply to write the alerts.")
+            )
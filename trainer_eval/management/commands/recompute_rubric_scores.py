@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trainer_eval.services.rubric_scores import KINDS, recompute_rubric_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule les scores de grille (total, max, /100) et la décision des évaluations "
+        "à partir des notes et des poids actuels des critères."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Applique réellement le recalcul. Sans --apply, affiche seulement les écarts.",
+        )
+        parser.add_argument(
+            "--kind",
+            choices=[*KINDS, "all"],
+            default="all",
+            help="Évaluations internes (formations), contributions projets, ou all.",
+        )
+        parser.add_argument(
+            "--rubric",
+            type=int,
+            action="append",
+            dest="rubrics",
+            help="Id de grille (répétable). Nécessite --kind internal ou project.",
+        )
+        parser.add_argument(
+            "--since",
+            help="Uniquement les évaluations à partir de cette date (AAAA-MM-JJ).",
+        )
+
+    def handle(self, *args, **options):
+        apply_changes = options["apply"]
+        kind = options["kind"]
+        rubric_ids = options["rubrics"]
+
+        if rubric_ids and kind == "all":
+            raise CommandError("--rubric nécessite --kind internal ou --kind project.")
+
+        since = None
+        if options["since"]:
+            try:
+                since = date.fromisoformat(options["since"])
+            except ValueError:
+                raise CommandError("--since doit être au format AAAA-MM-JJ.")
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Recompute rubric scores ==="))
+        self.stdout.write(f"Mode: {'APPLY' if apply_changes else 'DRY-RUN'}")
+        self.stdout.write(f"Kind: {kind}")
+        if rubric_ids:
+            self.stdout.write(f"Rubrics: {', '.join(map(str, rubric_ids))}")
+        if since:
+            self.stdout.write(f"Since: {since.isoformat()}")
+        self.stdout.write("")
+
+        kinds = list(KINDS) if kind == "all" else [kind]
+        for name in kinds:
+            result = recompute_rubric_scores(
+                name,
+                rubric_ids=rubric_ids,
+                since=since,
+                dry_run=not apply_changes,
+            )
+            label = "updated" if apply_changes else "with drifted scores"
+            self.stdout.write(f"[{name}] Evaluations scanned: {result.scanned}, {label}: {result.updated}")
+
+        if not apply_changes:
+            self.stdout.write(
+                self.style.WARNING("Simulation only. Re-run with --apply to update the scores.")
+            )
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer_eval', '0007_projectrubric_projectcriterion_and_more'),
+        ('trainings', '0035_product_classification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainerEvalSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('product', models.CharField(blank=True, choices=[('ARGONOS', 'ArgonOS'), ('MERCURE', 'Mercure')], default='', max_length=20)),
+                ('sessions_count', models.PositiveIntegerField(default=0)),
+                ('backup_sessions_count', models.PositiveIntegerField(default=0)),
+                ('session_days', models.DecimalField(decimal_places=1, default=0, max_digits=6)),
+                ('satisfaction_count', models.PositiveIntegerField(default=0)),
+                ('satisfaction_avg', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('evaluations_count', models.PositiveIntegerField(default=0)),
+                ('total_score_30_avg', models.DecimalField(blank=True, decimal_places=1, max_digits=4, null=True)),
+                ('rubric_score_avg', models.DecimalField(blank=True, decimal_places=1, max_digits=4, null=True)),
+                ('rubric_score_p25', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('rubric_score_median', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('rubric_score_p75', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('contributions_count', models.PositiveIntegerField(default=0)),
+                ('contribution_score_avg', models.DecimalField(blank=True, decimal_places=1, max_digits=4, null=True)),
+                ('strategic_points', models.IntegerField(default=0)),
+                ('stale', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('trainer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eval_snapshots', to='trainings.trainer')),
+            ],
+            options={
+                'ordering': ('trainer', 'month', 'product'),
+                'indexes': [models.Index(fields=['product', 'month'], name='snapshot_product_month_idx'), models.Index(fields=['stale'], name='snapshot_stale_idx')],
+                'unique_together': {('trainer', 'month', 'product')},
+            },
+        ),
+    ]
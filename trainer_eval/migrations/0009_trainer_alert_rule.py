@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer_eval', '0008_trainer_eval_snapshot'),
+        ('trainings', '0035_product_classification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='traineralert',
+            name='resolved_on',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='traineralert',
+            name='rule',
+            field=models.CharField(blank=True, default='', max_length=60),
+        ),
+        migrations.AddIndex(
+            model_name='traineralert',
+            index=models.Index(fields=['rule', 'status'], name='alert_rule_status_idx'),
+        ),
+    ]
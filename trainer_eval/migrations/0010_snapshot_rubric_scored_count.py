@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:20
+
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    # Valeur provisoire (toutes les évaluations du mois) et mois marqués à
+    # recalculer : build_trainer_snapshots remet le vrai décompte.
+    TrainerEvalSnapshot = apps.get_model("trainer_eval", "TrainerEvalSnapshot")
+    TrainerEvalSnapshot.objects.filter(rubric_score_avg__isnull=False).update(
+        rubric_scored_count=models.F("evaluations_count"),
+        stale=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer_eval', '0009_trainer_alert_rule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainerevalsnapshot',
+            name='rubric_scored_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,9 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils import timezone
 
+from trainings.mixins import ChangeTrackingMixin
+from trainings.models import Product
+
 
 class EvaluationDecision(models.TextChoices):
     BEGINNER = "beginner", "Débutant"
@@ -11,7 +14,19 @@ class EvaluationDecision(models.TextChoices):
     NA = "na", "Non concerné"
 
 
-class InternalEvaluation(models.Model):
+def rubric_score_100(total: int, max_total: int) -> int:
+    return int(round((total / max_total) * 100)) if max_total else 0
+
+
+def rubric_decision(score_100: int) -> str:
+    if score_100 < 50:
+        return EvaluationDecision.BEGINNER
+    if score_100 < 75:
+        return EvaluationDecision.INTERMEDIATE
+    return EvaluationDecision.EXPERT
+
+
+class InternalEvaluation(ChangeTrackingMixin, models.Model):
     """
     Évaluation interne : score core / specific / total
     + score grille (rubric) + décision
@@ -89,17 +104,11 @@ class InternalEvaluation(models.Model):
 
         self.rubric_score_total = total
         self.rubric_score_max = max_total
-        self.rubric_score_100 = int(round((total / max_total) * 100)) if max_total else 0
+        self.rubric_score_100 = rubric_score_100(total, max_total)
 
         # Si pas de critères => on ne touche pas à la décision
         if scores.exists():
-            s100 = self.rubric_score_100
-            if s100 < 50:
-                self.decision = EvaluationDecision.BEGINNER
-            elif s100 < 75:
-                self.decision = EvaluationDecision.INTERMEDIATE
-            else:
-                self.decision = EvaluationDecision.EXPERT
+            self.decision = rubric_decision(self.rubric_score_100)
 
         if commit:
             self.save(update_fields=[
@@ -124,7 +133,7 @@ class ContributionKind(models.TextChoices):
     FEEDBACK = "feedback", "Feedback produit"
 
 
-class StrategicContribution(models.Model):
+class StrategicContribution(ChangeTrackingMixin, models.Model):
     """
     Contributions "stratégiques" (ex: doc, mentoring, contenu, etc.)
     pour logiques de prime/objectif.
@@ -179,8 +188,15 @@ class TrainerAlert(models.Model):
 
     manager_comment = models.TextField(blank=True)
 
+    # Alertes générées par les règles (generate_trainer_alerts) ; vide = saisie manuelle
+    rule = models.CharField(max_length=60, blank=True, default="")
+    resolved_on = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         ordering = ["-triggered_on", "-id"]
+        indexes = [
+            models.Index(fields=["rule", "status"], name="alert_rule_status_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.trainer} — {self.severity} — {self.status}"
@@ -217,7 +233,7 @@ class EvaluationRubric(models.Model):
         return f"{self.training} — {self.version_label}"
 
 
-class EvaluationCriterion(models.Model):
+class EvaluationCriterion(ChangeTrackingMixin, models.Model):
     """
     Un critère appartenant à une grille.
     On structure en sections pour garder ton approche 'très complète'.
@@ -313,7 +329,7 @@ class ProjectRubric(models.Model):
         return f"{cat} — {self.version_label}"
 
 
-class ProjectCriterion(models.Model):
+class ProjectCriterion(ChangeTrackingMixin, models.Model):
     class Section(models.TextChoices):
         PREP = "prep", "Préparation"
         EXEC = "exec", "Exécution"
@@ -340,7 +356,7 @@ class ProjectCriterion(models.Model):
         return f"[{self.get_section_display()}] {self.label}"
 
 
-class ProjectContributionEvaluation(models.Model):
+class ProjectContributionEvaluation(ChangeTrackingMixin, models.Model):
     evaluated_on = models.DateField(default=timezone.now)
 
     trainer = models.ForeignKey(
@@ -410,16 +426,10 @@ class ProjectContributionEvaluation(models.Model):
 
         self.rubric_score_total = total
         self.rubric_score_max = max_total
-        self.rubric_score_100 = int(round((total / max_total) * 100)) if max_total else 0
+        self.rubric_score_100 = rubric_score_100(total, max_total)
 
         if scores.exists():
-            s100 = self.rubric_score_100
-            if s100 < 50:
-                self.decision = EvaluationDecision.BEGINNER
-            elif s100 < 75:
-                self.decision = EvaluationDecision.INTERMEDIATE
-            else:
-                self.decision = EvaluationDecision.EXPERT
+            self.decision = rubric_decision(self.rubric_score_100)
 
         if commit:
             self.save(update_fields=["rubric_score_total","rubric_score_max","rubric_score_100","decision"])
@@ -444,4 +454,60 @@ class ProjectScore(models.Model):
 
     class Meta:
         unique_together = ("evaluation", "criterion")
-        ordering = ("criterion__section", "criterion__sort_order", "id")
\ No newline at end of file
+        ordering = ("criterion__section", "criterion__sort_order", "id")
+
+
+# =========================================
+# Snapshots mensuels (tendances formateurs)
+# =========================================
+
+class TrainerEvalSnapshot(models.Model):
+    """
+    Indicateurs d'un formateur pour un mois et un produit, calculés par
+    `manage.py build_trainer_snapshots` (trainer_eval.services.snapshots).
+    - sessions / satisfaction : sessions animées (produit de la session)
+    - évaluations internes : produit du type de la formation évaluée
+    - contributions : rattachées au produit du formateur
+    `stale` = une donnée source a changé depuis le calcul (signaux).
+    """
+    trainer = models.ForeignKey(
+        "trainings.Trainer",
+        on_delete=models.CASCADE,
+        related_name="eval_snapshots",
+    )
+    month = models.DateField()  # 1er jour du mois
+    product = models.CharField(max_length=20, choices=Product.choices, blank=True, default="")
+
+    sessions_count = models.PositiveIntegerField(default=0)
+    backup_sessions_count = models.PositiveIntegerField(default=0)
+    session_days = models.DecimalField(max_digits=6, decimal_places=1, default=0)
+
+    satisfaction_count = models.PositiveIntegerField(default=0)
+    satisfaction_avg = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+
+    evaluations_count = models.PositiveIntegerField(default=0)
+    # évaluations notées sur une grille : poids de rubric_score_avg
+    rubric_scored_count = models.PositiveIntegerField(default=0)
+    total_score_30_avg = models.DecimalField(max_digits=4, decimal_places=1, null=True, blank=True)
+    rubric_score_avg = models.DecimalField(max_digits=4, decimal_places=1, null=True, blank=True)
+    rubric_score_p25 = models.PositiveSmallIntegerField(null=True, blank=True)
+    rubric_score_median = models.PositiveSmallIntegerField(null=True, blank=True)
+    rubric_score_p75 = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    contributions_count = models.PositiveIntegerField(default=0)
+    contribution_score_avg = models.DecimalField(max_digits=4, decimal_places=1, null=True, blank=True)
+    strategic_points = models.IntegerField(default=0)
+
+    stale = models.BooleanField(default=False)
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("trainer", "month", "product")
+        ordering = ("trainer", "month", "product")
+        indexes = [
+            models.Index(fields=["product", "month"], name="snapshot_product_month_idx"),
+            models.Index(fields=["stale"], name="snapshot_stale_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.trainer_id} — {self.month:%Y-%m} — {self.product or '—'}"
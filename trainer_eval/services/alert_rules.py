@@ -0,0 +1,293 @@
+# trainer_eval/services/alert_rules.py
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Iterable
+
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from argonteam.models import ObjectiveStatus, OneToOneObjective
+from trainer_eval.models import (
+    AlertSeverity,
+    AlertStatus,
+    EvaluationDecision,
+    InternalEvaluation,
+    TrainerAlert,
+)
+from trainings.models import Session
+from trainings.services.workload import trainer_workload_rows
+
+
+# =========================================================
+# Déclaration des règles
+# =========================================================
+# Une règle = un code stable + une fonction qui renvoie, en une requête groupée
+# (ou presque), les situations à signaler. Une situation est identifiée par
+# (règle, formateur, formation) : c'est cette clé qui rend la génération
+# idempotente (création, mise à jour de la valeur, ou clôture si elle disparaît).
+
+OPEN_STATUSES = [AlertStatus.OPEN, AlertStatus.ACK]
+
+
+@dataclass(frozen=True)
+class AlertHit:
+    trainer_id: int
+    value: str
+    training_id: int | None = None
+    severity: str | None = None  # None = sévérité par défaut de la règle
+
+    @property
+    def key(self) -> tuple[int, int | None]:
+        return (self.trainer_id, self.training_id)
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    code: str
+    category: str
+    metric: str
+    severity: str
+    collect: Callable[["AlertRule", date], Iterable[AlertHit]]
+    params: dict = field(default_factory=dict)
+
+    def hits(self, today: date) -> dict[tuple[int, int | None], AlertHit]:
+        return {hit.key: hit for hit in self.collect(self, today)}
+
+
+@dataclass
+class RuleResult:
+    rule: str
+    matched: int = 0
+    created: int = 0
+    updated: int = 0
+    resolved: int = 0
+
+
+# =========================================================
+# Collecteurs
+# =========================================================
+
+def _low_evaluations(rule: AlertRule, today: date) -> Iterable[AlertHit]:
+    """Dernière évaluation par (formateur, formation) : score grille bas ou décision débutant."""
+    since = today - timedelta(days=rule.params["lookback_days"])
+    # --date dans le passé : les évaluations postérieures n'existaient pas encore
+    newer = InternalEvaluation.objects.filter(
+        trainer_id=OuterRef("trainer_id"),
+        training_id=OuterRef("training_id"),
+        evaluated_on__lte=today,
+    ).filter(
+        Q(evaluated_on__gt=OuterRef("evaluated_on"))
+        | Q(evaluated_on=OuterRef("evaluated_on"), pk__gt=OuterRef("pk"))
+    )
+    low_score = Q(rubric_score_max__gt=0, rubric_score_100__lt=rule.params["min_score_100"])
+
+    rows = (
+        InternalEvaluation.objects
+        .filter(evaluated_on__gte=since, evaluated_on__lte=today, trainer__is_active=True)
+        .filter(low_score | Q(decision=EvaluationDecision.BEGINNER))
+        .filter(~Exists(newer))
+        .values_list("trainer_id", "training_id", "rubric_score_100", "rubric_score_max", "decision")
+    )
+    labels = dict(EvaluationDecision.choices)
+    for trainer_id, training_id, score_100, score_max, decision in rows:
+        scored = bool(score_max)
+        value = f"{score_100}/100" if scored else labels.get(decision, decision)
+        critical = scored and score_100 < rule.params["critical_score_100"]
+        yield AlertHit(
+            trainer_id=trainer_id,
+            training_id=training_id,
+            value=value,
+            severity=AlertSeverity.CRITICAL if critical else None,
+        )
+
+
+def _low_satisfaction(rule: AlertRule, today: date) -> Iterable[AlertHit]:
+    """Satisfaction client moyenne (/20) des sessions animées récemment."""
+    since = today - timedelta(days=rule.params["lookback_days"])
+    rows = (
+        Session.objects
+        .filter(
+            trainer__is_active=True,
+            start_date__gte=since,
+            start_date__lte=today,
+            client_satisfaction__isnull=False,
+        )
+        .order_by()
+        .values("trainer_id")
+        .annotate(n=Count("pk"), avg=Avg("client_satisfaction"))
+        .filter(n__gte=rule.params["min_sessions"], avg__lt=rule.params["min_avg"])
+    )
+    for r in rows:
+        avg = Decimal(str(r["avg"])).quantize(Decimal("0.1"))
+        yield AlertHit(
+            trainer_id=r["trainer_id"],
+            value=f"{avg}/20 ({r['n']} sessions)",
+            severity=AlertSeverity.CRITICAL if avg < rule.params["critical_avg"] else None,
+        )
+
+
+def _workload_overload(rule: AlertRule, today: date) -> Iterable[AlertHit]:
+    """Taux de charge du mois en cours (même calcul que le plan de charge)."""
+    month_start = today.replace(day=1)
+    month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+    for row in trainer_workload_rows(month_start, month_end):
+        rate = row["load_rate"]
+        if not row["trainer"].is_active or rate <= rule.params["max_rate"]:
+            continue
+        yield AlertHit(
+            trainer_id=row["trainer"].id,
+            value=f"{round(rate)}% ({month_start:%m/%Y})",
+            severity=AlertSeverity.CRITICAL if rate > rule.params["critical_rate"] else None,
+        )
+
+
+def _overdue_objectives(rule: AlertRule, today: date) -> Iterable[AlertHit]:
+    """Objectifs 1to1 non terminés dont l'échéance est passée."""
+    rows = (
+        OneToOneObjective.objects
+        .filter(trainer__is_active=True, due_date__lt=today)
+        .exclude(status=ObjectiveStatus.DONE)
+        .order_by()
+        .values("trainer_id")
+        .annotate(n=Count("pk"))
+    )
+    for r in rows:
+        yield AlertHit(
+            trainer_id=r["trainer_id"],
+            value=f"{r['n']} objectif(s) en retard",
+            severity=AlertSeverity.CRITICAL if r["n"] >= rule.params["critical_count"] else None,
+        )
+
+
+RULES = [
+    AlertRule(
+        code="low_evaluation",
+        category="Pédagogie",
+        metric="Score grille",
+        severity=AlertSeverity.WARNING,
+        collect=_low_evaluations,
+        params={"lookback_days": 365, "min_score_100": 50, "critical_score_100": 35},
+    ),
+    AlertRule(
+        code="low_satisfaction",
+        category="Satisfaction",
+        metric="Satisfaction client",
+        severity=AlertSeverity.WARNING,
+        collect=_low_satisfaction,
+        params={"lookback_days": 180, "min_sessions": 2, "min_avg": 14, "critical_avg": 12},
+    ),
+    AlertRule(
+        code="workload_overload",
+        category="Charge",
+        metric="Taux de charge",
+        severity=AlertSeverity.WARNING,
+        collect=_workload_overload,
+        params={"max_rate": Decimal("100"), "critical_rate": Decimal("120")},
+    ),
+    AlertRule(
+        code="overdue_objectives",
+        category="Process",
+        metric="Objectifs 1to1",
+        severity=AlertSeverity.INFO,
+        collect=_overdue_objectives,
+        params={"critical_count": 3},
+    ),
+]
+
+RULES_BY_CODE = {rule.code: rule for rule in RULES}
+
+
+# =========================================================
+# Synchronisation
+# =========================================================
+
+def _alert_key(alert: TrainerAlert) -> tuple[int, int | None]:
+    return (alert.trainer_id, alert.training_id)
+
+
+def apply_rule(rule: AlertRule, today: date, *, dry_run: bool = False) -> RuleResult:
+    """
+    Aligne les alertes ouvertes de la règle sur les situations actuelles :
+    - nouvelle situation           -> alerte créée
+    - valeur ou sévérité changée   -> alerte mise à jour (statut conservé)
+    - situation disparue           -> alerte clôturée (resolved_on renseigné)
+    Une situation déjà clôturée à la main avec la même valeur n'est pas recréée.
+    """
+    hits = rule.hits(today)
+    result = RuleResult(rule=rule.code, matched=len(hits))
+
+    open_alerts = {
+        _alert_key(alert): alert
+        for alert in TrainerAlert.objects.filter(rule=rule.code, status__in=OPEN_STATUSES)
+    }
+
+    handled = set()
+    new_keys = [key for key in hits if key not in open_alerts]
+    if new_keys:
+        handled = set(
+            TrainerAlert.objects
+            .filter(rule=rule.code, status=AlertStatus.CLOSED, resolved_on__isnull=True)
+            .filter(trainer_id__in={trainer_id for trainer_id, _ in new_keys})
+            .values_list("trainer_id", "training_id", "value")
+        )
+
+    now = timezone.now()
+    to_create = []
+    for key in new_keys:
+        hit = hits[key]
+        if (hit.trainer_id, hit.training_id, hit.value) in handled:
+            continue
+        to_create.append(TrainerAlert(
+            trainer_id=hit.trainer_id,
+            training_id=hit.training_id,
+            rule=rule.code,
+            triggered_on=now,
+            severity=hit.severity or rule.severity,
+            category=rule.category,
+            metric=rule.metric,
+            value=hit.value,
+        ))
+
+    to_update = []
+    for key, alert in open_alerts.items():
+        hit = hits.get(key)
+        if hit is None:
+            continue
+        severity = hit.severity or rule.severity
+        if (alert.value, alert.severity) != (hit.value, severity):
+            alert.value, alert.severity = hit.value, severity
+            to_update.append(alert)
+
+    to_resolve = [alert.pk for key, alert in open_alerts.items() if key not in hits]
+
+    result.created, result.updated, result.resolved = len(to_create), len(to_update), len(to_resolve)
+    if dry_run:
+        return result
+
+    with transaction.atomic():
+        if to_create:
+            TrainerAlert.objects.bulk_create(to_create, batch_size=500)
+        if to_update:
+            TrainerAlert.objects.bulk_update(to_update, ["value", "severity"], batch_size=500)
+        if to_resolve:
+            TrainerAlert.objects.filter(pk__in=to_resolve).update(
+                status=AlertStatus.CLOSED,
+                resolved_on=now,
+            )
+    return result
+
+
+def generate_alerts(
+    codes: Iterable[str] | None = None,
+    *,
+    today: date | None = None,
+    dry_run: bool = False,
+) -> list[RuleResult]:
+    today = today or timezone.localdate()
+    rules = RULES if codes is None else [RULES_BY_CODE[code] for code in codes]
+    return [apply_rule(rule, today, dry_run=dry_run) for rule in rules]
@@ -0,0 +1,230 @@
+# trainer_eval/services/rubric_scores.py
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+
+from trainer_eval.models import (
+    EvaluationScore,
+    InternalEvaluation,
+    ProjectContributionEvaluation,
+    ProjectScore,
+    rubric_decision,
+    rubric_score_100,
+)
+from trainer_eval.services.snapshots import mark_stale
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+SCORE_FIELDS = ["rubric_score_total", "rubric_score_max", "rubric_score_100", "decision"]
+
+
+# =========================================================
+# Types d'évaluations notées par grille
+# =========================================================
+
+@dataclass(frozen=True)
+class RubricKind:
+    evaluation_model: type
+    score_model: type
+
+
+KINDS = {
+    "internal": RubricKind(InternalEvaluation, EvaluationScore),
+    "project": RubricKind(ProjectContributionEvaluation, ProjectScore),
+}
+
+
+@dataclass(frozen=True)
+class RecomputeResult:
+    kind: str
+    scanned: int = 0
+    updated: int = 0
+
+
+# =========================================================
+# Agrégats SQL
+# =========================================================
+# Mêmes règles que recompute_rubric_scores() sur les modèles :
+# poids 0 => 1, note max 0 => 5.
+
+def _weight() -> Case:
+    return Case(
+        When(criterion__weight=0, then=Value(1)),
+        default=F("criterion__weight"),
+        output_field=IntegerField(),
+    )
+
+
+def _max_score() -> Case:
+    return Case(
+        When(criterion__max_score=0, then=Value(5)),
+        default=F("criterion__max_score"),
+        output_field=IntegerField(),
+    )
+
+
+def score_totals(kind: str, evaluation_ids: Iterable[int]) -> dict[int, tuple[int, int]]:
+    """{evaluation_id: (total pondéré, max pondéré)} en une requête groupée."""
+    score_model = KINDS[kind].score_model
+    rows = (
+        score_model.objects
+        .filter(evaluation_id__in=list(evaluation_ids))
+        .order_by()
+        .values("evaluation_id")
+        .annotate(
+            total=Sum(F("score") * _weight(), output_field=IntegerField()),
+            max_total=Sum(_max_score() * _weight(), output_field=IntegerField()),
+        )
+        .values_list("evaluation_id", "total", "max_total")
+    )
+    return {evaluation_id: (total or 0, max_total or 0) for evaluation_id, total, max_total in rows}
+
+
+def evaluations_for(
+    kind: str,
+    *,
+    rubric_ids: Iterable[int] | None = None,
+    since: date | None = None,
+):
+    """
+    Évaluations à recalculer. Avec `rubric_ids`, on prend celles rattachées à ces grilles
+    et celles qui ont des notes sur leurs critères (grille changée après coup).
+    """
+    spec = KINDS[kind]
+    qs = spec.evaluation_model.objects.all()
+
+    if rubric_ids is not None:
+        rubric_ids = list(rubric_ids)
+        scored = (
+            spec.score_model.objects
+            .filter(criterion__rubric_id__in=rubric_ids)
+            .values("evaluation_id")
+        )
+        qs = qs.filter(Q(rubric_id__in=rubric_ids) | Q(pk__in=scored))
+
+    if since is not None:
+        qs = qs.filter(evaluated_on__gte=since)
+
+    return qs
+
+
+# =========================================================
+# Recalcul en masse
+# =========================================================
+
+def recompute_rubric_scores(
+    kind: str,
+    *,
+    rubric_ids: Iterable[int] | None = None,
+    since: date | None = None,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> RecomputeResult:
+    """
+    Recalcule score total / max / sur 100 et décision des évaluations, par lots :
+    une requête groupée pour les notes, une pour les évaluations, un bulk_update
+    des seules lignes modifiées. dry_run=True compte les écarts sans rien écrire.
+    """
+    spec = KINDS[kind]
+    ids = list(
+        evaluations_for(kind, rubric_ids=rubric_ids, since=since)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    updated = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        totals = score_totals(kind, chunk)
+
+        changed = []
+        evaluations = (
+            spec.evaluation_model.objects
+            .filter(pk__in=chunk)
+            .only("pk", "trainer_id", "evaluated_on", *SCORE_FIELDS)
+        )
+        for evaluation in evaluations:
+            total, max_total = totals.get(evaluation.pk, (0, 0))
+            s100 = rubric_score_100(total, max_total)
+            # sans note, la décision saisie à la main est conservée
+            decision = rubric_decision(s100) if evaluation.pk in totals else evaluation.decision
+
+            new = (total, max_total, s100, decision)
+            old = tuple(getattr(evaluation, name) for name in SCORE_FIELDS)
+            if new != old:
+                for name, value in zip(SCORE_FIELDS, new):
+                    setattr(evaluation, name, value)
+                changed.append(evaluation)
+
+        if changed and not dry_run:
+            spec.evaluation_model.objects.bulk_update(changed, SCORE_FIELDS, batch_size=batch_size)
+            # bulk_update ne déclenche pas les signaux : snapshots des mois concernés à recalculer
+            mark_stale((e.trainer_id, e.evaluated_on, "") for e in changed)
+        updated += len(changed)
+
+    return RecomputeResult(kind=kind, scanned=len(ids), updated=updated)
+
+
+# =========================================================
+# Déclenchement automatique (changement de critère)
+# =========================================================
+
+# Pas de file de tâches dans le projet : un thread unique dépile les grilles
+# à recalculer (les écritures restent sérialisées, même sous SQLite).
+# Une grille déjà en attente n'est pas ajoutée deux fois.
+
+_pending: set[tuple[str, int]] = set()
+_lock = threading.Lock()
+_worker: threading.Thread | None = None
+
+
+def _run(kind: str, rubric_id: int) -> None:
+    try:
+        recompute_rubric_scores(kind, rubric_ids=[rubric_id])
+    except Exception:
+        logger.exception("Recalcul des scores impossible (%s, grille %s)", kind, rubric_id)
+
+
+def _drain() -> None:
+    global _worker
+    try:
+        while True:
+            with _lock:
+                if not _pending:
+                    _worker = None
+                    return
+                kind, rubric_id = _pending.pop()
+            _run(kind, rubric_id)
+    finally:
+        # connexion ouverte par ce thread : on la rend avant de sortir
+        connections.close_all()
+
+
+def _enqueue(kind: str, rubric_id: int) -> None:
+    global _worker
+    if not getattr(settings, "RUBRIC_RECOMPUTE_IN_BACKGROUND", True):
+        _run(kind, rubric_id)
+        return
+
+    with _lock:
+        _pending.add((kind, rubric_id))
+        if _worker is None:
+            _worker = threading.Thread(target=_drain, name="rubric-recompute", daemon=True)
+            _worker.start()
+
+
+def schedule_rubric_recompute(kind: str, rubric_id: int | None) -> None:
+    """Recalcule en arrière-plan les évaluations d'une grille, après le commit."""
+    if rubric_id:
+        transaction.on_commit(lambda: _enqueue(kind, rubric_id))
@@ -0,0 +1,317 @@
+# trainer_eval/services/snapshots.py
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Min, Q, Sum
+from django.utils import timezone
+
+from trainer_eval.models import (
+    InternalEvaluation,
+    ProjectContributionEvaluation,
+    StrategicContribution,
+    TrainerEvalSnapshot,
+)
+from trainings.models import Session, Trainer
+
+
+TREND_MONTHS = 12
+
+
+# =========================================================
+# Mois
+# =========================================================
+
+def month_start(d: date) -> date:
+    if isinstance(d, datetime):
+        d = timezone.localtime(d).date() if timezone.is_aware(d) else d.date()
+    return d.replace(day=1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(first: date, last: date) -> list[date]:
+    months = []
+    current = month_start(first)
+    while current <= last:
+        months.append(current)
+        current = add_months(current, 1)
+    return months
+
+
+def _dec(value, places: str = "0.1") -> Decimal | None:
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(Decimal(places))
+
+
+def _percentile(values: list[int], pct: float) -> int | None:
+    """Percentile par interpolation linéaire (valeurs déjà triées)."""
+    if not values:
+        return None
+    position = (len(values) - 1) * pct
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return int(round(values[low] + (values[high] - values[low]) * (position - low)))
+
+
+# =========================================================
+# Marquage "à recalculer" (signaux, recalculs en masse)
+# =========================================================
+
+def mark_stale(entries: Iterable[tuple[int | None, date | None, str]]) -> None:
+    """
+    entries : (trainer_id, date, produit). Marque les snapshots des mois concernés
+    comme périmés ; crée une ligne vide périmée si le mois n'a pas encore de snapshot.
+    """
+    keys = {}
+    for trainer_id, day, product in entries:
+        if trainer_id and day:
+            keys.setdefault((trainer_id, month_start(day)), product or "")
+    if not keys:
+        return
+
+    condition = Q()
+    for trainer_id, month in keys:
+        condition |= Q(trainer_id=trainer_id, month=month)
+    TrainerEvalSnapshot.objects.filter(condition).update(stale=True)
+
+    TrainerEvalSnapshot.objects.bulk_create(
+        [
+            TrainerEvalSnapshot(trainer_id=trainer_id, month=month, product=product, stale=True)
+            for (trainer_id, month), product in keys.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def stale_pairs() -> set[tuple[int, date]]:
+    return set(
+        TrainerEvalSnapshot.objects
+        .filter(stale=True)
+        .values_list("trainer_id", "month")
+    )
+
+
+# =========================================================
+# Calcul
+# =========================================================
+
+def first_activity_month() -> date | None:
+    candidates = [
+        Session.objects.aggregate(d=Min("start_date"))["d"],
+        InternalEvaluation.objects.aggregate(d=Min("evaluated_on"))["d"],
+        ProjectContributionEvaluation.objects.aggregate(d=Min("evaluated_on"))["d"],
+        StrategicContribution.objects.aggregate(d=Min("date"))["d"],
+    ]
+    candidates = [d for d in candidates if d]
+    return month_start(min(candidates)) if candidates else None
+
+
+def build_month(month: date, trainer_ids: Iterable[int] | None = None) -> int:
+    """
+    Recalcule les snapshots d'un mois (tous les formateurs, ou seulement `trainer_ids`) :
+    une requête groupée par source, puis remplacement des lignes du mois.
+    Retourne le nombre de lignes écrites.
+    """
+    month = month_start(month)
+    end = add_months(month, 1) - timedelta(days=1)
+    if trainer_ids is not None:
+        trainer_ids = list(trainer_ids)
+
+    def scoped(qs, field="trainer_id"):
+        if trainer_ids is None:
+            return qs
+        return qs.filter(**{f"{field}__in": trainer_ids})
+
+    rows: dict[tuple[int, str], dict] = defaultdict(dict)
+
+    # --- sessions (produit de la session) ---
+    sessions = Session.objects.filter(start_date__gte=month, start_date__lte=end).order_by()
+    for r in (
+        scoped(sessions)
+        .values("trainer_id", "product")
+        .annotate(
+            n=Count("pk"),
+            days=Sum("days_count"),
+            sat_n=Count("client_satisfaction"),
+            sat_avg=Avg("client_satisfaction"),
+        )
+    ):
+        row = rows[(r["trainer_id"], r["product"])]
+        row["sessions_count"] = r["n"]
+        row["session_days"] = _dec(r["days"] or 0)
+        row["satisfaction_count"] = r["sat_n"]
+        row["satisfaction_avg"] = _dec(r["sat_avg"], "0.01")
+
+    for r in (
+        scoped(sessions.filter(backup_trainer_id__isnull=False), "backup_trainer_id")
+        .values("backup_trainer_id", "product")
+        .annotate(n=Count("pk"))
+    ):
+        rows[(r["backup_trainer_id"], r["product"])]["backup_sessions_count"] = r["n"]
+
+    # --- évaluations internes (produit du type de la formation) ---
+    evaluations = defaultdict(list)
+    for trainer_id, product, score_100, score_max, total_30 in (
+        scoped(InternalEvaluation.objects.filter(evaluated_on__gte=month, evaluated_on__lte=end))
+        .order_by()
+        .values_list(
+            "trainer_id",
+            "training__training_type__product",
+            "rubric_score_100",
+            "rubric_score_max",
+            "total_score_30",
+        )
+    ):
+        evaluations[(trainer_id, product or "")].append((score_100 if score_max else None, total_30))
+
+    for key, items in evaluations.items():
+        rubric = sorted(s for s, _ in items if s is not None)
+        row = rows[key]
+        row["evaluations_count"] = len(items)
+        row["rubric_scored_count"] = len(rubric)
+        row["total_score_30_avg"] = _dec(sum(t for _, t in items) / len(items))
+        row["rubric_score_avg"] = _dec(sum(rubric) / len(rubric)) if rubric else None
+        row["rubric_score_p25"] = _percentile(rubric, 0.25)
+        row["rubric_score_median"] = _percentile(rubric, 0.5)
+        row["rubric_score_p75"] = _percentile(rubric, 0.75)
+
+    # --- contributions (produit du formateur) ---
+    contributions = list(
+        scoped(ProjectContributionEvaluation.objects.filter(evaluated_on__gte=month, evaluated_on__lte=end))
+        .order_by()
+        .values("trainer_id")
+        .annotate(n=Count("pk"), avg=Avg("rubric_score_100"))
+    )
+    strategic = list(
+        scoped(StrategicContribution.objects.filter(date__gte=month, date__lte=end))
+        .order_by()
+        .values("trainer_id")
+        .annotate(points=Sum("points"))
+    )
+
+    ids = {r["trainer_id"] for r in contributions} | {r["trainer_id"] for r in strategic}
+    trainer_products = dict(Trainer.objects.filter(pk__in=ids).values_list("id", "product"))
+
+    for r in contributions:
+        row = rows[(r["trainer_id"], trainer_products.get(r["trainer_id"]) or "")]
+        row["contributions_count"] = r["n"]
+        row["contribution_score_avg"] = _dec(r["avg"])
+    for r in strategic:
+        rows[(r["trainer_id"], trainer_products.get(r["trainer_id"]) or "")]["strategic_points"] = r["points"] or 0
+
+    now = timezone.now()
+    snapshots = [
+        TrainerEvalSnapshot(trainer_id=trainer_id, month=month, product=product, computed_at=now, **values)
+        for (trainer_id, product), values in rows.items()
+        if trainer_id
+    ]
+
+    with transaction.atomic():
+        scoped(TrainerEvalSnapshot.objects.filter(month=month)).delete()
+        TrainerEvalSnapshot.objects.bulk_create(snapshots, batch_size=500)
+
+    return len(snapshots)
+
+
+def rebuild_pairs(pairs: Iterable[tuple[int, date]]) -> int:
+    """Recalcule des couples (formateur, mois), regroupés par mois."""
+    by_month = defaultdict(set)
+    for trainer_id, month in pairs:
+        by_month[month_start(month)].add(trainer_id)
+    return sum(build_month(month, ids) for month, ids in sorted(by_month.items()))
+
+
+# =========================================================
+# Lecture : tendances et listes
+# =========================================================
+
+def _weighted(rows: list[dict], value: str, weight: str, places: str = "0.1") -> Decimal | None:
+    total = sum(r[weight] for r in rows if r[value] is not None)
+    if not total:
+        return None
+    return _dec(sum(r[value] * r[weight] for r in rows if r[value] is not None) / total, places)
+
+
+def trainer_trend(
+    trainer_id: int,
+    *,
+    product: str | None = None,
+    months: int = TREND_MONTHS,
+    today: date | None = None,
+) -> list[dict]:
+    """
+    Évolution mensuelle d'un formateur sur `months` mois (mois sans activité inclus),
+    pour un produit ou tous produits confondus (moyennes pondérées ; les percentiles
+    ne sont donnés que pour un produit).
+    """
+    last = month_start(today or timezone.localdate())
+    first = add_months(last, -(months - 1))
+
+    qs = TrainerEvalSnapshot.objects.filter(trainer_id=trainer_id, month__gte=first, month__lte=last)
+    if product is not None:
+        qs = qs.filter(product=product)
+
+    by_month = defaultdict(list)
+    for row in qs.values():
+        by_month[row["month"]].append(row)
+
+    trend = []
+    for month in month_range(first, last):
+        rows = by_month.get(month, [])
+        point = {
+            "month": month,
+            "sessions_count": sum(r["sessions_count"] for r in rows),
+            "backup_sessions_count": sum(r["backup_sessions_count"] for r in rows),
+            "session_days": sum((r["session_days"] for r in rows), Decimal("0.0")),
+            "evaluations_count": sum(r["evaluations_count"] for r in rows),
+            "rubric_scored_count": sum(r["rubric_scored_count"] for r in rows),
+            # moyenne de grille : pondérée par les seules évaluations notées
+            "rubric_score_avg": _weighted(rows, "rubric_score_avg", "rubric_scored_count"),
+            "total_score_30_avg": _weighted(rows, "total_score_30_avg", "evaluations_count"),
+            "satisfaction_avg": _weighted(rows, "satisfaction_avg", "satisfaction_count", "0.01"),
+            "contributions_count": sum(r["contributions_count"] for r in rows),
+            "strategic_points": sum(r["strategic_points"] for r in rows),
+            "stale": any(r["stale"] for r in rows),
+        }
+        single = rows[0] if len(rows) == 1 else None
+        for name in ("rubric_score_p25", "rubric_score_median", "rubric_score_p75"):
+            point[name] = single[name] if single else None
+        trend.append(point)
+    return trend
+
+
+def rubric_averages(
+    trainer_ids: Iterable[int],
+    *,
+    product: str | None = None,
+    months: int = TREND_MONTHS,
+    today: date | None = None,
+) -> dict[int, Decimal]:
+    """Score grille moyen (/100) par formateur sur les derniers mois, en une requête."""
+    first = add_months(month_start(today or timezone.localdate()), -(months - 1))
+    qs = TrainerEvalSnapshot.objects.filter(
+        trainer_id__in=list(trainer_ids),
+        month__gte=first,
+        rubric_score_avg__isnull=False,
+    )
+    if product is not None:
+        qs = qs.filter(product=product)
+
+    result = {}
+    for r in (
+        qs.order_by()
+        .values("trainer_id")
+        .annotate(n=Sum("rubric_scored_count"), weighted=Sum(F("rubric_score_avg") * F("rubric_scored_count")))
+    ):
+        if r["n"]:
+            result[r["trainer_id"]] = _dec(r["weighted"] / r["n"])
+    return result
@@ -0,0 +1,115 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from trainings.models import Session, Trainer, Training
+
+from .models import (
+    EvaluationCriterion,
+    InternalEvaluation,
+    ProjectContributionEvaluation,
+    ProjectCriterion,
+    StrategicContribution,
+)
+from .services.rubric_scores import schedule_rubric_recompute
+from .services.snapshots import mark_stale
+
+
+# Poids / note max d'un critère modifiés : les évaluations déjà notées
+# sur la grille sont recalculées en arrière-plan après le commit.
+SCORING_FIELDS = ("weight", "max_score", "rubric")
+
+
+def _schedule(kind, instance, created):
+    if created or not instance.has_changed(*SCORING_FIELDS):
+        return
+    schedule_rubric_recompute(kind, instance.rubric_id)
+    if instance.has_changed("rubric"):
+        schedule_rubric_recompute(kind, instance.initial_value("rubric"))
+
+
+@receiver(post_save, sender=EvaluationCriterion)
+def evaluation_criterion_changed(sender, instance, created, **kwargs):
+    _schedule("internal", instance, created)
+
+
+@receiver(post_save, sender=ProjectCriterion)
+def project_criterion_changed(sender, instance, created, **kwargs):
+    _schedule("project", instance, created)
+
+
+# =========================================================
+# Snapshots mensuels : mois touchés marqués à recalculer
+# =========================================================
+
+# Champs de Session repris dans les snapshots (un save limité à d'autres champs est ignoré)
+SNAPSHOT_SESSION_FIELDS = {
+    "trainer", "backup_trainer", "start_date", "days_count",
+    "client_satisfaction", "training", "training_type", "product",
+}
+
+
+def _tracked(instance, *names):
+    """Valeurs actuelles et, si elles ont changé, valeurs connues en base."""
+    current = tuple(getattr(instance, instance._meta.get_field(n).attname) for n in names)
+    values = [current]
+    if not instance._state.adding and instance.pk and instance.has_changed(*names):
+        values.append(tuple(instance.initial_value(n) for n in names))
+    return values
+
+
+def _training_product(training_id):
+    if not training_id:
+        return ""
+    return Training.objects.filter(pk=training_id).values_list("training_type__product", flat=True).first() or ""
+
+
+def _trainer_product(trainer_id):
+    if not trainer_id:
+        return ""
+    return Trainer.objects.filter(pk=trainer_id).values_list("product", flat=True).first() or ""
+
+
+@receiver(post_save, sender=Session)
+def session_snapshots_stale(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not SNAPSHOT_SESSION_FIELDS.intersection(update_fields):
+        return
+    entries = []
+    for trainer_id, backup_id, start in _tracked(instance, "trainer", "backup_trainer", "start_date"):
+        entries += [(trainer_id, start, instance.product), (backup_id, start, instance.product)]
+    mark_stale(entries)
+
+
+@receiver(post_delete, sender=Session)
+def session_deleted_snapshots_stale(sender, instance, **kwargs):
+    mark_stale([
+        (instance.trainer_id, instance.start_date, instance.product),
+        (instance.backup_trainer_id, instance.start_date, instance.product),
+    ])
+
+
+@receiver(post_save, sender=InternalEvaluation)
+@receiver(post_delete, sender=InternalEvaluation)
+def internal_evaluation_snapshots_stale(sender, instance, **kwargs):
+    product = _training_product(instance.training_id)
+    mark_stale(
+        (trainer_id, day, product)
+        for trainer_id, day in _tracked(instance, "trainer", "evaluated_on")
+    )
+
+
+@receiver(post_save, sender=ProjectContributionEvaluation)
+@receiver(post_delete, sender=ProjectContributionEvaluation)
+def contribution_evaluation_snapshots_stale(sender, instance, **kwargs):
+    mark_stale(
+        (trainer_id, day, _trainer_product(trainer_id))
+        for trainer_id, day in _tracked(instance, "trainer", "evaluated_on")
+    )
+
+
+@receiver(post_save, sender=StrategicContribution)
+@receiver(post_delete, sender=StrategicContribution)
+def strategic_contribution_snapshots_stale(sender, instance, **kwargs):
+    mark_stale(
+        (trainer_id, day, _trainer_product(trainer_id))
+        for trainer_id, day in _tracked(instance, "trainer", "date")
+    )
@@ -1,3 +1,312 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from trainings.models import Client, Session, Trainer, Training, TrainingType
+
+from .models import (
+    AlertSeverity,
+    AlertStatus,
+    EvaluationCriterion,
+    EvaluationDecision,
+    EvaluationRubric,
+    EvaluationScore,
+    InternalEvaluation,
+    StrategicContribution,
+    TrainerAlert,
+    TrainerEvalSnapshot,
+)
+from .services.alert_rules import RULES_BY_CODE, apply_rule
+from .services.rubric_scores import recompute_rubric_scores, score_totals
+from .services.snapshots import (
+    build_month,
+    mark_stale,
+    rebuild_pairs,
+    rubric_averages,
+    stale_pairs,
+    trainer_trend,
+)
+
+
+class SnapshotRubricAverageTests(TestCase):
+    """Moyenne de grille : pondérée par les évaluations notées, pas par toutes."""
+
+    MONTH = date(2026, 9, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        cls.argonos = Training.objects.create(
+            title="ArgonOS", training_type=TrainingType.objects.create(name="ArgonOS")
+        )
+        cls.mercure = Training.objects.create(
+            title="Mercure", training_type=TrainingType.objects.create(name="Mercure")
+        )
+
+    def evaluate(self, training, score_100=None):
+        InternalEvaluation.objects.create(
+            trainer=self.trainer,
+            training=training,
+            evaluated_on=self.MONTH,
+            rubric_score_100=score_100 or 0,
+            rubric_score_max=30 if score_100 is not None else 0,
+        )
+
+    def test_unscored_evaluations_do_not_weigh(self):
+        # ArgonOS : une évaluation notée 80 + trois sans grille ; Mercure : une notée 40
+        self.evaluate(self.argonos, 80)
+        for _ in range(3):
+            self.evaluate(self.argonos)
+        self.evaluate(self.mercure, 40)
+        build_month(self.MONTH)
+
+        today = date(2026, 9, 15)
+        point = trainer_trend(self.trainer.pk, months=1, today=today)[0]
+        self.assertEqual(point["evaluations_count"], 5)
+        self.assertEqual(point["rubric_scored_count"], 2)
+        self.assertEqual(point["rubric_score_avg"], Decimal("60.0"))
+        self.assertEqual(rubric_averages([self.trainer.pk], today=today), {self.trainer.pk: Decimal("60.0")})
+
+
+@override_settings(RUBRIC_RECOMPUTE_IN_BACKGROUND=False)
+class RubricScoreRecomputeTests(TestCase):
+    """Recalcul ensembliste des scores de grille : mêmes règles que le modèle."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        cls.training = Training.objects.create(title="Formation", training_type=TrainingType.objects.create(name="T"))
+        cls.rubric = EvaluationRubric.objects.create(training=cls.training, version_label="v1")
+        # poids 0 => 1, note max 0 => 5
+        cls.criteria = [
+            EvaluationCriterion.objects.create(rubric=cls.rubric, label="A", weight=2, max_score=5),
+            EvaluationCriterion.objects.create(rubric=cls.rubric, label="B", weight=0, max_score=4),
+            EvaluationCriterion.objects.create(rubric=cls.rubric, label="C", weight=1, max_score=0),
+        ]
+
+    def evaluation(self, scores=(), **kwargs):
+        evaluation = InternalEvaluation.objects.create(
+            trainer=self.trainer, training=self.training, rubric=self.rubric, **kwargs
+        )
+        for criterion, score in zip(self.criteria, scores):
+            EvaluationScore.objects.create(evaluation=evaluation, criterion=criterion, score=score)
+        return evaluation
+
+    def test_totals_match_model_method(self):
+        evaluation = self.evaluation((5, 1, 3))
+        # (5×2 + 1×1 + 3×1) / (5×2 + 4×1 + 5×1)
+        self.assertEqual(score_totals("internal", [evaluation.pk]), {evaluation.pk: (14, 19)})
+
+        evaluation.recompute_rubric_scores()
+        self.assertEqual((evaluation.rubric_score_total, evaluation.rubric_score_max), (14, 19))
+
+    def test_dry_run_then_apply_is_idempotent(self):
+        scored = self.evaluation((5, 4, 5))
+        unscored = self.evaluation(decision=EvaluationDecision.INTERMEDIATE)
+
+        result = recompute_rubric_scores("internal", dry_run=True)
+        self.assertEqual((result.scanned, result.updated), (2, 1))
+        scored.refresh_from_db()
+        self.assertEqual(scored.rubric_score_max, 0)
+
+        self.assertEqual(recompute_rubric_scores("internal").updated, 1)
+        scored.refresh_from_db()
+        unscored.refresh_from_db()
+        self.assertEqual((scored.rubric_score_100, scored.decision), (100, EvaluationDecision.EXPERT))
+        # sans note, la décision saisie à la main reste
+        self.assertEqual(unscored.decision, EvaluationDecision.INTERMEDIATE)
+
+        self.assertEqual(recompute_rubric_scores("internal").updated, 0)
+
+    def test_criterion_weight_change_recomputes_rubric(self):
+        evaluation = self.evaluation((5, 0, 0))
+        recompute_rubric_scores("internal")
+
+        criterion = self.criteria[0]
+        criterion.weight = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            criterion.save()
+
+        evaluation.refresh_from_db()
+        # (5×10) / (5×10 + 4 + 5)
+        self.assertEqual((evaluation.rubric_score_total, evaluation.rubric_score_max), (50, 59))
+
+
+class TrainerSnapshotTests(TestCase):
+    """Snapshots mensuels : calcul d'un mois, marquage « à recalculer » par les signaux."""
+
+    SEPT, OCT = date(2026, 9, 1), date(2026, 10, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.trainer = Trainer.objects.create(first_name="F", last_name="Formateur", product="ARGONOS")
+        cls.backup = Trainer.objects.create(first_name="B", last_name="Backup", product="ARGONOS")
+        cls.training_type = TrainingType.objects.create(name="ArgonOS")
+        cls.training = Training.objects.create(title="ArgonOS", training_type=cls.training_type)
+        cls.customer = Client.objects.create(name="Client")
+
+    def session(self, start, **kwargs):
+        return Session.objects.create(
+            training_type=self.training_type,
+            training=self.training,
+            client=self.customer,
+            trainer=self.trainer,
+            start_date=start,
+            **kwargs,
+        )
+
+    def snapshot(self, trainer=None, month=None):
+        return TrainerEvalSnapshot.objects.get(
+            trainer=trainer or self.trainer, month=month or self.SEPT, product="ARGONOS"
+        )
+
+    def test_build_month_aggregates_sources(self):
+        self.session(
+            date(2026, 9, 3),
+            days_count=Decimal("2.0"),
+            client_satisfaction=Decimal("16"),
+            backup_trainer=self.backup,
+        )
+        self.session(date(2026, 9, 20), days_count=Decimal("1.5"))
+        self.session(date(2026, 10, 2))
+        StrategicContribution.objects.create(trainer=self.trainer, kind="doc", points=3, date=date(2026, 9, 9))
+
+        self.assertEqual(build_month(self.SEPT), 2)
+
+        row = self.snapshot()
+        self.assertEqual((row.sessions_count, row.session_days, row.satisfaction_count), (2, Decimal("3.5"), 1))
+        self.assertEqual((row.satisfaction_avg, row.strategic_points, row.stale), (Decimal("16.00"), 3, False))
+        self.assertEqual(self.snapshot(self.backup).backup_sessions_count, 1)
+
+    def test_build_month_scoped_to_trainers(self):
+        self.session(date(2026, 9, 3), backup_trainer=self.backup)
+        build_month(self.SEPT)
+        Session.objects.update(client_satisfaction=Decimal("12"))
+
+        build_month(self.SEPT, [self.backup.pk])
+
+        self.assertIsNone(self.snapshot().satisfaction_avg)
+        self.assertTrue(TrainerEvalSnapshot.objects.filter(trainer=self.backup, month=self.SEPT).exists())
+
+    def test_mark_stale_creates_placeholder_once(self):
+        entries = [(self.trainer.pk, date(2026, 9, 12), "ARGONOS"), (self.trainer.pk, date(2026, 9, 30), "ARGONOS")]
+        mark_stale(entries)
+        mark_stale(entries + [(None, date(2026, 9, 1), ""), (self.trainer.pk, None, "")])
+        self.assertEqual(stale_pairs(), {(self.trainer.pk, self.SEPT)})
+        self.assertEqual(TrainerEvalSnapshot.objects.count(), 1)
+
+    def test_signals_mark_old_and_new_months(self):
+        session = self.session(date(2026, 9, 3))
+        build_month(self.SEPT)
+        self.assertEqual(stale_pairs(), set())
+
+        # champ sans effet sur les snapshots : rien à recalculer
+        session.notes = "note"
+        session.save(update_fields=["notes"])
+        self.assertEqual(stale_pairs(), set())
+
+        session.start_date = date(2026, 10, 5)
+        session.save()
+        self.assertEqual(stale_pairs(), {(self.trainer.pk, self.SEPT), (self.trainer.pk, self.OCT)})
+
+        self.assertEqual(rebuild_pairs(stale_pairs()), 1)
+        self.assertEqual(stale_pairs(), set())
+        self.assertFalse(TrainerEvalSnapshot.objects.filter(month=self.SEPT).exists())
+        self.assertEqual(self.snapshot(month=self.OCT).sessions_count, 1)
+
+    def test_evaluation_signal_marks_month(self):
+        evaluation = InternalEvaluation.objects.create(
+            trainer=self.trainer, training=self.training, evaluated_on=date(2026, 9, 8)
+        )
+        self.assertEqual(stale_pairs(), {(self.trainer.pk, self.SEPT)})
+        rebuild_pairs(stale_pairs())
+
+        evaluation.delete()
+        self.assertEqual(stale_pairs(), {(self.trainer.pk, self.SEPT)})
+
+
+class AlertRuleSyncTests(TestCase):
+    """apply_rule : création, mise à jour, clôture, et idempotence d'un passage à l'autre."""
+
+    TODAY = date(2026, 10, 19)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        cls.training_type = TrainingType.objects.create(name="ArgonOS")
+        cls.training = Training.objects.create(title="ArgonOS", training_type=cls.training_type)
+        cls.customer = Client.objects.create(name="Client")
+
+    def setUp(self):
+        self.rule = RULES_BY_CODE["low_satisfaction"]
+        self.sessions = [
+            Session.objects.create(
+                training_type=self.training_type,
+                training=self.training,
+                client=self.customer,
+                trainer=self.trainer,
+                start_date=self.TODAY - timedelta(days=days),
+                client_satisfaction=Decimal("13"),
+            )
+            for days in (10, 20)
+        ]
+
+    def apply(self, rule=None, **kwargs):
+        result = apply_rule(rule or self.rule, self.TODAY, **kwargs)
+        return result.created, result.updated, result.resolved
+
+    def alert(self):
+        return TrainerAlert.objects.get(rule=self.rule.code)
+
+    def test_second_run_changes_nothing(self):
+        self.assertEqual(self.apply(dry_run=True), (1, 0, 0))
+        self.assertFalse(TrainerAlert.objects.exists())
+
+        self.assertEqual(self.apply(), (1, 0, 0))
+        alert = self.alert()
+        self.assertEqual((alert.value, alert.severity), ("13.0/20 (2 sessions)", AlertSeverity.WARNING))
+        self.assertEqual(self.apply(), (0, 0, 0))
+
+    def test_value_change_updates_and_keeps_status(self):
+        self.apply()
+        TrainerAlert.objects.update(status=AlertStatus.ACK)
+        Session.objects.update(client_satisfaction=Decimal("11"))
+
+        self.assertEqual(self.apply(), (0, 1, 0))
+        alert = self.alert()
+        self.assertEqual((alert.status, alert.severity), (AlertStatus.ACK, AlertSeverity.CRITICAL))
+
+    def test_gone_situation_is_resolved(self):
+        self.apply()
+        Session.objects.update(client_satisfaction=Decimal("18"))
+
+        self.assertEqual(self.apply(), (0, 0, 1))
+        alert = self.alert()
+        self.assertEqual(alert.status, AlertStatus.CLOSED)
+        self.assertIsNotNone(alert.resolved_on)
+        self.assertEqual(self.apply(), (0, 0, 0))
+
+    def test_closed_by_hand_is_not_recreated_for_same_value(self):
+        self.apply()
+        TrainerAlert.objects.update(status=AlertStatus.CLOSED)
+
+        self.assertEqual(self.apply(), (0, 0, 0))
+        # la situation s'aggrave : nouvelle alerte
+        Session.objects.update(client_satisfaction=Decimal("12.5"))
+        self.assertEqual(self.apply(), (1, 0, 0))
+        self.assertEqual(TrainerAlert.objects.filter(status=AlertStatus.OPEN).count(), 1)
+
+    def test_evaluations_after_today_are_ignored(self):
+        rule = RULES_BY_CODE["low_evaluation"]
+        InternalEvaluation.objects.create(
+            trainer=self.trainer, training=self.training, evaluated_on=self.TODAY - timedelta(days=5),
+            rubric_score_100=40, rubric_score_max=30,
+        )
+        # évaluation postérieure à la date de génération : ne masque pas la précédente
+        InternalEvaluation.objects.create(
+            trainer=self.trainer, training=self.training, evaluated_on=self.TODAY + timedelta(days=5),
+            rubric_score_100=90, rubric_score_max=30,
+        )
+        self.assertEqual(self.apply(rule), (1, 0, 0))
+        self.assertEqual(TrainerAlert.objects.get(rule=rule.code).value, "40/100")
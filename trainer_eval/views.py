@@ -8,6 +8,8 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from trainings.models import Session, Trainer, Training
+from trainings.services.trainer_profile import get_trainer_profile
+from .services.snapshots import rubric_averages, trainer_trend
 
 from .models import (
     ContributionKind,
@@ -241,12 +243,8 @@ def internal_eval_create(request):
     )
 
 def _product_filter_q(product: str) -> Q:
-    """
-    Filtre produit basé sur TrainingType.name OU Training.title
-    (fallback si les TrainingTypes ne contiennent pas le mot).
-    """
-    p = (product or "ARGONOS").upper()
-    return Q(training__training_type__name__icontains=p) | Q(training__title__icontains=p)
+    """Filtre produit sur le code indexé TrainingType.product."""
+    return Q(training__training_type__product=(product or "ARGONOS").upper())
 
 
 @staff_member_required
@@ -292,7 +290,7 @@ def internal_eval_list(request):
     # =========================================================
     trainings = (
         Training.objects
-        .filter(Q(training_type__name__icontains=product) | Q(title__icontains=product))
+        .filter(training_type__product=product)
         .order_by("title")
     )
 
@@ -301,35 +299,19 @@ def internal_eval_list(request):
     #    (même sans éval) via:
     #    - sessions où ils sont trainer OU backup_trainer
     #    - OU évaluations existantes (fallback)
-    #
-    # ⚠️ IMPORTANT : adapte ces related_name si nécessaire :
-    #   - "primary_sessions" = related_name sur Session.trainer
-    #   - "backup_sessions"  = related_name sur Session.backup_trainer
-    #   (sur ta capture, tu as bien primary_sessions / backup_sessions)
+    #    Semi-jointures (pk IN sous-requête) : pas de produit cartésien
+    #    sessions × évaluations, donc pas de DISTINCT.
     # =========================================================
-    product_q_evals = (
-        Q(internal_evaluations__training__training_type__name__icontains=product) |
-        Q(internal_evaluations__training__title__icontains=product)
-    )
-
-    product_q_sessions = (
-        Q(primary_sessions__training__training_type__name__icontains=product) |
-        Q(primary_sessions__training__title__icontains=product) |
-        Q(backup_sessions__training__training_type__name__icontains=product) |
-        Q(backup_sessions__training__title__icontains=product)
-    )
+    product_sessions = Session.objects.for_product(product)
 
-    trainers = (
-        Trainer.objects
-        .filter(product_q_sessions | product_q_evals)
-        .distinct()
+    trainers = Trainer.objects.filter(
+        Q(pk__in=product_sessions.values("trainer_id"))
+        | Q(pk__in=product_sessions.filter(backup_trainer__isnull=False).values("backup_trainer_id"))
+        | Q(pk__in=InternalEvaluation.objects.filter(_product_filter_q(product)).values("trainer_id"))
     )
 
     # --- compteur d'évals (respecte tes filtres globaux) ---
-    count_filter = (
-        Q(internal_evaluations__training__training_type__name__icontains=product) |
-        Q(internal_evaluations__training__title__icontains=product)
-    )
+    count_filter = Q(internal_evaluations__training__training_type__product=product)
 
     if training_id.isdigit():
         count_filter &= Q(internal_evaluations__training_id=int(training_id))
@@ -341,20 +323,27 @@ def internal_eval_list(request):
     if q:
         trainers = trainers.filter(Q(first_name__icontains=q) | Q(last_name__icontains=q))
 
-    trainers = (
+    trainers = list(
         trainers
-        .annotate(eval_count=Count("internal_evaluations", filter=count_filter, distinct=True))
+        .annotate(eval_count=Count("internal_evaluations", filter=count_filter))
         .order_by("last_name", "first_name")
     )
 
+    # --- score grille moyen sur 12 mois (snapshots mensuels) ---
+    averages = rubric_averages([t.pk for t in trainers], product=product)
+    for t in trainers:
+        t.rubric_avg_12m = averages.get(t.pk)
+
     # =========================================================
     # 5) Sélection formateur (clic sur la carte à gauche)
     # =========================================================
     selected_trainer = None
+    trend = []
     if selected_trainer_id.isdigit():
         selected_trainer = Trainer.objects.filter(pk=int(selected_trainer_id)).first()
         if selected_trainer:
             rows = rows.filter(trainer=selected_trainer)
+            trend = trainer_trend(selected_trainer.pk, product=product)
 
     rows = rows.order_by("-evaluated_on", "-id")
 
@@ -384,6 +373,8 @@ def internal_eval_list(request):
         "trainings": trainings,
         "trainers": trainers,
         "selected_trainer": selected_trainer,
+        "trainer_profile": get_trainer_profile(selected_trainer) if selected_trainer else None,
+        "trend": trend,
         "rows": rows,
 
         "url_no_trainer": "?" + urlencode(params_no_trainer, doseq=True),
@@ -495,7 +486,7 @@ def contributions_list(request):
         steps = ProjectStep.objects.filter(project_id=int(project_id)).order_by("order", "id")
 
     # --- Trainers list (left) + counts ---
-    trainer_base = Trainer.objects.filter(project_contribution_evaluations__isnull=False).distinct()
+    trainer_base = Trainer.objects.filter(pk__in=ProjectContributionEvaluation.objects.values("trainer_id"))
 
     if q:
         trainer_base = trainer_base.filter(Q(first_name__icontains=q) | Q(last_name__icontains=q))
@@ -512,15 +503,17 @@ def contributions_list(request):
 
     trainers = (
         trainer_base
-        .annotate(contrib_count=Count("project_contribution_evaluations", filter=count_filter, distinct=True))
+        .annotate(contrib_count=Count("project_contribution_evaluations", filter=count_filter))
         .order_by("last_name", "first_name")
     )
 
     selected_trainer = None
+    trend = []
     if selected_trainer_id.isdigit():
         selected_trainer = Trainer.objects.filter(pk=int(selected_trainer_id)).first()
         if selected_trainer:
             rows = rows.filter(trainer=selected_trainer)
+            trend = trainer_trend(selected_trainer.pk)
 
     rows = rows.order_by("-evaluated_on", "-id")
 
@@ -542,6 +535,7 @@ def contributions_list(request):
 
         "trainers": trainers,
         "selected_trainer": selected_trainer,
+        "trend": trend,
         "rows": rows,
 
         "url_no_trainer": "?" + urlencode(params_no_trainer, doseq=True),
@@ -2,14 +2,21 @@ from decimal import Decimal
 
 from django.contrib import admin, messages
 from django import forms
+from django.db.models import Count, IntegerField, OuterRef, Subquery
 from django.urls import reverse
-from django.utils.html import format_html
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
 
 from import_export import resources, fields
 from import_export.admin import ImportExportModelAdmin
 from import_export.widgets import ForeignKeyWidget
 
+from argonteam.models import ArgonosModule
+
+from .paginators import EstimatedCountPaginator
+from .services.calendar_feeds import feed_path, rotate_feed_secret
 from .services.invitations import generate_invitations_for_session
+from .services.mailer import enqueue_session_convocations, enqueue_session_reminders
 
 from .models import MercureContract, MercureInvoice
 
@@ -24,27 +31,61 @@ from .models import (
     Session,
     Referrer,
     Participant,
+    ParticipantCompletion,
     Registration,
+    OutboundEmail,
+    OutboundEmailStatus,
     PartnerContractPlan,
     PartnerContractPlanSeat,
     PartnerContract,
 )
 
 
+# ---------------------------------------------------------
+# Flux iCalendar (abonnement Outlook / Google)
+# ---------------------------------------------------------
+class CalendarFeedAdminMixin:
+    calendar_feed_kind = ""
+    actions = ["rotate_calendar_feed"]
+
+    @admin.display(description="Calendrier (.ics)")
+    def calendar_feed(self, obj):
+        if not obj or not obj.pk:
+            return "—"
+        return format_html('<a href="{}">Lien d’abonnement</a>', feed_path(self.calendar_feed_kind, obj))
+
+    @admin.action(description="🔑 Régénérer le lien d'abonnement .ics (l'ancien lien ne marche plus)")
+    def rotate_calendar_feed(self, request, queryset):
+        n = 0
+        for obj in queryset:
+            rotate_feed_secret(obj)
+            n += 1
+        messages.success(request, f"{n} lien(s) d'abonnement régénéré(s).")
+
+
 # ---------------------------------------------------------
 # Clients
 # ---------------------------------------------------------
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(CalendarFeedAdminMixin, admin.ModelAdmin):
     list_display = ("name", "is_partner", "country")
     list_filter = ("is_partner", "country")
     search_fields = ("name", "country")
+    readonly_fields = ("calendar_feed",)
+    calendar_feed_kind = "client"
+
+
+@admin.register(Room)
+class RoomAdmin(CalendarFeedAdminMixin, admin.ModelAdmin):
+    list_display = ("name", "location")
+    search_fields = ("name", "location")
+    readonly_fields = ("calendar_feed",)
+    calendar_feed_kind = "room"
 
 
 # ---------------------------------------------------------
 # Enregistrements simples
 # ---------------------------------------------------------
-admin.site.register(Room)
 admin.site.register(TrainingType)
 
 
@@ -75,6 +116,60 @@ class RegistrationAdmin(admin.ModelAdmin):
         "session__reference",
         "session__training__title",
     )
+    # Session.__str__ affiche la formation et le client
+    list_select_related = ("participant", "session__training", "session__client")
+    autocomplete_fields = ("session", "participant")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(ParticipantCompletion)
+class ParticipantCompletionAdmin(admin.ModelAdmin):
+    list_display = ("participant", "training", "completed_on", "session")
+    list_filter = ("training",)
+    search_fields = (
+        "participant__first_name",
+        "participant__last_name",
+        "participant__email",
+        "training__title",
+    )
+    list_select_related = ("participant", "training", "session")
+    raw_id_fields = ("participant", "session")
+
+
+# ---------------------------------------------------------
+# Emails sortants (file d'envoi — commande send_queued_emails)
+# ---------------------------------------------------------
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("to_email", "subject", "kind", "status", "attempts", "next_attempt_at", "sent_at", "session")
+    list_filter = ("status", "kind")
+    search_fields = ("to_email", "subject", "session__reference")
+    list_select_related = ("session",)
+    raw_id_fields = ("session", "registration")
+    readonly_fields = ("attempts", "last_error", "sent_at", "created_at", "updated_at")
+    date_hierarchy = "created_at"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["requeue", "cancel"]
+
+    @admin.action(description="🔁 Remettre en file (nouvel essai immédiat)")
+    def requeue(self, request, queryset):
+        n = queryset.exclude(status=OutboundEmailStatus.SENT).update(
+            status=OutboundEmailStatus.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        messages.success(request, f"{n} email(s) remis en file.")
+
+    @admin.action(description="⛔ Annuler l'envoi")
+    def cancel(self, request, queryset):
+        n = queryset.filter(status=OutboundEmailStatus.PENDING).update(
+            status=OutboundEmailStatus.CANCELED,
+            updated_at=timezone.now(),
+        )
+        messages.success(request, f"{n} email(s) annulé(s).")
 
 
 @admin.register(Training)
@@ -82,6 +177,7 @@ class TrainingAdmin(admin.ModelAdmin):
     list_display = (
         "title",
         "training_type",
+        "capacity",
         "session_price_ht",
         "participant_price_ht",
         "partner_session_price_ht",
@@ -89,6 +185,7 @@ class TrainingAdmin(admin.ModelAdmin):
     )
     list_filter = ("training_type",)
     search_fields = ("title", "training_type__name")
+    filter_horizontal = ("prerequisites",)
 
     fieldsets = (
         ("Informations générales", {
@@ -96,9 +193,16 @@ class TrainingAdmin(admin.ModelAdmin):
                 "title",
                 "training_type",
                 "default_days",
+                "capacity",
                 "color",
             )
         }),
+        ("Pré-requis", {
+            "fields": (
+                "prerequisites",
+                "prerequisites_any",
+            )
+        }),
         ("Tarification standard", {
             "fields": (
                 "session_price_ht",
@@ -138,6 +242,27 @@ def generate_session_invitations(modeladmin, request, queryset):
         messages.success(request, f"✅ Terminé pour {ok} session(s).")
 
 
+@admin.action(description="📧 Envoyer convocations par email (PDF dans la langue de la session)")
+def queue_session_invitations(modeladmin, request, queryset):
+    base_url = request.build_absolute_uri("/")
+    queued = 0
+    for s in queryset:
+        try:
+            lang = s.invitation_language_default()
+            result = generate_invitations_for_session(session=s, lang=lang, base_url=base_url)
+            queued += enqueue_session_convocations(s, result, lang)
+        except Exception as e:
+            messages.error(request, f"Erreur {s.reference or s.id} : {e}")
+
+    messages.success(request, f"✅ {queued} convocation(s) mise(s) en file d'envoi (send_queued_emails).")
+
+
+@admin.action(description="⏰ Envoyer un rappel par email aux inscrits")
+def queue_session_reminders(modeladmin, request, queryset):
+    queued = sum(enqueue_session_reminders(s) for s in queryset.select_related("training", "room"))
+    messages.success(request, f"✅ {queued} rappel(s) mis en file d'envoi (send_queued_emails).")
+
+
 # ---------------------------------------------------------
 # Referrers
 # ---------------------------------------------------------
@@ -152,7 +277,7 @@ class ReferrerAdmin(admin.ModelAdmin):
 # Trainers
 # ---------------------------------------------------------
 @admin.register(Trainer)
-class TrainerAdmin(admin.ModelAdmin):
+class TrainerAdmin(CalendarFeedAdminMixin, admin.ModelAdmin):
     list_display = (
         "last_name",
         "first_name",
@@ -164,6 +289,8 @@ class TrainerAdmin(admin.ModelAdmin):
     )
     list_filter = ("product", "platform", "is_active")
     search_fields = ("last_name", "first_name", "email")
+    readonly_fields = ("calendar_feed",)
+    calendar_feed_kind = "trainer"
 
 
 # ---------------------------------------------------------
@@ -191,11 +318,36 @@ class ParticipantResource(resources.ModelResource):
         import_id_fields = ("email",)
 
 
+class SessionRelatedOnlyListFilter(admin.RelatedOnlyFieldListFilter):
+    """Filtre par session : libellés (formation, client) chargés en une seule requête."""
+
+    def field_choices(self, field, request, model_admin):
+        pk_qs = (
+            model_admin.get_queryset(request)
+            .distinct()
+            .values_list(f"{self.field_path}__pk", flat=True)
+        )
+        sessions = (
+            Session.objects.filter(pk__in=pk_qs)
+            .select_related("training", "client")
+            .order_by(*(self.field_admin_ordering(field, request, model_admin) or ()))
+        )
+        return [(session.pk, str(session)) for session in sessions]
+
+
 @admin.register(Participant)
 class ParticipantAdmin(ImportExportModelAdmin):
     resource_class = ParticipantResource
 
-    list_display = ("client", "first_name", "last_name", "email", "company_service", "referrer")
+    list_display = (
+        "client",
+        "first_name",
+        "last_name",
+        "email",
+        "company_service",
+        "referrer",
+        "registrations_count",
+    )
     search_fields = (
         "first_name",
         "last_name",
@@ -211,11 +363,32 @@ class ParticipantAdmin(ImportExportModelAdmin):
         "client",
         "company_service",
         ("registrations__session__training_type", admin.RelatedOnlyFieldListFilter),
-        ("registrations__session", admin.RelatedOnlyFieldListFilter),
+        ("registrations__session", SessionRelatedOnlyListFilter),
     )
 
+    list_select_related = ("client", "referrer")
+    autocomplete_fields = ("client",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     def get_queryset(self, request):
-        return super().get_queryset(request).distinct()
+        # pas de distinct() global : la liste admin dédoublonne déjà quand un filtre
+        # passe par les inscriptions ; le nombre d'inscriptions en sous-requête
+        # n'ajoute pas de jointure
+        registrations = (
+            Registration.objects.filter(participant=OuterRef("pk"))
+            .order_by()
+            .values("participant")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        return super().get_queryset(request).annotate(
+            _registrations_count=Subquery(registrations, output_field=IntegerField())
+        )
+
+    @admin.display(description="Inscriptions", ordering="_registrations_count")
+    def registrations_count(self, obj):
+        return getattr(obj, "_registrations_count", None) or 0
 
     def get_form(self, request, obj=None, **kwargs):
         form = super().get_form(request, obj=obj, **kwargs)
@@ -294,7 +467,7 @@ class SessionAdminForm(forms.ModelForm):
 @admin.register(Session)
 class SessionAdmin(admin.ModelAdmin):
     form = SessionAdminForm
-    actions = [generate_session_invitations]
+    actions = [generate_session_invitations, queue_session_invitations, queue_session_reminders]
 
     list_display = (
         "reference",
@@ -328,6 +501,7 @@ class SessionAdmin(admin.ModelAdmin):
         "trainer",
         "room",
         "on_client_site",
+        "language",
         "status",
         "convocations_sent_at",
         "report_sent_at",
@@ -345,12 +519,20 @@ class SessionAdmin(admin.ModelAdmin):
 
     ordering = ("-start_date",)
 
+    # colonnes FK de la liste ; jauge / compteurs lisent les champs stockés de la session
+    list_select_related = ("training_type", "training", "client", "trainer", "room")
+    # formation / type restent des listes : session_admin.js filtre les formations par type
+    autocomplete_fields = ("client", "trainer", "backup_trainer")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     readonly_fields = (
         "created_at",
         "expected_participants",
         "present_count",
         "bulk_registrations_button",
         "create_teams_button",
+        "trainer_availability_finder",
     )
 
     fieldsets = (
@@ -364,11 +546,13 @@ class SessionAdmin(admin.ModelAdmin):
                 "training",
                 "client",
                 "billing_mode",
+                "language",
                 "start_date",
                 "end_date",
                 "days_count",
                 "trainer",
                 "backup_trainer",
+                "trainer_availability_finder",
             )
         }),
         ("Tarification", {
@@ -422,10 +606,32 @@ class SessionAdmin(admin.ModelAdmin):
             obj.outlook_compose_link()
         )
 
+    @admin.display(description="Formateurs disponibles")
+    def trainer_availability_finder(self, obj):
+        # rempli par trainer_availability_admin.js à partir des dates / du type du formulaire
+        modules = ArgonosModule.objects.filter(is_active=True).order_by("name").values_list("id", "name")
+        return format_html(
+            """
+            <div id="trainer-availability" data-url="{}" data-session-id="{}">
+              <select id="ta-module"><option value="">Module (optionnel)</option>{}</select>
+              <label style="margin-left:8px;">Charge max (%)
+                <input id="ta-max-load" type="number" min="0" max="200" value="100" style="width:70px;">
+              </label>
+              <button type="button" class="button" id="ta-search" style="margin-left:8px;">🔎 Chercher</button>
+              <div id="ta-results" style="margin-top:8px;"></div>
+            </div>
+            """,
+            reverse("trainings:trainer_availability_json"),
+            obj.pk if obj and obj.pk else "",
+            format_html_join("", '<option value="{}">{}</option>', modules),
+        )
+
     def save_model(self, request, obj, form, change):
         obj.apply_pricing_from_training(save=False)
+        pricing_changed = not change or obj.has_changed(*Session.PRICING_FIELDS)
         super().save_model(request, obj, form, change)
-        obj.recalculate_prices(save=True)
+        if pricing_changed:
+            obj.recalculate_prices(save=True)
 
     @admin.display(description="Inscriptions en masse")
     def bulk_registrations_button(self, obj):
@@ -470,6 +676,7 @@ class SessionAdmin(admin.ModelAdmin):
         js = (
             "trainings/session_admin.js",
             "trainings/session_location_admin.js",
+            "trainings/trainer_availability_admin.js",
         )
 
 
@@ -488,6 +695,10 @@ class MercureInvoiceAdmin(admin.ModelAdmin):
     list_display = ("reference", "trainer", "session", "amount_ht", "received_date", "status", "paid_date")
     list_filter = ("status", "trainer")
     search_fields = ("reference", "session__reference", "trainer__first_name", "trainer__last_name")
+    list_select_related = ("trainer", "session__training", "session__client")
+    autocomplete_fields = ("session", "trainer")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 # ================================================================
@@ -10,18 +10,24 @@ from .models import (
     Referrer,
     Session,
 )
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 class BulkRegistrationForm(forms.Form):
+    # listes à recherche : seules les valeurs choisies sont rendues dans la page
     session = forms.ModelChoiceField(
-        queryset=Session.objects.order_by("-start_date"),
+        queryset=Session.objects.select_related("training", "client"),
         label="Session",
+        widget=AutocompleteSelect("trainings:sessions_autocomplete_json", placeholder="Référence, formation, client…"),
     )
 
     existing_participants = forms.ModelMultipleChoiceField(
         queryset=Participant.objects.none(),
         required=False,
-        widget=forms.SelectMultiple(attrs={"size": "30"}),
+        widget=AutocompleteSelectMultiple(
+            "trainings:participants_autocomplete_json",
+            placeholder="Nom, prénom, email, service…",
+        ),
         label="Participants existants",
     )
 
@@ -34,7 +40,7 @@ class BulkRegistrationForm(forms.Form):
         if sid:
             try:
                 session = Session.objects.select_related("client").get(pk=sid)
-            except Session.DoesNotExist:
+            except (Session.DoesNotExist, ValueError):
                 session = None
 
         if session:
@@ -42,6 +48,8 @@ class BulkRegistrationForm(forms.Form):
                 Participant.objects.filter(client=session.client)
                 .order_by("last_name", "first_name")
             )
+            # recherche limitée au client de la session (+ inscrits / pré-requis signalés)
+            self.fields["existing_participants"].widget.params["session_id"] = session.pk
         else:
             self.fields["existing_participants"].queryset = Participant.objects.none()
 
@@ -1,5 +1,6 @@
 from django import forms
 from .models import Participant, Registration
+from .widgets import AutocompleteSelect
 
 
 class SessionSearchForm(forms.Form):
@@ -14,6 +15,14 @@ class ParticipantForm(forms.ModelForm):
     class Meta:
         model = Participant
         fields = ["client", "first_name", "last_name", "email", "company_service", "referrer"]
+        widgets = {
+            # référents cherchés dans le client choisi au-dessus
+            "referrer": AutocompleteSelect(
+                "trainings:referrers_autocomplete_json",
+                forward={"client_id": "client"},
+                placeholder="Nom, prénom, email…",
+            ),
+        }
 
 
 class RegistrationMiniForm(forms.ModelForm):
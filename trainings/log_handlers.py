@@ -0,0 +1,17 @@
+# trainings/log_handlers.py
+from __future__ import annotations
+
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler qui crée son dossier à l'ouverture du fichier : avec
+    delay=True, rien n'est écrit sur disque tant qu'aucune ligne n'est journalisée
+    (pas d'effet de bord à l'import des settings).
+    """
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from itertools import cycle, islice
+from pathlib import Path
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from trainings.services.benchmarks import (
+    ASYNC_ENDPOINTS,
+    ENDPOINTS_BY_NAME,
+    run_asgi_load,
+    run_wsgi_load,
+    session_cookie,
+    synthetic_test_database,
+)
+from trainings.services.synthetic_data import SCALES, scale_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit des petites requêtes JSON (agenda, formulaires) servies en "
+        "parallèle par le chemin WSGI (pool de threads) et le chemin ASGI (boucle asyncio), "
+        "pendant que des dashboards lents sont rendus. Base de test temporaire remplie "
+        "par le générateur synthétique."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(SCALES), default="small", help="Volume du jeu synthétique.")
+        parser.add_argument("--seed", type=int, default=42, help="Graine du jeu synthétique.")
+        parser.add_argument("--sessions", type=int, help="Nombre de sessions (remplace la valeur du volume).")
+        parser.add_argument("--requests", type=int, default=200, help="Petites requêtes JSON à envoyer.")
+        parser.add_argument("--concurrency", type=int, default=20, help="Petites requêtes en vol à la fois.")
+        parser.add_argument("--slow", type=int, default=4, help="Dashboards lents rendus en parallèle.")
+        parser.add_argument(
+            "--slow-endpoint",
+            choices=list(ENDPOINTS_BY_NAME),
+            default="dashboard_ca_view",
+            help="Page lente utilisée comme charge de fond (défaut : dashboard_ca_view).",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["both", "wsgi", "asgi"],
+            default="both",
+            help="Chemin(s) à mesurer.",
+        )
+        parser.add_argument("--output", help="Fichier JSON des résultats.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1 or options["slow"] < 0:
+            raise CommandError("--requests et --concurrency doivent être positifs, --slow positif ou nul.")
+
+        anchor = timezone.localdate()
+        scale = scale_for(options["scale"], sessions=options["sessions"])
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Benchmark concurrency (WSGI vs ASGI) ==="))
+        self.stdout.write(f"Database: test database, synthetic {options['scale']} (seed {options['seed']})")
+
+        with synthetic_test_database(scale, seed=options["seed"], anchor=anchor, sqlite_file=True) as result:
+            self.stdout.write(
+                f"Generated: {result.counts.get('sessions', 0)} sessions, "
+                f"{result.counts.get('registrations', 0)} registrations"
+            )
+            results = self._run(options, anchor)
+            # connexions des threads de mesure fermées avant la destruction de la base
+            connections.close_all()
+
+        if options["output"]:
+            payload = {
+                "meta": {
+                    "date": timezone.now().isoformat(timespec="seconds"),
+                    "scale": options["scale"],
+                    "seed": options["seed"],
+                    "requests": options["requests"],
+                    "concurrency": options["concurrency"],
+                    "slow": options["slow"],
+                    "slow_endpoint": options["slow_endpoint"],
+                    "vendor": connection.vendor,
+                    "django": django.get_version(),
+                },
+                "results": {r.mode: asdict(r) for r in results},
+            }
+            Path(options["output"]).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            self.stdout.write(f"Results written to {options['output']}")
+
+    # ------------------------------------------------------------------
+
+    def _run(self, options, anchor):
+        User = get_user_model()
+        user = User.objects.create_superuser("benchmark", "benchmark@example.com", None)
+        cookie = session_cookie(user)
+
+        fast_urls = [endpoint.url(anchor) for endpoint in ASYNC_ENDPOINTS]
+        urls = list(islice(cycle(fast_urls), options["requests"]))
+        slow_urls = [ENDPOINTS_BY_NAME[options["slow_endpoint"]].url(anchor)] * options["slow"]
+
+        self.stdout.write(f"Small requests: {len(urls)} over {len(fast_urls)} JSON endpoints")
+        self.stdout.write(f"Background: {len(slow_urls)} x {options['slow_endpoint']}")
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'mode':<6} {'conc':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'slow p50':>10} {'wall s':>8} {'errors':>7}"
+        )
+
+        runners = {"wsgi": run_wsgi_load, "asgi": run_asgi_load}
+        modes = ["wsgi", "asgi"] if options["mode"] == "both" else [options["mode"]]
+        results = []
+        for mode in modes:
+            # une passe d'échauffement (imports, caches de templates) hors mesure
+            runners[mode](fast_urls, [], concurrency=1, cookie=cookie)
+            r = runners[mode](urls, slow_urls, concurrency=options["concurrency"], cookie=cookie)
+            results.append(r)
+            slow = f"{r.slow_p50_ms:.1f}" if r.slow_p50_ms is not None else "—"
+            line = (
+                f"{r.mode:<6} {r.concurrency:>5} {r.throughput_rps:>8.1f} {r.p50_ms:>9.1f} "
+                f"{r.p95_ms:>9.1f} {slow:>10} {r.wall_s:>8.2f} {r.errors:>7}"
+            )
+            self.stdout.write(line if not r.errors else self.style.WARNING(line))
+
+        if len(results) == 2:
+            wsgi, asgi = results
+            if wsgi.throughput_rps:
+                ratio = asgi.throughput_rps / wsgi.throughput_rps
+                self.stdout.write("")
+                self.stdout.write(f"ASGI / WSGI throughput: x{ratio:.2f}")
+        self.stdout.write("")
+        return results
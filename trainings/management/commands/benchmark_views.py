@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from trainings.services.benchmarks import (
+    ENDPOINTS,
+    ENDPOINTS_BY_NAME,
+    compare,
+    load_results,
+    measure,
+    synthetic_test_database,
+    write_results,
+)
+from trainings.services.synthetic_data import SCALES, scale_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure les pages les plus chargées via le client de test : latence p50/p95, "
+        "nombre et temps des requêtes SQL, pic mémoire. Par défaut sur une base de test "
+        "temporaire remplie par le générateur synthétique ; résultats en JSON, "
+        "comparables à une référence."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(SCALES), default="small", help="Volume du jeu synthétique.")
+        parser.add_argument("--seed", type=int, default=42, help="Graine du jeu synthétique.")
+        parser.add_argument("--sessions", type=int, help="Nombre de sessions (remplace la valeur du volume).")
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Mesure la base configurée telle quelle (rien n'est écrit : tout est annulé à la fin).",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            choices=list(ENDPOINTS_BY_NAME),
+            help="Page à mesurer (répétable). Par défaut : toutes.",
+        )
+        parser.add_argument("--iterations", type=int, default=10, help="Requêtes chronométrées par page.")
+        parser.add_argument("--warmup", type=int, default=1, help="Requêtes d'échauffement non comptées.")
+        parser.add_argument(
+            "--warm-cache",
+            action="store_true",
+            help="Garde le cache entre deux requêtes (par défaut il est vidé avant chaque requête).",
+        )
+        parser.add_argument("--output", help="Fichier JSON des résultats.")
+        parser.add_argument("--baseline", help="Fichier JSON de référence à comparer.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="Dégradation de latence tolérée par rapport à la référence, en %% (défaut : 20).",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations doit être positif.")
+
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = load_results(options["baseline"])
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Référence illisible : {exc}")
+
+        endpoints = [ENDPOINTS_BY_NAME[name] for name in options["endpoints"]] if options["endpoints"] else ENDPOINTS
+        anchor = timezone.localdate()
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Benchmark views ==="))
+
+        setup_test_environment()
+        try:
+            with self._database(options, anchor):
+                results = self._run(endpoints, options, anchor)
+        finally:
+            teardown_test_environment()
+
+        meta = {
+            "date": timezone.now().isoformat(timespec="seconds"),
+            "anchor": anchor.isoformat(),
+            "database": "current" if options["current_db"] else f"synthetic:{options['scale']}",
+            "seed": options["seed"],
+            "sessions": options["sessions"],
+            "iterations": options["iterations"],
+            "cold_cache": not options["warm_cache"],
+            "vendor": connection.vendor,
+            "django": django.get_version(),
+        }
+        if options["output"]:
+            write_results(options["output"], results, meta)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options["threshold"])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(line))
+                raise CommandError(f"{len(regressions)} régression(s) par rapport à la référence.")
+            self.stdout.write(self.style.SUCCESS("No regression against the baseline."))
+
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _database(self, options, anchor: date):
+        if options["current_db"]:
+            self.stdout.write(f"Database: {connection.settings_dict['NAME']} (current, rolled back)")
+            with transaction.atomic():
+                yield
+                transaction.set_rollback(True)
+            return
+
+        scale = scale_for(options["scale"], sessions=options["sessions"])
+        self.stdout.write(f"Database: test database, synthetic {options['scale']} (seed {options['seed']})")
+        with synthetic_test_database(scale, seed=options["seed"], anchor=anchor) as result:
+            self.stdout.write(
+                f"Generated: {result.counts.get('sessions', 0)} sessions, "
+                f"{result.counts.get('registrations', 0)} registrations"
+            )
+            yield
+
+    def _run(self, endpoints, options, anchor: date):
+        User = get_user_model()
+        user = (
+            User.objects.filter(username="benchmark", is_superuser=True).first()
+            or User.objects.create_superuser("benchmark", "benchmark@example.com", None)
+        )
+        client = Client()
+        client.force_login(user)
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'endpoint':<28} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'sql ms':>9} {'peak KB':>9}"
+        )
+        results = []
+        for endpoint in endpoints:
+            r = measure(
+                client,
+                endpoint,
+                today=anchor,
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                cold_cache=not options["warm_cache"],
+            )
+            results.append(r)
+            line = (
+                f"{r.name:<28} {r.status:>6} {r.p50_ms:>9.1f} {r.p95_ms:>9.1f} "
+                f"{r.queries:>8} {r.sql_ms:>9.1f} {r.peak_memory_kb:>9.0f}"
+            )
+            self.stdout.write(line if r.status == 200 else self.style.WARNING(line))
+        self.stdout.write("")
+        return results
@@ -7,6 +7,7 @@ from django.db import transaction
 from django.db.models import Count
 
 from trainings.models import Participant, Registration
+from trainings.services.counters import batched_session_refresh
 
 
 def norm(value: str | None) -> str:
@@ -235,7 +236,7 @@ class Command(BaseCommand):
             self.stdout.write(f"Email group: {email} ({len(participants)} participants)")
 
             if apply_changes:
-                with transaction.atomic():
+                with transaction.atomic(), batched_session_refresh():
                     moved, deleted = self._merge_group(participants, apply_changes=True)
             else:
                 moved, deleted = self._merge_group(participants, apply_changes=False)
@@ -286,7 +287,7 @@ class Command(BaseCommand):
             )
 
             if apply_changes:
-                with transaction.atomic():
+                with transaction.atomic(), batched_session_refresh():
                     moved, deleted = self._merge_group(group, apply_changes=True)
             else:
                 moved, deleted = self._merge_group(group, apply_changes=False)
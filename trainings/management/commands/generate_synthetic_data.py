@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from trainings.models import Session
+from trainings.services.synthetic_data import SCALES, generate_synthetic_data, scale_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données synthétique (clients, formateurs, sessions, inscriptions, "
+        "Mercure, projets, ArgonTeam, évaluations) pour les tests de charge et les benchmarks. "
+        "Même seed + même date d'ancrage = mêmes données."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Crée réellement les données. Sans --apply, affiche seulement les volumes prévus.",
+        )
+        parser.add_argument("--scale", choices=list(SCALES), default="small", help="Volume de base (défaut : small).")
+        parser.add_argument("--seed", type=int, default=42, help="Graine du générateur (défaut : 42).")
+        parser.add_argument("--anchor", help="Date d'ancrage des dates générées (AAAA-MM-JJ). Défaut : aujourd'hui.")
+        parser.add_argument("--sessions", type=int, help="Nombre de sessions (remplace la valeur du volume).")
+        parser.add_argument("--participants", type=int, help="Nombre de participants.")
+        parser.add_argument("--registrations-per-session", type=int, help="Inscriptions moyennes par session.")
+        parser.add_argument("--trainers", type=int, help="Nombre de formateurs.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Génère même si la base contient déjà des sessions.",
+        )
+
+    def handle(self, *args, **options):
+        apply_changes = options["apply"]
+
+        anchor = None
+        if options["anchor"]:
+            try:
+                anchor = date.fromisoformat(options["anchor"])
+            except ValueError:
+                raise CommandError("--anchor doit être au format AAAA-MM-JJ.")
+
+        scale = scale_for(
+            options["scale"],
+            sessions=options["sessions"],
+            participants=options["participants"],
+            registrations_per_session=options["registrations_per_session"],
+            trainers=options["trainers"],
+        )
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Generate synthetic data ==="))
+        self.stdout.write(f"Mode: {'APPLY' if apply_changes else 'DRY-RUN'}")
+        self.stdout.write(f"Database: {settings.DATABASES['default']['NAME']}")
+        self.stdout.write(f"Seed: {options['seed']}")
+        for name, value in asdict(scale).items():
+            self.stdout.write(f"  {name}: {value}")
+        self.stdout.write(f"  ~registrations: {scale.sessions * scale.registrations_per_session}")
+        self.stdout.write("")
+
+        if Session.objects.exists() and not options["force"]:
+            raise CommandError("La base contient déjà des sessions : utiliser une base vide ou --force.")
+
+        if not apply_changes:
+            self.stdout.write(
+                self.style.WARNING("Simulation only. Re-run with --apply to create the data.")
+            )
+            return
+
+        started = time.perf_counter()
+        result = generate_synthetic_data(scale, seed=options["seed"], anchor=anchor)
+        elapsed = time.perf_counter() - started
+
+        for label, count in result.counts.items():
+            self.stdout.write(f"{label}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Done in {elapsed:.1f}s"))
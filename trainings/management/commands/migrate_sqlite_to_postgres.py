@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+from django.db.models import Max
+from django.db.models.fields import AutoFieldMixin
+
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+# =========================================================
+# Modèles à copier, dans l'ordre des clés étrangères
+# =========================================================
+
+def copied_models(target: str) -> list:
+    """Tables de toutes les applis (M2M auto incluses), parents avant enfants."""
+    candidates = [
+        model
+        for model in apps.get_models(include_auto_created=True)
+        if model._meta.managed
+        and not model._meta.proxy
+        and router.allow_migrate_model(target, model)
+    ]
+    remaining = {model._meta.label: model for model in candidates}
+
+    def parents(model):
+        return {
+            field.related_model._meta.label
+            for field in model._meta.concrete_fields
+            if field.is_relation and field.related_model is not model
+        }
+
+    ordered = []
+    while remaining:
+        ready = [m for label, m in remaining.items() if not (parents(m) & remaining.keys())]
+        if not ready:
+            # cycle de FK : les contraintes sont différées jusqu'au commit, on prend le reste tel quel
+            ready = list(remaining.values())
+        for model in sorted(ready, key=lambda m: m._meta.label):
+            ordered.append(model)
+            remaining.pop(model._meta.label)
+    return ordered
+
+
+# =========================================================
+# Copie
+# =========================================================
+
+def _insert_sql(connection, model, fields) -> str:
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(f.column) for f in fields)
+    placeholders = ", ".join(["%s"] * len(fields))
+    return f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})"
+
+
+def copy_model(model, source: str, target: str, chunk_size: int) -> int:
+    """
+    Copie une table par lots : lecture en flux (iterator) côté source, executemany côté cible.
+    Valeurs brutes (values_list) : pas de save(), pas de signaux, auto_now conservés.
+    """
+    connection = connections[target]
+    fields = list(model._meta.concrete_fields)
+    sql = _insert_sql(connection, model, fields)
+
+    rows = (
+        model._base_manager.using(source)
+        .order_by("pk")
+        .values_list(*[f.attname for f in fields])
+        .iterator(chunk_size=chunk_size)
+    )
+
+    copied = 0
+    batch = []
+    with connection.cursor() as cursor:
+        for row in rows:
+            batch.append([f.get_db_prep_save(v, connection=connection) for f, v in zip(fields, row)])
+            if len(batch) >= chunk_size:
+                cursor.executemany(sql, batch)
+                copied += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            copied += len(batch)
+    return copied
+
+
+def clear_tables(models, target: str) -> None:
+    """Vide les tables cible (contenttypes / permissions recréés par migrate, notamment)."""
+    connection = connections[target]
+    tables = [model._meta.db_table for model in models]
+    statements = connection.ops.sql_flush(no_style(), tables, allow_cascade=True)
+    connection.ops.execute_sql_flush(statements)
+
+
+def reset_sequences(models, target: str) -> None:
+    connection = connections[target]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def next_id(model, target: str) -> int | None:
+    """Prochain id attribué par la base cible (None si non applicable)."""
+    connection = connections[target]
+    table, column = model._meta.db_table, model._meta.pk.column
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT pg_get_serial_sequence(%s, %s)", [table, column])
+            sequence = cursor.fetchone()[0]
+            if not sequence:
+                return None
+            cursor.execute(f"SELECT last_value, is_called FROM {sequence}")
+            last_value, is_called = cursor.fetchone()
+            return last_value + 1 if is_called else last_value
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = %s", [table])
+            row = cursor.fetchone()
+            return (row[0] if row else 0) + 1
+    return None
+
+
+# =========================================================
+# Commande
+# =========================================================
+
+class Command(BaseCommand):
+    help = (
+        "Copie toutes les tables d'une base SQLite vers la base cible (PostgreSQL, ou un autre "
+        "fichier SQLite pour tester) : ordre des clés étrangères, lecture en flux par lots, "
+        "puis contrôle des nombres de lignes et des séquences. "
+        "La cible doit être migrée au préalable (migrate --database <cible>)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Copie réellement les données. Sans --apply, affiche seulement le plan.",
+        )
+        parser.add_argument(
+            "--source",
+            default="sqlite_source",
+            help="Alias de la base source (défaut : sqlite_source, voir ARGON_SQLITE_SOURCE).",
+        )
+        parser.add_argument(
+            "--target",
+            default="default",
+            help="Alias de la base cible (défaut : default).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Lignes lues / insérées par lot (défaut : {DEFAULT_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        apply_changes = options["apply"]
+        source, target = options["source"], options["target"]
+        chunk_size = options["chunk_size"]
+
+        for alias in (source, target):
+            if alias not in connections.settings:
+                raise CommandError(f"Base inconnue : {alias} (voir DATABASES / ARGON_SQLITE_SOURCE).")
+        if source == target:
+            raise CommandError("La source et la cible doivent être deux bases différentes.")
+        if connections[source].vendor != "sqlite":
+            raise CommandError(f"La source {source} n'est pas une base SQLite.")
+        if chunk_size < 1:
+            raise CommandError("--chunk-size doit être positif.")
+
+        models = copied_models(target)
+        missing = set(m._meta.db_table for m in models) - set(connections[target].introspection.table_names())
+        if missing:
+            raise CommandError(
+                f"{len(missing)} table(s) absente(s) de la cible : lancer d'abord "
+                f"`manage.py migrate --database {target}`."
+            )
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Migrate SQLite to PostgreSQL ==="))
+        self.stdout.write(f"Mode: {'APPLY' if apply_changes else 'DRY-RUN'}")
+        self.stdout.write(f"Source: {source} ({connections[source].vendor})")
+        self.stdout.write(f"Target: {target} ({connections[target].vendor})")
+        self.stdout.write(f"Tables: {len(models)}")
+        self.stdout.write("")
+
+        source_counts = {m: m._base_manager.using(source).count() for m in models}
+
+        if not apply_changes:
+            for model in models:
+                self.stdout.write(f"{model._meta.db_table}: {source_counts[model]}")
+            self.stdout.write(
+                self.style.WARNING(
+                    "Simulation only. Re-run with --apply to copy the data "
+                    "(target tables are emptied first)."
+                )
+            )
+            return
+
+        # une seule transaction : les FK (DEFERRABLE INITIALLY DEFERRED) sont vérifiées au commit
+        with transaction.atomic(using=target):
+            clear_tables(models, target)
+            for model in models:
+                copied = copy_model(model, source, target, chunk_size)
+                self.stdout.write(f"{model._meta.db_table}: {copied}")
+            reset_sequences(models, target)
+
+        errors = self._check(models, source_counts, target)
+        if errors:
+            for error in errors:
+                self.stdout.write(self.style.ERROR(error))
+            raise CommandError(f"{len(errors)} contrôle(s) en échec.")
+
+        total = sum(source_counts.values())
+        self.stdout.write(self.style.SUCCESS(f"Rows copied: {total} in {len(models)} tables, counts and sequences OK"))
+
+    def _check(self, models, source_counts, target) -> list[str]:
+        errors = []
+        for model in models:
+            table = model._meta.db_table
+            count = model._base_manager.using(target).count()
+            if count != source_counts[model]:
+                errors.append(f"{table}: {count} rows in target, {source_counts[model]} in source")
+
+            if not isinstance(model._meta.pk, AutoFieldMixin) or not count:
+                continue
+            max_id = model._base_manager.using(target).aggregate(m=Max("pk"))["m"]
+            upcoming = next_id(model, target)
+            if upcoming is not None and upcoming <= max_id:
+                errors.append(f"{table}: next id {upcoming} <= max id {max_id}")
+        return errors
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+
+from trainings.models import Session
+from trainings.services.counters import (
+    active_registrations_q,
+    present_registrations_q,
+    refresh_session_counters,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule expected_participants / present_count de toutes les sessions "
+        "à partir des inscriptions (un seul UPDATE corrélé)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Applique réellement la correction. Sans --apply, affiche seulement les écarts.",
+        )
+
+    def handle(self, *args, **options):
+        apply_changes = options["apply"]
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Reconcile session counters ==="))
+        self.stdout.write(f"Mode: {'APPLY' if apply_changes else 'DRY-RUN'}")
+        self.stdout.write("")
+
+        drifted = (
+            Session.objects
+            .annotate(
+                real_expected=Count("registrations", filter=active_registrations_q("registrations__")),
+                real_present=Count("registrations", filter=present_registrations_q("registrations__")),
+            )
+            .exclude(
+                expected_participants=F("real_expected"),
+                present_count=F("real_present"),
+            )
+            .count()
+        )
+        self.stdout.write(f"Sessions with drifted counters: {drifted}")
+
+        if not apply_changes:
+            self.stdout.write(
+                self.style.WARNING("Simulation only. Re-run with --apply to fix the counters.")
+            )
+            return
+
+        updated = refresh_session_counters()
+        self.stdout.write(self.style.SUCCESS(f"Sessions updated: {updated}"))
+
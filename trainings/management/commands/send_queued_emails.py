@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from trainings.models import OutboundEmail, OutboundEmailStatus
+from trainings.services.mailer import dispatch_pending, due_emails
+
+
+class Command(BaseCommand):
+    help = (
+        "Envoie les emails en file (convocations, rappels) par lots : une connexion "
+        "SMTP par lot, débit limité, nouvel essai différé en cas d'échec. À lancer "
+        "par cron / tâche planifiée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Envoie réellement. Sans --apply, affiche seulement l'état de la file.",
+        )
+        parser.add_argument("--batch-size", type=int, help="Emails par lot (défaut : EMAIL_QUEUE_BATCH_SIZE).")
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help="Emails par minute au maximum (défaut : EMAIL_QUEUE_RATE_PER_MINUTE, 0 = sans limite).",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=0,
+            help="Nombre maximum de lots (0 = jusqu'à ce que la file soit vide).",
+        )
+
+    def handle(self, *args, **options):
+        apply_changes = options["apply"]
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size doit être positif.")
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Send queued emails ==="))
+        self.stdout.write(f"Mode: {'APPLY' if apply_changes else 'DRY-RUN'}")
+        self.stdout.write("")
+
+        by_status = dict(
+            OutboundEmail.objects.values_list("status").annotate(n=Count("id")).order_by()
+        )
+        for status in OutboundEmailStatus:
+            self.stdout.write(f"{status.label:<16} {by_status.get(status.value, 0):>6}")
+        self.stdout.write(f"{'Due now':<16} {due_emails().count():>6}")
+        self.stdout.write("")
+
+        if not apply_changes:
+            self.stdout.write(self.style.WARNING("Simulation only. Re-run with --apply to send."))
+            return
+
+        batches = sent = retried = failed = 0
+        while not options["max_batches"] or batches < options["max_batches"]:
+            result = dispatch_pending(batch_size=options["batch_size"], rate_per_minute=options["rate"])
+            if not result.processed:
+                break
+            batches += 1
+            sent += result.sent
+            retried += result.retried
+            failed += result.failed
+            self.stdout.write(
+                f"Batch {batches}: {result.sent} sent, {result.retried} to retry, {result.failed} failed"
+                + (f", {result.reconnections} reconnection(s)" if result.reconnections else "")
+            )
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(f"Sent: {sent}"))
+        if retried:
+            self.stdout.write(self.style.WARNING(f"To retry later: {retried}"))
+        if failed:
+            self.stdout.write(self.style.ERROR(f"Failed: {failed}"))
@@ -0,0 +1,271 @@
+# trainings/middleware.py
+from __future__ import annotations
+
+import cProfile
+import heapq
+import io
+import json
+import logging
+import pstats
+import random
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.template.base import Template
+from django.utils import timezone
+
+
+logger = logging.getLogger("argon.requests")
+
+
+# =========================================================
+# Mesures d'une requête
+# =========================================================
+
+@dataclass
+class RequestProfile:
+    top_n: int = 5
+    sql_count: int = 0
+    sql_ms: float = 0.0
+    template_ms: float = 0.0
+    template_depth: int = 0
+    # tas min (durée, ordre, sql) : on ne garde que les top_n requêtes les plus lentes
+    slowest: list = field(default_factory=list)
+
+    def add_query(self, sql: str, duration_ms: float) -> None:
+        self.sql_count += 1
+        self.sql_ms += duration_ms
+        item = (duration_ms, self.sql_count, sql)
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, item)
+        elif duration_ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def top_queries(self) -> list[dict]:
+        return [
+            {"ms": round(ms, 2), "sql": normalize_sql(sql)}
+            for ms, _, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("argon_request_profile", default=None)
+
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Forme normalisée d'une requête, pour regrouper les mêmes requêtes :
+    littéraux remplacés par ?, listes IN (%s, %s, ...) réduites, espaces compactés.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(%s, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+# =========================================================
+# Instrumentation SQL / templates
+# =========================================================
+
+def _sql_wrapper(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, (time.perf_counter() - started) * 1000)
+
+
+_original_template_render = Template.render
+
+
+def _timed_template_render(self, context):
+    profile = _current.get()
+    if profile is None:
+        return _original_template_render(self, context)
+    # les {% include %} / {% extends %} repassent par ici : seul le rendu le plus externe compte
+    profile.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_template_render(self, context)
+    finally:
+        profile.template_depth -= 1
+        if profile.template_depth == 0:
+            profile.template_ms += (time.perf_counter() - started) * 1000
+
+
+def _instrument_templates() -> None:
+    if Template.render is not _timed_template_render:
+        Template.render = _timed_template_render
+
+
+def _install_sql_wrapper(connection) -> None:
+    # installé à demeure : sans mesure en cours (_current vide), il ne fait rien
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _install_sql_wrapper(connection)
+
+
+def _on_request_started(sender, **kwargs):
+    # request_started est envoyé dans le thread de la requête (WSGI comme ASGI) :
+    # couvre les connexions déjà ouvertes de ce thread (connexions persistantes)
+    for connection in connections.all(initialized_only=True):
+        _install_sql_wrapper(connection)
+
+
+# =========================================================
+# Middleware
+# =========================================================
+
+class RequestProfilingMiddleware:
+    """
+    Par requête : temps total, nombre et temps des requêtes SQL, temps de rendu
+    des templates, requêtes les plus lentes.
+    - en-tête Server-Timing pour le staff ou en DEBUG (onglet réseau du navigateur)
+    - ligne JSON dans le journal "argon.requests" pour un échantillon des requêtes
+      et pour toutes les requêtes lentes
+    - GET ?_profile=1 (staff uniquement) : renvoie le résumé cProfile de la vue au lieu de la page
+
+    Réglages : REQUEST_PROFILING_* dans config/settings.py.
+
+    Utilisable en WSGI comme en ASGI. En ASGI, l'ORM tourne dans le thread de la
+    requête et non dans la boucle : le relevé SQL passe par un wrapper posé sur
+    chaque connexion du thread (à son ouverture et au début de chaque requête),
+    et la mesure en cours par une ContextVar (copiée dans ce thread par asgiref).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.enabled = getattr(settings, "REQUEST_PROFILING_ENABLED", True)
+        self.sample_rate = getattr(settings, "REQUEST_PROFILING_SAMPLE_RATE", 0.0)
+        self.slow_ms = getattr(settings, "REQUEST_PROFILING_SLOW_MS", 500)
+        self.top_n = getattr(settings, "REQUEST_PROFILING_TOP_QUERIES", 5)
+        self.server_timing = getattr(settings, "REQUEST_PROFILING_SERVER_TIMING", True)
+        if self.enabled:
+            _instrument_templates()
+            connection_created.connect(_on_connection_created, dispatch_uid="argon_request_profiling")
+            request_started.connect(_on_request_started, dispatch_uid="argon_request_profiling")
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        profile = RequestProfile(top_n=self.top_n)
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        show_timing = self._timing_allowed(getattr(request, "user", None))
+        return self._finish(request, response, profile, started, show_timing)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        profile = RequestProfile(top_n=self.top_n)
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        user = None
+        if self.server_timing and not settings.DEBUG and hasattr(request, "auser"):
+            # request.user (synchrone) ne peut pas être évalué ici : déjà chargé par login_required
+            user = await request.auser()
+        show_timing = self._timing_allowed(user)
+        return self._finish(request, response, profile, started, show_timing)
+
+    def _timing_allowed(self, user) -> bool:
+        # Server-Timing expose le nombre de requêtes SQL : staff ou DEBUG seulement
+        if not self.server_timing:
+            return False
+        return settings.DEBUG or bool(user and user.is_staff)
+
+    def _finish(self, request, response, profile: RequestProfile, started: float, show_timing: bool):
+        total_ms = (time.perf_counter() - started) * 1000
+
+        if show_timing:
+            response["Server-Timing"] = server_timing_header(profile, total_ms)
+
+        if total_ms >= self.slow_ms or (self.sample_rate and random.random() < self.sample_rate):
+            self._log(request, response, profile, total_ms)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled or request.GET.get("_profile") != "1":
+            return None
+        # la vue est appelée ici, avant le process_view des middlewares suivants
+        # (CsrfViewMiddleware) : méthodes sûres uniquement
+        if request.method not in ("GET", "HEAD"):
+            return None
+        # vue async : son exécution se fait dans la boucle, hors de portée de cProfile
+        if iscoroutinefunction(view_func):
+            return None
+        user = getattr(request, "user", None)
+        if not (user and user.is_staff):
+            return None
+
+        profiler = cProfile.Profile()
+        response = profiler.runcall(view_func, request, *view_args, **view_kwargs)
+        # TemplateResponse : le rendu fait partie du coût de la vue
+        if hasattr(response, "render") and callable(response.render):
+            profiler.runcall(response.render)
+
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(40)
+        return HttpResponse(out.getvalue(), content_type="text/plain; charset=utf-8")
+
+    def _log(self, request, response, profile: RequestProfile, total_ms: float) -> None:
+        match = getattr(request, "resolver_match", None)
+        entry = {
+            "ts": timezone.now().isoformat(timespec="milliseconds"),
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 1),
+            "sql_count": profile.sql_count,
+            "sql_ms": round(profile.sql_ms, 1),
+            "template_ms": round(profile.template_ms, 1),
+            "slow": total_ms >= self.slow_ms,
+            "top_queries": profile.top_queries(),
+        }
+        logger.info(json.dumps(entry, ensure_ascii=False))
+
+
+def server_timing_header(profile: RequestProfile, total_ms: float) -> str:
+    return ", ".join([
+        f'sql;dur={profile.sql_ms:.1f};desc="{profile.sql_count} queries"',
+        f"tpl;dur={profile.template_ms:.1f}",
+        f"total;dur={total_ms:.1f}",
+    ])
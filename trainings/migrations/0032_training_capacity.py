@@ -0,0 +1,57 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:58
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+# anciennes capacités codées en dur dans trainings/signals.py (10 par défaut)
+CAPACITY_6_TITLES = (
+    "Développeur niveau 1",
+    "Admin Système Installation",
+)
+
+
+def forwards(apps, schema_editor):
+    Training = apps.get_model("trainings", "Training")
+    Session = apps.get_model("trainings", "Session")
+    Registration = apps.get_model("trainings", "Registration")
+
+    Training.objects.filter(title__in=CAPACITY_6_TITLES).update(capacity=6)
+
+    # expected_participants contenait la capacité : on le remet au nombre d'inscrits actifs
+    def count_of(**filters):
+        return Coalesce(
+            Subquery(
+                Registration.objects.filter(session_id=OuterRef("pk"), **filters)
+                .exclude(status="CANCELED")
+                .order_by()
+                .values("session_id")
+                .annotate(n=Count("pk"))
+                .values("n"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    Session.objects.update(
+        expected_participants=count_of(),
+        present_count=count_of(status="PRESENT"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0031_registration_applied_unit_price_ht_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='training',
+            name='capacity',
+            field=models.PositiveSmallIntegerField(default=10, validators=[django.core.validators.MinValueValidator(1)], verbose_name='Capacité (places)'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
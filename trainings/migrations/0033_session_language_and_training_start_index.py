@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0032_training_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='language',
+            field=models.CharField(choices=[('fr', 'Français'), ('en', 'Anglais')], default='fr', max_length=2, verbose_name='Langue'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['training', 'start_date'], name='session_training_start_idx'),
+        ),
+    ]
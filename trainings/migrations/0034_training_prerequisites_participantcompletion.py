@@ -0,0 +1,92 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _is_level1_dp_or_de(title: str) -> bool:
+    # règle historique de views.check_initiation_prereq
+    title = (title or "").upper()
+    is_dp = "DATA PRÉPARATION" in title or "DATA PREPARATION" in title
+    is_de = "DATA EXPLORATION" in title
+    is_lvl1 = ("NIVEAU 1" in title) or ("NIV 1" in title) or ("N1" in title) or ("LEVEL 1" in title)
+    return is_lvl1 and (is_dp or is_de)
+
+
+def forwards(apps, schema_editor):
+    Training = apps.get_model("trainings", "Training")
+    Registration = apps.get_model("trainings", "Registration")
+    ParticipantCompletion = apps.get_model("trainings", "ParticipantCompletion")
+
+    # 1) pré-requis : Initiation ArgonOS avant DP1 / DE1
+    argonos = list(Training.objects.filter(training_type__name__iexact="ARGONOS"))
+    initiations = [t for t in argonos if "INITIATION" in (t.title or "").upper()]
+    if initiations:
+        for training in argonos:
+            if _is_level1_dp_or_de(training.title):
+                training.prerequisites.add(*initiations)
+
+    # 2) historique des formations suivies depuis les présences
+    first_by_pair = {}
+    rows = (
+        Registration.objects
+        .filter(status="PRESENT")
+        .order_by("session__start_date", "pk")
+        .values_list(
+            "participant_id",
+            "session__training_id",
+            "session_id",
+            "session__start_date",
+            "session__end_date",
+            "created_at",
+        )
+    )
+    for participant_id, training_id, session_id, start_date, end_date, created_at in rows.iterator():
+        first_by_pair.setdefault(
+            (participant_id, training_id),
+            (session_id, end_date or start_date or created_at.date()),
+        )
+
+    ParticipantCompletion.objects.bulk_create(
+        [
+            ParticipantCompletion(
+                participant_id=participant_id,
+                training_id=training_id,
+                session_id=session_id,
+                completed_on=completed_on,
+            )
+            for (participant_id, training_id), (session_id, completed_on) in first_by_pair.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0033_session_language_and_training_start_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='training',
+            name='prerequisites',
+            field=models.ManyToManyField(blank=True, related_name='required_for', to='trainings.training', verbose_name='Pré-requis'),
+        ),
+        migrations.CreateModel(
+            name='ParticipantCompletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_on', models.DateField(verbose_name='Suivie le')),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completions', to='trainings.participant')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='completions', to='trainings.session')),
+                ('training', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completions', to='trainings.training')),
+            ],
+            options={
+                'verbose_name': 'Formation suivie',
+                'verbose_name_plural': 'Formations suivies',
+                'constraints': [models.UniqueConstraint(fields=('participant', 'training'), name='uniq_participant_training_completion')],
+            },
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
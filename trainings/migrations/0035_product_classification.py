@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
+
+
+PRODUCTS = ("ARGONOS", "MERCURE")
+
+
+def forwards(apps, schema_editor):
+    TrainingType = apps.get_model("trainings", "TrainingType")
+    Training = apps.get_model("trainings", "Training")
+    Session = apps.get_model("trainings", "Session")
+
+    def product_from_label(label):
+        txt = (label or "").upper()
+        return next((code for code in PRODUCTS if code in txt), "")
+
+    # le code produit contenu dans le nom du type ; à défaut, celui que portent
+    # les titres de toutes ses formations (ancien filtre sur Training.title)
+    for training_type in TrainingType.objects.all():
+        product = product_from_label(training_type.name)
+        if not product:
+            found = {
+                product_from_label(title)
+                for title in Training.objects.filter(training_type=training_type).values_list("title", flat=True)
+            }
+            if len(found) == 1:
+                product = found.pop()
+        if product:
+            TrainingType.objects.filter(pk=training_type.pk).update(product=product)
+
+    own = Subquery(
+        TrainingType.objects.filter(pk=OuterRef("training_type_id")).values("product")[:1]
+    )
+    via_training = Subquery(
+        Training.objects.filter(pk=OuterRef("training_id")).values("training_type__product")[:1]
+    )
+    Session.objects.update(product=Coalesce(NullIf(own, Value("")), via_training, Value("")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0034_training_prerequisites_participantcompletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='product',
+            field=models.CharField(blank=True, choices=[('ARGONOS', 'ArgonOS'), ('MERCURE', 'Mercure')], default='', editable=False, max_length=20, verbose_name='Produit'),
+        ),
+        migrations.AddField(
+            model_name='trainingtype',
+            name='product',
+            field=models.CharField(blank=True, choices=[('ARGONOS', 'ArgonOS'), ('MERCURE', 'Mercure')], db_index=True, default='', max_length=20, verbose_name='Produit'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['product', 'start_date'], name='session_product_start_idx'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
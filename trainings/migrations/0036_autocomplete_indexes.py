@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0035_product_classification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['client', 'last_name', 'first_name'], name='participant_client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['last_name', 'first_name'], name='participant_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='referrer',
+            index=models.Index(fields=['client', 'last_name', 'first_name'], name='referrer_client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['-start_date', '-id'], name='session_start_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['reference'], name='session_reference_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0036_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CONVOCATION', 'Convocation'), ('REMINDER', 'Rappel'), ('OTHER', 'Autre')], default='OTHER', max_length=20, verbose_name='Type')),
+                ('status', models.CharField(choices=[('PENDING', 'En attente'), ('SENDING', 'Envoi en cours'), ('SENT', 'Envoyé'), ('FAILED', 'Échec'), ('CANCELED', 'Annulé')], default='PENDING', max_length=20, verbose_name='Statut')),
+                ('to_email', models.EmailField(max_length=254, verbose_name='Destinataire')),
+                ('from_email', models.CharField(blank=True, default='', max_length=254, verbose_name='Expéditeur')),
+                ('subject', models.CharField(max_length=255, verbose_name='Objet')),
+                ('body', models.TextField(verbose_name='Texte')),
+                ('html_body', models.TextField(blank=True, default='', verbose_name='HTML')),
+                ('attachments', models.JSONField(blank=True, default=list, verbose_name='Pièces jointes')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Prochain essai')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Dernière erreur')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Envoyé le')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('registration', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbound_emails', to='trainings.registration')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbound_emails', to='trainings.session')),
+            ],
+            options={
+                'verbose_name': 'Email sortant',
+                'verbose_name_plural': 'Emails sortants',
+                'ordering': ('-created_at',),
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx')],
+            },
+        ),
+    ]
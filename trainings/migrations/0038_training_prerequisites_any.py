@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+
+def _is_level1_dp_or_de(title: str) -> bool:
+    # même règle que 0034 (views.check_initiation_prereq historique)
+    title = (title or "").upper()
+    is_dp = "DATA PRÉPARATION" in title or "DATA PREPARATION" in title
+    is_de = "DATA EXPLORATION" in title
+    is_lvl1 = ("NIVEAU 1" in title) or ("NIV 1" in title) or ("N1" in title) or ("LEVEL 1" in title)
+    return is_lvl1 and (is_dp or is_de)
+
+
+def forwards(apps, schema_editor):
+    # 0034 a ajouté toutes les Initiations ArgonOS en pré-requis de DP1 / DE1 :
+    # l'ancienne règle acceptait n'importe laquelle d'entre elles
+    Training = apps.get_model("trainings", "Training")
+    ids = [
+        pk
+        for pk, title in (
+            Training.objects
+            .filter(training_type__name__iexact="ARGONOS", prerequisites__isnull=False)
+            .distinct()
+            .values_list("pk", "title")
+        )
+        if _is_level1_dp_or_de(title)
+    ]
+    Training.objects.filter(pk__in=ids).update(prerequisites_any=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0037_outbound_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='training',
+            name='prerequisites_any',
+            field=models.BooleanField(default=False, help_text='Coché : une des formations pré-requises suffit (ex. une Initiation ArgonOS). Sinon toutes sont requises.', verbose_name='Un seul pré-requis suffit'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
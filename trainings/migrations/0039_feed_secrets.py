@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:05
+
+import secrets
+
+import trainings.models
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    # AddField applique la même valeur par défaut à toutes les lignes existantes :
+    # un secret distinct par objet, sinon un lien en révélerait d'autres
+    for model_name in ("Client", "Room", "Trainer"):
+        Model = apps.get_model("trainings", model_name)
+        objs = list(Model.objects.only("pk"))
+        for obj in objs:
+            obj.ics_secret = secrets.token_urlsafe(16)
+        Model.objects.bulk_update(objs, ["ics_secret"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0038_training_prerequisites_any'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='ics_secret',
+            field=models.CharField(default=trainings.models.new_feed_secret, editable=False, max_length=32, verbose_name='Secret du flux .ics'),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='ics_secret',
+            field=models.CharField(default=trainings.models.new_feed_secret, editable=False, max_length=32, verbose_name='Secret du flux .ics'),
+        ),
+        migrations.AddField(
+            model_name='trainer',
+            name='ics_secret',
+            field=models.CharField(default=trainings.models.new_feed_secret, editable=False, max_length=32, verbose_name='Secret du flux .ics'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,110 @@
+# trainings/mixins.py
+from __future__ import annotations
+
+from django.db import models
+
+
+_MISSING = object()
+
+
+class ChangeTrackingMixin(models.Model):
+    """
+    Mémorise les valeurs des champs chargées depuis la base afin de savoir,
+    au moment du save(), ce qui a réellement changé — sans relire la ligne.
+
+    - `changed_fields` : noms des champs modifiés depuis le chargement
+      (tous les champs pour une instance non encore enregistrée)
+    - `has_changed(*names)` : True si au moins un de ces champs a changé
+    - `initial_value(name)` : valeur connue en base pour ce champ
+
+    Le snapshot est rafraîchi après save() (limité à update_fields si fourni)
+    et après refresh_from_db().
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # field_names contient les attnames (ex: "training_id") réellement chargés
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    # ------------------------------------------------------------------
+    # Lecture de l'état
+    # ------------------------------------------------------------------
+
+    def _tracked_snapshot(self) -> dict:
+        return getattr(self, "_loaded_values", None) or {}
+
+    def initial_value(self, name: str, default=None):
+        """
+        Valeur du champ telle que chargée depuis la base.
+        Si le champ n'a pas été chargé (defer/only ou instance construite à la main
+        avec un pk), on la lit une seule fois puis on la garde en snapshot.
+        """
+        attname = self._meta.get_field(name).attname
+        snapshot = self._tracked_snapshot()
+        if attname in snapshot:
+            return snapshot[attname]
+
+        if self._state.adding or self.pk is None:
+            return default
+
+        value = (
+            type(self)._base_manager.using(self._state.db or "default")
+            .filter(pk=self.pk)
+            .values_list(attname, flat=True)
+            .first()
+        )
+        if not hasattr(self, "_loaded_values"):
+            self._loaded_values = {}
+        self._loaded_values[attname] = value
+        return value
+
+    @property
+    def changed_fields(self) -> set[str]:
+        snapshot = self._tracked_snapshot()
+        changed = set()
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                # champ différé jamais lu : il n'a pas pu être modifié
+                continue
+            initial = snapshot.get(field.attname, _MISSING)
+            if initial is _MISSING or initial != self.__dict__[field.attname]:
+                changed.add(field.name)
+        return changed
+
+    def has_changed(self, *names: str) -> bool:
+        changed = self.changed_fields
+        return any(name in changed for name in names)
+
+    # ------------------------------------------------------------------
+    # Rafraîchissement du snapshot
+    # ------------------------------------------------------------------
+
+    def _refresh_tracked_snapshot(self, names=None) -> None:
+        if not hasattr(self, "_loaded_values"):
+            self._loaded_values = {}
+
+        if names is None:
+            fields = self._meta.concrete_fields
+        else:
+            fields = [self._meta.get_field(name) for name in names]
+
+        for field in fields:
+            if field.attname in self.__dict__:
+                self._loaded_values[field.attname] = self.__dict__[field.attname]
+
+    def save(self, *args, update_fields=None, **kwargs):
+        # Django 5.x accepte encore save(force_insert, force_update, using, update_fields)
+        if update_fields is None and len(args) > 3:
+            update_fields, args = args[3], args[:3]
+        super().save(*args, update_fields=update_fields, **kwargs)
+        self._refresh_tracked_snapshot(update_fields)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        fields = kwargs.get("fields", args[1] if len(args) > 1 else None)
+        self._refresh_tracked_snapshot(fields)
@@ -1,6 +1,7 @@
 # trainings/models.py
 from __future__ import annotations
 
+import secrets
 from datetime import datetime, time, timedelta
 from decimal import Decimal
 from urllib.parse import urlencode
@@ -11,15 +12,23 @@ from django.db import models
 from django.utils import timezone
 from django.utils.html import format_html
 
+from .mixins import ChangeTrackingMixin
+
 
 # =========================================================
 # Référentiels
 # =========================================================
 
+def new_feed_secret() -> str:
+    """Secret du lien d'abonnement .ics (services.calendar_feeds) : le changer révoque l'ancien lien."""
+    return secrets.token_urlsafe(16)
+
+
 class Client(models.Model):
     name = models.CharField(max_length=200)
     is_partner = models.BooleanField("Partenaire", default=False)
     country = models.CharField("Pays", max_length=120, blank=True, default="")
+    ics_secret = models.CharField("Secret du flux .ics", max_length=32, default=new_feed_secret, editable=False)
 
     def __str__(self) -> str:
         return self.name
@@ -28,23 +37,73 @@ class Client(models.Model):
 class Room(models.Model):
     name = models.CharField(max_length=120)
     location = models.CharField(max_length=200, blank=True)
+    ics_secret = models.CharField("Secret du flux .ics", max_length=32, default=new_feed_secret, editable=False)
 
     def __str__(self) -> str:
         return self.name
 
 
-class TrainingType(models.Model):
+class Product(models.TextChoices):
+    ARGONOS = "ARGONOS", "ArgonOS"
+    MERCURE = "MERCURE", "Mercure"
+
+
+def product_from_label(label: str | None) -> str:
+    """Code produit déduit d'un libellé ("ArgonOS avancé" -> ARGONOS), "" si aucun."""
+    txt = (label or "").upper()
+    for code in Product.values:
+        if code in txt:
+            return code
+    return ""
+
+
+class TrainingType(ChangeTrackingMixin):
     name = models.CharField(max_length=120)
 
+    # recopié sur les sessions (Session.product) pour filtrer par produit sur index
+    product = models.CharField(
+        "Produit",
+        max_length=20,
+        choices=Product.choices,
+        blank=True,
+        default="",
+        db_index=True,
+    )
+
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self.product:
+            self.product = product_from_label(self.name)
+        super().save(*args, **kwargs)
+
 
 class Training(models.Model):
     title = models.CharField(max_length=200)
     training_type = models.ForeignKey(TrainingType, on_delete=models.PROTECT)
     default_days = models.DecimalField(max_digits=4, decimal_places=1, default=Decimal("1.0"))
     color = models.CharField(max_length=7, default="#3b82f6")  # format #RRGGBB
+    capacity = models.PositiveSmallIntegerField(
+        "Capacité (places)",
+        default=10,
+        validators=[MinValueValidator(1)],
+    )
+
+    # formations à avoir suivies (présence validée) avant de s'inscrire
+    prerequisites = models.ManyToManyField(
+        "self",
+        blank=True,
+        symmetrical=False,
+        related_name="required_for",
+        verbose_name="Pré-requis",
+    )
+    prerequisites_any = models.BooleanField(
+        "Un seul pré-requis suffit",
+        default=False,
+        help_text="Coché : une des formations pré-requises suffit (ex. une Initiation ArgonOS). "
+                  "Sinon toutes sont requises.",
+    )
 
     # =========================
     # Tarifs de référence
@@ -139,6 +198,8 @@ class Trainer(models.Model):
         validators=[MinValueValidator(0), MaxValueValidator(100)],
     )
 
+    ics_secret = models.CharField("Secret du flux .ics", max_length=32, default=new_feed_secret, editable=False)
+
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}".strip()
 
@@ -276,12 +337,26 @@ class WorkEnvironment(models.TextChoices):
     PSFORMATIONMID = "PSFormationMid", "PSFormationMid"
 
 
+class SessionLanguage(models.TextChoices):
+    FR = "fr", "Français"
+    EN = "en", "Anglais"
+
+
 class SessionBillingMode(models.TextChoices):
     COLLECTIVE = "COLLECTIVE", "Inscription collective"
     INDIVIDUAL = "INDIVIDUAL", "Inscriptions individuelles"
 
 
-class Session(models.Model):
+class SessionQuerySet(models.QuerySet):
+    def for_product(self, product: str | None):
+        """Sessions d'un produit (ARGONOS / MERCURE) ; sans produit, pas de filtre."""
+        product = (product or "").upper().strip()
+        if not product:
+            return self
+        return self.filter(product=product)
+
+
+class Session(ChangeTrackingMixin):
     reference = models.CharField(max_length=50, blank=True, default="")
 
     on_client_site = models.BooleanField(default=False)
@@ -320,6 +395,13 @@ class Session(models.Model):
 
     notes = models.TextField(blank=True)
 
+    language = models.CharField(
+        "Langue",
+        max_length=2,
+        choices=SessionLanguage.choices,
+        default=SessionLanguage.FR,
+    )
+
     # =========================
     # Facturation
     # =========================
@@ -415,6 +497,39 @@ class Session(models.Model):
         editable=False,
     )
 
+    # produit du type de session (ou, à défaut, du type de la formation)
+    product = models.CharField(
+        "Produit",
+        max_length=20,
+        choices=Product.choices,
+        blank=True,
+        default="",
+        editable=False,
+    )
+
+    objects = SessionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # recherche de places disponibles : formation + période
+            models.Index(fields=["training", "start_date"], name="session_training_start_idx"),
+            # filtres produit des dashboards / calendrier : produit + période
+            models.Index(fields=["product", "start_date"], name="session_product_start_idx"),
+            # liste à recherche des sessions : plus récentes d'abord, recherche par référence
+            models.Index(fields=["-start_date", "-id"], name="session_start_desc_idx"),
+            models.Index(fields=["reference"], name="session_reference_idx"),
+        ]
+
+    # champs dont la modification impose de recalculer les montants de la session
+    PRICING_FIELDS = frozenset({
+        "training",
+        "client",
+        "billing_mode",
+        "applied_session_price_ht",
+        "applied_participant_price_ht",
+        "travel_fee_ht",
+    })
+
     @property
     def is_partner_pricing(self) -> bool:
         return bool(self.client_id and getattr(self.client, "is_partner", False))
@@ -497,7 +612,7 @@ class Session(models.Model):
     # --- Invitations helpers (HTML -> PDF) ---------------------------------
 
     def invitation_language_default(self) -> str:
-        return "fr"
+        return self.language or SessionLanguage.FR
 
     def invitation_location_label(self) -> str:
         if self.on_client_site:
@@ -543,21 +658,23 @@ class Session(models.Model):
             ])
 
     def update_participant_counters(self, save: bool = False) -> None:
-        regs = self.registrations.all()
-        self.expected_participants = regs.count()
-        self.present_count = regs.filter(status=RegistrationStatus.PRESENT).count()
+        from .services.counters import compute_session_counters
+
+        self.expected_participants, self.present_count = compute_session_counters(self.pk)
 
         if save and self.pk:
             self.save(update_fields=["expected_participants", "present_count"])
 
-    def recalculate_prices(self, save: bool = True) -> None:
+    def recalculate_prices(self, save: bool = True, counters: bool = True) -> None:
         """
         Recalcule :
         - training_price_ht
         - price_ht
-        - compteurs participants
+        - compteurs participants (sauf counters=False : déjà mis à jour par
+          services.counters.refresh_session_counters)
         """
-        self.update_participant_counters(save=False)
+        if counters:
+            self.update_participant_counters(save=False)
 
         if self.billing_mode == SessionBillingMode.COLLECTIVE:
             if self.applied_session_price_ht is None:
@@ -575,35 +692,50 @@ class Session(models.Model):
         self.price_ht = (self.training_price_ht or Decimal("0.00")) + (self.travel_fee_ht or Decimal("0.00"))
 
         if save and self.pk:
-            self.save(update_fields=[
-                "expected_participants",
-                "present_count",
-                "training_price_ht",
-                "price_ht",
-            ])
+            fields = ["training_price_ht", "price_ht"]
+            if counters:
+                fields = ["expected_participants", "present_count", *fields]
+            self.save(update_fields=fields)
+
+    def compute_product(self) -> str:
+        product = self.training_type.product if self.training_type_id else ""
+        if not product and self.training_id:
+            product = self.training.training_type.product
+        return product
 
     def save(self, *args, **kwargs):
         # auto-fill training_type depuis training si besoin
-        if self.training and not self.training_type_id:
+        if self.training_id and not self.training_type_id:
             self.training_type = self.training.training_type
 
         # détecter si start_date change (pour recalculer / rouvrir l'alerte)
-        old_start_date = None
-        if self.pk:
-            old_start_date = (
-                Session.objects.filter(pk=self.pk)
-                .values_list("start_date", flat=True)
-                .first()
-            )
+        # -> via le snapshot chargé, sans relire la session en base
+        adding = self._state.adding
+        update_fields = kwargs.get("update_fields")
+
+        if adding or (
+            (update_fields is None or {"training", "training_type"} & set(update_fields))
+            and self.has_changed("training", "training_type")
+        ):
+            self.product = self.compute_product()
+            if update_fields is not None:
+                kwargs["update_fields"] = [*update_fields, "product"]
+        reference_changed = (
+            not adding
+            and (update_fields is None or "reference" in update_fields)
+            and self.has_changed("reference")
+        )
 
         if self.start_date:
             computed = self.start_date - timedelta(days=16)
 
             if not self.convocations_sent_at:
                 self.convocations_sent_at = computed
-            elif old_start_date and old_start_date != self.start_date:
-                self.convocations_sent_at = computed
-                self.convocation_alert_closed = False
+            elif not adding and self.has_changed("start_date"):
+                old_start_date = self.initial_value("start_date")
+                if old_start_date and old_start_date != self.start_date:
+                    self.convocations_sent_at = computed
+                    self.convocation_alert_closed = False
 
         # snapshot tarif si non défini
         if self.training_id:
@@ -623,6 +755,12 @@ class Session(models.Model):
 
         super().save(*args, **kwargs)
 
+        # la référence du contrat Mercure est une copie de celle de la session
+        if reference_changed:
+            MercureContract.objects.filter(session_id=self.pk).update(
+                reference=(self.reference or "").strip()
+            )
+
 
 # =========================================================
 # Participants / inscriptions
@@ -644,6 +782,12 @@ class Referrer(models.Model):
     company_service = models.CharField(max_length=200)
     service_address = models.TextField("Adresse du service", blank=True)
 
+    class Meta:
+        indexes = [
+            # listes à recherche : référents d'un client triés par nom
+            models.Index(fields=["client", "last_name", "first_name"], name="referrer_client_name_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name} - {self.company_service}"
 
@@ -670,6 +814,13 @@ class Participant(models.Model):
         related_name="participants",
     )
 
+    class Meta:
+        indexes = [
+            # listes à recherche : participants d'un client triés par nom
+            models.Index(fields=["client", "last_name", "first_name"], name="participant_client_name_idx"),
+            models.Index(fields=["last_name", "first_name"], name="participant_name_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}".strip()
 
@@ -689,7 +840,7 @@ class RegistrationBillingRate(models.IntegerChoices):
     FULL = 100, "Facturation 100%"
 
 
-class Registration(models.Model):
+class Registration(ChangeTrackingMixin):
     session = models.ForeignKey(
         Session,
         on_delete=models.CASCADE,
@@ -740,6 +891,19 @@ class Registration(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # champs qui pèsent sur les compteurs de la session
+    SESSION_COUNTER_FIELDS = ("session", "status")
+    # champs qui pèsent sur le montant d'une session facturée par participant
+    SESSION_RECALC_FIELDS = (
+        "session",
+        "participant",
+        "status",
+        "is_free",
+        "billing_rate_percent",
+        "applied_unit_price_ht",
+        "billed_amount_ht",
+    )
+
     class Meta:
         unique_together = ("session", "participant")
 
@@ -838,16 +1002,159 @@ class Registration(models.Model):
 
         self.compute_billed_amount_ht(save=False)
 
+        # recalcul session uniquement si un champ qui pèse sur les montants/compteurs a bougé
+        adding = self._state.adding
+        needs_counters = adding or self.has_changed(*self.SESSION_COUNTER_FIELDS)
+        needs_pricing = adding or self.has_changed(*self.SESSION_RECALC_FIELDS)
+        completion_changed = adding or self.has_changed("status", "session", "participant")
+        previous = None if adding else {
+            name: self.initial_value(name) for name in ("participant", "session", "status")
+        }
+        old_session_id = previous["session"] if previous else None
+
         super().save(*args, **kwargs)
 
-        if self.session_id:
-            self.session.recalculate_prices(save=True)
+        # historique des formations suivies (pré-requis)
+        if completion_changed:
+            from .services.prerequisites import sync_registration_completion
 
-    def delete(self, *args, **kwargs):
-        session = self.session
-        super().delete(*args, **kwargs)
-        if session:
-            session.recalculate_prices(save=True)
+            sync_registration_completion(self, previous=previous)
+
+        if not (needs_counters or needs_pricing):
+            return
+
+        from .services.counters import defer_session_refresh, refresh_sessions
+
+        session_ids = [sid for sid in {old_session_id, self.session_id} if sid]
+        pending = [
+            sid for sid in session_ids
+            if not defer_session_refresh(sid, pricing=needs_pricing)
+        ]
+        if pending:
+            refresh_sessions(
+                pending if needs_counters else (),
+                pricing_ids=pending if needs_pricing else (),
+            )
+
+
+class ParticipantCompletion(models.Model):
+    """
+    Formation suivie par un participant (présence validée sur une session).
+    Alimentée automatiquement par Registration.save() : sert au contrôle
+    des pré-requis sans relire tout l'historique des inscriptions.
+    """
+    participant = models.ForeignKey(
+        Participant,
+        on_delete=models.CASCADE,
+        related_name="completions",
+    )
+    training = models.ForeignKey(
+        Training,
+        on_delete=models.CASCADE,
+        related_name="completions",
+    )
+    session = models.ForeignKey(
+        Session,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="completions",
+    )
+    completed_on = models.DateField("Suivie le")
+
+    class Meta:
+        verbose_name = "Formation suivie"
+        verbose_name_plural = "Formations suivies"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["participant", "training"],
+                name="uniq_participant_training_completion",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.participant} — {self.training} ({self.completed_on})"
+
+
+# =========================================================
+# Emails sortants (file d'envoi)
+# =========================================================
+
+class OutboundEmailKind(models.TextChoices):
+    CONVOCATION = "CONVOCATION", "Convocation"
+    REMINDER = "REMINDER", "Rappel"
+    OTHER = "OTHER", "Autre"
+
+
+class OutboundEmailStatus(models.TextChoices):
+    PENDING = "PENDING", "En attente"
+    SENDING = "SENDING", "Envoi en cours"
+    SENT = "SENT", "Envoyé"
+    FAILED = "FAILED", "Échec"
+    CANCELED = "CANCELED", "Annulé"
+
+
+class OutboundEmail(models.Model):
+    """
+    Email en file d'envoi. Alimenté par trainings.services.mailer
+    (convocations, rappels), envoyé par la commande send_queued_emails
+    par lots sur une seule connexion SMTP.
+    """
+    kind = models.CharField(
+        "Type",
+        max_length=20,
+        choices=OutboundEmailKind.choices,
+        default=OutboundEmailKind.OTHER,
+    )
+    status = models.CharField(
+        "Statut",
+        max_length=20,
+        choices=OutboundEmailStatus.choices,
+        default=OutboundEmailStatus.PENDING,
+    )
+
+    to_email = models.EmailField("Destinataire")
+    from_email = models.CharField("Expéditeur", max_length=254, blank=True, default="")
+    subject = models.CharField("Objet", max_length=255)
+    body = models.TextField("Texte")
+    html_body = models.TextField("HTML", blank=True, default="")
+    # chemins relatifs à MEDIA_ROOT (ex. convocations/<reference>/Convocation_....pdf)
+    attachments = models.JSONField("Pièces jointes", default=list, blank=True)
+
+    session = models.ForeignKey(
+        Session,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="outbound_emails",
+    )
+    registration = models.ForeignKey(
+        Registration,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="outbound_emails",
+    )
+
+    attempts = models.PositiveSmallIntegerField("Tentatives", default=0)
+    next_attempt_at = models.DateTimeField("Prochain essai", default=timezone.now)
+    last_error = models.TextField("Dernière erreur", blank=True, default="")
+    sent_at = models.DateTimeField("Envoyé le", null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Email sortant"
+        verbose_name_plural = "Emails sortants"
+        ordering = ("-created_at",)
+        indexes = [
+            # lot suivant : emails en attente dont l'heure d'essai est passée
+            models.Index(fields=["status", "next_attempt_at"], name="outbound_email_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} → {self.to_email} ({self.get_status_display()})"
 
 
 # ==================================================================================
@@ -869,7 +1176,7 @@ class MercureInvoiceStatus(models.TextChoices):
     PAID = "PAID", "Payée"
 
 
-class MercureContract(models.Model):
+class MercureContract(ChangeTrackingMixin):
     """
     Contrat d'application Mercure (1 contrat par session Mercure)
     Objectif: suivi + alerte J-30 si non envoyé/signé.
@@ -908,7 +1215,8 @@ class MercureContract(models.Model):
         if not self.trainer_id and getattr(self.session, "trainer_id", None):
             self.trainer_id = self.session.trainer_id
 
-        if self.session_id:
+        # la référence suit la session (Session.save propage ensuite les renommages)
+        if self.session_id and (self._state.adding or self.has_changed("session")):
             self.reference = (getattr(self.session, "reference", "") or "").strip()
 
         super().save(*args, **kwargs)
@@ -1053,7 +1361,7 @@ class PartnerContractPlanSeat(models.Model):
         return f"{self.plan} — {self.training} ({self.included_seats})"
 
 
-class PartnerContract(models.Model):
+class PartnerContract(ChangeTrackingMixin):
     STATUS_ACTIVE = "active"
     STATUS_EXPIRED = "expired"
     STATUS_DRAFT = "draft"
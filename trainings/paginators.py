@@ -0,0 +1,65 @@
+# trainings/paginators.py
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+DEFAULT_THRESHOLD = 50_000
+
+
+# =========================================================
+# Nombre de lignes estimé
+# =========================================================
+# Sur une grosse table, le COUNT(*) d'une liste admin non filtrée parcourt
+# toute la table à chaque affichage. Les statistiques du moteur donnent un
+# ordre de grandeur gratuit : suffisant pour la pagination.
+
+def estimated_row_count(queryset) -> int | None:
+    """
+    Nombre de lignes de la table d'après les statistiques du moteur.
+    None si la liste est filtrée (l'estimation ne vaudrait que pour la table entière)
+    ou si le moteur n'a pas de statistiques.
+    """
+    if queryset.query.where or queryset.query.distinct:
+        return None
+
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)", [table])
+            row = cursor.fetchone()
+            # -1 : table jamais analysée
+            return int(row[0]) if row and row[0] >= 0 else None
+
+        if connection.vendor == "sqlite":
+            # sqlite_stat1 n'existe qu'après un premier ANALYZE
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            row = cursor.fetchone()
+            # "stat" commence par le nombre de lignes de la table
+            return int(row[0].split()[0]) if row and row[0] else None
+
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator des listes admin volumineuses : au-delà de
+    ADMIN_ESTIMATED_COUNT_THRESHOLD lignes estimées, la liste non filtrée
+    affiche l'estimation au lieu d'un COUNT(*) exact.
+    """
+
+    @cached_property
+    def count(self):
+        threshold = getattr(settings, "ADMIN_ESTIMATED_COUNT_THRESHOLD", DEFAULT_THRESHOLD)
+        if hasattr(self.object_list, "query"):
+            estimate = estimated_row_count(self.object_list)
+            if estimate is not None and estimate >= threshold:
+                return estimate
+        return super().count
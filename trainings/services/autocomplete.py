@@ -0,0 +1,140 @@
+# trainings/services/autocomplete.py
+from __future__ import annotations
+
+from django.db.models import Exists, OuterRef, Q, QuerySet
+
+from trainings.models import Participant, Referrer, Registration, Session
+from trainings.services.prerequisites import missing_prerequisites
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+# =========================================================
+# Recherche
+# =========================================================
+# Recherche par préfixe, mot par mot : "dup jea" trouve "Jean Dupont".
+# Chaque mot doit commencer un des champs cherchés. Les listes sont
+# bornées par client quand il est connu (index client + nom).
+
+def _terms(q: str) -> list[str]:
+    return [term for term in (q or "").split() if term][:5]
+
+
+def _prefix_filter(qs: QuerySet, q: str, fields: tuple[str, ...]) -> QuerySet:
+    for term in _terms(q):
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f"{field}__istartswith": term})
+        qs = qs.filter(condition)
+    return qs
+
+
+def search_participants(q: str = "", client_id: int | None = None) -> QuerySet:
+    qs = Participant.objects.select_related("client")
+    if client_id:
+        qs = qs.filter(client_id=client_id)
+    qs = _prefix_filter(qs, q, ("last_name", "first_name", "email", "company_service"))
+    return qs.order_by("last_name", "first_name", "id")
+
+
+def search_referrers(q: str = "", client_id: int | None = None) -> QuerySet:
+    """Avec un client : ses référents et ceux de ses participants."""
+    qs = Referrer.objects.select_related("client")
+    if client_id:
+        qs = qs.filter(
+            Q(client_id=client_id)
+            | Exists(Participant.objects.filter(referrer=OuterRef("pk"), client_id=client_id))
+        )
+    qs = _prefix_filter(qs, q, ("last_name", "first_name", "email", "company_service"))
+    return qs.order_by("last_name", "first_name", "id")
+
+
+def search_sessions(q: str = "") -> QuerySet:
+    qs = Session.objects.select_related("training", "client")
+    qs = _prefix_filter(qs, q, ("reference", "training__title", "client__name"))
+    return qs.order_by("-start_date", "-id")
+
+
+# =========================================================
+# Pagination
+# =========================================================
+
+def page_bounds(page, page_size) -> tuple[int, int]:
+    """(page, taille) valides à partir des paramètres GET bruts."""
+    try:
+        page = max(1, int(page))
+    except (TypeError, ValueError):
+        page = 1
+    try:
+        page_size = min(MAX_PAGE_SIZE, max(1, int(page_size)))
+    except (TypeError, ValueError):
+        page_size = DEFAULT_PAGE_SIZE
+    return page, page_size
+
+
+def paginate(qs: QuerySet, page: int, page_size: int) -> tuple[list, bool]:
+    """
+    Une page de résultats + "il y en a d'autres".
+    Pas de COUNT : on lit une ligne de plus que la page.
+    """
+    start = (page - 1) * page_size
+    rows = list(qs[start:start + page_size + 1])
+    return rows[:page_size], len(rows) > page_size
+
+
+# =========================================================
+# Résultats JSON
+# =========================================================
+
+def participant_results(participants: list[Participant], session: Session | None = None) -> list[dict]:
+    """
+    Avec une session : participants déjà inscrits signalés, pré-requis
+    manquants de la formation calculés pour la page seulement.
+    """
+    registered = set()
+    missing = {}
+    if session is not None and participants:
+        ids = [p.id for p in participants]
+        registered = set(
+            Registration.objects.filter(session=session, participant_id__in=ids)
+            .values_list("participant_id", flat=True)
+        )
+        missing = missing_prerequisites(session.training_id, ids)
+
+    return [
+        {
+            "id": p.id,
+            "text": str(p),
+            "email": p.email,
+            "service": p.company_service,
+            "client": p.client.name if p.client else "",
+            "registered": p.id in registered,
+            "missing": missing.get(p.id) or [],
+        }
+        for p in participants
+    ]
+
+
+def referrer_results(referrers: list[Referrer]) -> list[dict]:
+    return [
+        {
+            "id": r.id,
+            "text": f"{r.first_name} {r.last_name}".strip() + (f" — {r.client.name}" if r.client else ""),
+            "email": r.email,
+        }
+        for r in referrers
+    ]
+
+
+def session_results(sessions: list[Session]) -> list[dict]:
+    return [
+        {
+            "id": s.id,
+            "text": str(s),
+            "start_date": s.start_date.isoformat() if s.start_date else None,
+            "client_id": s.client_id,
+        }
+        for s in sessions
+    ]
@@ -0,0 +1,138 @@
+# trainings/services/availability.py
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import date
+
+from django.db.models import F
+from django.utils import timezone
+
+from trainings.models import Session, SessionStatus
+
+
+# Sessions sur lesquelles on peut encore inscrire des participants
+OPEN_SESSION_STATUSES = (
+    SessionStatus.DRAFT,
+    SessionStatus.PLANNED,
+    SessionStatus.CONFIRMED,
+)
+
+DEFAULT_LIMIT = 200
+
+
+@dataclass(frozen=True)
+class SessionAvailability:
+    session_id: int
+    reference: str
+    training_id: int
+    training_title: str
+    training_type: str
+    client_id: int
+    client_name: str
+    start_date: date
+    end_date: date | None
+    on_client_site: bool
+    room_id: int | None
+    room_name: str
+    language: str
+    status: str
+    capacity: int
+    booked: int
+    remaining: int
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["start_date"] = self.start_date.isoformat()
+        data["end_date"] = self.end_date.isoformat() if self.end_date else None
+        return data
+
+
+def find_available_sessions(
+    *,
+    training_id: int | None = None,
+    product: str = "",
+    client_id: int | None = None,
+    on_client_site: bool | None = None,
+    room_id: int | None = None,
+    language: str = "",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    min_seats: int = 1,
+    limit: int = DEFAULT_LIMIT,
+) -> list[SessionAvailability]:
+    """
+    Sessions à venir ayant au moins `min_seats` places libres.
+
+    Places restantes = Training.capacity - Session.expected_participants
+    (compteur maintenu par trainings.services.counters) : une seule requête,
+    sans compter les inscriptions session par session.
+    """
+    date_from = date_from or timezone.localdate()
+
+    qs = (
+        Session.objects
+        .filter(status__in=OPEN_SESSION_STATUSES, start_date__gte=date_from)
+        .annotate(remaining=F("training__capacity") - F("expected_participants"))
+        .filter(remaining__gte=max(1, min_seats))
+    )
+
+    if date_to:
+        qs = qs.filter(start_date__lte=date_to)
+    if training_id:
+        qs = qs.filter(training_id=training_id)
+    if client_id:
+        qs = qs.filter(client_id=client_id)
+    if on_client_site is not None:
+        qs = qs.filter(on_client_site=on_client_site)
+    if room_id:
+        qs = qs.filter(room_id=room_id)
+    if language:
+        qs = qs.filter(language=language)
+
+    qs = qs.for_product(product)
+
+    rows = (
+        qs.order_by("start_date", "id")
+        .values(
+            "id",
+            "reference",
+            "training_id",
+            "training__title",
+            "training_type__name",
+            "client_id",
+            "client__name",
+            "start_date",
+            "end_date",
+            "on_client_site",
+            "room_id",
+            "room__name",
+            "language",
+            "status",
+            "training__capacity",
+            "expected_participants",
+            "remaining",
+        )[:limit]
+    )
+
+    return [
+        SessionAvailability(
+            session_id=row["id"],
+            reference=row["reference"] or "",
+            training_id=row["training_id"],
+            training_title=row["training__title"] or "",
+            training_type=row["training_type__name"] or "",
+            client_id=row["client_id"],
+            client_name=row["client__name"] or "",
+            start_date=row["start_date"],
+            end_date=row["end_date"],
+            on_client_site=row["on_client_site"],
+            room_id=row["room_id"],
+            room_name=row["room__name"] or "",
+            language=row["language"],
+            status=row["status"],
+            capacity=row["training__capacity"],
+            booked=row["expected_participants"],
+            remaining=row["remaining"],
+        )
+        for row in rows
+    ]
@@ -0,0 +1,451 @@
+# trainings/services/benchmarks.py
+from __future__ import annotations
+
+import asyncio
+import calendar
+import io
+import json
+import math
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from trainings.middleware import RequestProfile
+from trainings.services.synthetic_data import SyntheticResult, SyntheticScale, generate_synthetic_data
+
+
+# =========================================================
+# Pages mesurées
+# =========================================================
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    url_name: str
+    params: Callable[[date], dict] | None = None
+
+    def url(self, today: date) -> str:
+        url = reverse(self.url_name)
+        params = self.params(today) if self.params else {}
+        if params:
+            url += "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        return url
+
+
+def _calendar_month(today: date) -> dict:
+    last = calendar.monthrange(today.year, today.month)[1]
+    return {"from": today.replace(day=1).isoformat(), "to": today.replace(day=last).isoformat()}
+
+
+ENDPOINTS = [
+    Endpoint("home_view", "trainings:home"),
+    Endpoint("control_center_view", "trainings:control_center"),
+    Endpoint("dashboard_ca_view", "trainings:dashboard_ca"),
+    Endpoint("trainer_workload_dashboard", "trainings:trainer_workload_dashboard"),
+    Endpoint("partners_dashboard", "trainings:partners_dashboard"),
+    Endpoint("client_hub", "trainings:client_hub"),
+    Endpoint("sessions_json", "trainings:sessions_json", _calendar_month),
+    Endpoint("training_manage_home", "trainings:training_manage_home"),
+    Endpoint("projects_home", "projects:projects_home"),
+]
+
+ENDPOINTS_BY_NAME = {endpoint.name: endpoint for endpoint in ENDPOINTS}
+
+
+def _prereq_check(today: date) -> dict:
+    """Prochaine session avec inscrits + email d'un inscrit : le contrôle va jusqu'à la base."""
+    from trainings.models import Registration
+
+    row = (
+        Registration.objects.filter(session__start_date__gte=today)
+        .order_by("session__start_date", "id")
+        .values_list("session_id", "participant__email")
+        .first()
+    )
+    return {"session_id": row[0], "email": row[1]} if row else {}
+
+
+# endpoints JSON async (agenda, formulaires) : les petites requêtes de la mesure de charge
+ASYNC_ENDPOINTS = [
+    Endpoint("sessions_json", "trainings:sessions_json", _calendar_month),
+    Endpoint("clients_list_json", "trainings:clients_list_json"),
+    Endpoint("trainers_list_json", "trainings:trainers_list_json"),
+    Endpoint("trainings_by_type_json", "trainings:trainings_by_type_json"),
+    Endpoint("api_prereq_initiation", "trainings:api_prereq_initiation", _prereq_check),
+]
+
+
+# =========================================================
+# Base de mesure
+# =========================================================
+
+@contextmanager
+def synthetic_test_database(
+    scale: SyntheticScale,
+    *,
+    seed: int,
+    anchor: date,
+    sqlite_file: bool = False,
+):
+    """
+    Base de test temporaire remplie par le générateur synthétique, détruite en sortie.
+    `sqlite_file` : en SQLite, base dans un fichier (WAL) plutôt qu'en mémoire,
+    pour que plusieurs threads y accèdent comme en production.
+    """
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    previous_test_name = test_settings.get("NAME")
+    tmp_dir = None
+    if sqlite_file and connection.vendor == "sqlite":
+        tmp_dir = tempfile.mkdtemp(prefix="argon-bench-")
+        test_settings["NAME"] = str(Path(tmp_dir) / "bench.sqlite3")
+
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        result: SyntheticResult = generate_synthetic_data(scale, seed=seed, anchor=anchor)
+        yield result
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = previous_test_name
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# =========================================================
+# Mesure
+# =========================================================
+
+@dataclass
+class EndpointResult:
+    name: str
+    url: str
+    status: int
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    queries: int
+    sql_ms: float
+    peak_memory_kb: float
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentile au rang le plus proche (valeurs non triées acceptées)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@contextmanager
+def sql_profile():
+    """
+    Nombre et temps des requêtes SQL du bloc, chronométrées par perf_counter
+    (le journal de Django arrondit chaque durée à la milliseconde).
+    """
+    profile = RequestProfile()
+
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            profile.add_query(sql, (time.perf_counter() - started) * 1000)
+
+    with connection.execute_wrapper(wrapper):
+        yield profile
+
+
+def _request(client: Client, url: str, cold_cache: bool):
+    if cold_cache:
+        cache.clear()
+    return client.get(url)
+
+
+def measure(
+    client: Client,
+    endpoint: Endpoint,
+    *,
+    today: date,
+    iterations: int = 10,
+    warmup: int = 1,
+    cold_cache: bool = True,
+) -> EndpointResult:
+    """
+    - latence : `iterations` requêtes chronométrées, après `warmup` requêtes ignorées
+    - requêtes SQL (nombre, temps) : relevées sur la dernière requête chronométrée
+    - pic mémoire : une requête supplémentaire sous tracemalloc (qui ralentit tout,
+      d'où la passe séparée)
+    """
+    url = endpoint.url(today)
+    for _ in range(warmup):
+        _request(client, url, cold_cache)
+
+    timings = []
+    response = None
+    for _ in range(iterations):
+        with sql_profile() as sql:
+            started = time.perf_counter()
+            response = _request(client, url, cold_cache)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        _request(client, url, cold_cache)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return EndpointResult(
+        name=endpoint.name,
+        url=url,
+        status=response.status_code,
+        iterations=iterations,
+        p50_ms=round(percentile(timings, 50), 2),
+        p95_ms=round(percentile(timings, 95), 2),
+        mean_ms=round(statistics.fmean(timings), 2),
+        queries=sql.sql_count,
+        sql_ms=round(sql.sql_ms, 2),
+        peak_memory_kb=round(peak / 1024, 1),
+    )
+
+
+# =========================================================
+# Résultats / référence
+# =========================================================
+
+def write_results(path: str | Path, results: list[EndpointResult], meta: dict) -> None:
+    payload = {"meta": meta, "results": {r.name: asdict(r) for r in results}}
+    Path(path).write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def load_results(path: str | Path) -> dict[str, dict]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+
+
+def compare(results: list[EndpointResult], baseline: dict[str, dict], threshold_pct: float) -> list[str]:
+    """
+    Régressions par rapport à la référence :
+    - p50 ou p95 plus lent de plus de `threshold_pct` %
+    - plus de requêtes SQL (le nombre de requêtes ne doit jamais augmenter)
+    """
+    regressions = []
+    factor = 1 + threshold_pct / 100
+    for r in results:
+        ref = baseline.get(r.name)
+        if not ref:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = ref[metric], getattr(r, metric)
+            if before and after > before * factor:
+                regressions.append(f"{r.name}: {metric} {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+        if r.queries > ref["queries"]:
+            regressions.append(f"{r.name}: queries {ref['queries']} -> {r.queries}")
+    return regressions
+
+
+# =========================================================
+# Charge concurrente : WSGI (threads) / ASGI (boucle)
+# =========================================================
+# Les deux chemins passent par les vrais handlers Django (tous les middlewares,
+# signaux request_started / request_finished, connexions par thread), appelés
+# dans le processus : pas de serveur HTTP à lancer. WSGI : un pool de threads,
+# comme un serveur WSGI threadé. ASGI : une boucle asyncio, les vues classiques
+# passant dans un thread par requête (ThreadSensitiveContext du handler).
+
+HOST = "localhost"
+
+
+@dataclass
+class LoadResult:
+    mode: str
+    concurrency: int
+    requests: int
+    slow_requests: int
+    errors: int
+    wall_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    slow_p50_ms: float | None
+
+
+def _split(url: str) -> tuple[str, str]:
+    parts = urlsplit(url)
+    return parts.path, parts.query
+
+
+def _wsgi_environ(url: str, cookie: str) -> dict:
+    path, query = _split(url)
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SCRIPT_NAME": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "HTTP_COOKIE": cookie,
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+
+def wsgi_get(app, url: str, cookie: str) -> int:
+    status = []
+
+    def start_response(value, headers, exc_info=None):
+        status.append(int(value.split()[0]))
+
+    response = app(_wsgi_environ(url, cookie), start_response)
+    try:
+        for _ in response:
+            pass
+    finally:
+        # request_finished : fermeture des connexions, comme un vrai serveur
+        if hasattr(response, "close"):
+            response.close()
+    return status[0]
+
+
+async def asgi_get(app, url: str, cookie: str) -> int:
+    path, query = _split(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", HOST.encode()), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": (HOST, 80),
+    }
+    status = []
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # client toujours connecté : le handler annule cette attente une fois la réponse envoyée
+        await asyncio.get_running_loop().create_future()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+def _load_result(mode, concurrency, fast, slow, errors, wall_s) -> LoadResult:
+    return LoadResult(
+        mode=mode,
+        concurrency=concurrency,
+        requests=len(fast),
+        slow_requests=len(slow),
+        errors=errors,
+        wall_s=round(wall_s, 3),
+        throughput_rps=round(len(fast) / wall_s, 1) if wall_s else 0.0,
+        p50_ms=round(percentile(fast, 50), 2) if fast else 0.0,
+        p95_ms=round(percentile(fast, 95), 2) if fast else 0.0,
+        slow_p50_ms=round(percentile(slow, 50), 2) if slow else None,
+    )
+
+
+def run_wsgi_load(urls: list[str], slow_urls: list[str], *, concurrency: int, cookie: str) -> LoadResult:
+    """`urls` : petites requêtes (concurrency à la fois) ; `slow_urls` : lancées d'emblée, en parallèle."""
+    from django.core.wsgi import get_wsgi_application
+
+    app = get_wsgi_application()
+    fast, slow, errors = [], [], 0
+
+    def timed(url):
+        started = time.perf_counter()
+        status = wsgi_get(app, url, cookie)
+        return status, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(slow_urls) or 1) as slow_pool, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+        slow_futures = [slow_pool.submit(timed, url) for url in slow_urls]
+        fast_futures = [pool.submit(timed, url) for url in urls]
+        for future in fast_futures:
+            status, ms = future.result()
+            fast.append(ms)
+            errors += status != 200
+        wall_s = time.perf_counter() - started
+        for future in slow_futures:
+            status, ms = future.result()
+            slow.append(ms)
+            errors += status != 200
+    return _load_result("wsgi", concurrency, fast, slow, errors, wall_s)
+
+
+def run_asgi_load(urls: list[str], slow_urls: list[str], *, concurrency: int, cookie: str) -> LoadResult:
+    from django.core.asgi import get_asgi_application
+
+    app = get_asgi_application()
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(url, limit):
+            if limit is None:
+                started = time.perf_counter()
+                return await asgi_get(app, url, cookie), (time.perf_counter() - started) * 1000
+            async with limit:
+                started = time.perf_counter()
+                return await asgi_get(app, url, cookie), (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        slow_tasks = [asyncio.create_task(timed(url, None)) for url in slow_urls]
+        fast_results = await asyncio.gather(*(timed(url, semaphore) for url in urls))
+        wall_s = time.perf_counter() - started
+        slow_results = await asyncio.gather(*slow_tasks)
+        return fast_results, slow_results, wall_s
+
+    fast_results, slow_results, wall_s = asyncio.run(main())
+    errors = sum(status != 200 for status, _ in fast_results + slow_results)
+    return _load_result(
+        "asgi",
+        concurrency,
+        [ms for _, ms in fast_results],
+        [ms for _, ms in slow_results],
+        errors,
+        wall_s,
+    )
+
+
+def session_cookie(user) -> str:
+    """En-tête Cookie d'une session connectée pour `user`."""
+    client = Client()
+    client.force_login(user)
+    return f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
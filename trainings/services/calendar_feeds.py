@@ -0,0 +1,253 @@
+# trainings/services/calendar_feeds.py
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signing import Signer
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from trainings.models import Client, Room, Session, SessionStatus, Trainer, Training, new_feed_secret
+from trainings.services.dashboard_cache import cached_block
+
+
+DEFAULT_PAST_DAYS = 90
+DEFAULT_FUTURE_DAYS = 365
+# intervalle de rafraîchissement conseillé aux clients calendrier
+REFRESH_INTERVAL = "PT15M"
+
+FEED_MODELS = {
+    "trainer": Trainer,
+    "room": Room,
+    "client": Client,
+}
+
+_signer = Signer(salt="trainings.calendar_feeds")
+
+
+# =========================================================
+# Jetons d'abonnement
+# =========================================================
+# Les clients calendrier (Outlook, Google, Apple) ne savent pas se
+# connecter : l'URL du flux porte une signature de (type, id, secret de
+# l'objet). Régénérer le secret (rotate_feed_secret) révoque le lien d'un
+# seul formateur / client / salle sans toucher à SECRET_KEY.
+
+def feed_token(kind: str, obj_id: int, secret: str) -> str:
+    return _signer.signature(f"{kind}:{obj_id}:{secret}")
+
+
+def feed_secret(kind: str, obj_id: int) -> str | None:
+    """Secret courant de l'objet (None s'il n'existe pas), en cache jusqu'à sa prochaine modification."""
+    model = FEED_MODELS[kind]
+    return cached_block(
+        "ics_feed_secret",
+        lambda: model.objects.filter(pk=obj_id).values_list("ics_secret", flat=True).first(),
+        depends_on=[model],
+        key_parts=(kind, obj_id),
+    )
+
+
+def check_feed_token(kind: str, obj_id: int, token: str) -> bool:
+    secret = feed_secret(kind, obj_id)
+    if not secret:
+        return False
+    return constant_time_compare(feed_token(kind, obj_id, secret), token or "")
+
+
+def feed_path(kind: str, obj) -> str:
+    """Chemin du flux de `obj` (Trainer, Room ou Client chargé avec ics_secret)."""
+    return reverse("trainings:calendar_feed", args=[kind, obj.pk, feed_token(kind, obj.pk, obj.ics_secret)])
+
+
+def rotate_feed_secret(obj) -> None:
+    """Nouveau secret : l'ancien lien d'abonnement cesse de fonctionner."""
+    obj.ics_secret = new_feed_secret()
+    # post_save : nouvelle génération, le secret en cache est oublié
+    obj.save(update_fields=["ics_secret"])
+
+
+# =========================================================
+# Sessions du flux
+# =========================================================
+
+def feed_window(today: date | None = None) -> tuple[date, date]:
+    today = today or timezone.localdate()
+    past = getattr(settings, "ICS_FEED_PAST_DAYS", DEFAULT_PAST_DAYS)
+    future = getattr(settings, "ICS_FEED_FUTURE_DAYS", DEFAULT_FUTURE_DAYS)
+    return today - timedelta(days=past), today + timedelta(days=future)
+
+
+def feed_sessions(kind: str, obj_id: int, start: date, end: date):
+    """Sessions qui recoupent [start, end] ; pour un formateur : principal ou backup."""
+    qs = (
+        Session.objects
+        .select_related("training", "client", "trainer", "backup_trainer", "room")
+        .annotate(last_day=Coalesce("end_date", "start_date"))
+        .filter(start_date__isnull=False, start_date__lte=end, last_day__gte=start)
+    )
+    if kind == "trainer":
+        qs = qs.filter(Q(trainer_id=obj_id) | Q(backup_trainer_id=obj_id))
+    elif kind == "room":
+        qs = qs.filter(room_id=obj_id)
+    else:
+        qs = qs.filter(client_id=obj_id)
+    return qs.order_by("start_date", "id")
+
+
+# =========================================================
+# Rendu iCalendar (RFC 5545)
+# =========================================================
+
+def _escape(value) -> str:
+    text = str(value or "")
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Lignes de 75 octets max, suite précédée d'un espace."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        size = 75 if not parts else 74
+        # ne pas couper un caractère UTF-8 en deux
+        while size < len(encoded) and (encoded[size] & 0xC0) == 0x80:
+            size -= 1
+        parts.append(encoded[:size].decode("utf-8"))
+        encoded = encoded[size:]
+    return "\r\n ".join(parts)
+
+
+def _ics_date(d: date) -> str:
+    return d.strftime("%Y%m%d")
+
+
+def _ics_utc(dt: datetime) -> str:
+    return dt.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+_STATUS = {
+    SessionStatus.DRAFT: "TENTATIVE",
+    SessionStatus.CANCELED: "CANCELLED",
+}
+
+
+def _event_lines(session: Session, kind: str, obj_id: int, stamp: str) -> list[str]:
+    end = session.end_date or session.start_date
+    summary = f"{session.training.title} — {session.client.name}"
+    if kind == "trainer" and session.backup_trainer_id == obj_id and session.trainer_id != obj_id:
+        summary += " (backup)"
+    if session.status == SessionStatus.CANCELED:
+        summary = f"[Annulée] {summary}"
+
+    description = "\n".join([
+        f"Référence : {session.reference}",
+        f"Formation : {session.training.title}",
+        f"Client : {session.client.name}",
+        f"Formateur : {session.trainer}",
+        f"Backup : {session.backup_trainer or ''}",
+        f"Horaires : {session.invitation_schedule_full()}",
+    ])
+
+    return [
+        "BEGIN:VEVENT",
+        f"UID:session-{session.id}@argon-trainings",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{_ics_date(session.start_date)}",
+        # journée entière : DTEND exclusif
+        f"DTEND;VALUE=DATE:{_ics_date(end + timedelta(days=1))}",
+        f"SUMMARY:{_escape(summary)}",
+        f"LOCATION:{_escape(session.invitation_location_label())}",
+        f"DESCRIPTION:{_escape(description)}",
+        f"STATUS:{_STATUS.get(session.status, 'CONFIRMED')}",
+        "TRANSP:OPAQUE",
+        "END:VEVENT",
+    ]
+
+
+def render_ics(name: str, sessions, kind: str, obj_id: int, now: datetime | None = None) -> str:
+    stamp = _ics_utc(now or timezone.now())
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Argon//Trainings//FR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+        f"REFRESH-INTERVAL;VALUE=DURATION:{REFRESH_INTERVAL}",
+        f"X-PUBLISHED-TTL:{REFRESH_INTERVAL}",
+    ]
+    for session in sessions:
+        lines.extend(_event_lines(session, kind, obj_id, stamp))
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+# =========================================================
+# Flux en cache
+# =========================================================
+
+@dataclass
+class CalendarFeed:
+    body: str
+    etag: str
+    last_modified: datetime
+
+
+def _content_etag(body: str) -> str:
+    # DTSTAMP (date de génération) exclu : même contenu => même ETag
+    content = "\r\n".join(line for line in body.split("\r\n") if not line.startswith("DTSTAMP:"))
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+def _feed_name(kind: str, obj) -> str:
+    if kind == "trainer":
+        return f"Formations — {obj.first_name} {obj.last_name}".strip()
+    return f"Formations — {obj}"
+
+
+def build_feed(kind: str, obj_id: int, today: date | None = None) -> CalendarFeed | None:
+    """
+    Flux .ics d'un formateur / d'une salle / d'un client, ou None si l'objet
+    n'existe pas. Recalculé seulement quand une des données affichées change
+    (générations de trainings.services.dashboard_cache) ou que la fenêtre glisse.
+    """
+    start, end = feed_window(today)
+    model = FEED_MODELS[kind]
+
+    def builder():
+        obj = model.objects.filter(pk=obj_id).first()
+        if obj is None:
+            return None
+        now = timezone.now().replace(microsecond=0)
+        body = render_ics(_feed_name(kind, obj), feed_sessions(kind, obj_id, start, end), kind, obj_id, now)
+        etag = _content_etag(body)
+
+        # recalcul sans changement visible (autre session modifiée) : même Last-Modified
+        meta_key = f"ics_feed:meta:{kind}:{obj_id}"
+        previous = cache.get(meta_key)
+        last_modified = previous[1] if previous and previous[0] == etag else now
+        cache.set(meta_key, (etag, last_modified), None)
+        return CalendarFeed(body=body, etag=etag, last_modified=last_modified)
+
+    return cached_block(
+        "ics_feed",
+        builder,
+        depends_on=[Session, Trainer, Client, Room, Training],
+        key_parts=(kind, obj_id, start, end),
+    )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterable
+
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from trainings.models import Registration, RegistrationStatus, Session, SessionBillingMode
+from trainings.services.dashboard_cache import bump_generation
+
+
+# Une inscription annulée ne compte pas dans les participants prévus.
+ACTIVE_REGISTRATION_STATUSES = [
+    value for value in RegistrationStatus.values
+    if value != RegistrationStatus.CANCELED
+]
+
+
+def active_registrations_q(prefix: str = "") -> Q:
+    return Q(**{f"{prefix}status__in": ACTIVE_REGISTRATION_STATUSES})
+
+
+def present_registrations_q(prefix: str = "") -> Q:
+    return Q(**{f"{prefix}status": RegistrationStatus.PRESENT})
+
+
+DEFAULT_BATCH_SIZE = 500
+
+_state = threading.local()
+
+
+def _count_subquery(condition: Q) -> Coalesce:
+    subquery = (
+        Registration.objects
+        .filter(condition, session_id=OuterRef("pk"))
+        .order_by()
+        .values("session_id")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def session_counter_expressions() -> dict:
+    """
+    Expressions SQL des compteurs d'une session (sous-requêtes corrélées),
+    utilisables telles quelles dans un `Session.objects.update(...)`.
+    """
+    return {
+        "expected_participants": _count_subquery(active_registrations_q()),
+        "present_count": _count_subquery(present_registrations_q()),
+    }
+
+
+def compute_session_counters(session_id: int) -> tuple[int, int]:
+    """
+    Compteurs d'une session en une seule requête d'agrégat :
+    (participants prévus, présents).
+    """
+    totals = Registration.objects.filter(session_id=session_id).aggregate(
+        expected=Count("pk", filter=active_registrations_q()),
+        present=Count("pk", filter=present_registrations_q()),
+    )
+    return totals["expected"] or 0, totals["present"] or 0
+
+
+def refresh_session_counters(
+    session_ids: Iterable[int] | None = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Met à jour expected_participants / present_count via un UPDATE corrélé.
+    - session_ids=None : toutes les sessions en une seule requête
+    - sinon : un UPDATE par lot de `batch_size` sessions
+    Retourne le nombre de sessions mises à jour.
+    """
+    if session_ids is None:
+        updated = Session.objects.update(**session_counter_expressions())
+    else:
+        ids = sorted({sid for sid in session_ids if sid})
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            updated += Session.objects.filter(pk__in=chunk).update(**session_counter_expressions())
+
+    # UPDATE en masse : pas de post_save, on invalide les blocs de dashboards à la main
+    bump_generation(Session)
+    return updated
+
+
+def refresh_sessions(session_ids: Iterable[int], *, pricing_ids: Iterable[int] = ()) -> None:
+    """
+    Recalcul des sessions après un changement d'inscriptions :
+    - compteurs de `session_ids` : UPDATE corrélé (refresh_session_counters)
+    - montants de `pricing_ids` : seulement pour les sessions facturées par
+      participant (le montant d'une session collective ne dépend pas des inscriptions)
+    """
+    session_ids = sorted({sid for sid in session_ids if sid})
+    if session_ids:
+        refresh_session_counters(session_ids)
+
+    pricing_ids = sorted({sid for sid in pricing_ids if sid})
+    for start in range(0, len(pricing_ids), DEFAULT_BATCH_SIZE):
+        chunk = pricing_ids[start:start + DEFAULT_BATCH_SIZE]
+        sessions = (
+            Session.objects
+            .filter(pk__in=chunk)
+            .exclude(billing_mode=SessionBillingMode.COLLECTIVE)
+            .select_related("training", "client")
+        )
+        for session in sessions:
+            session.recalculate_prices(save=True, counters=False)
+
+
+# ---------------------------------------------------------------------------
+# Opérations de masse : un seul recalcul par session en sortie de bloc
+# ---------------------------------------------------------------------------
+
+def _pending() -> dict[int, bool] | None:
+    return getattr(_state, "pending", None)
+
+
+def defer_session_refresh(session_id: int | None, *, pricing: bool = True) -> bool:
+    """
+    Si un bloc `batched_session_refresh()` est ouvert, mémorise la session
+    à recalculer en sortie (compteurs, et montants si `pricing`) et retourne
+    True (l'appelant n'a rien à faire).
+    """
+    pending = _pending()
+    if pending is None:
+        return False
+    if session_id:
+        pending[session_id] = pending.get(session_id, False) or pricing
+    return True
+
+
+@contextmanager
+def batched_session_refresh():
+    """
+    Regroupe les recalculs de sessions déclenchés par Registration.save/delete :
+
+        with batched_session_refresh():
+            for row in rows:
+                Registration.objects.get_or_create(...)
+
+    En sortie, les compteurs de toutes les sessions touchées sont mis à jour
+    par lots d'UPDATE corrélés, et les montants recalculés une seule fois par
+    session, au lieu d'une fois par inscription.
+    Les blocs imbriqués sont absorbés par le bloc le plus externe.
+    """
+    if _pending() is not None:
+        yield
+        return
+
+    _state.pending = {}
+    try:
+        yield
+        pending = _state.pending
+    finally:
+        _state.pending = None
+
+    refresh_sessions(pending, pricing_ids=[sid for sid, pricing in pending.items() if pricing])
@@ -0,0 +1,99 @@
+# trainings/services/dashboard_cache.py
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+
+
+GENERATION_PREFIX = "dashboards:gen"
+BLOCK_PREFIX = "dashboards:block"
+DEFAULT_TIMEOUT = 60 * 60 * 6
+
+
+# =========================================================
+# Générations par modèle
+# =========================================================
+# Chaque modèle suivi a un compteur incrémenté à chaque save/delete
+# (voir trainings.signals). Un bloc de dashboard est rangé sous une clé
+# qui contient les générations des modèles dont il dépend : dès qu'un de
+# ces modèles change, la clé change et le bloc est recalculé.
+
+def _label(model: type[models.Model] | str) -> str:
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _generation_key(model) -> str:
+    return f"{GENERATION_PREFIX}:{_label(model)}"
+
+
+def _seed() -> int:
+    # valeur initiale croissante : si le compteur est évincé du cache,
+    # il ne retombe jamais sur une génération déjà utilisée
+    return time.time_ns()
+
+
+def generations(models_: Iterable) -> dict[str, int]:
+    """{label: génération} des modèles demandés, en un seul aller-retour cache."""
+    keys = {_generation_key(m): _label(m) for m in models_}
+    found = cache.get_many(keys.keys())
+
+    result = {}
+    for key, label in keys.items():
+        value = found.get(key)
+        if value is None:
+            cache.add(key, _seed(), None)
+            value = cache.get(key)
+        result[label] = value
+    return result
+
+
+def bump_generation(*models_) -> None:
+    for model in models_:
+        key = _generation_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _seed(), None)
+
+
+# =========================================================
+# Blocs en cache
+# =========================================================
+
+def _block_key(name: str, depends_on: Iterable, key_parts: Iterable) -> str:
+    gens = generations(depends_on)
+    versions = "-".join(f"{gens[label]}" for label in sorted(gens))
+    digest = hashlib.md5(repr(tuple(key_parts)).encode("utf-8")).hexdigest()
+    return f"{BLOCK_PREFIX}:{name}:{digest}:{hashlib.md5(versions.encode()).hexdigest()}"
+
+
+def cached_block(
+    name: str,
+    builder: Callable[[], object],
+    *,
+    depends_on: Iterable,
+    key_parts: Iterable = (),
+    timeout: int | None = None,
+):
+    """
+    Retourne le résultat de `builder()` mis en cache.
+
+    - depends_on : modèles (ou labels "app.model") dont dépend le bloc
+    - key_parts  : paramètres du bloc (filtres, date du jour...) ; doivent avoir un repr stable
+
+    Le résultat doit être picklable (dicts, listes, instances de modèles...) :
+    ne jamais renvoyer un QuerySet non évalué.
+    """
+    key = _block_key(name, depends_on, key_parts)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        if timeout is None:
+            timeout = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+        cache.set(key, value, timeout)
+    return value
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 from urllib.parse import quote_plus
@@ -21,6 +21,8 @@ class InvitationResult:
     folder_abs: str
     pdf_files: list[str]
     emails_file: str
+    # registration_id -> nom du PDF (pièce jointe de l'email de convocation)
+    pdf_by_registration: dict[int, str] = field(default_factory=dict)
 
 
 def _safe_filename(s: str) -> str:
@@ -132,6 +134,7 @@ def generate_invitations_for_session(*, session: Session, lang: str, base_url: s
     logo_url = base_url.rstrip("/") + static("trainings/logo-ArgonOS.png")
 
     pdf_files: list[str] = []
+    pdf_by_registration: dict[int, str] = {}
     today = date.today()
 
     for r in regs:
@@ -157,12 +160,14 @@ def generate_invitations_for_session(*, session: Session, lang: str, base_url: s
 
         pdfkit.from_string(html, pdf_path, configuration=config, options=options)
         pdf_files.append(pdf_name)
+        pdf_by_registration[r.id] = pdf_name
 
     return InvitationResult(
         folder_rel=folder_rel,
         folder_abs=folder_abs,
         pdf_files=pdf_files,
         emails_file=emails_filename,
+        pdf_by_registration=pdf_by_registration,
     )
 
 def generate_invitation_for_registration(*, registration: Registration, lang: str, base_url: str) -> str:
@@ -0,0 +1,376 @@
+# trainings/services/mailer.py
+from __future__ import annotations
+
+import os
+import smtplib
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection as db_connection, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from trainings.models import (
+    OutboundEmail,
+    OutboundEmailKind,
+    OutboundEmailStatus,
+    Registration,
+    Session,
+)
+from trainings.services.counters import active_registrations_q
+from trainings.services.invitations import InvitationResult, _location_address_only
+
+
+DEFAULT_BATCH_SIZE = 100
+# Office 365 (smtp.office365.com) : 30 messages / minute par boîte d'envoi
+DEFAULT_RATE_PER_MINUTE = 30
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BASE_SECONDS = 60
+MAX_RETRY_DELAY = timedelta(hours=6)
+# un email resté "SENDING" plus longtemps vient d'un envoi interrompu
+STALE_SENDING_AFTER = timedelta(minutes=15)
+
+SUBJECTS = {
+    (OutboundEmailKind.CONVOCATION, "fr"): "Convocation — {training} ({date})",
+    (OutboundEmailKind.CONVOCATION, "en"): "Invitation — {training} ({date})",
+    (OutboundEmailKind.REMINDER, "fr"): "Rappel — {training} ({date})",
+    (OutboundEmailKind.REMINDER, "en"): "Reminder — {training} ({date})",
+}
+
+# échecs définitifs : un nouvel essai ne changera rien
+PERMANENT_ERRORS = (FileNotFoundError, smtplib.SMTPRecipientsRefused)
+# connexion perdue en cours de lot : on en rouvre une pour la suite
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class EmailNotSent(Exception):
+    """send_messages() a renvoyé 0 (backend en fail_silently, refus non signalé) : échec temporaire."""
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+# =========================================================
+# Mise en file
+# =========================================================
+
+def enqueue_email(
+    *,
+    to: str,
+    subject: str,
+    body: str,
+    html_body: str = "",
+    kind: str = OutboundEmailKind.OTHER,
+    attachments: Iterable[str] = (),
+    session: Session | None = None,
+    registration: Registration | None = None,
+    from_email: str = "",
+) -> OutboundEmail:
+    """`attachments` : chemins relatifs à MEDIA_ROOT."""
+    return OutboundEmail.objects.create(
+        kind=kind,
+        to_email=to,
+        from_email=from_email,
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        attachments=list(attachments),
+        session=session,
+        registration=registration,
+    )
+
+
+def _lang(lang: str) -> str:
+    lang = (lang or "fr").lower().strip()
+    return lang if lang in ("fr", "en") else "fr"
+
+
+def _render(kind: str, lang: str, session: Session, participant) -> tuple[str, str]:
+    date_fmt = "%d/%m/%Y" if lang == "fr" else "%Y-%m-%d"
+    subject = SUBJECTS[(kind, lang)].format(
+        training=session.training,
+        date=session.start_date.strftime(date_fmt) if session.start_date else "—",
+    )
+    body = render_to_string(
+        f"trainings/emails/{kind.lower()}_{lang}.txt",
+        {
+            "session": session,
+            "participant": participant,
+            "location_address": _location_address_only(session),
+        },
+    )
+    return subject, body
+
+
+def _enqueue_for_registrations(
+    session: Session,
+    kind: str,
+    lang: str,
+    attachment_for: Callable[[Registration], str | None],
+    *,
+    resend: bool,
+) -> int:
+    """
+    Un email par inscription active ayant une adresse. Sans `resend`, les
+    inscriptions qui ont déjà un email de ce type en file ou envoyé sont ignorées.
+    """
+    regs = (
+        Registration.objects.select_related("participant")
+        .filter(active_registrations_q(), session=session)
+        .exclude(participant__email="")
+        .order_by("participant__last_name", "participant__first_name")
+    )
+    if not resend:
+        regs = regs.exclude(
+            outbound_emails__kind=kind,
+            outbound_emails__status__in=[
+                OutboundEmailStatus.PENDING,
+                OutboundEmailStatus.SENDING,
+                OutboundEmailStatus.SENT,
+            ],
+        )
+
+    emails = []
+    for r in regs:
+        subject, body = _render(kind, lang, session, r.participant)
+        attachment = attachment_for(r)
+        emails.append(OutboundEmail(
+            kind=kind,
+            to_email=r.participant.email.strip(),
+            subject=subject,
+            body=body,
+            attachments=[attachment] if attachment else [],
+            session=session,
+            registration=r,
+        ))
+    OutboundEmail.objects.bulk_create(emails)
+    return len(emails)
+
+
+def enqueue_session_convocations(
+    session: Session,
+    result: InvitationResult,
+    lang: str,
+    *,
+    resend: bool = False,
+) -> int:
+    """
+    Met en file les convocations d'une session, avec le PDF généré par
+    generate_invitations_for_session (`result`) en pièce jointe.
+    """
+    lang = _lang(lang)
+
+    def attachment_for(r: Registration) -> str | None:
+        pdf_name = result.pdf_by_registration.get(r.id)
+        return f"{result.folder_rel}/{pdf_name}" if pdf_name else None
+
+    return _enqueue_for_registrations(
+        session, OutboundEmailKind.CONVOCATION, lang, attachment_for, resend=resend,
+    )
+
+
+def enqueue_session_reminders(session: Session, lang: str | None = None, *, resend: bool = False) -> int:
+    """Rappel sans pièce jointe, dans la langue de la session par défaut."""
+    lang = _lang(lang or session.invitation_language_default())
+    return _enqueue_for_registrations(
+        session, OutboundEmailKind.REMINDER, lang, lambda r: None, resend=resend,
+    )
+
+
+# =========================================================
+# Envoi
+# =========================================================
+# Un lot = une connexion SMTP (une seule négociation TLS + login), sur
+# laquelle les messages partent un par un pour garder un statut par email.
+# Débit borné (EMAIL_QUEUE_RATE_PER_MINUTE) ; en cas d'échec temporaire,
+# nouvel essai plus tard avec un délai qui double à chaque tentative.
+
+@dataclass
+class DispatchResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    reconnections: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.retried + self.failed
+
+
+def retry_delay(attempts: int, base_seconds: int | None = None) -> timedelta:
+    base = base_seconds if base_seconds is not None else _setting(
+        "EMAIL_QUEUE_RETRY_BASE_SECONDS", DEFAULT_RETRY_BASE_SECONDS
+    )
+    delay = timedelta(seconds=base * 2 ** max(0, attempts - 1))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def due_emails(now=None):
+    now = now or timezone.now()
+    return OutboundEmail.objects.filter(
+        status=OutboundEmailStatus.PENDING,
+        next_attempt_at__lte=now,
+    )
+
+
+def release_stale(now=None) -> int:
+    """Remet en attente les emails bloqués en SENDING (process interrompu)."""
+    now = now or timezone.now()
+    return OutboundEmail.objects.filter(
+        status=OutboundEmailStatus.SENDING,
+        updated_at__lt=now - STALE_SENDING_AFTER,
+    ).update(status=OutboundEmailStatus.PENDING, updated_at=now)
+
+
+def claim_batch(limit: int, now=None) -> list[OutboundEmail]:
+    """
+    Réserve un lot (passage en SENDING) : deux envois lancés en même temps
+    ne prennent pas les mêmes emails. Seuls les emails passés en SENDING par
+    cet appel sont renvoyés.
+    """
+    now = now or timezone.now()
+    claim = {"status": OutboundEmailStatus.SENDING, "updated_at": now}
+    with transaction.atomic():
+        due = due_emails(now).order_by("next_attempt_at", "id")
+        if db_connection.features.has_select_for_update_skip_locked:
+            # lignes verrouillées par ce SELECT : personne d'autre ne peut les prendre
+            ids = list(due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+            OutboundEmail.objects.filter(id__in=ids).update(**claim)
+        else:
+            # sans SKIP LOCKED, un autre envoi a pu lire les mêmes ids :
+            # UPDATE conditionnel ligne par ligne, on ne garde que celles qu'on a prises
+            ids = [
+                pk for pk in due.values_list("id", flat=True)[:limit]
+                if OutboundEmail.objects.filter(pk=pk, status=OutboundEmailStatus.PENDING).update(**claim)
+            ]
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by("next_attempt_at", "id"))
+
+
+def build_message(email: OutboundEmail, connection=None) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or None,
+        to=[email.to_email],
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    for rel_path in email.attachments:
+        message.attach_file(os.path.join(str(settings.MEDIA_ROOT), rel_path))
+    return message
+
+
+def _mark_sent(email: OutboundEmail, now) -> None:
+    email.status = OutboundEmailStatus.SENT
+    email.attempts += 1
+    email.sent_at = now
+    email.last_error = ""
+    email.save(update_fields=["status", "attempts", "sent_at", "last_error", "updated_at"])
+
+
+def _mark_error(email: OutboundEmail, exc: Exception, now, *, max_attempts: int, permanent: bool) -> bool:
+    """True si l'email sera retenté."""
+    email.attempts += 1
+    email.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+    retry = not permanent and email.attempts < max_attempts
+    if retry:
+        email.status = OutboundEmailStatus.PENDING
+        email.next_attempt_at = now + retry_delay(email.attempts)
+    else:
+        email.status = OutboundEmailStatus.FAILED
+    email.save(update_fields=["status", "attempts", "last_error", "next_attempt_at", "updated_at"])
+    return retry
+
+
+def dispatch_pending(
+    *,
+    batch_size: int | None = None,
+    rate_per_minute: float | None = None,
+    max_attempts: int | None = None,
+    connection=None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> DispatchResult:
+    """
+    Envoie un lot d'emails dus sur une seule connexion (backend EMAIL_BACKEND
+    par défaut : SMTP en production, locmem en test).
+    """
+    batch_size = batch_size or _setting("EMAIL_QUEUE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    if rate_per_minute is None:
+        rate_per_minute = _setting("EMAIL_QUEUE_RATE_PER_MINUTE", DEFAULT_RATE_PER_MINUTE)
+    max_attempts = max_attempts or _setting("EMAIL_QUEUE_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+    interval = 60.0 / rate_per_minute if rate_per_minute else 0.0
+    if interval:
+        # un lot doit se terminer bien avant STALE_SENDING_AFTER, sinon
+        # release_stale le rendrait à un autre envoi (double envoi)
+        batch_size = max(1, min(batch_size, int(STALE_SENDING_AFTER.total_seconds() / 2 / interval)))
+
+    result = DispatchResult()
+    release_stale()
+    emails = claim_batch(batch_size)
+    if not emails:
+        return result
+
+    connection = connection or get_connection(fail_silently=False)
+
+    def give_back(remaining, exc):
+        for email in remaining:
+            if _mark_error(email, exc, timezone.now(), max_attempts=max_attempts, permanent=False):
+                result.retried += 1
+            else:
+                result.failed += 1
+
+    try:
+        connection.open()
+    except Exception as exc:
+        # serveur injoignable : tout le lot repart en attente
+        give_back(emails, exc)
+        return result
+
+    try:
+        last_sent_at = None
+        touched_at = time.monotonic()
+        for position, email in enumerate(emails):
+            # SMTP lent : le reste du lot reste marqué comme en cours d'envoi
+            if time.monotonic() - touched_at > STALE_SENDING_AFTER.total_seconds() / 3:
+                OutboundEmail.objects.filter(
+                    id__in=[e.id for e in emails[position:]], status=OutboundEmailStatus.SENDING,
+                ).update(updated_at=timezone.now())
+                touched_at = time.monotonic()
+            if interval and last_sent_at is not None:
+                wait = interval - (time.monotonic() - last_sent_at)
+                if wait > 0:
+                    sleep(wait)
+            last_sent_at = time.monotonic()
+
+            try:
+                if not connection.send_messages([build_message(email, connection)]):
+                    raise EmailNotSent("Le backend email n'a envoyé aucun message.")
+            except PERMANENT_ERRORS as exc:
+                _mark_error(email, exc, timezone.now(), max_attempts=max_attempts, permanent=True)
+                result.failed += 1
+            except Exception as exc:
+                if _mark_error(email, exc, timezone.now(), max_attempts=max_attempts, permanent=False):
+                    result.retried += 1
+                else:
+                    result.failed += 1
+                if isinstance(exc, CONNECTION_ERRORS):
+                    connection.close()
+                    try:
+                        connection.open()
+                    except Exception as reconnect_exc:
+                        # serveur perdu : le reste du lot repart en attente tout de suite
+                        give_back(emails[position + 1:], reconnect_exc)
+                        return result
+                    result.reconnections += 1
+            else:
+                _mark_sent(email, timezone.now())
+                result.sent += 1
+    finally:
+        connection.close()
+    return result
@@ -0,0 +1,237 @@
+# trainings/services/prerequisites.py
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Iterable
+
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from trainings.models import (
+    Participant,
+    ParticipantCompletion,
+    Registration,
+    RegistrationStatus,
+    Session,
+    Training,
+)
+
+
+# =========================================================
+# Historique des formations suivies
+# =========================================================
+
+def refresh_completion(participant_id: int, training_id: int) -> None:
+    """
+    Recalcule la formation suivie (participant, formation) à partir des
+    inscriptions PRESENT : première session suivie, ou suppression s'il n'y en a plus.
+    """
+    first = (
+        Registration.objects
+        .filter(
+            participant_id=participant_id,
+            session__training_id=training_id,
+            status=RegistrationStatus.PRESENT,
+        )
+        .order_by("session__start_date", "pk")
+        .values("session_id", "session__start_date", "session__end_date")
+        .first()
+    )
+
+    if not first:
+        ParticipantCompletion.objects.filter(
+            participant_id=participant_id,
+            training_id=training_id,
+        ).delete()
+        return
+
+    completed_on = first["session__end_date"] or first["session__start_date"] or timezone.localdate()
+    ParticipantCompletion.objects.update_or_create(
+        participant_id=participant_id,
+        training_id=training_id,
+        defaults={"session_id": first["session_id"], "completed_on": completed_on},
+    )
+
+
+def sync_registration_completion(registration: Registration, *, previous: dict | None = None) -> None:
+    """
+    À appeler après l'enregistrement d'une inscription.
+    `previous` : valeurs connues en base avant le save (participant, session, status),
+    None pour une création.
+    """
+    previous = previous or {}
+    is_present = registration.status == RegistrationStatus.PRESENT
+    was_present = previous.get("status") == RegistrationStatus.PRESENT
+
+    if not (is_present or was_present):
+        return
+
+    pairs = set()
+    if registration.session_id and registration.participant_id:
+        pairs.add((registration.participant_id, registration.session.training_id))
+
+    old_session_id = previous.get("session")
+    old_participant_id = previous.get("participant")
+    if was_present and old_session_id and old_participant_id:
+        if old_session_id == registration.session_id:
+            old_training_id = registration.session.training_id
+        else:
+            old_training_id = (
+                Session.objects.filter(pk=old_session_id)
+                .values_list("training_id", flat=True)
+                .first()
+            )
+        if old_training_id:
+            pairs.add((old_participant_id, old_training_id))
+
+    for participant_id, training_id in pairs:
+        refresh_completion(participant_id, training_id)
+
+
+# =========================================================
+# Contrôle des pré-requis
+# =========================================================
+
+@dataclass
+class EligibilityResult:
+    email: str
+    participant_id: int | None
+    ok: bool
+    message: str
+    missing: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class PrerequisiteRule:
+    """Pré-requis d'une formation : toutes les formations, ou une seule (`any_of`)."""
+    trainings: dict[int, str] = field(default_factory=dict)
+    any_of: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.trainings)
+
+    @property
+    def titles(self) -> list[str]:
+        return sorted(self.trainings.values())
+
+    @property
+    def label(self) -> str:
+        return (" ou " if self.any_of else ", ").join(self.titles)
+
+    def missing(self, done_ids: set[int]) -> list[str]:
+        """Titres manquants ; « A ou B » en un seul élément pour un pré-requis au choix."""
+        if self.any_of:
+            return [] if done_ids & self.trainings.keys() else [self.label]
+        return [title for tid, title in sorted(self.trainings.items(), key=lambda item: item[1]) if tid not in done_ids]
+
+
+def training_prerequisites(training_id: int | None) -> dict[int, str]:
+    """{id: titre} des formations pré-requises."""
+    return prerequisite_rule(training_id).trainings
+
+
+def prerequisite_rule(training_id: int | None) -> PrerequisiteRule:
+    """Pré-requis de la formation et règle (toutes / une seule), en une requête."""
+    if not training_id:
+        return PrerequisiteRule()
+    rows = list(
+        Training.prerequisites.through.objects
+        .filter(from_training_id=training_id)
+        .values_list("to_training_id", "to_training__title", "from_training__prerequisites_any")
+    )
+    return PrerequisiteRule(
+        trainings={tid: title for tid, title, _ in rows},
+        any_of=bool(rows) and rows[0][2],
+    )
+
+
+def missing_prerequisites(
+    training_id: int | None,
+    participant_ids: Iterable[int],
+    *,
+    rule: PrerequisiteRule | None = None,
+) -> dict[int, list[str]]:
+    """
+    Pour chaque participant : titres des pré-requis non suivis (liste vide si éligible).
+    Une requête pour les pré-requis (si non fournis) + une pour les formations suivies.
+    """
+    participant_ids = {pid for pid in participant_ids if pid}
+    if rule is None:
+        rule = prerequisite_rule(training_id)
+
+    if not rule or not participant_ids:
+        return {pid: [] for pid in participant_ids}
+
+    done = {}
+    for participant_id, done_training_id in (
+        ParticipantCompletion.objects
+        .filter(participant_id__in=participant_ids, training_id__in=rule.trainings.keys())
+        .values_list("participant_id", "training_id")
+    ):
+        done.setdefault(participant_id, set()).add(done_training_id)
+
+    return {pid: rule.missing(done.get(pid, set())) for pid in participant_ids}
+
+
+def check_eligibility(session: Session, emails: Iterable[str]) -> list[EligibilityResult]:
+    """
+    Vérifie les pré-requis d'une liste d'emails pour une session, en 3 requêtes
+    quel que soit le nombre d'emails. L'ordre (et les doublons) de `emails` est conservé.
+    """
+    emails = [(e or "").strip() for e in emails]
+    rule = prerequisite_rule(session.training_id)
+
+    if not rule:
+        return [
+            EligibilityResult(email=e, participant_id=None, ok=True, message="Pré-requis non applicable.")
+            for e in emails
+        ]
+
+    wanted = {e.lower() for e in emails if e}
+    participants = {}
+    for pid, email_lower in (
+        Participant.objects
+        .annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=wanted)
+        .order_by("id")
+        .values_list("id", "email_lower")
+    ):
+        participants.setdefault(email_lower, pid)
+
+    missing_by_participant = missing_prerequisites(
+        session.training_id,
+        participants.values(),
+        rule=rule,
+    )
+
+    training_title = session.training.title if session.training_id else ""
+    results = []
+    for email in emails:
+        if not email:
+            results.append(EligibilityResult(
+                email=email, participant_id=None, ok=False,
+                message="Email requis pour vérifier le pré-requis.",
+            ))
+            continue
+
+        pid = participants.get(email.lower())
+        if not pid:
+            results.append(EligibilityResult(
+                email=email, participant_id=None, ok=False,
+                message="Participant inconnu : crée-le d'abord.",
+            ))
+            continue
+
+        missing = missing_by_participant.get(pid, [])
+        if missing:
+            message = f"⛔ Pré-requis non validé : {', '.join(missing)} requis avant {training_title}."
+        else:
+            message = f"✅ Pré-requis validé : {rule.label} déjà suivi."
+        results.append(EligibilityResult(
+            email=email, participant_id=pid, ok=not missing, message=message, missing=missing,
+        ))
+
+    return results
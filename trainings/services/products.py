@@ -0,0 +1,42 @@
+# trainings/services/products.py
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from trainings.models import Session, Training, TrainingType
+from trainings.services.dashboard_cache import bump_generation
+
+
+def session_product_expression() -> Coalesce:
+    """
+    Produit d'une session en SQL : celui de son type, sinon celui du type
+    de sa formation (même règle que Session.compute_product).
+    """
+    own = Subquery(
+        TrainingType.objects.filter(pk=OuterRef("training_type_id")).values("product")[:1]
+    )
+    via_training = Subquery(
+        Training.objects.filter(pk=OuterRef("training_id")).values("training_type__product")[:1]
+    )
+    return Coalesce(NullIf(own, Value("")), via_training, Value(""))
+
+
+def refresh_session_products(training_type_ids: Iterable[int] | None = None) -> int:
+    """
+    Recopie le produit sur les sessions en un seul UPDATE :
+    - training_type_ids=None : toutes les sessions
+    - sinon : les sessions de ces types (directement ou via leur formation)
+    """
+    qs = Session.objects.all()
+    if training_type_ids is not None:
+        ids = list(training_type_ids)
+        qs = qs.filter(Q(training_type_id__in=ids) | Q(training__training_type_id__in=ids))
+
+    updated = qs.update(product=session_product_expression())
+
+    # UPDATE en masse : pas de post_save, on invalide les blocs de dashboards à la main
+    bump_generation(Session)
+    return updated
@@ -0,0 +1,648 @@
+# trainings/services/synthetic_data.py
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from argonteam.models import (
+    ArgonosModule,
+    ObjectiveStatus,
+    OneToOneMeeting,
+    OneToOneObjective,
+    TrainerModuleMastery,
+    monday_of_week,
+)
+from projects.models import Project, ProjectCategory, ProjectStep, Task, TaskAssignment
+from projects.services.task_counters import refresh_project_counters
+from projects.services.task_ranking import RANK_STEP
+from trainer_eval.models import (
+    ContributionKind,
+    EvaluationCriterion,
+    EvaluationRubric,
+    EvaluationScore,
+    InternalEvaluation,
+    StrategicContribution,
+    rubric_decision,
+    rubric_score_100,
+)
+from trainings.models import (
+    Client,
+    MercureContract,
+    MercureContractStatus,
+    MercureInvoice,
+    MercureInvoiceStatus,
+    Participant,
+    ParticipantCompletion,
+    PartnerContract,
+    PartnerContractPlan,
+    Product,
+    Registration,
+    RegistrationBillingRate,
+    RegistrationStatus,
+    Room,
+    Session,
+    SessionBillingMode,
+    SessionLanguage,
+    SessionStatus,
+    Trainer,
+    TrainerAbsence,
+    TrainerAbsenceType,
+    TrainerWorkloadEntry,
+    TrainerWorkloadEntryStatus,
+    TrainerWorkloadType,
+    Training,
+    TrainingType,
+)
+from trainings.services.counters import ACTIVE_REGISTRATION_STATUSES
+from trainings.services.dashboard_cache import bump_generation
+
+
+CHUNK_SIZE = 2000
+
+# sessions générées par lot (sessions + inscriptions du lot insérées ensemble)
+SESSION_CHUNK = 1000
+
+
+# =========================================================
+# Volumes
+# =========================================================
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    clients: int
+    partners: int
+    trainers: int
+    trainings: int
+    sessions: int
+    participants: int
+    registrations_per_session: int
+    projects: int
+    tasks_per_project: int
+    modules: int
+
+
+SCALES = {
+    "small": SyntheticScale(
+        clients=40, partners=8, trainers=12, trainings=25, sessions=1_000,
+        participants=4_000, registrations_per_session=6, projects=15, tasks_per_project=15, modules=20,
+    ),
+    "medium": SyntheticScale(
+        clients=200, partners=25, trainers=35, trainings=70, sessions=5_000,
+        participants=25_000, registrations_per_session=10, projects=60, tasks_per_project=25, modules=40,
+    ),
+    "large": SyntheticScale(
+        clients=600, partners=60, trainers=80, trainings=150, sessions=10_000,
+        participants=60_000, registrations_per_session=10, projects=150, tasks_per_project=30, modules=60,
+    ),
+}
+
+
+@dataclass
+class SyntheticResult:
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def add(self, label: str, n: int) -> None:
+        self.counts[label] = self.counts.get(label, 0) + n
+
+
+FIRST_NAMES = [
+    "Camille", "Lucas", "Léa", "Hugo", "Chloé", "Louis", "Manon", "Jules", "Emma", "Arthur",
+    "Inès", "Nathan", "Sarah", "Théo", "Julie", "Paul", "Clara", "Adam", "Alice", "Tom",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau",
+    "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier",
+]
+SERVICES = ["Direction", "Enquêtes", "Analyse", "Renseignement", "SI", "Support", "Formation"]
+
+
+def _name(rng: random.Random) -> tuple[str, str]:
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def _bulk(model, objs, result: SyntheticResult, label: str | None = None) -> list:
+    created = model.objects.bulk_create(objs, batch_size=CHUNK_SIZE)
+    result.add(label or model._meta.verbose_name_plural, len(created))
+    return created
+
+
+# =========================================================
+# Référentiels
+# =========================================================
+
+def _clients(rng, scale, result):
+    clients = [
+        Client(name=f"Client {i:04d}", country=rng.choice(["France", "France", "France", "Belgique", "Suisse"]))
+        for i in range(1, scale.clients + 1)
+    ]
+    clients += [
+        Client(name=f"Partenaire {i:03d}", is_partner=True, country="France")
+        for i in range(1, scale.partners + 1)
+    ]
+    clients = _bulk(Client, clients, result, "clients")
+
+    plans = {}
+    for name, label, price in (
+        (PartnerContractPlan.PLAN_SILVER, "Silver", Decimal("5000.00")),
+        (PartnerContractPlan.PLAN_GOLD, "Gold", Decimal("12000.00")),
+        (PartnerContractPlan.PLAN_PLATINUM, "Platinum", Decimal("25000.00")),
+    ):
+        plans[name], _ = PartnerContractPlan.objects.get_or_create(
+            name=name, defaults={"label": label, "price_ht": price}
+        )
+
+    contracts = []
+    for partner in (c for c in clients if c.is_partner):
+        plan = plans[rng.choice(list(plans))]
+        start = date(2024, rng.randint(1, 12), 1)
+        contracts.append(PartnerContract(
+            partner=partner,
+            plan=plan,
+            start_date=start,
+            end_date=start + timedelta(days=365 * rng.randint(1, 3)),
+            price_ht_snapshot=plan.price_ht,
+        ))
+    _bulk(PartnerContract, contracts, result, "partner contracts")
+    return clients
+
+
+def _catalog(rng, scale, result):
+    types = _bulk(TrainingType, [
+        TrainingType(name="Formation ArgonOS", product=Product.ARGONOS),
+        TrainingType(name="Formation Mercure", product=Product.MERCURE),
+    ], result, "training types")
+
+    trainings = []
+    for i in range(1, scale.trainings + 1):
+        training_type = types[0] if i % 3 else types[1]
+        session_price = Decimal(rng.randrange(1500, 6000, 100))
+        trainings.append(Training(
+            title=f"{training_type.get_product_display()} — Module {i:03d}",
+            training_type=training_type,
+            default_days=Decimal(rng.choice([1, 2, 3, 5])),
+            capacity=rng.choice([8, 10, 12]),
+            session_price_ht=session_price,
+            participant_price_ht=(session_price / 8).quantize(Decimal("1")),
+            partner_session_price_ht=(session_price * Decimal("0.8")).quantize(Decimal("1")),
+            partner_participant_price_ht=(session_price / 10).quantize(Decimal("1")),
+        ))
+    trainings = _bulk(Training, trainings, result, "trainings")
+
+    rooms = _bulk(Room, [Room(name=f"Salle {i}", location="Siège") for i in range(1, 6)], result, "rooms")
+    return trainings, rooms
+
+
+def _trainers(rng, scale, anchor, result):
+    trainers = []
+    for i in range(1, scale.trainers + 1):
+        first, last = _name(rng)
+        product = Trainer.PRODUCT_MERCURE if i % 4 == 0 else Trainer.PRODUCT_ARGONOS
+        trainers.append(Trainer(
+            first_name=first,
+            last_name=f"{last} {i:03d}",
+            product=product,
+            platform=product,
+            email=f"trainer{i:03d}@example.com",
+            workload_percent=Decimal(rng.choice([100, 100, 100, 80, 50])),
+        ))
+    trainers = _bulk(Trainer, trainers, result, "trainers")
+
+    absences, entries = [], []
+    for trainer in trainers:
+        for _ in range(rng.randint(2, 6)):
+            start = anchor + timedelta(days=rng.randint(-365, 180))
+            days = rng.randint(1, 5)
+            absences.append(TrainerAbsence(
+                trainer=trainer,
+                absence_type=rng.choice(TrainerAbsenceType.values),
+                start_date=start,
+                end_date=start + timedelta(days=days - 1),
+                days_count=Decimal(days),
+            ))
+        for _ in range(rng.randint(3, 10)):
+            start = anchor + timedelta(days=rng.randint(-365, 180))
+            days = rng.randint(1, 4)
+            entries.append(TrainerWorkloadEntry(
+                trainer=trainer,
+                workload_type=rng.choice(TrainerWorkloadType.values),
+                title=rng.choice(["Préparation support", "Veille produit", "Recette", "Salon", "Mise à jour démo"]),
+                start_date=start,
+                end_date=start + timedelta(days=days - 1),
+                days_count=Decimal(days),
+                status=rng.choice(TrainerWorkloadEntryStatus.values),
+            ))
+    _bulk(TrainerAbsence, absences, result, "trainer absences")
+    _bulk(TrainerWorkloadEntry, entries, result, "trainer workload entries")
+    return trainers
+
+
+def _participants(rng, scale, clients, result):
+    participants = []
+    for i in range(1, scale.participants + 1):
+        first, last = _name(rng)
+        participants.append(Participant(
+            client=clients[i % len(clients)],
+            first_name=first,
+            last_name=last,
+            email=f"participant{i:06d}@example.com",
+            company_service=rng.choice(SERVICES),
+        ))
+    participants = _bulk(Participant, participants, result, "participants")
+
+    by_client = {}
+    for p in participants:
+        by_client.setdefault(p.client_id, []).append(p)
+    return by_client
+
+
+# =========================================================
+# Sessions, inscriptions, Mercure
+# =========================================================
+
+def _session_status(rng, start: date, anchor: date) -> str:
+    if rng.random() < 0.04:
+        return SessionStatus.CANCELED
+    if start < anchor - timedelta(days=7):
+        return SessionStatus.CLOSED
+    if start <= anchor:
+        return SessionStatus.IN_PROGRESS
+    if start <= anchor + timedelta(days=60):
+        return rng.choice([SessionStatus.CONFIRMED, SessionStatus.PLANNED])
+    return rng.choice([SessionStatus.PLANNED, SessionStatus.DRAFT])
+
+
+def _registration_status(rng, session_status: str) -> str:
+    if rng.random() < 0.05:
+        return RegistrationStatus.CANCELED
+    if session_status in (SessionStatus.CLOSED, SessionStatus.IN_PROGRESS):
+        return RegistrationStatus.PRESENT if rng.random() < 0.9 else RegistrationStatus.ABSENT
+    return rng.choice([RegistrationStatus.INVITED, RegistrationStatus.REGISTERED, RegistrationStatus.CONFIRMED])
+
+
+def _sessions(rng, scale, anchor, clients, trainings, rooms, trainers, participants_by_client, result):
+    """
+    Sessions par lots : pour chaque lot, les inscriptions sont tirées d'abord
+    (prix et compteurs calculés comme Session.save / Registration.save),
+    puis sessions et inscriptions sont insérées en bulk_create.
+    """
+    trainers_by_product = {
+        Product.ARGONOS: [t for t in trainers if t.product == Trainer.PRODUCT_ARGONOS],
+        Product.MERCURE: [t for t in trainers if t.product == Trainer.PRODUCT_MERCURE] or trainers,
+    }
+    completions = {}
+    first_day = anchor - timedelta(days=730)
+
+    for offset in range(0, scale.sessions, SESSION_CHUNK):
+        sessions, plans = [], []
+
+        for i in range(offset + 1, min(offset + SESSION_CHUNK, scale.sessions) + 1):
+            training = rng.choice(trainings)
+            client = rng.choice(clients)
+            product = training.training_type.product
+            start = first_day + timedelta(days=rng.randint(0, 910))
+            days = training.default_days
+            status = _session_status(rng, start, anchor)
+            billing_mode = SessionBillingMode.INDIVIDUAL if rng.random() < 0.3 else SessionBillingMode.COLLECTIVE
+            is_partner = client.is_partner
+            trainer = rng.choice(trainers_by_product[product])
+            backup = rng.choice(trainers) if rng.random() < 0.25 else None
+
+            session = Session(
+                reference=f"S{start:%y%m}-{i:05d}",
+                training_type=training.training_type,
+                training=training,
+                product=product,
+                client=client,
+                trainer=trainer,
+                backup_trainer=backup if backup and backup.pk != trainer.pk else None,
+                room=rng.choice(rooms) if rng.random() < 0.5 else None,
+                start_date=start,
+                end_date=start + timedelta(days=max(int(days) - 1, 0)),
+                days_count=days,
+                status=status,
+                language=SessionLanguage.EN if rng.random() < 0.1 else SessionLanguage.FR,
+                billing_mode=billing_mode,
+                applied_session_price_ht=training.get_session_price_ht(is_partner=is_partner),
+                applied_participant_price_ht=training.get_participant_price_ht(is_partner=is_partner),
+                convocations_sent_at=start - timedelta(days=16),
+                client_satisfaction=(
+                    Decimal(rng.randint(22, 40)) / 2
+                    if status == SessionStatus.CLOSED and rng.random() < 0.7 else None
+                ),
+            )
+
+            pool = participants_by_client.get(client.pk, [])
+            k = min(len(pool), max(1, int(rng.gauss(scale.registrations_per_session, 2))))
+            plan = [(p, _registration_status(rng, status), rng.random() < 0.03) for p in rng.sample(pool, k)]
+
+            billed = []
+            for participant, reg_status, is_free in plan:
+                rate = RegistrationBillingRate.FULL
+                if reg_status == RegistrationStatus.CANCELED:
+                    rate = rng.choice(RegistrationBillingRate.values)
+                unit = session.applied_participant_price_ht
+                amount = Decimal("0.00")
+                if billing_mode == SessionBillingMode.INDIVIDUAL and not is_free:
+                    amount = (unit * Decimal(rate) / Decimal("100")).quantize(Decimal("0.01"))
+                billed.append((rate, unit, amount))
+
+            if billing_mode == SessionBillingMode.COLLECTIVE:
+                session.training_price_ht = session.applied_session_price_ht
+            else:
+                session.training_price_ht = sum((a for _, _, a in billed), Decimal("0.00"))
+            session.price_ht = session.training_price_ht + session.travel_fee_ht
+            session.expected_participants = sum(1 for _, s, _ in plan if s in ACTIVE_REGISTRATION_STATUSES)
+            session.present_count = sum(1 for _, s, _ in plan if s == RegistrationStatus.PRESENT)
+
+            sessions.append(session)
+            plans.append((plan, billed))
+
+        sessions = _bulk(Session, sessions, result, "sessions")
+
+        registrations = []
+        for session, (plan, billed) in zip(sessions, plans):
+            for (participant, reg_status, is_free), (rate, unit, amount) in zip(plan, billed):
+                registrations.append(Registration(
+                    session=session,
+                    participant=participant,
+                    status=reg_status,
+                    is_free=is_free,
+                    canceled_at=session.start_date - timedelta(days=20) if reg_status == RegistrationStatus.CANCELED else None,
+                    billing_rate_percent=rate,
+                    applied_unit_price_ht=unit,
+                    billed_amount_ht=amount,
+                ))
+                if reg_status == RegistrationStatus.PRESENT:
+                    key = (participant.pk, session.training_id)
+                    if key not in completions or session.start_date < completions[key][1]:
+                        completions[key] = (session.pk, session.start_date, session.end_date)
+        _bulk(Registration, registrations, result, "registrations")
+
+        _mercure(rng, anchor, [s for s in sessions if s.product == Product.MERCURE], result)
+
+    _bulk(ParticipantCompletion, [
+        ParticipantCompletion(
+            participant_id=participant_id,
+            training_id=training_id,
+            session_id=session_id,
+            completed_on=end or start,
+        )
+        for (participant_id, training_id), (session_id, start, end) in completions.items()
+    ], result, "participant completions")
+
+
+def _mercure(rng, anchor, sessions, result):
+    contracts, invoices = [], []
+    for session in sessions:
+        if session.status == SessionStatus.CANCELED:
+            continue
+        past = session.start_date < anchor
+        contracts.append(MercureContract(
+            session=session,
+            trainer_id=session.trainer_id,
+            reference=session.reference,
+            status=MercureContractStatus.SIGNED if past else rng.choice(MercureContractStatus.values[:3]),
+            sent_date=session.start_date - timedelta(days=35) if past else None,
+            signed_date=session.start_date - timedelta(days=25) if past else None,
+        ))
+        if session.status == SessionStatus.CLOSED:
+            received = session.end_date + timedelta(days=rng.randint(2, 20))
+            paid = received < anchor - timedelta(days=45) and rng.random() < 0.9
+            invoices.append(MercureInvoice(
+                session=session,
+                trainer_id=session.trainer_id,
+                reference=f"F-{session.reference}",
+                amount_ht=(session.days_count * Decimal(rng.randrange(500, 900, 50))).quantize(Decimal("0.01")),
+                received_date=received,
+                paid_date=received + timedelta(days=rng.randint(20, 40)) if paid else None,
+                status=MercureInvoiceStatus.PAID if paid else rng.choice(MercureInvoiceStatus.values[:4]),
+            ))
+    _bulk(MercureContract, contracts, result, "mercure contracts")
+    _bulk(MercureInvoice, invoices, result, "mercure invoices")
+
+
+# =========================================================
+# Projets
+# =========================================================
+
+def _projects(rng, scale, anchor, trainers, result):
+    categories = []
+    for name in ("Contenu", "Produit", "Interne", "Client"):
+        category, _ = ProjectCategory.objects.get_or_create(name=name)
+        categories.append(category)
+
+    projects = _bulk(Project, [
+        Project(
+            name=f"Projet {i:04d}",
+            category=rng.choice(categories),
+            status=rng.choice([Project.Status.TODO, Project.Status.DOING, Project.Status.DOING, Project.Status.DONE]),
+            target_date=anchor + timedelta(days=rng.randint(-90, 270)),
+            estimated_days=Decimal(rng.randint(5, 60)),
+        )
+        for i in range(1, scale.projects + 1)
+    ], result, "projects")
+
+    steps, tasks = [], []
+    for project in projects:
+        for order, title in enumerate(("Cadrage", "Réalisation", "Recette", "Livraison"), start=1):
+            steps.append(ProjectStep(project=project, title=title, order=order))
+        ranks = {}
+        for n in range(1, scale.tasks_per_project + 1):
+            status = rng.choice(Task.Status.values)
+            ranks[status] = ranks.get(status, 0) + RANK_STEP
+            tasks.append(Task(
+                project=project,
+                title=f"Tâche {n:03d}",
+                status=status,
+                order=ranks[status],
+                priority=rng.choice([1, 2, 2, 3]),
+                due_date=anchor + timedelta(days=rng.randint(-60, 120)),
+                estimated_days=Decimal(rng.randint(1, 8)),
+            ))
+    _bulk(ProjectStep, steps, result, "project steps")
+    tasks = _bulk(Task, tasks, result, "tasks")
+
+    assignments = []
+    for task in tasks:
+        if rng.random() < 0.6:
+            start = anchor + timedelta(days=rng.randint(-90, 90))
+            assignments.append(TaskAssignment(
+                task=task,
+                trainer=rng.choice(trainers),
+                planned_days=Decimal(rng.randint(1, 5)),
+                start_date=start,
+                end_date=start + timedelta(days=rng.randint(2, 20)),
+                status=rng.choice(TaskAssignment.Status.values),
+            ))
+    _bulk(TaskAssignment, assignments, result, "task assignments")
+
+    # bulk_create ne passe pas par Task.save : compteurs recalculés en un UPDATE
+    refresh_project_counters([p.pk for p in projects])
+
+
+# =========================================================
+# ArgonTeam / évaluations
+# =========================================================
+
+def _argonteam(rng, scale, anchor, trainers, result):
+    modules = _bulk(ArgonosModule, [
+        ArgonosModule(
+            name=f"Module ArgonOS {i:03d}",
+            kind=rng.choice([ArgonosModule.KIND_TECH, ArgonosModule.KIND_FUNC]),
+            level=rng.choice([ArgonosModule.LEVEL_1, ArgonosModule.LEVEL_2, ArgonosModule.LEVEL_3]),
+            major_version=rng.randint(1, 4),
+        )
+        for i in range(1, scale.modules + 1)
+    ], result, "modules")
+
+    masteries, meetings = [], []
+    for trainer in trainers:
+        for module in rng.sample(modules, k=min(len(modules), rng.randint(3, 15))):
+            masteries.append(TrainerModuleMastery(
+                trainer=trainer,
+                module=module,
+                auto_level=rng.choice([c[0] for c in TrainerModuleMastery.AUTO_CHOICES]),
+                manager_status=rng.choice([c[0] for c in TrainerModuleMastery.STATUS_CHOICES]),
+                cert_status=rng.choice([c[0] for c in TrainerModuleMastery.STATUS_CHOICES]),
+            ))
+        week = monday_of_week(anchor)
+        for n in range(rng.randint(4, 12)):
+            meetings.append(OneToOneMeeting(trainer=trainer, week_start=week - timedelta(weeks=n * 2)))
+    _bulk(TrainerModuleMastery, masteries, result, "module masteries")
+    meetings = _bulk(OneToOneMeeting, meetings, result, "1to1 meetings")
+
+    objectives = []
+    for meeting in meetings:
+        for n in range(rng.randint(0, 3)):
+            objectives.append(OneToOneObjective(
+                trainer_id=meeting.trainer_id,
+                meeting=meeting,
+                title=f"Objectif {n + 1} — semaine du {meeting.week_start:%d/%m}",
+                due_date=meeting.week_start + timedelta(days=rng.randint(7, 60)),
+                status=rng.choice(ObjectiveStatus.values),
+            ))
+    _bulk(OneToOneObjective, objectives, result, "1to1 objectives")
+
+
+def _rubrics(trainings, result):
+    """Une grille par formation : 6 critères notés sur 5, deux pondérés x2."""
+    rubrics = _bulk(EvaluationRubric, [
+        EvaluationRubric(training=t, version_label="2026.1", title="Grille standard")
+        for t in trainings
+    ], result, "evaluation rubrics")
+
+    sections = list(EvaluationCriterion.Section.values)
+    criteria = _bulk(EvaluationCriterion, [
+        EvaluationCriterion(
+            rubric=rubric,
+            section=sections[k % len(sections)],
+            label=f"Critère {k + 1}",
+            weight=2 if k < 2 else 1,
+            max_score=5,
+            sort_order=k + 1,
+        )
+        for rubric in rubrics
+        for k in range(6)
+    ], result, "evaluation criteria")
+
+    criteria_by_training = {rubric.training_id: (rubric, []) for rubric in rubrics}
+    for criterion in criteria:
+        criteria_by_training[criterion.rubric.training_id][1].append(criterion)
+    return criteria_by_training
+
+
+def _evaluations(rng, anchor, trainers, trainings, result):
+    criteria_by_training = _rubrics(trainings, result)
+
+    # notes par critère tirées autour d'un niveau par évaluation ;
+    # totaux et décision calculés comme recompute_rubric_scores
+    evaluations, notes, contributions = [], [], []
+    for trainer in trainers:
+        for _ in range(rng.randint(2, 8)):
+            training = rng.choice(trainings)
+            rubric, criteria = criteria_by_training[training.id]
+            level = rng.uniform(0.3, 1.0)
+            scores = [
+                (c, min(c.max_score, max(0, round(rng.gauss(level * c.max_score, 0.8)))))
+                for c in criteria
+            ]
+            total = sum(score * c.weight for c, score in scores)
+            max_total = sum(c.max_score * c.weight for c, _ in scores)
+            score_100 = rubric_score_100(total, max_total)
+
+            core, specific = rng.randint(8, 20), rng.randint(3, 10)
+            evaluations.append(InternalEvaluation(
+                trainer=trainer,
+                training=training,
+                rubric=rubric,
+                evaluated_on=anchor - timedelta(days=rng.randint(0, 700)),
+                core_score_20=core,
+                specific_score_10=specific,
+                total_score_30=core + specific,
+                rubric_score_total=total,
+                rubric_score_max=max_total,
+                rubric_score_100=score_100,
+                decision=rubric_decision(score_100),
+            ))
+            notes.append(scores)
+        for _ in range(rng.randint(0, 6)):
+            contributions.append(StrategicContribution(
+                trainer=trainer,
+                kind=rng.choice(ContributionKind.values),
+                date=anchor - timedelta(days=rng.randint(0, 700)),
+                points=rng.randint(1, 5),
+            ))
+    evaluations = _bulk(InternalEvaluation, evaluations, result, "internal evaluations")
+    _bulk(EvaluationScore, [
+        EvaluationScore(evaluation=evaluation, criterion=criterion, score=score)
+        for evaluation, scores in zip(evaluations, notes)
+        for criterion, score in scores
+    ], result, "evaluation scores")
+    _bulk(StrategicContribution, contributions, result, "strategic contributions")
+
+
+# =========================================================
+# Point d'entrée
+# =========================================================
+
+def scale_for(name: str, **overrides) -> SyntheticScale:
+    return replace(SCALES[name], **{k: v for k, v in overrides.items() if v is not None})
+
+
+def generate_synthetic_data(
+    scale: SyntheticScale,
+    *,
+    seed: int = 42,
+    anchor: date | None = None,
+) -> SyntheticResult:
+    """
+    Génère un jeu de données complet (mêmes données pour un même seed et une même
+    date d'ancrage). Tout passe par bulk_create : pas de save() ni de signaux,
+    les champs calculés (produit, prix, compteurs, formations suivies) sont
+    renseignés directement.
+    """
+    rng = random.Random(seed)
+    anchor = anchor or timezone.localdate()
+    result = SyntheticResult()
+
+    with transaction.atomic():
+        clients = _clients(rng, scale, result)
+        trainings, rooms = _catalog(rng, scale, result)
+        trainers = _trainers(rng, scale, anchor, result)
+        participants_by_client = _participants(rng, scale, clients, result)
+        _sessions(rng, scale, anchor, clients, trainings, rooms, trainers, participants_by_client, result)
+        _projects(rng, scale, anchor, trainers, result)
+        _argonteam(rng, scale, anchor, trainers, result)
+        _evaluations(rng, anchor, trainers, trainings, result)
+
+    # bulk_create : pas de post_save, blocs de dashboards invalidés à la main
+    bump_generation(
+        Session, Registration, TrainerAbsence, TrainerWorkloadEntry, MercureInvoice,
+        Trainer, Client, Training, TrainingType, TaskAssignment,
+    )
+    return result
@@ -0,0 +1,366 @@
+# trainings/services/trainer_availability.py
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable
+
+from django.db.models import Q
+
+from argonteam.models import TrainerModuleMastery
+from argonteam.services.module_graph import MASTERED_Q
+from trainings.models import (
+    Session,
+    SessionStatus,
+    Trainer,
+    TrainerAbsence,
+    TrainerWorkloadEntry,
+    TrainerWorkloadEntryStatus,
+)
+from trainings.services.workload import (
+    BACKUP_LOAD_FACTOR,
+    WORKLOAD_SESSION_STATUSES,
+    load_rate,
+    net_capacity,
+    prorated_days_for_period,
+    theoretical_capacity,
+    working_days_between,
+)
+
+# Import Projects (optionnel)
+try:
+    from projects.models import TaskAssignment
+except Exception:
+    TaskAssignment = None
+
+
+MAX_SLOTS = 3
+MAX_CONFLICTS = 5
+# période de recherche maximale (jours calendaires entre from et to)
+MAX_RANGE_DAYS = 366
+# plafond de charge accepté (%) : au-delà, le filtre n'a plus de sens
+MAX_LOAD_LIMIT = Decimal("1000")
+
+
+# =========================================================
+# Index d'intervalles
+# =========================================================
+# Par formateur : intervalles de dates (bornes incluses) triés par début,
+# avec la fin maximale cumulée. La fin cumulée est croissante : une
+# recherche dichotomique donne le premier intervalle qui peut recouper une
+# période, la liste triée par début donne le dernier. Les périodes libres
+# se lisent sur la version fusionnée (intervalles disjoints).
+
+@dataclass(frozen=True, order=True)
+class BusyInterval:
+    start: date
+    end: date
+    kind: str = field(compare=False)
+    label: str = field(compare=False)
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "label": self.label,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+        }
+
+
+class IntervalIndex:
+    def __init__(self, intervals: Iterable[BusyInterval] = ()):
+        self.intervals = sorted(intervals)
+        self._starts = [i.start for i in self.intervals]
+        self._max_ends = []
+        running = date.min
+        for interval in self.intervals:
+            running = max(running, interval.end)
+            self._max_ends.append(running)
+
+        merged: list[list[date]] = []
+        for interval in self.intervals:
+            if merged and interval.start <= merged[-1][1] + timedelta(days=1):
+                merged[-1][1] = max(merged[-1][1], interval.end)
+            else:
+                merged.append([interval.start, interval.end])
+        self.merged = [(start, end) for start, end in merged]
+        self._merged_ends = [end for _, end in self.merged]
+
+    def overlapping(self, start: date, end: date) -> list[BusyInterval]:
+        """Intervalles qui recoupent [start, end]."""
+        lo = bisect_left(self._max_ends, start)
+        hi = bisect_right(self._starts, end)
+        return [i for i in self.intervals[lo:hi] if i.end >= start]
+
+    def free_ranges(self, start: date, end: date) -> list[tuple[date, date]]:
+        """Périodes libres (bornes incluses) dans [start, end]."""
+        ranges = []
+        cursor = start
+        k = bisect_left(self._merged_ends, start)
+        while cursor <= end:
+            if k < len(self.merged) and self.merged[k][0] <= end:
+                busy_start, busy_end = self.merged[k]
+                if busy_start > cursor:
+                    ranges.append((cursor, busy_start - timedelta(days=1)))
+                cursor = max(cursor, busy_end + timedelta(days=1))
+                k += 1
+            else:
+                ranges.append((cursor, end))
+                break
+        return ranges
+
+
+def _next_working_day(d: date) -> date:
+    while d.weekday() >= 5:
+        d += timedelta(days=1)
+    return d
+
+
+def _add_working_days(start: date, days: int) -> date:
+    """Dernier jour d'une période de `days` jours ouvrés commençant à `start` (jour ouvré)."""
+    end = start
+    remaining = days - 1
+    while remaining > 0:
+        end += timedelta(days=1)
+        if end.weekday() < 5:
+            remaining -= 1
+    return end
+
+
+def free_slots(index: IntervalIndex, start: date, end: date, days: int, limit: int = MAX_SLOTS):
+    """Premières périodes de `days` jours ouvrés consécutifs libres dans [start, end]."""
+    slots = []
+    for free_start, free_end in index.free_ranges(start, end):
+        slot_start = _next_working_day(free_start)
+        while slot_start <= free_end and len(slots) < limit:
+            slot_end = _add_working_days(slot_start, days)
+            if slot_end > free_end:
+                break
+            slots.append((slot_start, slot_end))
+            slot_start = _next_working_day(slot_end + timedelta(days=1))
+        if len(slots) >= limit:
+            break
+    return slots
+
+
+# =========================================================
+# Disponibilités de l'équipe
+# =========================================================
+
+@dataclass
+class TrainerAvailability:
+    trainer_id: int
+    name: str
+    product: str
+    qualified: bool
+    is_free: bool
+    under_load: bool
+    free_days: int
+    load_rate: Decimal
+    projected_load_rate: Decimal
+    slots: list[tuple[date, date]]
+    conflicts: list[BusyInterval]
+
+    @property
+    def available(self) -> bool:
+        return self.qualified and self.is_free and self.under_load
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["available"] = self.available
+        data["load_rate"] = float(round(self.load_rate, 1))
+        data["projected_load_rate"] = float(round(self.projected_load_rate, 1))
+        data["slots"] = [{"start": s.isoformat(), "end": e.isoformat()} for s, e in self.slots]
+        data["conflicts"] = [c.as_dict() for c in self.conflicts]
+        return data
+
+
+def _session_label(session: Session, backup: bool) -> str:
+    label = session.reference or session.training.title
+    return f"{label} (backup)" if backup else label
+
+
+def build_indexes(
+    trainer_ids: Iterable[int],
+    date_from: date,
+    date_to: date,
+    *,
+    exclude_session_id: int | None = None,
+) -> tuple[dict[int, IntervalIndex], dict[int, dict[str, Decimal]]]:
+    """
+    Un index d'intervalles bloquants par formateur (sessions principal / backup,
+    absences) et la charge de la période (mêmes règles que le plan de charge),
+    en quatre requêtes pour toute l'équipe.
+    """
+    trainer_ids = set(trainer_ids)
+    busy = defaultdict(list)
+    load = defaultdict(lambda: defaultdict(Decimal))
+
+    sessions = (
+        Session.objects
+        .exclude(status=SessionStatus.CANCELED)
+        .filter(start_date__isnull=False, start_date__lte=date_to)
+        .filter(Q(end_date__isnull=True, start_date__gte=date_from) | Q(end_date__gte=date_from))
+        .filter(Q(trainer_id__in=trainer_ids) | Q(backup_trainer_id__in=trainer_ids))
+        .select_related("training")
+        .only(
+            "id", "reference", "status", "trainer_id", "backup_trainer_id",
+            "start_date", "end_date", "days_count", "training__title",
+        )
+    )
+    if exclude_session_id:
+        sessions = sessions.exclude(pk=exclude_session_id)
+
+    # brouillons : jours bloqués mais hors charge, comme dans le plan de charge
+    for s in sessions:
+        end = s.end_date or s.start_date
+        days = prorated_days_for_period(s.start_date, s.end_date, s.days_count, date_from, date_to)
+        counted = s.status in WORKLOAD_SESSION_STATUSES
+        for trainer_id, backup in ((s.trainer_id, False), (s.backup_trainer_id, True)):
+            if trainer_id not in trainer_ids:
+                continue
+            busy[trainer_id].append(
+                BusyInterval(s.start_date, end, "backup" if backup else "session", _session_label(s, backup))
+            )
+            if counted:
+                load[trainer_id]["backup" if backup else "primary"] += (
+                    days * BACKUP_LOAD_FACTOR if backup else days
+                )
+
+    # order_by() : pas de jointure pour le tri par défaut des modèles
+    absences = TrainerAbsence.objects.filter(
+        trainer_id__in=trainer_ids, start_date__lte=date_to, end_date__gte=date_from,
+    ).order_by()
+    for a in absences:
+        busy[a.trainer_id].append(BusyInterval(a.start_date, a.end_date, "absence", a.get_absence_type_display()))
+        load[a.trainer_id]["absence"] += prorated_days_for_period(
+            a.start_date, a.end_date, a.days_count, date_from, date_to
+        )
+
+    # charges annexes et projets : comptées dans la charge, sans bloquer de jours
+    entries = (
+        TrainerWorkloadEntry.objects
+        .exclude(status=TrainerWorkloadEntryStatus.CANCELED)
+        .filter(trainer_id__in=trainer_ids, start_date__lte=date_to, end_date__gte=date_from)
+        .only("trainer_id", "start_date", "end_date", "days_count")
+        .order_by()
+    )
+    for e in entries:
+        load[e.trainer_id]["extra"] += prorated_days_for_period(
+            e.start_date, e.end_date, e.days_count, date_from, date_to
+        )
+
+    if TaskAssignment is not None:
+        assignments = (
+            TaskAssignment.objects
+            .exclude(status=TaskAssignment.Status.CANCELED)
+            .filter(trainer_id__in=trainer_ids, start_date__lte=date_to, end_date__gte=date_from)
+            .only("trainer_id", "start_date", "end_date", "planned_days")
+            .order_by()
+        )
+        for a in assignments:
+            load[a.trainer_id]["project"] += prorated_days_for_period(
+                a.start_date, a.end_date, a.planned_days, date_from, date_to
+            )
+
+    indexes = {trainer_id: IntervalIndex(busy.get(trainer_id, ())) for trainer_id in trainer_ids}
+    return indexes, load
+
+
+def _within(value, low, high, *, low_inclusive: bool = True) -> bool:
+    value = Decimal(value)
+    if not value.is_finite():
+        return False
+    return (value >= low if low_inclusive else value > low) and value <= high
+
+
+def find_available_trainers(
+    *,
+    date_from: date,
+    date_to: date | None = None,
+    days: int | Decimal | None = None,
+    module_id: int | None = None,
+    max_load: Decimal | None = None,
+    product: str = "",
+    exclude_session_id: int | None = None,
+    only_available: bool = False,
+) -> list[TrainerAvailability]:
+    """
+    Formateurs actifs libres `days` jours ouvrés consécutifs entre `date_from`
+    et `date_to`, qualifiés sur `module_id` (maîtrise validée), dont la charge
+    sur la période, session comprise, reste sous `max_load` %.
+
+    Par défaut `days` couvre tous les jours ouvrés de la période. Les
+    formateurs non retenus sont renvoyés après les autres avec le motif
+    (qualified / is_free / under_load), sauf avec `only_available`.
+    """
+    date_to = max(date_to or date_from, date_from)
+    if (date_to - date_from).days > MAX_RANGE_DAYS:
+        raise ValueError(f"Période de recherche limitée à {MAX_RANGE_DAYS} jours.")
+    # bornes vérifiées avant tout calcul : math.ceil(1e1000000) ne rend pas la main
+    if days is not None and not _within(days, 0, MAX_RANGE_DAYS, low_inclusive=False):
+        raise ValueError(f"Nombre de jours attendu entre 1 et {MAX_RANGE_DAYS}.")
+    if max_load is not None and not _within(max_load, 0, MAX_LOAD_LIMIT):
+        raise ValueError(f"Charge maximale attendue entre 0 et {MAX_LOAD_LIMIT} %.")
+    period_days = working_days_between(date_from, date_to)
+    days = max(1, math.ceil(days)) if days else max(1, period_days)
+    # au-delà des jours ouvrés de la période aucun créneau n'existe :
+    # inutile de compter des centaines de jours dans free_slots
+    slot_days = min(days, period_days + 1)
+
+    trainers = Trainer.objects.filter(is_active=True).order_by("last_name", "first_name")
+    product = (product or "").upper().strip()
+    if product:
+        trainers = trainers.filter(product=product)
+    trainers = list(trainers.only("id", "first_name", "last_name", "product", "workload_percent"))
+
+    qualified_ids = None
+    if module_id:
+        qualified_ids = set(
+            TrainerModuleMastery.objects
+            .filter(MASTERED_Q, module_id=module_id, trainer__in=[t.id for t in trainers])
+            .order_by()
+            .values_list("trainer_id", flat=True)
+        )
+
+    indexes, loads = build_indexes(
+        [t.id for t in trainers], date_from, date_to, exclude_session_id=exclude_session_id,
+    )
+
+    results = []
+    for trainer in trainers:
+        index = indexes[trainer.id]
+        load = loads.get(trainer.id, {})
+        capacity = net_capacity(
+            theoretical_capacity(trainer.workload_percent, date_from, date_to),
+            load.get("absence", Decimal("0.0")),
+        )
+        total = sum((load.get(k, Decimal("0.0")) for k in ("primary", "backup", "extra", "project")), Decimal("0.0"))
+        rate = load_rate(total, capacity)
+        projected = load_rate(total + Decimal(days), capacity)
+
+        slots = free_slots(index, date_from, date_to, slot_days)
+        free_days = sum(working_days_between(s, e) for s, e in index.free_ranges(date_from, date_to))
+
+        results.append(TrainerAvailability(
+            trainer_id=trainer.id,
+            name=str(trainer),
+            product=trainer.product,
+            qualified=qualified_ids is None or trainer.id in qualified_ids,
+            is_free=bool(slots),
+            under_load=max_load is None or projected <= max_load,
+            free_days=free_days,
+            load_rate=rate,
+            projected_load_rate=projected,
+            slots=slots,
+            conflicts=index.overlapping(date_from, date_to)[:MAX_CONFLICTS],
+        ))
+
+    if only_available:
+        results = [r for r in results if r.available]
+    results.sort(key=lambda r: (not r.available, not r.is_free, r.projected_load_rate, r.name))
+    return results
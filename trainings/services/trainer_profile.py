@@ -0,0 +1,242 @@
+# trainings/services/trainer_profile.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from argonteam.models import (
+    ArgonosModule,
+    ObjectiveStatus,
+    OneToOneMeeting,
+    OneToOneObjective,
+    TrainerModuleMastery,
+)
+from argonteam.services.module_graph import ModuleReadiness, compute_readiness
+from trainings.models import Session, Trainer
+
+# Import Projects (optionnel)
+try:
+    from projects.models import TaskAssignment
+except Exception:
+    TaskAssignment = None
+
+
+CACHE_PREFIX = "trainings:trainer_profile"
+CACHE_TIMEOUT = 60 * 60
+GENERATION_KEY = f"{CACHE_PREFIX}:generation"
+
+RECENT_SESSIONS_LIMIT = 10
+DONE_OBJECTIVES_LIMIT = 25
+
+
+# =========================================================
+# Structure
+# =========================================================
+
+@dataclass(frozen=True)
+class ModuleRow:
+    module: ArgonosModule
+    mastery: TrainerModuleMastery | None
+    readiness: ModuleReadiness | None
+
+
+@dataclass
+class TrainerProfile:
+    """
+    Tout ce qu'affiche la fiche d'un formateur (équipe ArgonOS, évaluations,
+    centre de pilotage), chargé en un nombre fixe de requêtes et picklable
+    (mis en cache par `get_trainer_profile`).
+    """
+
+    trainer: Trainer
+    today: date
+    week_start: date
+    meetings: list[OneToOneMeeting] = field(default_factory=list)
+    objectives_open: list[OneToOneObjective] = field(default_factory=list)
+    objectives_done: list[OneToOneObjective] = field(default_factory=list)
+    recent_sessions: list[Session] = field(default_factory=list)
+    this_week_meeting: OneToOneMeeting | None = None
+    this_week_objectives: list[OneToOneObjective] = field(default_factory=list)
+    module_rows: list[ModuleRow] = field(default_factory=list)
+    task_assignments: list = field(default_factory=list)
+
+    @property
+    def can_create_this_week(self) -> bool:
+        return self.this_week_meeting is None
+
+    @property
+    def modules_count(self) -> int:
+        return len(self.module_rows)
+
+    @property
+    def modules_mastered(self) -> int:
+        return sum(1 for row in self.module_rows if row.readiness and row.readiness.mastered)
+
+    @property
+    def task_assignments_open(self) -> list:
+        done = TaskAssignment.Status.DONE if TaskAssignment is not None else None
+        return [a for a in self.task_assignments if a.status != done]
+
+    @property
+    def task_assignments_done(self) -> list:
+        done = TaskAssignment.Status.DONE if TaskAssignment is not None else None
+        return [a for a in self.task_assignments if a.status == done]
+
+    @property
+    def project_load_total(self) -> Decimal:
+        return sum(
+            (a.planned_days or Decimal("0.0") for a in self.task_assignments_open),
+            Decimal("0.0"),
+        )
+
+
+# =========================================================
+# Chargement
+# =========================================================
+
+def _monday_of_week(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def _load_module_rows(trainer: Trainer) -> list[ModuleRow]:
+    # les modules ArgonOS ne concernent que les formateurs ArgonOS
+    if trainer.product != Trainer.PRODUCT_ARGONOS:
+        return []
+
+    modules = list(ArgonosModule.objects.filter(is_active=True).order_by("kind", "level", "name"))
+
+    masteries = {
+        m.module_id: m
+        for m in TrainerModuleMastery.objects.filter(trainer=trainer, module__is_active=True)
+    }
+
+    missing = [
+        TrainerModuleMastery(trainer=trainer, module=mod)
+        for mod in modules
+        if mod.id not in masteries
+    ]
+    if missing:
+        TrainerModuleMastery.objects.bulk_create(missing, ignore_conflicts=True)
+        masteries = {
+            m.module_id: m
+            for m in TrainerModuleMastery.objects.filter(trainer=trainer, module__is_active=True)
+        }
+
+    readiness = compute_readiness([trainer.id], with_tracks=False).for_trainer(trainer.id)
+
+    return [
+        ModuleRow(module=mod, mastery=masteries.get(mod.id), readiness=readiness.get(mod.id))
+        for mod in modules
+    ]
+
+
+def load_trainer_profile(trainer: Trainer, *, today: date | None = None) -> TrainerProfile:
+    """
+    Construit le profil sans cache. Nombre de requêtes constant :
+    réunions, objectifs, sessions récentes, modules + maîtrises + préparation,
+    affectations projet (+ création des maîtrises manquantes au premier passage).
+    """
+    today = today or timezone.localdate()
+    week_start = _monday_of_week(today)
+
+    meetings = list(OneToOneMeeting.objects.filter(trainer=trainer).order_by("-week_start"))
+    this_week_meeting = next((m for m in meetings if m.week_start == week_start), None)
+
+    objectives = list(OneToOneObjective.objects.filter(trainer=trainer).order_by("-created_at"))
+    objectives_done = [o for o in objectives if o.status == ObjectiveStatus.DONE]
+
+    this_week_objectives = []
+    if this_week_meeting:
+        this_week_objectives = [o for o in objectives if o.meeting_id == this_week_meeting.id]
+
+    recent_sessions = list(
+        Session.objects
+        .filter(trainer=trainer)
+        .select_related("training", "client")
+        .order_by("-start_date")[:RECENT_SESSIONS_LIMIT]
+    )
+
+    task_assignments = []
+    if TaskAssignment is not None:
+        task_assignments = list(
+            TaskAssignment.objects
+            .select_related("task", "task__project")
+            .filter(trainer=trainer, is_visible_in_one_to_one=True)
+            .exclude(status=TaskAssignment.Status.CANCELED)
+            .order_by("start_date", "end_date", "task__project__name", "task__title")
+        )
+
+    return TrainerProfile(
+        trainer=trainer,
+        today=today,
+        week_start=week_start,
+        meetings=meetings,
+        objectives_open=[o for o in objectives if o.status != ObjectiveStatus.DONE],
+        objectives_done=objectives_done[:DONE_OBJECTIVES_LIMIT],
+        recent_sessions=recent_sessions,
+        this_week_meeting=this_week_meeting,
+        this_week_objectives=this_week_objectives,
+        module_rows=_load_module_rows(trainer),
+        task_assignments=task_assignments,
+    )
+
+
+# =========================================================
+# Cache
+# =========================================================
+
+def _generation() -> int:
+    return cache.get_or_set(GENERATION_KEY, 1, None)
+
+
+def _cache_key(trainer_id: int, today: date) -> str:
+    return f"{CACHE_PREFIX}:{_generation()}:{trainer_id}:{today.isoformat()}"
+
+
+def get_trainer_profile(trainer: Trainer, *, today: date | None = None) -> TrainerProfile:
+    """Profil en cache ; invalidé par les signaux (trainings.signals, argonteam.signals)."""
+    today = today or timezone.localdate()
+    key = _cache_key(trainer.id, today)
+    profile = cache.get(key)
+    if profile is None:
+        profile = load_trainer_profile(trainer, today=today)
+        cache.set(key, profile, CACHE_TIMEOUT)
+    return profile
+
+
+def invalidate_trainer_profile(*trainer_ids: int | None) -> None:
+    today = timezone.localdate()
+    keys = [_cache_key(tid, today) for tid in {tid for tid in trainer_ids if tid}]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_all_trainer_profiles() -> None:
+    """Pour les changements partagés (modules, tâches, projets)."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 2, None)
+
+
+# =========================================================
+# Agrégats multi-formateurs (listes, centre de pilotage)
+# =========================================================
+
+def open_objective_counts(trainer_ids: Iterable[int]) -> dict[int, int]:
+    """Objectifs 1to1 non terminés par formateur, en une requête groupée."""
+    return dict(
+        OneToOneObjective.objects
+        .filter(trainer_id__in=list(trainer_ids))
+        .exclude(status=ObjectiveStatus.DONE)
+        .order_by()
+        .values("trainer_id")
+        .annotate(n=Count("pk"))
+        .values_list("trainer_id", "n")
+    )
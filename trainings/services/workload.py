@@ -0,0 +1,272 @@
+# trainings/services/workload.py
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Q
+
+from trainings.models import (
+    Session,
+    SessionStatus,
+    Trainer,
+    TrainerAbsence,
+    TrainerWorkloadEntry,
+    TrainerWorkloadEntryStatus,
+)
+from trainings.services.dashboard_cache import cached_block
+
+# Import Projects (optionnel)
+try:
+    from projects.models import TaskAssignment
+except Exception:
+    TaskAssignment = None
+
+
+# Sessions comptées dans la charge des formateurs (plan de charge, disponibilités)
+WORKLOAD_SESSION_STATUSES = [
+    SessionStatus.PLANNED,
+    SessionStatus.CONFIRMED,
+    SessionStatus.IN_PROGRESS,
+    SessionStatus.CLOSED,
+]
+
+# un backup compte pour moitié dans la charge
+BACKUP_LOAD_FACTOR = Decimal("0.5")
+# taux affiché quand il y a de la charge sans aucune capacité
+OVERLOAD_RATE = Decimal("999.0")
+
+
+# =========================================================
+# Jours
+# =========================================================
+
+def working_days_between(start: date, end: date) -> int:
+    """
+    Nombre de jours ouvrés (lun->ven) inclusifs.
+    """
+    if end < start:
+        return 0
+
+    current = start
+    total = 0
+    while current <= end:
+        if current.weekday() < 5:
+            total += 1
+        current += timedelta(days=1)
+    return total
+
+
+def inclusive_days_between(start: date | None, end: date | None) -> int:
+    if not start:
+        return 0
+    if not end:
+        end = start
+    if end < start:
+        return 0
+    return (end - start).days + 1
+
+
+def overlap_inclusive_days(
+    start_a: date | None,
+    end_a: date | None,
+    start_b: date,
+    end_b: date,
+) -> int:
+    """
+    Nombre de jours calendaires inclusifs communs entre [a] et [b].
+    """
+    if not start_a:
+        return 0
+
+    if not end_a:
+        end_a = start_a
+
+    a = max(start_a, start_b)
+    b = min(end_a, end_b)
+
+    if b < a:
+        return 0
+    return (b - a).days + 1
+
+
+def prorated_days_for_period(
+    item_start: date | None,
+    item_end: date | None,
+    item_days_count: Decimal | None,
+    period_start: date,
+    period_end: date,
+) -> Decimal:
+    """
+    Répartit proportionnellement days_count selon le chevauchement de dates.
+    Exemple :
+    - item sur 4 jours calendaires
+    - chevauchement de 2 jours
+    => 50% de days_count
+    """
+    if not item_start:
+        return Decimal("0.0")
+
+    total_span = inclusive_days_between(item_start, item_end)
+    overlap = overlap_inclusive_days(item_start, item_end, period_start, period_end)
+
+    if total_span <= 0 or overlap <= 0:
+        return Decimal("0.0")
+
+    base = item_days_count if item_days_count is not None else Decimal(str(overlap))
+    return (Decimal(overlap) / Decimal(total_span)) * Decimal(base)
+
+
+# =========================================================
+# Capacité / taux de charge
+# =========================================================
+
+def theoretical_capacity(workload_percent: Decimal | None, period_start: date, period_end: date) -> Decimal:
+    """Jours ouvrés de la période x capacité disponible du formateur (%)."""
+    availability_pct = Decimal(workload_percent or Decimal("100.00"))
+    return (Decimal(working_days_between(period_start, period_end)) * availability_pct) / Decimal("100")
+
+
+def net_capacity(theoretical: Decimal, absence_days: Decimal) -> Decimal:
+    return max(theoretical - absence_days, Decimal("0.0"))
+
+
+def load_rate(total_load: Decimal, capacity_net: Decimal) -> Decimal:
+    if capacity_net > 0:
+        return (total_load / capacity_net) * Decimal("100")
+    return Decimal("0.0") if total_load == 0 else OVERLOAD_RATE
+
+
+# =========================================================
+# Plan de charge mensuel
+# =========================================================
+
+def compute_trainer_workload_rows(month_start: date, month_end: date) -> list[dict]:
+    """
+    Charge du mois pour tous les formateurs (valeurs non arrondies).
+    Partagé par l'accueil, le centre de pilotage et le plan de charge.
+    """
+    trainers = list(Trainer.objects.order_by("last_name", "first_name"))
+
+    sessions_qs = (
+        Session.objects
+        .filter(
+            status__in=WORKLOAD_SESSION_STATUSES,
+            start_date__isnull=False,
+            start_date__lte=month_end,
+        )
+        .filter(Q(end_date__isnull=True, start_date__gte=month_start) | Q(end_date__gte=month_start))
+        .only("trainer_id", "backup_trainer_id", "start_date", "end_date", "days_count")
+    )
+
+    absences_qs = (
+        TrainerAbsence.objects
+        .filter(start_date__lte=month_end, end_date__gte=month_start)
+    )
+
+    workload_entries_qs = (
+        TrainerWorkloadEntry.objects
+        .exclude(status=TrainerWorkloadEntryStatus.CANCELED)
+        .filter(start_date__lte=month_end, end_date__gte=month_start)
+    )
+
+    task_assignments_qs = TaskAssignment.objects.none()
+    if TaskAssignment is not None:
+        task_assignments_qs = (
+            TaskAssignment.objects
+            .exclude(status=TaskAssignment.Status.CANCELED)
+            .filter(
+                trainer__isnull=False,
+                start_date__lte=month_end,
+                end_date__gte=month_start,
+            )
+        )
+
+    sessions_by_primary = defaultdict(list)
+    sessions_by_backup = defaultdict(list)
+    absences_by_trainer = defaultdict(list)
+    extra_workloads_by_trainer = defaultdict(list)
+    assignments_by_trainer = defaultdict(list)
+
+    for s in sessions_qs:
+        if s.trainer_id:
+            sessions_by_primary[s.trainer_id].append(s)
+        if s.backup_trainer_id:
+            sessions_by_backup[s.backup_trainer_id].append(s)
+
+    for absence in absences_qs:
+        absences_by_trainer[absence.trainer_id].append(absence)
+
+    for entry in workload_entries_qs:
+        extra_workloads_by_trainer[entry.trainer_id].append(entry)
+
+    for assignment in task_assignments_qs:
+        assignments_by_trainer[assignment.trainer_id].append(assignment)
+
+    rows = []
+    for trainer in trainers:
+        capacity_theoretical = theoretical_capacity(trainer.workload_percent, month_start, month_end)
+
+        primary_days = sum(
+            (prorated_days_for_period(s.start_date, s.end_date, s.days_count, month_start, month_end)
+             for s in sessions_by_primary.get(trainer.id, [])),
+            Decimal("0.0"),
+        )
+        backup_days = sum(
+            (prorated_days_for_period(s.start_date, s.end_date, s.days_count, month_start, month_end)
+             * BACKUP_LOAD_FACTOR
+             for s in sessions_by_backup.get(trainer.id, [])),
+            Decimal("0.0"),
+        )
+        absence_days = sum(
+            (prorated_days_for_period(a.start_date, a.end_date, a.days_count, month_start, month_end)
+             for a in absences_by_trainer.get(trainer.id, [])),
+            Decimal("0.0"),
+        )
+        extra_days = sum(
+            (prorated_days_for_period(e.start_date, e.end_date, e.days_count, month_start, month_end)
+             for e in extra_workloads_by_trainer.get(trainer.id, [])),
+            Decimal("0.0"),
+        )
+        project_days = sum(
+            (prorated_days_for_period(a.start_date, a.end_date, a.planned_days, month_start, month_end)
+             for a in assignments_by_trainer.get(trainer.id, [])),
+            Decimal("0.0"),
+        )
+
+        capacity_net = net_capacity(capacity_theoretical, absence_days)
+        total_load = primary_days + backup_days + extra_days + project_days
+
+        rows.append({
+            "trainer": trainer,
+            "capacity_theoretical": capacity_theoretical,
+            "absence_days": absence_days,
+            "capacity_net": capacity_net,
+            "primary_days": primary_days,
+            "backup_days": backup_days,
+            "extra_days": extra_days,
+            "project_days": project_days,
+            "total_load": total_load,
+            "load_rate": load_rate(total_load, capacity_net),
+            "primary_sessions_count": len(sessions_by_primary.get(trainer.id, [])),
+            "backup_sessions_count": len(sessions_by_backup.get(trainer.id, [])),
+            "extra_entries_count": len(extra_workloads_by_trainer.get(trainer.id, [])),
+            "project_assignments_count": len(assignments_by_trainer.get(trainer.id, [])),
+            "absences_count": len(absences_by_trainer.get(trainer.id, [])),
+        })
+
+    return rows
+
+
+def trainer_workload_rows(month_start: date, month_end: date) -> list[dict]:
+    """Version en cache : recalculée seulement si une des sources a changé."""
+    depends_on = [Session, TrainerAbsence, TrainerWorkloadEntry, Trainer]
+    if TaskAssignment is not None:
+        depends_on.append(TaskAssignment)
+    return cached_block(
+        "trainer_workload_rows",
+        lambda: compute_trainer_workload_rows(month_start, month_end),
+        depends_on=depends_on,
+        key_parts=(month_start, month_end),
+    )
@@ -1,54 +1,150 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from .models import Registration, Session, RegistrationStatus
+from argonteam.models import ArgonosModule, OneToOneMeeting, OneToOneObjective, TrainerModuleMastery
 
+from .models import (
+    Client,
+    MercureInvoice,
+    Registration,
+    RegistrationStatus,
+    Room,
+    Session,
+    Trainer,
+    TrainerAbsence,
+    TrainerWorkloadEntry,
+    Training,
+    TrainingType,
+)
+from .services.counters import defer_session_refresh, refresh_sessions
+from .services.dashboard_cache import bump_generation
+from .services.prerequisites import refresh_completion
+from .services.products import refresh_session_products
+from .services.trainer_profile import invalidate_all_trainer_profiles, invalidate_trainer_profile
 
-CAPACITY_10_TITLES = {
-    "Initiation",
-    "Data Exploration niveau 1",
-    "Data Préparation niveau 1",
-}
+# Import Projects (optionnel)
+try:
+    from projects.models import Project, Task, TaskAssignment
+except Exception:
+    Project = None
+    Task = None
+    TaskAssignment = None
 
-CAPACITY_6_TITLES = {
-    "Développeur niveau 1",
-    "Admin Système Installation",
-}
+
+# Les compteurs de session (expected_participants / present_count) sont gérés
+# par trainings.services.counters, l'historique des formations suivies par
+# trainings.services.prerequisites :
+# - Registration.save() met les deux à jour quand un champ pertinent change
+# - la suppression passe ici, pour couvrir aussi les suppressions en masse
+#   (queryset.delete(), action admin)
 
 
-def _capacity_for_session(session: Session) -> int:
-    title = (session.training.title or "").strip()
-    if title in CAPACITY_10_TITLES:
-        return 10
-    if title in CAPACITY_6_TITLES:
-        return 6
-    return 10
+@receiver(post_delete, sender=Registration)
+def registration_deleted(sender, instance, origin=None, **kwargs):
+    # suppression en cascade depuis la session : rien à recalculer
+    if isinstance(origin, Session) or (
+        isinstance(origin, QuerySet) and origin.model is Session
+    ):
+        return
 
+    session = Session.objects.filter(pk=instance.session_id).first()
+    if not session:
+        return
 
-def _recompute_counts(session_id: int) -> None:
-    session = Session.objects.select_related("training").get(id=session_id)
+    if instance.status == RegistrationStatus.PRESENT:
+        refresh_completion(instance.participant_id, session.training_id)
 
-    expected = _capacity_for_session(session)
+    if not defer_session_refresh(session.pk, pricing=True):
+        refresh_sessions([session.pk], pricing_ids=[session.pk])
 
-    present = (
-        Registration.objects
-        .filter(session_id=session_id, status=RegistrationStatus.PRESENT)
-        .values("participant_id")
-        .distinct()
-        .count()
-    )
 
-    Session.objects.filter(id=session_id).update(
-        expected_participants=expected,
-        present_count=present,
-    )
+# =========================================================
+# Cache des profils formateurs (trainings.services.trainer_profile)
+# =========================================================
 
+@receiver(post_save, sender=Trainer)
+def trainer_changed(sender, instance, **kwargs):
+    invalidate_trainer_profile(instance.pk)
 
-@receiver(post_save, sender=Registration)
-def registration_saved(sender, instance, **kwargs):
-    _recompute_counts(instance.session_id)
 
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def session_trainer_profile_changed(sender, instance, created=False, **kwargs):
+    # post_save : le snapshot n'est pas encore rafraîchi, initial_value = ancien formateur
+    previous = None if created else instance.initial_value("trainer")
+    invalidate_trainer_profile(instance.trainer_id, previous)
 
-@receiver(post_delete, sender=Registration)
-def registration_deleted(sender, instance, **kwargs):
-    _recompute_counts(instance.session_id)
+
+@receiver(post_save, sender=OneToOneMeeting)
+@receiver(post_delete, sender=OneToOneMeeting)
+@receiver(post_save, sender=OneToOneObjective)
+@receiver(post_delete, sender=OneToOneObjective)
+@receiver(post_save, sender=TrainerModuleMastery)
+@receiver(post_delete, sender=TrainerModuleMastery)
+def one_to_one_changed(sender, instance, **kwargs):
+    invalidate_trainer_profile(instance.trainer_id)
+
+
+@receiver(post_save, sender=ArgonosModule)
+@receiver(post_delete, sender=ArgonosModule)
+def argonos_module_changed(sender, **kwargs):
+    invalidate_all_trainer_profiles()
+
+
+@receiver(m2m_changed, sender=ArgonosModule.prerequisites.through)
+def argonos_module_prerequisites_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_all_trainer_profiles()
+
+
+# Tâches / projets : partagés entre formateurs (titres, statuts) -> tout invalider
+if TaskAssignment is not None:
+
+    @receiver(post_save, sender=TaskAssignment)
+    @receiver(post_delete, sender=TaskAssignment)
+    @receiver(post_save, sender=Task)
+    @receiver(post_delete, sender=Task)
+    @receiver(post_save, sender=Project)
+    @receiver(post_delete, sender=Project)
+    def project_data_changed(sender, **kwargs):
+        invalidate_all_trainer_profiles()
+
+
+# =========================================================
+# Produit recopié sur les sessions (Session.product)
+# =========================================================
+
+@receiver(post_save, sender=TrainingType)
+def training_type_product_changed(sender, instance, created, **kwargs):
+    if not created and instance.has_changed("product"):
+        refresh_session_products([instance.pk])
+
+
+# =========================================================
+# Générations des blocs de dashboards (trainings.services.dashboard_cache)
+# =========================================================
+
+DASHBOARD_MODELS = {
+    Session,
+    Registration,
+    TrainerAbsence,
+    TrainerWorkloadEntry,
+    MercureInvoice,
+    Trainer,
+    Client,
+    Room,
+    Training,
+    TrainingType,
+}
+if TaskAssignment is not None:
+    DASHBOARD_MODELS.add(TaskAssignment)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def dashboard_data_changed(sender, **kwargs):
+    # concrete_model : couvre aussi les proxies (ex: finance.FinanceMercureInvoice)
+    model = getattr(getattr(sender, "_meta", None), "concrete_model", None)
+    if model in DASHBOARD_MODELS:
+        bump_generation(model)
@@ -0,0 +1,212 @@
+// Listes de choix à recherche (trainings.widgets.AutocompleteSelect / AutocompleteSelectMultiple).
+// Le <select> d'origine est masqué mais reste le champ envoyé : on n'y ajoute que les
+// valeurs choisies. Réponse attendue de l'endpoint : {results: [{id, text, ...}], more: bool}.
+(function () {
+  const DEBOUNCE_MS = 250;
+
+  function injectStyles() {
+    if (document.getElementById("ac-styles")) return;
+    const style = document.createElement("style");
+    style.id = "ac-styles";
+    style.textContent = `
+      .ac-wrap { position: relative; max-width: 640px; }
+      .ac-chips { display: flex; flex-wrap: wrap; gap: 6px; margin-bottom: 6px; }
+      .ac-chip { display: inline-flex; align-items: center; gap: 6px; padding: 3px 8px;
+                 border: 1px solid rgba(127,127,127,.45); border-radius: 999px; font-size: 12px; }
+      .ac-chip button { border: 0; background: none; color: inherit; cursor: pointer; font-weight: 700; }
+      .ac-input { width: 100%; box-sizing: border-box; }
+      .ac-list { position: absolute; z-index: 1000; left: 0; right: 0; max-height: 320px; overflow-y: auto;
+                 margin: 2px 0 0; padding: 0; list-style: none; background: #fff; color: #111;
+                 border: 1px solid rgba(127,127,127,.45); border-radius: 6px; box-shadow: 0 6px 18px rgba(0,0,0,.18); }
+      .ac-list li { padding: 6px 10px; cursor: pointer; font-size: 13px; }
+      .ac-list li:hover, .ac-list li.is-active { background: #e8efff; }
+      .ac-list li.is-disabled { opacity: .55; cursor: default; }
+      .ac-list li small { display: block; opacity: .7; }
+      .ac-list li .ac-warn { color: #b45309; }
+    `;
+    document.head.appendChild(style);
+  }
+
+  function describe(item) {
+    const parts = [];
+    if (item.email) parts.push(item.email);
+    if (item.service) parts.push(item.service);
+    if (item.client) parts.push(item.client);
+    return parts.join(" · ");
+  }
+
+  function setup(select) {
+    if (select.dataset.autocompleteReady) return;
+    select.dataset.autocompleteReady = "1";
+
+    const multiple = select.multiple;
+    const baseUrl = select.dataset.autocompleteUrl;
+    const fixedParams = select.dataset.autocompleteParams || "";
+    // "param:champ,param:champ" : valeurs d'autres champs du formulaire, lues à chaque recherche
+    const forward = (select.dataset.autocompleteForward || "")
+      .split(",")
+      .filter(Boolean)
+      .map((pair) => pair.split(":"));
+
+    const wrap = document.createElement("div");
+    wrap.className = "ac-wrap";
+    const chips = document.createElement("div");
+    chips.className = "ac-chips";
+    const input = document.createElement("input");
+    input.type = "text";
+    input.className = "ac-input " + (select.className || "");
+    input.placeholder = select.dataset.autocompletePlaceholder || "Rechercher…";
+    input.autocomplete = "off";
+    const list = document.createElement("ul");
+    list.className = "ac-list";
+    list.hidden = true;
+
+    select.style.display = "none";
+    select.parentNode.insertBefore(wrap, select.nextSibling);
+    wrap.append(chips, input, list);
+
+    let timer = null;
+    let page = 1;
+    let lastQuery = null;
+    let controller = null;
+
+    function selectedOptions() {
+      return Array.from(select.options).filter((o) => o.value && o.selected);
+    }
+
+    function renderChips() {
+      chips.innerHTML = "";
+      selectedOptions().forEach((opt) => {
+        const chip = document.createElement("span");
+        chip.className = "ac-chip";
+        chip.textContent = opt.textContent;
+        const remove = document.createElement("button");
+        remove.type = "button";
+        remove.textContent = "×";
+        remove.addEventListener("click", () => {
+          opt.remove();
+          renderChips();
+          select.dispatchEvent(new Event("change", { bubbles: true }));
+        });
+        chip.appendChild(remove);
+        chips.appendChild(chip);
+      });
+    }
+
+    function choose(item) {
+      let opt = Array.from(select.options).find((o) => o.value === String(item.id));
+      if (!multiple) {
+        Array.from(select.options).forEach((o) => { if (o.value && o !== opt) o.remove(); });
+      }
+      if (!opt) {
+        opt = new Option(item.text, item.id, true, true);
+        select.add(opt);
+      }
+      opt.selected = true;
+      input.value = "";
+      close();
+      renderChips();
+      select.dispatchEvent(new Event("change", { bubbles: true }));
+    }
+
+    function close() {
+      list.hidden = true;
+      list.innerHTML = "";
+    }
+
+    function renderItems(data, append) {
+      if (!append) list.innerHTML = "";
+      const more = list.querySelector(".ac-more");
+      if (more) more.remove();
+
+      if (!append && !data.results.length) {
+        const empty = document.createElement("li");
+        empty.className = "is-disabled";
+        empty.textContent = "Aucun résultat";
+        list.appendChild(empty);
+      }
+
+      data.results.forEach((item) => {
+        const li = document.createElement("li");
+        li.textContent = item.text;
+        const info = describe(item);
+        if (info) {
+          const small = document.createElement("small");
+          small.textContent = info;
+          li.appendChild(small);
+        }
+        if (item.missing && item.missing.length) {
+          const warn = document.createElement("small");
+          warn.className = "ac-warn";
+          warn.textContent = "⛔ Pré-requis manquants : " + item.missing.join(", ");
+          li.appendChild(warn);
+        }
+        if (item.registered) {
+          li.classList.add("is-disabled");
+          const note = document.createElement("small");
+          note.textContent = "Déjà inscrit";
+          li.appendChild(note);
+        } else {
+          li.addEventListener("mousedown", (e) => { e.preventDefault(); choose(item); });
+        }
+        list.appendChild(li);
+      });
+
+      if (data.more) {
+        const li = document.createElement("li");
+        li.className = "ac-more";
+        li.textContent = "Plus de résultats…";
+        li.addEventListener("mousedown", (e) => { e.preventDefault(); load(lastQuery, page + 1); });
+        list.appendChild(li);
+      }
+      list.hidden = false;
+    }
+
+    function load(q, wantedPage) {
+      if (controller) controller.abort();
+      controller = new AbortController();
+      const params = new URLSearchParams(fixedParams);
+      forward.forEach(([param, fieldName]) => {
+        const field = select.form && select.form.elements[fieldName];
+        if (field && field.value) params.set(param, field.value);
+      });
+      params.set("q", q);
+      params.set("page", wantedPage);
+      fetch(`${baseUrl}?${params.toString()}`, {
+        credentials: "same-origin",
+        headers: { "X-Requested-With": "XMLHttpRequest" },
+        signal: controller.signal,
+      })
+        .then((r) => r.json())
+        .then((data) => {
+          page = wantedPage;
+          lastQuery = q;
+          renderItems(data, wantedPage > 1);
+        })
+        .catch((err) => {
+          if (err.name !== "AbortError") console.error("Erreur autocomplete:", err);
+        });
+    }
+
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => load(input.value.trim(), 1), DEBOUNCE_MS);
+    });
+    input.addEventListener("focus", () => load(input.value.trim(), 1));
+    input.addEventListener("blur", () => setTimeout(close, 150));
+    input.addEventListener("keydown", (e) => {
+      if (e.key === "Escape") close();
+      if (e.key === "Enter") e.preventDefault();
+    });
+
+    renderChips();
+  }
+
+  function init(root) {
+    injectStyles();
+    (root || document).querySelectorAll("select[data-autocomplete-url]").forEach(setup);
+  }
+
+  window.ArgonAutocomplete = { init };
+  document.addEventListener("DOMContentLoaded", () => init(document));
+})();
@@ -0,0 +1,138 @@
+// Formulaire session (admin) : formateurs libres sur les dates saisies.
+// Endpoint : /api/trainers/availability/ (trainings.views.trainer_availability_json).
+(function () {
+  function esc(value) {
+    const div = document.createElement("div");
+    div.textContent = value == null ? "" : String(value);
+    return div.innerHTML;
+  }
+
+  function fieldValue(id) {
+    const el = document.getElementById(id);
+    return el ? (el.value || "").trim() : "";
+  }
+
+  function frDate(iso) {
+    const [y, m, d] = iso.split("-");
+    return `${d}/${m}/${y}`;
+  }
+
+  // trainer / backup_trainer sont des listes autocomplete (select2) : on ajoute l'option puis on notifie
+  function pickTrainer(fieldId, item) {
+    const select = document.getElementById(fieldId);
+    if (!select) return;
+    let opt = Array.from(select.options).find((o) => o.value === String(item.trainer_id));
+    if (!opt) {
+      opt = new Option(item.name, item.trainer_id, true, true);
+      select.add(opt);
+    }
+    select.value = String(item.trainer_id);
+    if (window.django && window.django.jQuery) {
+      window.django.jQuery(select).trigger("change");
+    } else {
+      select.dispatchEvent(new Event("change", { bubbles: true }));
+    }
+  }
+
+  function reasons(item) {
+    const out = [];
+    if (!item.qualified) out.push("module non validé");
+    if (!item.is_free) out.push("pas de créneau libre");
+    if (!item.under_load) out.push("charge trop haute");
+    return out.join(", ");
+  }
+
+  function render(container, data) {
+    container.innerHTML = "";
+    if (!data.trainers.length) {
+      container.textContent = "Aucun formateur actif pour ce produit.";
+      return;
+    }
+
+    const summary = document.createElement("div");
+    summary.style.margin = "0 0 6px";
+    summary.textContent = `${data.count} formateur(s) disponible(s)`;
+    container.appendChild(summary);
+
+    const table = document.createElement("table");
+    table.innerHTML = `
+      <thead><tr>
+        <th>Formateur</th><th>Charge → avec session</th><th>Créneaux libres</th><th>Occupé</th><th></th>
+      </tr></thead>`;
+    const tbody = document.createElement("tbody");
+
+    data.trainers.forEach((item) => {
+      const tr = document.createElement("tr");
+      if (!item.available) tr.style.opacity = "0.55";
+      const slots = item.slots.map((s) => (s.start === s.end ? frDate(s.start) : `${frDate(s.start)} → ${frDate(s.end)}`));
+      const conflicts = item.conflicts.map((c) => `${esc(c.label)} (${frDate(c.start)} → ${frDate(c.end)})`);
+      tr.innerHTML = `
+        <td><strong>${esc(item.name)}</strong>${item.available ? "" : `<br><small>${esc(reasons(item))}</small>`}</td>
+        <td>${item.load_rate}% → ${item.projected_load_rate}%</td>
+        <td>${slots.length ? slots.join("<br>") : "—"}</td>
+        <td>${conflicts.length ? conflicts.join("<br>") : "—"}</td>
+        <td></td>`;
+
+      const actions = tr.lastElementChild;
+      [["id_trainer", "Principal"], ["id_backup_trainer", "Backup"]].forEach(([fieldId, label]) => {
+        const btn = document.createElement("button");
+        btn.type = "button";
+        btn.className = "button";
+        btn.style.marginRight = "4px";
+        btn.textContent = label;
+        btn.addEventListener("click", () => pickTrainer(fieldId, item));
+        actions.appendChild(btn);
+      });
+      tbody.appendChild(tr);
+    });
+
+    table.appendChild(tbody);
+    container.appendChild(table);
+  }
+
+  function search(box) {
+    const results = box.querySelector("#ta-results");
+    const from = fieldValue("id_start_date");
+    if (!from) {
+      results.textContent = "Renseigne d'abord la date de début.";
+      return;
+    }
+
+    const params = new URLSearchParams({ from });
+    const to = fieldValue("id_end_date");
+    if (to) params.set("to", to);
+    const days = fieldValue("id_days_count");
+    if (days) params.set("days", days);
+    const trainingType = fieldValue("id_training_type");
+    if (trainingType) params.set("training_type_id", trainingType);
+    const moduleId = fieldValue("ta-module");
+    if (moduleId) params.set("module_id", moduleId);
+    const maxLoad = fieldValue("ta-max-load");
+    if (maxLoad) params.set("max_load", maxLoad);
+    if (box.dataset.sessionId) params.set("exclude_session_id", box.dataset.sessionId);
+
+    results.textContent = "Recherche…";
+    fetch(`${box.dataset.url}?${params.toString()}`, {
+      credentials: "same-origin",
+      headers: { "X-Requested-With": "XMLHttpRequest" },
+    })
+      .then((r) => r.json())
+      .then((data) => {
+        if (!data.ok) {
+          results.textContent = data.message || "Erreur.";
+          return;
+        }
+        render(results, data);
+      })
+      .catch((err) => {
+        console.error("Erreur disponibilités formateurs:", err);
+        results.textContent = "Erreur lors de la recherche.";
+      });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    const box = document.getElementById("trainer-availability");
+    if (!box) return;
+    box.querySelector("#ta-search").addEventListener("click", () => search(box));
+  });
+})();
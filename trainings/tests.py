@@ -1,3 +1,729 @@
-from django.test import TestCase
+import smtplib
+import tempfile
+import warnings
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import django
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.db import connection
+from django.test import Client as TestClient, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from argonteam.models import (
+    ArgonosModule,
+    ObjectiveStatus,
+    OneToOneMeeting,
+    OneToOneObjective,
+    TrainerModuleMastery,
+)
+from argonteam.services.module_graph import get_module_graph, invalidate_module_graph
+from projects.models import Project
+
+from .models import (
+    Client,
+    MercureInvoice,
+    OutboundEmail,
+    OutboundEmailKind,
+    OutboundEmailStatus,
+    Participant,
+    Registration,
+    RegistrationStatus,
+    Room,
+    Session,
+    SessionBillingMode,
+    Trainer,
+    Training,
+    TrainingType,
+)
+from .services.counters import batched_session_refresh, refresh_session_counters
+from .services.calendar_feeds import feed_path, rotate_feed_secret
+from .services.invitations import InvitationResult
+from .services.prerequisites import check_eligibility, missing_prerequisites
+from .services.trainer_availability import (
+    MAX_RANGE_DAYS,
+    BusyInterval,
+    IntervalIndex,
+    find_available_trainers,
+    free_slots,
+)
+from .services.mailer import (
+    claim_batch,
+    dispatch_pending,
+    enqueue_session_convocations,
+    enqueue_session_reminders,
+    retry_delay,
+)
+
+
+class ArgonosManagerDashboardTests(TestCase):
+    """
+    Le dashboard manager ArgonOS doit rester à nombre de requêtes constant,
+    quel que soit le volume d'objectifs / formateurs.
+    """
+
+    # session + user + groupes (manager_required) + formateurs + objectifs + maîtrises
+    EXPECTED_QUERIES = 6
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("manager", "manager@example.com", "pwd")
+        cls.modules = [ArgonosModule.objects.create(name=f"Module {i}") for i in range(3)]
+
+    def setUp(self):
+        invalidate_module_graph()
+        get_module_graph()  # graphe en cache, comme en production
+        self.client.force_login(self.user)
+        self.url = reverse("trainings:argonos_manager_dashboard")
+        self.today = timezone.localdate()
+
+    def _add_trainer(self, index: int, objectives: int) -> Trainer:
+        trainer = Trainer.objects.create(first_name="F", last_name=f"Formateur {index}", product="ARGONOS")
+        meeting = OneToOneMeeting.objects.create(trainer=trainer, week_start=self.today)
+        statuses = [ObjectiveStatus.TODO, ObjectiveStatus.BLOCKED, ObjectiveStatus.DONE]
+        for i in range(objectives):
+            OneToOneObjective.objects.create(
+                trainer=trainer,
+                meeting=meeting,
+                title=f"Objectif {i}",
+                status=statuses[i % len(statuses)],
+                due_date=self.today + timedelta(days=(i % 5) * 4 - 8),
+            )
+        TrainerModuleMastery.objects.create(
+            trainer=trainer,
+            module=self.modules[0],
+            manager_status=TrainerModuleMastery.STATUS_OK,
+        )
+        return trainer
+
+    def test_query_count_is_constant(self):
+        self._add_trainer(1, objectives=3)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            self.client.get(self.url)
+
+        for index in range(2, 8):
+            self._add_trainer(index, objectives=12)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_kpis_match_per_trainer_rows(self):
+        for index in range(3):
+            self._add_trainer(index, objectives=6)
+
+        response = self.client.get(self.url)
+        rows = response.context["rows"]
+
+        objectives = OneToOneObjective.objects.filter(trainer__product="ARGONOS")
+        not_done = objectives.exclude(status=ObjectiveStatus.DONE)
+        self.assertEqual(response.context["kpi_total"], objectives.count())
+        self.assertEqual(response.context["kpi_open"], not_done.count())
+        self.assertEqual(response.context["kpi_blocked"], objectives.filter(status=ObjectiveStatus.BLOCKED).count())
+        self.assertEqual(response.context["kpi_overdue"], not_done.filter(due_date__lt=self.today).count())
+        self.assertEqual(response.context["kpi_total"], sum(r["objectives_total"] for r in rows))
+        self.assertEqual([r["modules_validated"] for r in rows], [1, 1, 1])
+        self.assertEqual(rows[0]["modules_total"], len(self.modules))
+
+
+class AdminChangelistQueryCountTests(TestCase):
+    """
+    Les listes admin les plus volumineuses doivent garder un nombre de requêtes
+    constant quand le nombre de lignes affichées augmente (pas de requête par ligne).
+    """
+
+    CHANGELISTS = (
+        "admin:trainings_session_changelist",
+        "admin:trainings_registration_changelist",
+        "admin:trainings_participant_changelist",
+        "admin:trainings_mercureinvoice_changelist",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pwd")
+        cls.training_type = TrainingType.objects.create(name="Type")
+        cls.training = Training.objects.create(title="Formation", training_type=cls.training_type)
+        cls.today = timezone.localdate()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.counter = 0
+
+    def _add_rows(self, count: int) -> None:
+        for _ in range(count):
+            self.counter += 1
+            i = self.counter
+            client = Client.objects.create(name=f"Client {i}")
+            trainer = Trainer.objects.create(first_name="F", last_name=f"Formateur {i}")
+            session = Session.objects.create(
+                reference=f"S{i}",
+                training_type=self.training_type,
+                training=self.training,
+                client=client,
+                trainer=trainer,
+                start_date=self.today,
+                end_date=self.today,
+            )
+            participant = Participant.objects.create(
+                client=client, first_name="P", last_name=f"Participant {i}", email=f"p{i}@example.com"
+            )
+            Registration.objects.create(session=session, participant=participant)
+            MercureInvoice.objects.create(session=session, trainer=trainer, reference=f"F{i}")
+
+    def _query_count(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_constant(self):
+        self._add_rows(1)
+        baseline = {name: self._query_count(reverse(name)) for name in self.CHANGELISTS}
+
+        self._add_rows(6)
+        for name in self.CHANGELISTS:
+            with self.subTest(changelist=name):
+                with self.assertNumQueries(baseline[name]):
+                    self.client.get(reverse(name))
+
+    def test_participant_registrations_are_annotated(self):
+        self._add_rows(2)
+        response = self.client.get(reverse("admin:trainings_participant_changelist"))
+        counts = [p._registrations_count for p in response.context["cl"].result_list]
+        self.assertEqual(counts, [1, 1])
+
+
+class CountingEmailBackend(LocmemEmailBackend):
+    """Backend locmem qui compte les ouvertures de connexion (= sessions TLS en SMTP)."""
+
+    opened = 0
+    fail_for: set[str] = set()
+    # destinataires pour lesquels le backend renvoie 0 sans lever d'erreur
+    silent_for: set[str] = set()
+    # destinataires qui coupent la connexion ; la reconnexion échoue ensuite
+    disconnect_for: set[str] = set()
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        if CountingEmailBackend.opened > 1 and self.disconnect_for:
+            raise ConnectionRefusedError("Serveur injoignable")
+        return super().open()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & self.disconnect_for:
+                raise smtplib.SMTPServerDisconnected("Connexion perdue")
+            if set(message.to) & self.fail_for:
+                raise smtplib.SMTPDataError(451, b"Temporary failure")
+            if set(message.to) & self.silent_for:
+                return 0
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND="trainings.tests.CountingEmailBackend")
+class OutboundEmailQueueTests(TestCase):
+    """
+    File d'envoi : un lot part sur une seule connexion, chaque email garde son
+    statut, les échecs temporaires sont retentés plus tard.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        training_type = TrainingType.objects.create(name="Type")
+        training = Training.objects.create(title="Formation", training_type=training_type)
+        client = Client.objects.create(name="Client")
+        trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        cls.session = Session.objects.create(
+            reference="S1",
+            training_type=training_type,
+            training=training,
+            client=client,
+            trainer=trainer,
+            start_date=timezone.localdate() + timedelta(days=7),
+        )
+        participants = Participant.objects.bulk_create(
+            Participant(client=client, first_name="P", last_name=f"Participant {i:03}", email=f"p{i}@example.com")
+            for i in range(200)
+        )
+        cls.registrations = Registration.objects.bulk_create(
+            Registration(session=cls.session, participant=p) for p in participants
+        )
+
+    def setUp(self):
+        CountingEmailBackend.opened = 0
+        CountingEmailBackend.fail_for = set()
+        CountingEmailBackend.silent_for = set()
+        CountingEmailBackend.disconnect_for = set()
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = override_settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _invitations(self) -> InvitationResult:
+        folder = Path(self.media.name) / "convocations" / "S1"
+        folder.mkdir(parents=True)
+        pdf_by_registration = {}
+        for r in self.registrations:
+            name = f"Convocation_{r.id}_FR.pdf"
+            (folder / name).write_bytes(b"%PDF-1.4")
+            pdf_by_registration[r.id] = name
+        return InvitationResult(
+            folder_rel="convocations/S1",
+            folder_abs=str(folder),
+            pdf_files=list(pdf_by_registration.values()),
+            emails_file="emails_fr.txt",
+            pdf_by_registration=pdf_by_registration,
+        )
+
+    def test_batch_reuses_one_connection(self):
+        queued = enqueue_session_convocations(self.session, self._invitations(), "fr")
+        self.assertEqual(queued, 200)
+
+        result = dispatch_pending(batch_size=200, rate_per_minute=0)
+
+        self.assertEqual(result.sent, 200)
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 200)
+        self.assertEqual(len(mail.outbox[0].attachments), 1)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmailStatus.SENT).exists())
+
+    def test_enqueue_skips_already_queued(self):
+        enqueue_session_reminders(self.session)
+        self.assertEqual(enqueue_session_reminders(self.session), 0)
+        self.assertEqual(enqueue_session_reminders(self.session, resend=True), 200)
+        self.assertEqual(OutboundEmail.objects.filter(kind=OutboundEmailKind.REMINDER).count(), 400)
+
+    def test_rate_limit_spaces_messages(self):
+        enqueue_session_reminders(self.session)
+        waits = []
+        dispatch_pending(batch_size=5, rate_per_minute=60, sleep=waits.append)
+        self.assertEqual(len(waits), 4)
+        self.assertTrue(all(0 < w <= 1.0 for w in waits))
+
+    def test_temporary_failure_is_retried_with_backoff(self):
+        enqueue_session_reminders(self.session)
+        CountingEmailBackend.fail_for = {"p0@example.com"}
+
+        result = dispatch_pending(batch_size=200, rate_per_minute=0, max_attempts=2)
+        self.assertEqual((result.sent, result.retried, result.failed), (199, 1, 0))
+
+        email = OutboundEmail.objects.get(to_email="p0@example.com")
+        self.assertEqual(email.status, OutboundEmailStatus.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("SMTPDataError", email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(retry_delay(3, base_seconds=60), timedelta(minutes=4))
+
+        # pas encore dû : rien à envoyer
+        self.assertEqual(dispatch_pending(rate_per_minute=0).processed, 0)
+
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        result = dispatch_pending(rate_per_minute=0, max_attempts=2)
+        self.assertEqual(result.failed, 1)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmailStatus.FAILED, 2))
+
+    def test_missing_attachment_fails_without_retry(self):
+        result = self._invitations()
+        enqueue_session_convocations(self.session, result, "fr")
+        missing = Path(result.folder_abs) / result.pdf_by_registration[self.registrations[0].id]
+        missing.unlink()
+
+        dispatch = dispatch_pending(batch_size=200, rate_per_minute=0)
+
+        self.assertEqual((dispatch.sent, dispatch.failed), (199, 1))
+        email = OutboundEmail.objects.get(registration=self.registrations[0])
+        self.assertEqual(email.status, OutboundEmailStatus.FAILED)
+        self.assertEqual(email.attempts, 1)
+
+    def test_silent_backend_failure_is_retried(self):
+        enqueue_session_convocations(self.session, self._invitations(), "fr")
+        CountingEmailBackend.silent_for = {"p0@example.com"}
+
+        result = dispatch_pending(batch_size=200, rate_per_minute=0)
+
+        self.assertEqual((result.sent, result.retried), (199, 1))
+        email = OutboundEmail.objects.get(to_email="p0@example.com")
+        self.assertEqual(email.status, OutboundEmailStatus.PENDING)
+        self.assertIn("EmailNotSent", email.last_error)
+
+    def test_failed_reconnect_releases_rest_of_batch(self):
+        enqueue_session_reminders(self.session)
+        first = OutboundEmail.objects.order_by("next_attempt_at", "id").values_list("to_email", flat=True)[:10]
+        CountingEmailBackend.disconnect_for = {first[9]}
+
+        result = dispatch_pending(batch_size=200, rate_per_minute=0)
+
+        self.assertEqual((result.sent, result.retried, result.reconnections), (9, 191, 0))
+        self.assertFalse(OutboundEmail.objects.filter(status=OutboundEmailStatus.SENDING).exists())
+        self.assertEqual(
+            OutboundEmail.objects.filter(last_error__startswith="ConnectionRefusedError").count(), 190
+        )
+
+    def test_batch_fits_before_stale_release(self):
+        enqueue_session_reminders(self.session)
+        # 1 email / minute : au plus 7 emails avant la moitié du délai de 15 min
+        result = dispatch_pending(batch_size=200, rate_per_minute=1, sleep=lambda s: None)
+        self.assertEqual(result.sent, 7)
+
+    def test_claim_returns_only_rows_it_moved(self):
+        enqueue_session_convocations(self.session, self._invitations(), "fr")
+        # lecture faite avant qu'un autre envoi ne prenne 50 emails (pas de SKIP LOCKED)
+        taken = list(OutboundEmail.objects.order_by("id").values_list("id", flat=True)[:50])
+        OutboundEmail.objects.filter(id__in=taken).update(status=OutboundEmailStatus.SENDING)
+        stale_read = lambda now=None: OutboundEmail.objects.all()
+
+        with mock.patch("trainings.services.mailer.due_emails", stale_read), \
+                mock.patch.object(connection.features, "has_select_for_update_skip_locked", False):
+            claimed = claim_batch(200)
+
+        self.assertEqual(len(claimed), 150)
+        self.assertFalse({e.id for e in claimed} & set(taken))
+
+
+class PrerequisiteRuleTests(TestCase):
+    """
+    Règle historique DP1 / DE1 : n'importe quelle Initiation ArgonOS suivie
+    suffit, même quand plusieurs Initiations sont déclarées en pré-requis.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        argonos = TrainingType.objects.create(name="ARGONOS")
+        client = Client.objects.create(name="Client")
+        trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        cls.initiations = [
+            Training.objects.create(title=title, training_type=argonos)
+            for title in ("Initiation ArgonOS", "Initiation ArgonOS (e-learning)")
+        ]
+        cls.dp1 = Training.objects.create(
+            title="Data Préparation Niveau 1", training_type=argonos, prerequisites_any=True,
+        )
+        cls.dp1.prerequisites.add(*cls.initiations)
+        cls.session = Session.objects.create(
+            reference="DP1", training_type=argonos, training=cls.dp1, client=client, trainer=trainer,
+        )
+
+        cls.trained = Participant.objects.create(client=client, first_name="A", last_name="Formé", email="a@example.com")
+        cls.newcomer = Participant.objects.create(client=client, first_name="B", last_name="Nouveau", email="b@example.com")
+        initiation_session = Session.objects.create(
+            reference="INIT", training_type=argonos, training=cls.initiations[1], client=client, trainer=trainer,
+        )
+        Registration.objects.create(
+            session=initiation_session, participant=cls.trained, status=RegistrationStatus.PRESENT,
+        )
+
+    def test_any_initiation_is_enough(self):
+        missing = missing_prerequisites(self.dp1.id, [self.trained.id, self.newcomer.id])
+        self.assertEqual(missing[self.trained.id], [])
+        self.assertEqual(
+            missing[self.newcomer.id],
+            ["Initiation ArgonOS ou Initiation ArgonOS (e-learning)"],
+        )
+
+        trained, newcomer = check_eligibility(self.session, ["a@example.com", "b@example.com"])
+        self.assertTrue(trained.ok)
+        self.assertFalse(newcomer.ok)
+
+    def test_all_prerequisites_required_by_default(self):
+        self.dp1.prerequisites_any = False
+        self.dp1.save(update_fields=["prerequisites_any"])
+
+        missing = missing_prerequisites(self.dp1.id, [self.trained.id])
+        self.assertEqual(missing[self.trained.id], ["Initiation ArgonOS"])
+
+
+# profilage coupé par défaut sous `manage.py test` ; ni échantillon ni requête lente journalisés
+@override_settings(
+    REQUEST_PROFILING_ENABLED=True, REQUEST_PROFILING_SAMPLE_RATE=0, REQUEST_PROFILING_SLOW_MS=60_000,
+)
+class RequestProfilingMiddlewareTests(TestCase):
+    """?_profile=1 : profil cProfile pour le staff, sans court-circuiter le CSRF."""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="Projet")
+        self.client = TestClient(enforce_csrf_checks=True)
+        self.client.force_login(User.objects.create_user("staff", is_staff=True))
+
+    def test_get_returns_profile(self):
+        response = self.client.get(reverse("trainings:home") + "?_profile=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+        self.assertIn(b"cumulative", response.content)
+
+    def test_server_timing_only_for_staff(self):
+        response = self.client.get(reverse("trainings:home"))
+        self.assertIn("sql;dur=", response["Server-Timing"])
+
+        trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        anonymous = TestClient()
+        response = anonymous.get(feed_path("trainer", trainer))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Server-Timing", response)
+
+    def test_post_keeps_csrf_check(self):
+        url = reverse("projects:project_delete", args=[self.project.pk])
+        response = self.client.post(url + "?_profile=1")
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+
+
+class CalendarFeedLinkTests(TestCase):
+    """Liens .ics : un secret par objet, révocable, jamais listé en masse."""
+
+    def setUp(self):
+        self.trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        self.other = Trainer.objects.create(first_name="A", last_name="Autre")
+        self.client.force_login(User.objects.create_user("user"))
+
+    def test_secrets_differ_per_object(self):
+        self.assertNotEqual(self.trainer.ics_secret, self.other.ics_secret)
+        path = feed_path("trainer", self.trainer)
+        forged = path.replace(f"/{self.trainer.pk}/", f"/{self.other.pk}/")
+        self.assertEqual(self.client.get(forged).status_code, 404)
+
+    def test_rotation_revokes_old_link(self):
+        old = feed_path("trainer", self.trainer)
+        self.assertEqual(self.client.get(old).status_code, 200)
+        rotate_feed_secret(self.trainer)
+        self.assertEqual(self.client.get(old).status_code, 404)
+        self.assertEqual(self.client.get(feed_path("trainer", self.trainer)).status_code, 200)
+
+    def test_lists_do_not_expose_links(self):
+        for name in ("trainings:trainers_list_json", "trainings:clients_list_json"):
+            self.assertNotIn(b"calendar", self.client.get(reverse(name)).content)
+        url = reverse("trainings:calendar_feed_link_json", args=["trainer", self.trainer.pk])
+        data = self.client.get(url).json()
+        self.assertTrue(data["url"].endswith(feed_path("trainer", self.trainer)))
+
+    def test_admin_changelists_do_not_print_links(self):
+        Room.objects.create(name="Salle")
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pwd"))
+        for model in ("room", "client", "trainer"):
+            response = self.client.get(reverse(f"admin:trainings_{model}_changelist"))
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn(b"/calendar/", response.content)
+
+
+class IntervalIndexTests(SimpleTestCase):
+    """Bornes incluses : intervalles contigus, imbriqués, week-ends, index vide."""
+
+    # lundi 19 octobre 2026
+    MON = date(2026, 10, 19)
+
+    def day(self, n):
+        return self.MON + timedelta(days=n)
+
+    def busy(self, start, end, label="x"):
+        return BusyInterval(self.day(start), self.day(end), "session", label)
+
+    def test_empty_index(self):
+        index = IntervalIndex()
+        self.assertEqual(index.overlapping(self.day(0), self.day(4)), [])
+        self.assertEqual(index.free_ranges(self.day(0), self.day(4)), [(self.day(0), self.day(4))])
+        self.assertEqual(free_slots(index, self.day(0), self.day(4), 5), [(self.day(0), self.day(4))])
+
+    def test_adjacent_intervals_merge_and_touch_bounds(self):
+        index = IntervalIndex([self.busy(0, 1), self.busy(2, 3)])
+        self.assertEqual(index.merged, [(self.day(0), self.day(3))])
+        # fin incluse : le jour 3 est encore occupé, le jour 4 est libre
+        self.assertEqual([i.end for i in index.overlapping(self.day(3), self.day(3))], [self.day(3)])
+        self.assertEqual(index.overlapping(self.day(4), self.day(4)), [])
+        self.assertEqual(index.free_ranges(self.day(0), self.day(4)), [(self.day(4), self.day(4))])
+
+    def test_nested_interval_after_long_one(self):
+        # le court intervalle imbriqué ne doit pas masquer la fin du long
+        index = IntervalIndex([self.busy(0, 9, "long"), self.busy(2, 3, "court")])
+        self.assertEqual([i.label for i in index.overlapping(self.day(7), self.day(8))], ["long"])
+        self.assertEqual(
+            sorted(i.label for i in index.overlapping(self.day(3), self.day(3))), ["court", "long"]
+        )
+        self.assertEqual(index.free_ranges(self.day(0), self.day(11)), [(self.day(10), self.day(11))])
+
+    def test_slots_skip_weekends(self):
+        # occupé du lundi au mercredi : 3 jours ouvrés libres = jeudi -> mardi suivant
+        index = IntervalIndex([self.busy(0, 2)])
+        self.assertEqual(free_slots(index, self.day(0), self.day(9), 3), [(self.day(3), self.day(7))])
+        # un créneau ne commence jamais un samedi
+        self.assertEqual(free_slots(index, self.day(5), self.day(7), 1), [(self.day(7), self.day(7))])
+        self.assertEqual(free_slots(index, self.day(5), self.day(6), 1), [])
+
+
+class TrainerAvailabilityJsonTests(TestCase):
+    def setUp(self):
+        Trainer.objects.create(first_name="F", last_name="Formateur")
+        self.client.force_login(User.objects.create_user("user"))
+        self.url = reverse("trainings:trainer_availability_json")
+
+    def test_rejects_non_finite_numbers(self):
+        for params in ({"days": "NaN"}, {"days": "Infinity"}, {"max_load": "nan"}):
+            response = self.client.get(self.url, {"from": "2026-10-19", **params})
+            self.assertEqual(response.status_code, 400, params)
+            self.assertFalse(response.json()["ok"])
+
+    def test_rejects_out_of_range_numbers(self):
+        # 1e30 : InvalidOperation dans as_dict ; 1e1000000 : math.ceil interminable
+        for params in (
+            {"days": "1e30"}, {"days": "1e1000000"}, {"days": "0"}, {"days": "-2"},
+            {"days": str(MAX_RANGE_DAYS + 1)}, {"max_load": "1e30"}, {"max_load": "-1"},
+        ):
+            response = self.client.get(self.url, {"from": "2026-10-19", **params})
+            self.assertEqual(response.status_code, 400, params)
+        with self.assertRaises(ValueError):
+            find_available_trainers(date_from=date(2026, 10, 19), days=Decimal("1e30"))
+
+    def test_range_is_capped(self):
+        start = date(2026, 10, 19)
+        response = self.client.get(self.url, {
+            "from": start.isoformat(),
+            "to": (start + timedelta(days=MAX_RANGE_DAYS + 1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(self.url, {"from": start.isoformat(), "to": "2026-10-23", "days": "366"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 0)
+
+
+class ChangeTrackingMixinTests(TestCase):
+    """Après un save limité à certains champs, les autres restent « modifiés »."""
+
+    def setUp(self):
+        self.training_type = TrainingType.objects.create(name="Type")
+        self.training_type.name = "Renommé"
+        self.training_type.product = "MERCURE"
+
+    def assert_only_product_saved(self):
+        self.assertFalse(self.training_type.has_changed("product"))
+        self.assertTrue(self.training_type.has_changed("name"))
+
+    def test_keyword_update_fields(self):
+        self.training_type.save(update_fields=["product"])
+        self.assert_only_product_saved()
+
+    @skipUnless(django.VERSION < (6, 0), "arguments positionnels retirés de Model.save() en Django 6.0")
+    def test_positional_update_fields(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            self.training_type.save(False, False, None, ["product"])
+        self.assert_only_product_saved()
+
+
+class SessionCounterTests(TestCase):
+    """
+    Compteurs de session (prévus / présents) tenus par UPDATE corrélé, et
+    recalculs regroupés dans batched_session_refresh().
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.training_type = TrainingType.objects.create(name="Type")
+        cls.training = Training.objects.create(title="Formation", training_type=cls.training_type)
+        cls.customer = Client.objects.create(name="Client")
+        cls.trainer = Trainer.objects.create(first_name="F", last_name="Formateur")
+        cls.participants = Participant.objects.bulk_create(
+            Participant(client=cls.customer, first_name="P", last_name=f"Participant {i}", email=f"c{i}@example.com")
+            for i in range(5)
+        )
+
+    def new_session(self, reference, **kwargs):
+        return Session.objects.create(
+            reference=reference,
+            training_type=self.training_type,
+            training=self.training,
+            client=self.customer,
+            trainer=self.trainer,
+            # annulation à plus de 30 jours : non facturée
+            start_date=timezone.localdate() + timedelta(days=60),
+            **kwargs,
+        )
+
+    def setUp(self):
+        self.session = self.new_session(
+            "S1",
+            billing_mode=SessionBillingMode.INDIVIDUAL,
+            applied_participant_price_ht=Decimal("100.00"),
+        )
+
+    def counters(self, session=None):
+        session = session or self.session
+        session.refresh_from_db()
+        return session.expected_participants, session.present_count
+
+    def register(self, participant, session=None, **kwargs):
+        return Registration.objects.create(session=session or self.session, participant=participant, **kwargs)
+
+    def test_counters_follow_registration_changes(self):
+        first = self.register(self.participants[0])
+        second = self.register(self.participants[1])
+        self.assertEqual(self.counters(), (2, 0))
+        self.assertEqual(self.session.price_ht, Decimal("200.00"))
+
+        first.status = RegistrationStatus.PRESENT
+        first.save()
+        self.assertEqual(self.counters(), (2, 1))
+
+        second.status = RegistrationStatus.CANCELED
+        second.save()
+        self.assertEqual(self.counters(), (1, 1))
+        self.assertEqual(self.session.price_ht, Decimal("100.00"))
+
+        first.delete()
+        self.assertEqual(self.counters(), (0, 0))
+        self.assertEqual(self.session.price_ht, Decimal("0.00"))
+
+    def test_moving_registration_updates_both_sessions(self):
+        other = self.new_session("S2")
+        registration = self.register(self.participants[0])
+        registration.session = other
+        registration.save()
+        self.assertEqual(self.counters(), (0, 0))
+        self.assertEqual(self.counters(other), (1, 0))
+
+    def test_refresh_repairs_drifted_counters(self):
+        other = self.new_session("S2")
+        Registration.objects.bulk_create([
+            Registration(session=self.session, participant=self.participants[0], status=RegistrationStatus.PRESENT),
+            Registration(session=other, participant=self.participants[1]),
+        ])
+        self.assertEqual(self.counters(), (0, 0))
+
+        self.assertEqual(refresh_session_counters([self.session.pk, other.pk], batch_size=1), 2)
+        self.assertEqual((self.counters(), self.counters(other)), ((1, 1), (1, 0)))
+
+        Session.objects.update(expected_participants=9, present_count=9)
+        refresh_session_counters()
+        self.assertEqual((self.counters(), self.counters(other)), ((1, 1), (1, 0)))
+
+    def test_batched_refresh_runs_once_on_exit(self):
+        with CaptureQueriesContext(connection) as queries:
+            with batched_session_refresh():
+                for participant in self.participants:
+                    self.register(participant)
+                # bloc imbriqué absorbé par le bloc externe
+                with batched_session_refresh():
+                    self.register(self.participants[0], session=self.new_session("S2"))
+                self.assertEqual(self.counters(), (0, 0))
+
+        self.assertEqual(self.counters(), (5, 0))
+        self.assertEqual(self.session.price_ht, Decimal("500.00"))
+        counter_updates = [
+            q for q in queries.captured_queries
+            if q["sql"].startswith('UPDATE "trainings_session" SET "expected_participants"')
+        ]
+        self.assertEqual(len(counter_updates), 1)
+
+    def test_collective_session_price_ignores_registrations(self):
+        session = self.new_session("S2", applied_session_price_ht=Decimal("900.00"))
+        self.register(self.participants[0], session=session)
+        self.register(self.participants[1], session=session)
+        self.assertEqual(self.counters(session), (2, 0))
+        self.assertEqual(session.price_ht, Decimal("900.00"))
@@ -12,6 +12,7 @@ urlpatterns = [
     # =========================================================
     path("", views.home_view, name="home"),
     path("agenda/", views.agenda_view, name="agenda"),
+    path("calendar/<str:kind>/<int:obj_id>/<str:token>.ics", views.calendar_feed, name="calendar_feed"),
     path("dashboard/", views.dashboard_view, name="dashboard"),
 
     # =========================================================
@@ -69,7 +70,13 @@ urlpatterns = [
     path("api/trainings/", views.trainings_by_type_json, name="trainings_by_type_json"),
     path("api/clients/", views.clients_list_json, name="clients_list_json"),
     path("api/trainers/", views.trainers_list_json, name="trainers_list_json"),
+    path("api/calendar-link/<str:kind>/<int:obj_id>/", views.calendar_feed_link_json, name="calendar_feed_link_json"),
+    path("api/participants/autocomplete/", views.participants_autocomplete_json, name="participants_autocomplete_json"),
+    path("api/referrers/autocomplete/", views.referrers_autocomplete_json, name="referrers_autocomplete_json"),
+    path("api/sessions/autocomplete/", views.sessions_autocomplete_json, name="sessions_autocomplete_json"),
     path("api/trainings-legend/", views.trainings_legend_json, name="trainings_legend_json"),
+    path("api/sessions/availability/", views.session_availability_json, name="session_availability_json"),
+    path("api/trainers/availability/", views.trainer_availability_json, name="trainer_availability_json"),
 
     # =========================================================
     # Détail session
@@ -166,6 +173,7 @@ urlpatterns = [
     path("test-pdf/", views.test_pdf, name="test_pdf"),
     path("alerts/convocations/<int:session_id>/create-invitations/", views.create_invitations, name="create_invitations"),
     path("api/prereq-initiation/", views.api_prereq_initiation, name="api_prereq_initiation"),
+    path("api/prereq-batch/", views.api_prereq_batch, name="api_prereq_batch"),
 
     path("partners/", views.partners_dashboard, name="partners_dashboard"),
     
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import glob
 import os
+import re
 from collections import defaultdict
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from functools import wraps
 
 import pdfkit
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
@@ -19,13 +21,30 @@ from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
 from django.utils.encoding import smart_str
-from django.views.decorators.http import require_POST
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET, require_POST
 from calendar import monthrange
 from django.db import models
+from .services import autocomplete
 from .services.participants import get_or_create_participant_identity
+from .services.counters import batched_session_refresh
+from .services.availability import find_available_sessions
+from .services.trainer_availability import MAX_LOAD_LIMIT, MAX_RANGE_DAYS, find_available_trainers
+from .services.prerequisites import (
+    check_eligibility,
+    missing_prerequisites,
+    prerequisite_rule,
+    training_prerequisites,
+)
+from .services.trainer_profile import get_trainer_profile, open_objective_counts
+from .services.dashboard_cache import cached_block
+from .services.workload import trainer_workload_rows, working_days_between
+from .services.calendar_feeds import FEED_MODELS, build_feed, check_feed_token, feed_path
 
 from trainings.services.invitations import generate_invitations_for_session
+from trainings.services.mailer import enqueue_session_convocations
 
 from .forms import (
     BulkRegistrationForm,
@@ -45,6 +64,7 @@ from .models import (
     PartnerContract,
     PartnerContractPlan,
     PartnerContractPlanSeat,
+    Product,
     Referrer,
     Registration,
     RegistrationStatus,
@@ -53,13 +73,10 @@ from .models import (
     Trainer,
     Training,
     TrainingType,
-    SessionStatus,
     TrainerAbsence,
-    TrainerWorkloadEntry,
 )
 
 from argonteam.models import (
-    ArgonosModule,
     ObjectiveCategory,
     ObjectiveStatus,
     OneToOneMeeting,
@@ -67,6 +84,7 @@ from argonteam.models import (
     OneToOneStatus,
     TrainerModuleMastery,
 )
+from argonteam.services.module_graph import MASTERED_Q, get_module_graph
 
 try:
     from projects.models import Project, Task, TaskAssignment
@@ -203,82 +221,6 @@ def _month_bounds_from_string(month_str: str | None) -> tuple[date, date, str]:
     return start, end, normalized
 
 
-def _working_days_between(start: date, end: date) -> int:
-    """
-    Nombre de jours ouvrés (lun->ven) inclusifs.
-    """
-    if end < start:
-        return 0
-
-    current = start
-    total = 0
-    while current <= end:
-        if current.weekday() < 5:
-            total += 1
-        current += timedelta(days=1)
-    return total
-
-
-def _inclusive_days_between(start: date | None, end: date | None) -> int:
-    if not start:
-        return 0
-    if not end:
-        end = start
-    if end < start:
-        return 0
-    return (end - start).days + 1
-
-
-def _overlap_inclusive_days(
-    start_a: date | None,
-    end_a: date | None,
-    start_b: date,
-    end_b: date,
-) -> int:
-    """
-    Nombre de jours calendaires inclusifs communs entre [a] et [b].
-    """
-    if not start_a:
-        return 0
-
-    if not end_a:
-        end_a = start_a
-
-    a = max(start_a, start_b)
-    b = min(end_a, end_b)
-
-    if b < a:
-        return 0
-    return (b - a).days + 1
-
-
-def _prorated_days_for_period(
-    item_start: date | None,
-    item_end: date | None,
-    item_days_count: Decimal | None,
-    period_start: date,
-    period_end: date,
-) -> Decimal:
-    """
-    Répartit proportionnellement days_count selon le chevauchement de dates.
-    Exemple :
-    - item sur 4 jours calendaires
-    - chevauchement de 2 jours
-    => 50% de days_count
-    """
-    if not item_start:
-        return Decimal("0.0")
-
-    total_span = _inclusive_days_between(item_start, item_end)
-    overlap = _overlap_inclusive_days(item_start, item_end, period_start, period_end)
-
-    if total_span <= 0 or overlap <= 0:
-        return Decimal("0.0")
-
-    base = item_days_count if item_days_count is not None else Decimal(str(overlap))
-    return (Decimal(overlap) / Decimal(total_span)) * Decimal(base)
-
-
 def _workload_status_label(rate_pct: Decimal) -> str:
     if rate_pct > Decimal("100"):
         return "Surcharge"
@@ -288,6 +230,35 @@ def _workload_status_label(rate_pct: Decimal) -> str:
         return "Sous-charge"
     return "OK"
 
+
+def _team_load_snapshot(trainer_rows: list[dict], limit: int) -> tuple[list[dict], Decimal, int]:
+    """
+    Synthèse équipe (accueil, centre de pilotage) :
+    (formateurs les plus chargés, charge moyenne, nb en surcharge).
+    """
+    total_load_rate = sum((row["load_rate"] for row in trainer_rows), Decimal("0.0"))
+    overload_count = sum(1 for row in trainer_rows if row["load_rate"] > Decimal("100"))
+    team_load_avg = (
+        round(total_load_rate / Decimal(len(trainer_rows)), 1) if trainer_rows else Decimal("0.0")
+    )
+
+    top_rows = [
+        {
+            "trainer": row["trainer"],
+            "load_rate": round(row["load_rate"], 1),
+            "status_label": _workload_status_label(row["load_rate"]),
+            "project_assignments_count": row["project_assignments_count"],
+        }
+        for row in trainer_rows
+    ]
+    top_rows = sorted(top_rows, key=lambda x: x["load_rate"], reverse=True)[:limit]
+
+    open_objectives = open_objective_counts(row["trainer"].id for row in top_rows)
+    for row in top_rows:
+        row["open_objectives_count"] = open_objectives.get(row["trainer"].id, 0)
+
+    return top_rows, team_load_avg, overload_count
+
 # =========================================================
 # Sync objectifs -> Tasks (projects app)
 # =========================================================
@@ -373,6 +344,58 @@ def _sync_task_from_objective(objective: OneToOneObjective) -> None:
 # Pages principales
 # =========================================================
 
+def _compute_home_kpis(week_start: date, week_end: date, month_start: date, month_end: date) -> dict:
+    """Indicateurs de l'accueil ne dépendant que des sessions / clients (mis en cache)."""
+    week_sessions = Session.objects.filter(start_date__gte=week_start, start_date__lte=week_end)
+
+    week_argonos_count = week_sessions.for_product(Product.ARGONOS).count()
+    week_mercure_count = week_sessions.for_product(Product.MERCURE).count()
+
+    planned_days = 0
+    for start_date, end_date in week_sessions.values_list("start_date", "end_date"):
+        planned_days += _session_days_in_week(start_date, end_date, week_start, week_end)
+
+    working_days = 5
+    week_utilization_pct = round((planned_days / working_days) * 100) if working_days else None
+
+    home_ca_qs = (
+        Session.objects
+        .annotate(ca_date=Coalesce("end_date", "start_date"))
+        .filter(
+            ca_date__isnull=False,
+            ca_date__gte=month_start,
+            ca_date__lte=month_end,
+        )
+    )
+
+    zero_dec = Value(Decimal("0.00"), output_field=DecimalField(max_digits=12, decimal_places=2))
+    month_totals = home_ca_qs.aggregate(
+        sessions=Count("id"),
+        ca=Coalesce(Sum("price_ht"), zero_dec),
+        travel=Coalesce(Sum("travel_fee_ht"), zero_dec),
+    )
+
+    partners_active = Client.objects.filter(is_partner=True).count()
+
+    sessions_partners_month = Session.objects.filter(
+        client__is_partner=True,
+        start_date__isnull=False,
+        start_date__gte=month_start,
+        start_date__lte=month_end,
+    ).count()
+
+    return {
+        "week_argonos_count": week_argonos_count,
+        "week_mercure_count": week_mercure_count,
+        "week_utilization_pct": week_utilization_pct,
+        "sessions_month": month_totals["sessions"],
+        "ca_month": month_totals["ca"] or Decimal("0.00"),
+        "travel_month": month_totals["travel"] or Decimal("0.00"),
+        "partners_active": partners_active,
+        "sessions_partners_month": sessions_partners_month,
+    }
+
+
 @login_required
 def home_view(request):
     today = date.today()
@@ -387,26 +410,13 @@ def home_view(request):
         month_end = date(today.year, today.month + 1, 1) - timedelta(days=1)
 
     # =========================================================
-    # Weekly sessions
+    # Weekly sessions / KPIs (en cache, invalidés par génération)
     # =========================================================
-    week_sessions = (
-        Session.objects
-        .select_related("training", "training_type", "client", "trainer")
-        .filter(start_date__gte=week_start, start_date__lte=week_end)
-    )
-
-    week_argonos_count = (
-        week_sessions.filter(
-            Q(training_type__name__iexact="ArgonOS")
-            | Q(training__training_type__name__iexact="ArgonOS")
-        ).count()
-    )
-
-    week_mercure_count = (
-        week_sessions.filter(
-            Q(training_type__name__iexact="Mercure")
-            | Q(training__training_type__name__iexact="Mercure")
-        ).count()
+    kpis = cached_block(
+        "home_kpis",
+        lambda: _compute_home_kpis(week_start, week_end, month_start, month_end),
+        depends_on=[Session, Training, TrainingType, Client],
+        key_parts=(week_start, week_end, month_start, month_end),
     )
 
     week_deadlines_count = None
@@ -425,12 +435,6 @@ def home_view(request):
                 .count()
             )
 
-    planned_days = 0
-    for start_date, end_date in week_sessions.values_list("start_date", "end_date"):
-        planned_days += _session_days_in_week(start_date, end_date, week_start, week_end)
-
-    working_days = 5
-    week_utilization_pct = round((planned_days / working_days) * 100) if working_days else None
     utilization_target = 80
 
     # =========================================================
@@ -491,40 +495,6 @@ def home_view(request):
 
     alerts_total = invoices_alerts_count + convocations_alerts_count
 
-    # =========================================================
-    # Home KPIs
-    # =========================================================
-    home_ca_qs = (
-        Session.objects
-        .annotate(ca_date=Coalesce("end_date", "start_date"))
-        .filter(
-            ca_date__isnull=False,
-            ca_date__gte=month_start,
-            ca_date__lte=month_end,
-        )
-    )
-
-    sessions_month = home_ca_qs.count()
-
-    ca_month = home_ca_qs.aggregate(
-        v=Coalesce(
-            Sum("price_ht"),
-            Value(Decimal("0.00")),
-            output_field=DecimalField(max_digits=12, decimal_places=2),
-        )
-    ).get("v") or Decimal("0.00")
-
-
-    travel_month = home_ca_qs.aggregate(
-        v=Coalesce(
-            Sum("travel_fee_ht"),
-            Value(Decimal("0.00")),
-            output_field=DecimalField(max_digits=12, decimal_places=2),
-        )
-    ).get("v") or Decimal("0.00")
-
-
-
     # =========================================================
     # Operations pulse
     # =========================================================
@@ -538,165 +508,19 @@ def home_view(request):
     # =========================================================
     # Team snapshot
     # =========================================================
-    active_trainers = list(
-        Trainer.objects
-        .filter(is_active=True)
-        .order_by("last_name", "first_name")
+    team_rows, team_load_avg, overload_count = _team_load_snapshot(
+        [row for row in trainer_workload_rows(month_start, month_end) if row["trainer"].is_active],
+        limit=5,
     )
 
-    team_rows = []
-    overload_count = 0
-    total_load_rate = Decimal("0.0")
-
-    month_working_days = _working_days_between(month_start, month_end)
-
-    session_statuses_included = [
-        SessionStatus.PLANNED,
-        SessionStatus.CONFIRMED,
-        SessionStatus.IN_PROGRESS,
-        SessionStatus.CLOSED,
-    ]
-
-    sessions_qs_month = (
-        Session.objects
-        .select_related("trainer", "backup_trainer")
-        .filter(
-            status__in=session_statuses_included,
-            start_date__isnull=False,
-            start_date__lte=month_end,
-        )
-        .filter(Q(end_date__isnull=True, start_date__gte=month_start) | Q(end_date__gte=month_start))
-    )
-
-    absences_qs = (
-        TrainerAbsence.objects
-        .select_related("trainer")
-        .filter(start_date__lte=month_end, end_date__gte=month_start)
-    )
-
-    workload_entries_qs = (
-        TrainerWorkloadEntry.objects
-        .select_related("trainer")
-        .exclude(status="CANCELED")
-        .filter(start_date__lte=month_end, end_date__gte=month_start)
-    )
-
-    task_assignments_qs = TaskAssignment.objects.none()
-    if TaskAssignment is not None:
-        task_assignments_qs = (
-            TaskAssignment.objects
-            .select_related("trainer", "task", "task__project")
-            .exclude(status=TaskAssignment.Status.CANCELED)
-            .filter(
-                trainer__isnull=False,
-                start_date__lte=month_end,
-                end_date__gte=month_start,
-            )
-        )
-
-    sessions_by_primary = defaultdict(list)
-    sessions_by_backup = defaultdict(list)
-    absences_by_trainer = defaultdict(list)
-    extra_workloads_by_trainer = defaultdict(list)
-    assignments_by_trainer = defaultdict(list)
-
-    for s in sessions_qs_month:
-        if s.trainer_id:
-            sessions_by_primary[s.trainer_id].append(s)
-        if s.backup_trainer_id:
-            sessions_by_backup[s.backup_trainer_id].append(s)
-
-    for absence in absences_qs:
-        absences_by_trainer[absence.trainer_id].append(absence)
-
-    for entry in workload_entries_qs:
-        extra_workloads_by_trainer[entry.trainer_id].append(entry)
-
-    for assignment in task_assignments_qs:
-        assignments_by_trainer[assignment.trainer_id].append(assignment)
-
-    for trainer in active_trainers:
-        availability_pct = Decimal(getattr(trainer, "workload_percent", Decimal("100.00")) or Decimal("100.00"))
-        theoretical_capacity = (Decimal(month_working_days) * availability_pct) / Decimal("100")
-
-        primary_days = Decimal("0.0")
-        for s in sessions_by_primary.get(trainer.id, []):
-            primary_days += _prorated_days_for_period(
-                s.start_date, s.end_date, s.days_count, month_start, month_end
-            )
-
-        backup_days = Decimal("0.0")
-        for s in sessions_by_backup.get(trainer.id, []):
-            backup_days += _prorated_days_for_period(
-                s.start_date, s.end_date, s.days_count, month_start, month_end
-            ) * Decimal("0.5")
-
-        absence_days = Decimal("0.0")
-        for a in absences_by_trainer.get(trainer.id, []):
-            absence_days += _prorated_days_for_period(
-                a.start_date, a.end_date, a.days_count, month_start, month_end
-            )
-
-        extra_days = Decimal("0.0")
-        for e in extra_workloads_by_trainer.get(trainer.id, []):
-            extra_days += _prorated_days_for_period(
-                e.start_date, e.end_date, e.days_count, month_start, month_end
-            )
-
-        project_days = Decimal("0.0")
-        for a in assignments_by_trainer.get(trainer.id, []):
-            project_days += _prorated_days_for_period(
-                a.start_date, a.end_date, a.planned_days, month_start, month_end
-            )
-
-        net_capacity = theoretical_capacity - absence_days
-        if net_capacity < 0:
-            net_capacity = Decimal("0.0")
-
-        total_planned = primary_days + backup_days + extra_days + project_days
-        if net_capacity > 0:
-            load_rate = (total_planned / net_capacity) * Decimal("100")
-        else:
-            load_rate = Decimal("0.0") if total_planned == 0 else Decimal("999.0")
-
-        if load_rate > Decimal("100"):
-            overload_count += 1
-
-        total_load_rate += load_rate
-
-        team_rows.append({
-            "trainer": trainer,
-            "load_rate": round(load_rate, 1),
-            "status_label": _workload_status_label(load_rate),
-            "project_assignments_count": len(assignments_by_trainer.get(trainer.id, [])),
-            "open_objectives_count": OneToOneObjective.objects.filter(trainer=trainer).exclude(
-                status=ObjectiveStatus.DONE
-            ).count(),
-        })
-
-    team_rows = sorted(team_rows, key=lambda x: x["load_rate"], reverse=True)[:5]
-    team_load_avg = round((total_load_rate / Decimal(len(active_trainers))), 1) if active_trainers else Decimal("0.0")
-
-    # =========================================================
-    # Partners snapshot
-    # =========================================================
-    partners_active = Client.objects.filter(is_partner=True).count()
-
-    sessions_partners_month = Session.objects.filter(
-        client__is_partner=True,
-        start_date__isnull=False,
-        start_date__gte=month_start,
-        start_date__lte=month_end,
-    ).count()
-
     return render(request, "trainings/home.html", {
         "today": today,
         "week_start": week_start,
         "week_end": week_end,
-        "week_argonos_count": week_argonos_count,
-        "week_mercure_count": week_mercure_count,
+        "week_argonos_count": kpis["week_argonos_count"],
+        "week_mercure_count": kpis["week_mercure_count"],
         "week_deadlines_count": week_deadlines_count if week_deadlines_count is not None else "—",
-        "week_utilization_pct": week_utilization_pct,
+        "week_utilization_pct": kpis["week_utilization_pct"],
         "utilization_target": utilization_target,
 
         "convocations_alerts": convocations_alerts_list,
@@ -706,17 +530,17 @@ def home_view(request):
         "alerts_total": alerts_total,
         "can_access_mercure": can_access_mercure,
 
-        "sessions_month": sessions_month,
-        "ca_month": ca_month,
-        "travel_month": travel_month,
+        "sessions_month": kpis["sessions_month"],
+        "ca_month": kpis["ca_month"],
+        "travel_month": kpis["travel_month"],
         "upcoming_sessions_short": upcoming_sessions_short,
 
         "team_rows": team_rows,
         "team_load_avg": team_load_avg,
         "overload_count": overload_count,
 
-        "partners_active": partners_active,
-        "sessions_partners_month": sessions_partners_month,
+        "partners_active": kpis["partners_active"],
+        "sessions_partners_month": kpis["sessions_partners_month"],
     })
 
 
@@ -730,6 +554,7 @@ def create_invitations(request, session_id: int):
     )
 
     lang = (request.POST.get("lang") or "fr").lower().strip()
+    send = request.POST.get("send") == "1"
     base_url = request.build_absolute_uri("/")
 
     try:
@@ -738,6 +563,9 @@ def create_invitations(request, session_id: int):
             request,
             f"✅ Convocations {lang.upper()} générées : {len(result.pdf_files)} PDF — {result.folder_rel}"
         )
+        if send:
+            queued = enqueue_session_convocations(session, result, lang)
+            messages.success(request, f"📧 {queued} email(s) de convocation mis en file d'envoi.")
     except Exception as e:
         messages.error(request, f"❌ Erreur convocations : {e}")
 
@@ -764,6 +592,32 @@ def agenda_view(request):
     return render(request, "trainings/agenda.html", {"today": today})
 
 
+@require_GET
+def calendar_feed(request, kind: str, obj_id: int, token: str):
+    """
+    Flux iCalendar d'un formateur / d'une salle / d'un client, à ajouter comme
+    abonnement dans Outlook ou Google Agenda. Accès par jeton signé (pas de
+    session). Les clients qui renvoient ETag / Last-Modified reçoivent un 304
+    tant que le flux ne change pas.
+    """
+    if kind not in FEED_MODELS or not check_feed_token(kind, obj_id, token):
+        raise Http404
+    feed = build_feed(kind, obj_id)
+    if feed is None:
+        raise Http404
+
+    etag = quote_etag(feed.etag)
+    last_modified = int(feed.last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(feed.body, content_type="text/calendar; charset=utf-8")
+        response["Content-Disposition"] = f'inline; filename="{kind}-{obj_id}.ics"'
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 @login_required
 def session_detail_view(request, session_id: int):
     session = get_object_or_404(
@@ -810,11 +664,21 @@ def bulk_registrations(request):
 
                 selected.append(participant)
 
-            for participant in selected:
-                Registration.objects.get_or_create(
-                    session=session,
-                    participant=participant,
-                    defaults={"status": RegistrationStatus.INVITED},
+            # un seul recalcul de la session pour tout le lot
+            with batched_session_refresh():
+                for participant in selected:
+                    Registration.objects.get_or_create(
+                        session=session,
+                        participant=participant,
+                        defaults={"status": RegistrationStatus.INVITED},
+                    )
+
+            missing = missing_prerequisites(session.training_id, [p.id for p in selected])
+            flagged = [p for p in selected if missing.get(p.id)]
+            if flagged:
+                messages.warning(
+                    request,
+                    "Pré-requis non validés pour : " + ", ".join(str(p) for p in flagged),
                 )
 
             return redirect(f"/admin/trainings/session/{session.id}/change/")
@@ -832,10 +696,28 @@ def bulk_registrations(request):
     if sid:
         selected_session = Session.objects.select_related("training", "client").filter(pk=sid).first()
 
+    # participants choisis qui n'ont pas les pré-requis de la formation
+    # (la recherche les signale déjà : on ne parcourt plus tout le client)
+    ineligible_participants = []
+    selected_ids = [v for v in (form["existing_participants"].value() or []) if str(v).isdigit()]
+    if selected_session and selected_ids:
+        candidates = form.fields["existing_participants"].queryset.filter(pk__in=selected_ids)
+        missing = missing_prerequisites(
+            selected_session.training_id,
+            candidates.values_list("id", flat=True),
+        )
+        flagged = {pid: titles for pid, titles in missing.items() if titles}
+        if flagged:
+            ineligible_participants = [
+                {"participant": p, "missing": flagged[p.id]}
+                for p in candidates.filter(pk__in=flagged.keys())
+            ]
+
     return render(request, "trainings/bulk_registrations.html", {
         "form": form,
         "formset": formset,
         "selected_session": selected_session,
+        "ineligible_participants": ineligible_participants,
     })
 
 
@@ -843,8 +725,13 @@ def bulk_registrations(request):
 # APIs
 # =========================================================
 
+# Endpoints JSON en lecture seule de l'agenda et des formulaires : vues async
+# (ORM async). Sous ASGI (config.asgi), les nombreuses petites requêtes
+# parallèles ne font plus la queue derrière les rendus de dashboards ;
+# sous WSGI, Django les exécute comme des vues classiques.
+
 @login_required
-def sessions_json(request):
+async def sessions_json(request):
     """Renvoie les sessions + absences pour FullCalendar avec filtres."""
 
     client_id = request.GET.get("client_id")
@@ -914,11 +801,8 @@ def sessions_json(request):
     if trainer_id:
         qs = qs.filter(trainer_id=trainer_id)
 
-    if product in ("ARGONOS", "MERCURE"):
-        qs = qs.filter(
-            Q(training_type__name__iexact=product)
-            | Q(training__training_type__name__iexact=product)
-        )
+    if product in Product.values:
+        qs = qs.for_product(product)
 
     if from_date:
         qs = qs.filter(start_date__gte=from_date)
@@ -927,7 +811,7 @@ def sessions_json(request):
 
     events = []
 
-    for session in qs:
+    async for session in qs:
         if not session.start_date:
             continue
 
@@ -974,7 +858,7 @@ def sessions_json(request):
         if trainer_id:
             abs_qs = abs_qs.filter(trainer_id=trainer_id)
 
-        if product in ("ARGONOS", "MERCURE"):
+        if product in Product.values:
             abs_qs = abs_qs.filter(trainer__product=product)
 
         if from_date:
@@ -982,7 +866,7 @@ def sessions_json(request):
         if to_date:
             abs_qs = abs_qs.filter(start_date__lte=to_date)
 
-        for absence in abs_qs:
+        async for absence in abs_qs:
             start_date = getattr(absence, "start_date", None)
             end_date = getattr(absence, "end_date", None) or start_date
             if not start_date:
@@ -1014,30 +898,214 @@ def sessions_json(request):
 
 
 @login_required
-def trainings_by_type_json(request):
+async def trainings_by_type_json(request):
     training_type_id = request.GET.get("training_type_id")
 
     qs = Training.objects.all().order_by("title")
     if training_type_id:
         qs = qs.filter(training_type_id=training_type_id)
 
-    data = [{"id": t.id, "title": t.title} for t in qs]
+    data = [{"id": t["id"], "title": t["title"]} async for t in qs.values("id", "title")]
     return JsonResponse(data, safe=False)
 
 
 @login_required
-def clients_list_json(request):
-    data = list(Client.objects.order_by("name").values("id", "name"))
+async def clients_list_json(request):
+    data = [row async for row in Client.objects.order_by("name").values("id", "name")]
     return JsonResponse(data, safe=False)
 
 
 @login_required
-def trainers_list_json(request):
-    qs = Trainer.objects.order_by("last_name", "first_name")
-    data = [{"id": t.id, "name": f"{t.first_name} {t.last_name}".strip()} for t in qs]
+async def trainers_list_json(request):
+    qs = Trainer.objects.order_by("last_name", "first_name").values("id", "first_name", "last_name")
+    data = [
+        {
+            "id": t["id"],
+            "name": f"{t['first_name']} {t['last_name']}".strip(),
+        }
+        async for t in qs
+    ]
     return JsonResponse(data, safe=False)
 
 
+@login_required
+async def calendar_feed_link_json(request, kind: str, obj_id: int):
+    """
+    Lien d'abonnement .ics d'un seul formateur / client / salle, demandé par
+    l'agenda quand on le sélectionne (les listes n'exposent aucun lien).
+    """
+    model = FEED_MODELS.get(kind)
+    if model is None:
+        raise Http404
+    obj = await model.objects.filter(pk=obj_id).only("pk", "ics_secret").afirst()
+    if obj is None:
+        raise Http404
+    return JsonResponse({"ok": True, "url": request.build_absolute_uri(feed_path(kind, obj))})
+
+
+# ---------------------------------------------------------
+# Autocomplete (trainings/autocomplete.js)
+# ---------------------------------------------------------
+# Réponse : {"results": [{"id", "text", ...}], "more": bool}, pages de 20
+# (page_size, max 50). Paramètres : q + filtres propres à chaque liste.
+
+def _autocomplete_page(request, qs):
+    page, page_size = autocomplete.page_bounds(request.GET.get("page"), request.GET.get("page_size"))
+    return autocomplete.paginate(qs, page, page_size)
+
+
+def _int_get(request, name):
+    value = (request.GET.get(name) or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+@login_required
+def participants_autocomplete_json(request):
+    """Participants ; session_id : limite au client de la session, signale inscrits et pré-requis."""
+    session = None
+    session_id = _int_get(request, "session_id")
+    if session_id:
+        session = Session.objects.filter(pk=session_id).only("id", "client_id", "training_id").first()
+
+    client_id = session.client_id if session else _int_get(request, "client_id")
+    qs = autocomplete.search_participants(request.GET.get("q", ""), client_id=client_id)
+    participants, more = _autocomplete_page(request, qs)
+    return JsonResponse({
+        "results": autocomplete.participant_results(participants, session=session),
+        "more": more,
+    })
+
+
+@login_required
+def referrers_autocomplete_json(request):
+    qs = autocomplete.search_referrers(request.GET.get("q", ""), client_id=_int_get(request, "client_id"))
+    referrers, more = _autocomplete_page(request, qs)
+    return JsonResponse({"results": autocomplete.referrer_results(referrers), "more": more})
+
+
+@login_required
+def sessions_autocomplete_json(request):
+    qs = autocomplete.search_sessions(request.GET.get("q", ""))
+    sessions, more = _autocomplete_page(request, qs)
+    return JsonResponse({"results": autocomplete.session_results(sessions), "more": more})
+
+
+@login_required
+def session_availability_json(request):
+    """
+    Sessions à venir avec places libres.
+    Filtres GET : training_id, product, client_id, site (client|room), room_id,
+    language, from, to (YYYY-MM-DD), min_seats.
+    """
+    def _int_param(name):
+        value = (request.GET.get(name) or "").strip()
+        return int(value) if value.isdigit() else None
+
+    def _date_param(name):
+        value = (request.GET.get(name) or "").strip()
+        try:
+            return date.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+
+    site = (request.GET.get("site") or "").strip().lower()
+    on_client_site = {"client": True, "room": False}.get(site)
+
+    results = find_available_sessions(
+        training_id=_int_param("training_id"),
+        product=request.GET.get("product") or "",
+        client_id=_int_param("client_id"),
+        on_client_site=on_client_site,
+        room_id=_int_param("room_id"),
+        language=(request.GET.get("language") or "").strip().lower(),
+        date_from=_date_param("from"),
+        date_to=_date_param("to"),
+        min_seats=_int_param("min_seats") or 1,
+    )
+
+    return JsonResponse({
+        "count": len(results),
+        "sessions": [item.as_dict() for item in results],
+    })
+
+
+@login_required
+def trainer_availability_json(request):
+    """
+    Formateurs libres pour une session (formulaire session de l'admin).
+    GET : from, to (YYYY-MM-DD), days (jours ouvrés consécutifs, défaut : toute la
+    période), module_id, max_load (%), product ou training_type_id,
+    exclude_session_id (session en cours d'édition), only_available=1.
+    """
+    def _int_param(name):
+        value = (request.GET.get(name) or "").strip()
+        return int(value) if value.isdigit() else None
+
+    def _decimal_param(name):
+        value = (request.GET.get(name) or "").strip().replace(",", ".")
+        try:
+            return Decimal(value) if value else None
+        except ArithmeticError:
+            return None
+
+    def _date_param(name):
+        value = (request.GET.get(name) or "").strip()
+        for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+        return None
+
+    date_from = _date_param("from")
+    if not date_from:
+        return JsonResponse({"ok": False, "message": "Date de début requise (from)."}, status=400)
+    date_to = _date_param("to") or date_from
+    if date_to < date_from:
+        return JsonResponse({"ok": False, "message": "La date de fin précède la date de début."}, status=400)
+    if (date_to - date_from).days > MAX_RANGE_DAYS:
+        return JsonResponse(
+            {"ok": False, "message": f"Période limitée à {MAX_RANGE_DAYS} jours."}, status=400
+        )
+
+    days = _decimal_param("days")
+    max_load = _decimal_param("max_load")
+    # NaN / Infinity / 1e30 passent Decimal() : bornés avant tout calcul
+    if days is not None and not (days.is_finite() and 0 < days <= MAX_RANGE_DAYS):
+        return JsonResponse(
+            {"ok": False, "message": f"Nombre de jours attendu entre 1 et {MAX_RANGE_DAYS} (days)."}, status=400
+        )
+    if max_load is not None and not (max_load.is_finite() and 0 <= max_load <= MAX_LOAD_LIMIT):
+        return JsonResponse(
+            {"ok": False, "message": f"Charge maximale attendue entre 0 et {MAX_LOAD_LIMIT} % (max_load)."},
+            status=400,
+        )
+
+    product = request.GET.get("product") or ""
+    training_type_id = _int_param("training_type_id")
+    if not product and training_type_id:
+        product = (
+            TrainingType.objects.filter(pk=training_type_id).values_list("product", flat=True).first() or ""
+        )
+
+    results = find_available_trainers(
+        date_from=date_from,
+        date_to=date_to,
+        days=days,
+        module_id=_int_param("module_id"),
+        max_load=max_load,
+        product=product,
+        exclude_session_id=_int_param("exclude_session_id"),
+        only_available=request.GET.get("only_available") == "1",
+    )
+
+    return JsonResponse({
+        "ok": True,
+        "count": sum(1 for r in results if r.available),
+        "trainers": [r.as_dict() for r in results],
+    })
+
+
 @login_required
 def trainings_legend_json(request):
     trainings = Training.objects.select_related("training_type").all().order_by("training_type__name", "title")
@@ -1133,128 +1201,43 @@ def team_argonos(request):
     if tab not in ("detail", "1to1"):
         tab = "detail"
 
-    meetings = OneToOneMeeting.objects.none()
-    objectives_open = OneToOneObjective.objects.none()
-    objectives_done = OneToOneObjective.objects.none()
-    recent_sessions = Session.objects.none()
-
-    today = timezone.localdate()
-    this_week_start = _monday_of_week(today)
-    this_week_meeting = None
-    this_week_objectives = OneToOneObjective.objects.none()
-    can_create_this_week = False
+    profile = get_trainer_profile(selected) if selected else None
 
-    module_rows = []
-    modules_count = 0
+    context = {
+        "trainers": trainers,
+        "selected": selected,
+        "tab": tab,
+        "profile": profile,
+        "this_week_start": profile.week_start if profile else _monday_of_week(timezone.localdate()),
+    }
+    if profile:
+        context.update({
+            "meetings": profile.meetings,
+            "objectives_open": profile.objectives_open,
+            "objectives_done": profile.objectives_done,
+            "recent_sessions": profile.recent_sessions,
+            "this_week_meeting": profile.this_week_meeting,
+            "this_week_objectives": profile.this_week_objectives,
+            "can_create_this_week": profile.can_create_this_week,
+            "module_rows": profile.module_rows,
+            "modules_count": profile.modules_count,
+            "visible_task_assignments": profile.task_assignments,
+            "visible_task_assignments_open": profile.task_assignments_open,
+            "visible_task_assignments_done": profile.task_assignments_done,
+            "project_load_total": profile.project_load_total,
+        })
 
-    visible_task_assignments = []
-    visible_task_assignments_open = []
-    visible_task_assignments_done = []
-    project_load_total = Decimal("0.0")
+    return render(request, "trainings/team_argonos.html", context)
 
-    if selected:
-        meetings = OneToOneMeeting.objects.filter(trainer=selected).order_by("-week_start")
 
-        objectives_open = (
-            OneToOneObjective.objects
-            .filter(trainer=selected)
-            .exclude(status=ObjectiveStatus.DONE)
-            .order_by("-created_at")
-        )
 
-        objectives_done = (
-            OneToOneObjective.objects
-            .filter(trainer=selected, status=ObjectiveStatus.DONE)
-            .order_by("-created_at")[:25]
-        )
+@login_required
+def create_one_to_one_argonos(request):
+    trainer_id = request.GET.get("trainer")
+    trainer = get_object_or_404(Trainer, id=trainer_id, product="ARGONOS")
 
-        recent_sessions = Session.objects.filter(trainer=selected).order_by("-start_date")[:10]
-
-        this_week_meeting = (
-            OneToOneMeeting.objects
-            .filter(trainer=selected, week_start=this_week_start)
-            .first()
-        )
-        can_create_this_week = this_week_meeting is None
-
-        if this_week_meeting:
-            this_week_objectives = this_week_meeting.objectives.all().order_by("-created_at")
-
-        modules = ArgonosModule.objects.filter(is_active=True).order_by("kind", "level", "name")
-        modules_count = modules.count()
-
-        existing = TrainerModuleMastery.objects.filter(trainer=selected, module__in=modules)
-        existing_by_module_id = {m.module_id: m for m in existing}
-
-        missing = []
-        for mod in modules:
-            if mod.id not in existing_by_module_id:
-                missing.append(TrainerModuleMastery(trainer=selected, module=mod))
-        if missing:
-            TrainerModuleMastery.objects.bulk_create(missing, ignore_conflicts=True)
-            existing = TrainerModuleMastery.objects.filter(trainer=selected, module__in=modules)
-            existing_by_module_id = {m.module_id: m for m in existing}
-
-        for mod in modules:
-            mastery = existing_by_module_id.get(mod.id)
-            module_rows.append({"module": mod, "mastery": mastery})
-
-        if TaskAssignment is not None:
-            visible_task_assignments = list(
-                TaskAssignment.objects
-                .select_related("task", "task__project", "trainer")
-                .filter(
-                    trainer=selected,
-                    is_visible_in_one_to_one=True,
-                )
-                .exclude(status=TaskAssignment.Status.CANCELED)
-                .order_by("start_date", "end_date", "task__project__name", "task__title")
-            )
-
-            visible_task_assignments_open = [
-                a for a in visible_task_assignments
-                if a.status != TaskAssignment.Status.DONE
-            ]
-
-            visible_task_assignments_done = [
-                a for a in visible_task_assignments
-                if a.status == TaskAssignment.Status.DONE
-            ]
-
-            project_load_total = sum(
-                (a.planned_days or Decimal("0.0"))
-                for a in visible_task_assignments_open
-            )
-
-    return render(request, "trainings/team_argonos.html", {
-        "trainers": trainers,
-        "selected": selected,
-        "tab": tab,
-        "meetings": meetings,
-        "objectives_open": objectives_open,
-        "objectives_done": objectives_done,
-        "recent_sessions": recent_sessions,
-        "this_week_start": this_week_start,
-        "this_week_meeting": this_week_meeting,
-        "this_week_objectives": this_week_objectives,
-        "can_create_this_week": can_create_this_week,
-        "module_rows": module_rows,
-        "modules_count": modules_count,
-        "visible_task_assignments": visible_task_assignments,
-        "visible_task_assignments_open": visible_task_assignments_open,
-        "visible_task_assignments_done": visible_task_assignments_done,
-        "project_load_total": project_load_total,
-    })
-
-
-
-@login_required
-def create_one_to_one_argonos(request):
-    trainer_id = request.GET.get("trainer")
-    trainer = get_object_or_404(Trainer, id=trainer_id, product="ARGONOS")
-
-    today = timezone.localdate()
-    week_start = _monday_of_week(today)
+    today = timezone.localdate()
+    week_start = _monday_of_week(today)
 
     OneToOneMeeting.objects.get_or_create(
         trainer=trainer,
@@ -1480,67 +1463,75 @@ def argonos_manager_dashboard(request):
         elif filter_type == "done":
             filtered_objectives = base_qs.filter(status=ObjectiveStatus.DONE)
 
-    trainers = Trainer.objects.filter(product="ARGONOS").order_by("last_name", "first_name")
-    obj_qs = OneToOneObjective.objects.filter(trainer__product="ARGONOS")
-
-    kpi_total = obj_qs.count()
-    kpi_open = obj_qs.exclude(status=ObjectiveStatus.DONE).count()
-    kpi_done = obj_qs.filter(status=ObjectiveStatus.DONE).count()
-    kpi_blocked = obj_qs.filter(status=ObjectiveStatus.BLOCKED).count()
-    kpi_overdue = obj_qs.filter(due_date__lt=today).exclude(status=ObjectiveStatus.DONE).count()
-    kpi_due_soon = obj_qs.filter(due_date__gte=today, due_date__lte=soon_limit).exclude(status=ObjectiveStatus.DONE).count()
-
-    per_trainer = trainers.annotate(
-        objectives_total=Count("one_to_one_objectives", distinct=True),
-        objectives_open=Count(
-            "one_to_one_objectives",
-            filter=~Q(one_to_one_objectives__status=ObjectiveStatus.DONE),
-            distinct=True,
-        ),
-        objectives_done=Count(
-            "one_to_one_objectives",
-            filter=Q(one_to_one_objectives__status=ObjectiveStatus.DONE),
-            distinct=True,
-        ),
-        objectives_blocked=Count(
-            "one_to_one_objectives",
-            filter=Q(one_to_one_objectives__status=ObjectiveStatus.BLOCKED),
-            distinct=True,
-        ),
-        objectives_overdue=Count(
-            "one_to_one_objectives",
-            filter=Q(one_to_one_objectives__due_date__lt=today) & ~Q(one_to_one_objectives__status=ObjectiveStatus.DONE),
-            distinct=True,
-        ),
-        objectives_due_soon=Count(
-            "one_to_one_objectives",
-            filter=Q(one_to_one_objectives__due_date__gte=today)
-            & Q(one_to_one_objectives__due_date__lte=soon_limit)
-            & ~Q(one_to_one_objectives__status=ObjectiveStatus.DONE),
-            distinct=True,
-        ),
-    )
+    trainers = list(Trainer.objects.filter(product="ARGONOS").order_by("last_name", "first_name"))
+
+    # 1 requête groupée par formateur : Count conditionnels, sans distinct (pas de jointure multiple)
+    not_done = ~Q(status=ObjectiveStatus.DONE)
+    objectives_by_trainer = {
+        row["trainer_id"]: row
+        for row in (
+            OneToOneObjective.objects
+            .filter(trainer__product="ARGONOS")
+            .order_by()
+            .values("trainer_id")
+            .annotate(
+                objectives_total=Count("id"),
+                objectives_open=Count("id", filter=not_done),
+                objectives_done=Count("id", filter=Q(status=ObjectiveStatus.DONE)),
+                objectives_blocked=Count("id", filter=Q(status=ObjectiveStatus.BLOCKED)),
+                objectives_overdue=Count("id", filter=Q(due_date__lt=today) & not_done),
+                objectives_due_soon=Count(
+                    "id",
+                    filter=Q(due_date__gte=today, due_date__lte=soon_limit) & not_done,
+                ),
+            )
+        )
+    }
 
-    modules_active = ArgonosModule.objects.filter(is_active=True)
-    modules_active_count = modules_active.count()
+    # 1 requête groupée pour la maîtrise des modules ; nb de modules actifs via le graphe en cache
+    modules_active_count = len(get_module_graph().names)
+    validated_map = dict(
+        TrainerModuleMastery.objects
+        .filter(MASTERED_Q, trainer__product="ARGONOS", module__is_active=True)
+        .order_by()
+        .values("trainer_id")
+        .annotate(validated=Count("id"))
+        .values_list("trainer_id", "validated")
+    )
 
-    mastery_qs = TrainerModuleMastery.objects.filter(trainer__product="ARGONOS", module__is_active=True)
-    validated_by_trainer = (
-        mastery_qs.values("trainer_id")
-        .annotate(validated=Count("id", filter=Q(manager_status="OK") | Q(cert_status="OK") | Q(validated_major__isnull=False)))
+    objective_keys = (
+        "objectives_total",
+        "objectives_open",
+        "objectives_done",
+        "objectives_blocked",
+        "objectives_overdue",
+        "objectives_due_soon",
     )
-    validated_map = {row["trainer_id"]: row["validated"] for row in validated_by_trainer}
+    kpis = dict.fromkeys(objective_keys, 0)
 
     rows = []
-    for trainer in per_trainer:
+    for trainer in trainers:
+        counts = objectives_by_trainer.get(trainer.id, {})
         validated = validated_map.get(trainer.id, 0)
         ratio = round((validated / modules_active_count) * 100) if modules_active_count else None
-        rows.append({
+        row = {
             "trainer": trainer,
             "modules_validated": validated,
             "modules_total": modules_active_count,
             "modules_ratio": ratio,
-        })
+        }
+        for key in objective_keys:
+            row[key] = counts.get(key, 0)
+            kpis[key] += row[key]
+        rows.append(row)
+
+    # KPI globaux = somme des lignes formateurs
+    kpi_total = kpis["objectives_total"]
+    kpi_open = kpis["objectives_open"]
+    kpi_done = kpis["objectives_done"]
+    kpi_blocked = kpis["objectives_blocked"]
+    kpi_overdue = kpis["objectives_overdue"]
+    kpi_due_soon = kpis["objectives_due_soon"]
 
     return render(request, "trainings/argon_manager_dashboard.html", {
         "today": today,
@@ -1561,6 +1552,59 @@ def argonos_manager_dashboard(request):
 # Dashboard CA
 # =========================================================
 
+def _compute_ca_kpis(qs, today: date) -> dict:
+    """KPI et graphes du dashboard CA pour un queryset de sessions annoté `ca_date`."""
+    zero_dec = Value(Decimal("0.00"), output_field=DecimalField(max_digits=12, decimal_places=2))
+    realise = Q(ca_date__lte=today)
+    previsionnel = Q(ca_date__gt=today)
+
+    totals = qs.aggregate(
+        ca_formation_total=Coalesce(Sum("training_price_ht"), zero_dec),
+        ca_formation_realise=Coalesce(Sum("training_price_ht", filter=realise), zero_dec),
+        ca_formation_previsionnel=Coalesce(Sum("training_price_ht", filter=previsionnel), zero_dec),
+        travel_total=Coalesce(Sum("travel_fee_ht"), zero_dec),
+        travel_realise=Coalesce(Sum("travel_fee_ht", filter=realise), zero_dec),
+        travel_previsionnel=Coalesce(Sum("travel_fee_ht", filter=previsionnel), zero_dec),
+        ca_total=Coalesce(Sum("price_ht"), zero_dec),
+        ca_realise=Coalesce(Sum("price_ht", filter=realise), zero_dec),
+        ca_previsionnel=Coalesce(Sum("price_ht", filter=previsionnel), zero_dec),
+        total_sessions=Count("id"),
+    )
+
+    # Graph évolution : TOTAL global par mois
+    month_map: dict[str, Decimal] = {}
+    for ca_date, price_ht in qs.exclude(ca_date__isnull=True).values_list("ca_date", "price_ht"):
+        key = ca_date.strftime("%Y-%m")
+        month_map[key] = month_map.get(key, Decimal("0.00")) + (price_ht or Decimal("0.00"))
+
+    labels_month = sorted(month_map.keys())
+    values_month = [float(month_map[k]) for k in labels_month]
+
+    # Répartition produit : CA formation uniquement
+    by_type = (
+        qs.values("training_type__name")
+        .annotate(total=Coalesce(Sum("training_price_ht"), zero_dec))
+        .order_by("-total")
+    )
+    labels_type = [row["training_type__name"] or "Sans type" for row in by_type]
+    values_type = [float(row["total"] or 0) for row in by_type]
+
+    status_rows = qs.values("status").annotate(c=Count("id")).order_by("-c")
+    status_counts = []
+    for row in status_rows:
+        raw = (row["status"] or "").strip()
+        status_counts.append({"label": raw if raw else "—", "count": row["c"]})
+
+    return {
+        **totals,
+        "labels_month": labels_month,
+        "values_month": values_month,
+        "labels_type": labels_type,
+        "values_type": values_type,
+        "status_counts": status_counts,
+    }
+
+
 @login_required
 @manager_required
 def dashboard_ca_view(request):
@@ -1636,66 +1680,13 @@ def dashboard_ca_view(request):
         except Exception:
             pass
 
-    zero_dec = Value(Decimal("0.00"), output_field=DecimalField(max_digits=12, decimal_places=2))
-
-        
-
-    # =========================
-    # KPI formation
-    # =========================
-    ca_formation_total = qs.aggregate(v=Coalesce(Sum("training_price_ht"), zero_dec))["v"]
-    ca_formation_realise = qs.filter(ca_date__lte=today).aggregate(v=Coalesce(Sum("training_price_ht"), zero_dec))["v"]
-    ca_formation_previsionnel = qs.filter(ca_date__gt=today).aggregate(v=Coalesce(Sum("training_price_ht"), zero_dec))["v"]
-
-    # =========================
-    # KPI déplacements
-    # =========================
-    travel_total = qs.aggregate(v=Coalesce(Sum("travel_fee_ht"), zero_dec))["v"]
-    travel_realise = qs.filter(ca_date__lte=today).aggregate(v=Coalesce(Sum("travel_fee_ht"), zero_dec))["v"]
-    travel_previsionnel = qs.filter(ca_date__gt=today).aggregate(v=Coalesce(Sum("travel_fee_ht"), zero_dec))["v"]
-
-    # =========================
-    # KPI globaux
-    # =========================
-    ca_total = qs.aggregate(v=Coalesce(Sum("price_ht"), zero_dec))["v"]
-    ca_realise = qs.filter(ca_date__lte=today).aggregate(v=Coalesce(Sum("price_ht"), zero_dec))["v"]
-    ca_previsionnel = qs.filter(ca_date__gt=today).aggregate(v=Coalesce(Sum("price_ht"), zero_dec))["v"]
-
-    # =========================
-    # Graph évolution : TOTAL global
-    # =========================
-    month_map: dict[str, Decimal] = {}
-    for session in qs.exclude(ca_date__isnull=True):
-        d = getattr(session, "ca_date", None)
-        if not d:
-            continue
-        key = d.strftime("%Y-%m")
-        month_map[key] = month_map.get(key, Decimal("0.00")) + (session.price_ht or Decimal("0.00"))
-
-    labels_month = []
-    values_month = []
-    for k in sorted(month_map.keys()):
-        labels_month.append(k)
-        values_month.append(float(month_map[k]))
-
-    # =========================
-    # Répartition produit : CA formation uniquement
-    # =========================
-    by_type = (
-        qs.values("training_type__name")
-        .annotate(total=Coalesce(Sum("training_price_ht"), zero_dec))
-        .order_by("-total")
+    # KPI / graphes en cache : clé = filtres + date du jour, invalidés par génération
+    kpis = cached_block(
+        "dashboard_ca",
+        lambda: _compute_ca_kpis(qs, today),
+        depends_on=[Session, Training, TrainingType],
+        key_parts=(today, training_type_id, period, view_mode, month_str),
     )
-    labels_type = [row["training_type__name"] or "Sans type" for row in by_type]
-    values_type = [float(row["total"] or 0) for row in by_type]
-
-    total_sessions = qs.count()
-    status_rows = qs.values("status").annotate(c=Count("id")).order_by("-c")
-
-    status_counts = []
-    for row in status_rows:
-        raw = (row["status"] or "").strip()
-        status_counts.append({"label": raw if raw else "—", "count": row["c"]})
 
     sessions = qs.order_by("-ca_date", "-start_date")
 
@@ -1703,23 +1694,23 @@ def dashboard_ca_view(request):
         "today": today,
         "sessions": sessions,
 
-        "ca_formation_total": ca_formation_total,
-        "ca_formation_realise": ca_formation_realise,
-        "ca_formation_previsionnel": ca_formation_previsionnel,
-
-        "travel_total": travel_total,
-        "travel_realise": travel_realise,
-        "travel_previsionnel": travel_previsionnel,
-
-        "ca_total": ca_total,
-        "ca_realise": ca_realise,
-        "ca_previsionnel": ca_previsionnel,
-        "labels_month": labels_month,
-        "values_month": values_month,
-        "labels_type": labels_type,
-        "values_type": values_type,
-        "total_sessions": total_sessions,
-        "status_counts": status_counts,
+        "ca_formation_total": kpis["ca_formation_total"],
+        "ca_formation_realise": kpis["ca_formation_realise"],
+        "ca_formation_previsionnel": kpis["ca_formation_previsionnel"],
+
+        "travel_total": kpis["travel_total"],
+        "travel_realise": kpis["travel_realise"],
+        "travel_previsionnel": kpis["travel_previsionnel"],
+
+        "ca_total": kpis["ca_total"],
+        "ca_realise": kpis["ca_realise"],
+        "ca_previsionnel": kpis["ca_previsionnel"],
+        "labels_month": kpis["labels_month"],
+        "values_month": kpis["values_month"],
+        "labels_type": kpis["labels_type"],
+        "values_type": kpis["values_type"],
+        "total_sessions": kpis["total_sessions"],
+        "status_counts": kpis["status_counts"],
         "training_types": training_types,
         "period_choices": PERIOD_CHOICES,
         "view_choices": VIEW_CHOICES,
@@ -1994,139 +1985,78 @@ def test_pdf(request):
 # Pré-requis ArgonOS
 # =========================================================
 
-def _session_product_name(session: Session) -> str:
-    try:
-        if getattr(session, "training_type", None) and getattr(session.training_type, "name", None):
-            return (session.training_type.name or "").upper()
-    except Exception:
-        pass
-
-    try:
-        if getattr(session, "training", None) and getattr(session.training, "training_type", None):
-            return (session.training.training_type.name or "").upper()
-    except Exception:
-        pass
-
-    return ""
-
-
-def _session_training_title(session: Session) -> str:
-    try:
-        if getattr(session, "training", None) and getattr(session.training, "title", None):
-            return session.training.title or ""
-    except Exception:
-        pass
-    return ""
-
-
-def _needs_initiation_prereq_for_session(session: Session) -> bool:
-    product = _session_product_name(session)
-    if product != "ARGONOS":
-        return False
-
-    title = _session_training_title(session).upper()
-
-    is_dp = "DATA PRÉPARATION" in title or "DATA PREPARATION" in title
-    is_de = "DATA EXPLORATION" in title
-    is_lvl1 = ("NIVEAU 1" in title) or ("NIV 1" in title) or ("N1" in title) or ("LEVEL 1" in title)
-
-    return is_lvl1 and (is_dp or is_de)
-
-
 def check_initiation_prereq(session: Session, email: str) -> tuple[bool, str]:
+    """
+    Contrôle unitaire utilisé par l'ajout de participant : s'appuie sur les
+    pré-requis déclarés sur la formation et l'historique des formations suivies.
+    """
     if not session:
         return False, "Session introuvable."
 
-    if not _needs_initiation_prereq_for_session(session):
-        return True, "Pré-requis non applicable."
-
-    email = (email or "").strip()
-    if not email:
-        return False, "Email requis pour vérifier le pré-requis."
-
-    participant = Participant.objects.filter(email__iexact=email).first()
-    if not participant:
-        return False, "Participant inconnu : crée-le d'abord."
-
-    initiation_q = Q(session__training__title__icontains="initiation")
-    argonos_q = (
-        Q(session__training_type__name__iexact="ARGONOS")
-        | Q(session__training__training_type__name__iexact="ARGONOS")
-    )
-
-    attended = (
-        Registration.objects
-        .filter(participant=participant)
-        .filter(initiation_q)
-        .filter(argonos_q)
-        .filter(status=RegistrationStatus.PRESENT)
-        .exists()
-    )
-
-    if attended:
-        return True, "✅ Pré-requis validé : Initiation déjà suivie."
-    return False, "⛔ Pré-requis non validé : Initiation ArgonOS requise avant DP1/DE1."
+    result = check_eligibility(session, [email])[0]
+    return result.ok, result.message
 
 
 @login_required
-def api_prereq_initiation(request):
+async def api_prereq_initiation(request):
     sid = (request.GET.get("session_id") or "").strip()
     email = (request.GET.get("email") or "").strip()
 
     if not sid.isdigit():
         return JsonResponse({"needs_prereq": False, "ok": True, "message": ""})
 
-    session = (
-        Session.objects.select_related("training", "training_type", "training__training_type")
-        .filter(pk=int(sid))
-        .first()
-    )
+    session = await Session.objects.select_related("training").filter(pk=int(sid)).afirst()
     if not session:
         return JsonResponse({"needs_prereq": False, "ok": False, "message": "Session introuvable."})
 
-    needs = _needs_initiation_prereq_for_session(session)
-    if not needs:
+    # services de pré-requis synchrones : exécutés dans le thread de la requête
+    if not await sync_to_async(training_prerequisites)(session.training_id):
         return JsonResponse({"needs_prereq": False, "ok": True, "message": ""})
 
-    ok, msg = check_initiation_prereq(session, email)
+    ok, msg = await sync_to_async(check_initiation_prereq)(session, email)
     return JsonResponse({"needs_prereq": True, "ok": ok, "message": msg})
 
 
-# =========================================================
-# Partners dashboard
-# =========================================================
-
 @login_required
-def partners_dashboard(request):
-    partner_id = (request.GET.get("partner") or "").strip()
-    country = (request.GET.get("country") or "").strip()
-    training = (request.GET.get("training") or "").strip()
-
-    partners_qs = Client.objects.filter(is_partner=True)
-
-    if country:
-        partners_qs = partners_qs.filter(country=country)
+def api_prereq_batch(request):
+    """
+    Vérifie les pré-requis de toute une liste d'emails pour une session.
+    Paramètres (GET ou POST) : session_id, emails (répété et/ou séparé par , ; ou retour ligne).
+    """
+    params = request.POST if request.method == "POST" else request.GET
+    sid = (params.get("session_id") or "").strip()
 
-    selected_partner = None
-    if partner_id.isdigit():
-        selected_partner = Client.objects.filter(pk=int(partner_id), is_partner=True).first()
+    emails = []
+    for raw in params.getlist("emails"):
+        emails.extend(e for e in re.split(r"[,;\s]+", raw or "") if e)
 
-    sessions_qs = (
-        Session.objects
-        .select_related("client", "training", "training_type", "trainer", "room")
-        .filter(client__is_partner=True)
-        .order_by("-start_date", "-id")
-    )
+    if not sid.isdigit():
+        return JsonResponse({"ok": False, "message": "session_id requis."}, status=400)
 
-    if country:
-        sessions_qs = sessions_qs.filter(client__country=country)
+    session = Session.objects.select_related("training").filter(pk=int(sid)).first()
+    if not session:
+        return JsonResponse({"ok": False, "message": "Session introuvable."}, status=404)
+
+    rule = prerequisite_rule(session.training_id)
+    results = check_eligibility(session, emails)
+
+    return JsonResponse({
+        "ok": all(r.ok for r in results),
+        "session_id": session.id,
+        "needs_prereq": bool(rule),
+        "prerequisites": rule.titles,
+        "prerequisites_any": rule.any_of,
+        "ineligible_count": sum(1 for r in results if not r.ok),
+        "results": [r.as_dict() for r in results],
+    })
 
-    if selected_partner:
-        sessions_qs = sessions_qs.filter(client=selected_partner)
 
-    if training:
-        sessions_qs = sessions_qs.filter(training__title=training)
+# =========================================================
+# Partners dashboard
+# =========================================================
 
+def _compute_partners_stats(partners_qs, sessions_qs, selected_partner, country: str, training: str) -> dict:
+    """Compteurs et graphes du dashboard partenaires (mis en cache)."""
     total_partners = partners_qs.count() if not selected_partner else 1
 
     countries_count = (
@@ -2142,7 +2072,7 @@ def partners_dashboard(request):
         total=Coalesce(Sum("present_count"), Value(0), output_field=IntegerField())
     )["total"]
 
-    participants_by_training = (
+    participants_by_training = list(
         sessions_qs.values("training__title")
         .annotate(
             participants=Coalesce(Sum("present_count"), Value(0), output_field=IntegerField()),
@@ -2151,7 +2081,7 @@ def partners_dashboard(request):
         .order_by("training__title")
     )
 
-    partners_by_country = (
+    partners_by_country = list(
         partners_qs.exclude(country="")
         .values("country")
         .annotate(total=Count("id"))
@@ -2173,7 +2103,7 @@ def partners_dashboard(request):
     if training:
         sessions_by_partner = sessions_by_partner.filter(training__title=training)
 
-    sessions_by_partner = (
+    sessions_by_partner = list(
         sessions_by_partner
         .values("client__id", "client__name")
         .annotate(total=Count("id"))
@@ -2190,7 +2120,7 @@ def partners_dashboard(request):
     if training:
         participants_by_partner = participants_by_partner.filter(training__title=training)
 
-    participants_by_partner = (
+    participants_by_partner = list(
         participants_by_partner
         .values("client__id", "client__name")
         .annotate(
@@ -2222,30 +2152,13 @@ def partners_dashboard(request):
     partner_breakdown_participants = [row["participants"] or 0 for row in selected_partner_breakdown]
     partner_breakdown_sessions = [row["sessions"] or 0 for row in selected_partner_breakdown]
 
-    partner_options = Client.objects.filter(is_partner=True).order_by("name")
-
-    country_options = (
-        Client.objects.filter(is_partner=True)
-        .exclude(country="")
-        .values_list("country", flat=True)
-        .distinct()
-        .order_by("country")
-    )
-
-    context = {
-        "partner_options": partner_options,
-        "country_options": country_options,
-        "selected_partner": selected_partner,
-        "selected_partner_id": partner_id,
-        "selected_country": country,
-        "selected_training": training,
+    return {
         "total_partners": total_partners,
         "countries_count": countries_count,
         "sessions_count": sessions_count,
         "participants_total": participants_total,
         "participants_by_training": participants_by_training,
         "partners_by_country": partners_by_country,
-        "sessions": sessions_qs,
         "country_chart_labels": country_chart_labels,
         "country_chart_values": country_chart_values,
         "participants_training_chart_labels": participants_training_chart_labels,
@@ -2261,6 +2174,85 @@ def partners_dashboard(request):
         "partner_breakdown_participants": partner_breakdown_participants,
         "partner_breakdown_sessions": partner_breakdown_sessions,
     }
+
+
+@login_required
+def partners_dashboard(request):
+    partner_id = (request.GET.get("partner") or "").strip()
+    country = (request.GET.get("country") or "").strip()
+    training = (request.GET.get("training") or "").strip()
+
+    partners_qs = Client.objects.filter(is_partner=True)
+
+    if country:
+        partners_qs = partners_qs.filter(country=country)
+
+    selected_partner = None
+    if partner_id.isdigit():
+        selected_partner = Client.objects.filter(pk=int(partner_id), is_partner=True).first()
+
+    sessions_qs = (
+        Session.objects
+        .select_related("client", "training", "training_type", "trainer", "room")
+        .filter(client__is_partner=True)
+        .order_by("-start_date", "-id")
+    )
+
+    if country:
+        sessions_qs = sessions_qs.filter(client__country=country)
+
+    if selected_partner:
+        sessions_qs = sessions_qs.filter(client=selected_partner)
+
+    if training:
+        sessions_qs = sessions_qs.filter(training__title=training)
+
+    stats = cached_block(
+        "partners_dashboard",
+        lambda: _compute_partners_stats(partners_qs, sessions_qs, selected_partner, country, training),
+        depends_on=[Session, Client, Training, Registration],
+        key_parts=(selected_partner.pk if selected_partner else None, country, training),
+    )
+
+    partner_options = Client.objects.filter(is_partner=True).order_by("name")
+
+    country_options = (
+        Client.objects.filter(is_partner=True)
+        .exclude(country="")
+        .values_list("country", flat=True)
+        .distinct()
+        .order_by("country")
+    )
+
+    context = {
+        "partner_options": partner_options,
+        "country_options": country_options,
+        "selected_partner": selected_partner,
+        "selected_partner_id": partner_id,
+        "selected_country": country,
+        "selected_training": training,
+        "total_partners": stats["total_partners"],
+        "countries_count": stats["countries_count"],
+        "sessions_count": stats["sessions_count"],
+        "participants_total": stats["participants_total"],
+        "participants_by_training": stats["participants_by_training"],
+        "partners_by_country": stats["partners_by_country"],
+        "sessions": sessions_qs,
+        "country_chart_labels": stats["country_chart_labels"],
+        "country_chart_values": stats["country_chart_values"],
+        "participants_training_chart_labels": stats["participants_training_chart_labels"],
+        "participants_training_chart_values": stats["participants_training_chart_values"],
+        "partner_sessions_chart_labels": stats["partner_sessions_chart_labels"],
+        "partner_sessions_chart_values": stats["partner_sessions_chart_values"],
+        "partner_sessions_chart_ids": stats["partner_sessions_chart_ids"],
+        "partner_participants_chart_labels": stats["partner_participants_chart_labels"],
+        "partner_participants_chart_values": stats["partner_participants_chart_values"],
+        "partner_participants_chart_ids": stats["partner_participants_chart_ids"],
+        "selected_partner_breakdown": stats["selected_partner_breakdown"],
+        "partner_breakdown_labels": stats["partner_breakdown_labels"],
+        "partner_breakdown_participants": stats["partner_breakdown_participants"],
+        "partner_breakdown_sessions": stats["partner_breakdown_sessions"],
+    }
     return render(request, "trainings/partners_dashboard.html", context)
 
 
@@ -2435,88 +2427,16 @@ def trainer_workload_dashboard(request):
 
     month_start, month_end, selected_month = _month_bounds_from_string(month_str)
 
-    trainers_qs = Trainer.objects.filter(is_active=True).order_by("last_name", "first_name")
-
-    if product in (Trainer.PRODUCT_ARGONOS, Trainer.PRODUCT_MERCURE):
-        trainers_qs = trainers_qs.filter(product=product)
-
-    if trainer_id.isdigit():
-        trainers_qs = trainers_qs.filter(id=int(trainer_id))
-
-    trainers = list(trainers_qs)
-
-    session_statuses_included = [
-        SessionStatus.PLANNED,
-        SessionStatus.CONFIRMED,
-        SessionStatus.IN_PROGRESS,
-        SessionStatus.CLOSED,
-    ]
-
-    sessions_qs = (
-        Session.objects
-        .select_related("training", "training_type", "client", "trainer", "backup_trainer")
-        .filter(
-            status__in=session_statuses_included,
-            start_date__isnull=False,
-            start_date__lte=month_end,
-        )
-        .filter(Q(end_date__isnull=True, start_date__gte=month_start) | Q(end_date__gte=month_start))
-    )
-
-    absences_qs = (
-        TrainerAbsence.objects
-        .select_related("trainer")
-        .filter(
-            start_date__lte=month_end,
-            end_date__gte=month_start,
-        )
-    )
-
-    workload_entries_qs = (
-        TrainerWorkloadEntry.objects
-        .select_related("trainer")
-        .exclude(status="CANCELED")
-        .filter(
-            start_date__lte=month_end,
-            end_date__gte=month_start,
-        )
-    )
-
-    task_assignments_qs = TaskAssignment.objects.none()
-    if TaskAssignment is not None:
-        task_assignments_qs = (
-            TaskAssignment.objects
-            .select_related("trainer", "task", "task__project")
-            .exclude(status=TaskAssignment.Status.CANCELED)
-            .filter(
-                trainer__is_active=True,
-                start_date__lte=month_end,
-                end_date__gte=month_start,
-            )
-        )
-
-    sessions_by_primary = defaultdict(list)
-    sessions_by_backup = defaultdict(list)
-    absences_by_trainer = defaultdict(list)
-    extra_workloads_by_trainer = defaultdict(list)
-    assignments_by_trainer = defaultdict(list)
-
-    for s in sessions_qs:
-        if s.trainer_id:
-            sessions_by_primary[s.trainer_id].append(s)
-        if s.backup_trainer_id:
-            sessions_by_backup[s.backup_trainer_id].append(s)
-
-    for absence in absences_qs:
-        absences_by_trainer[absence.trainer_id].append(absence)
-
-    for entry in workload_entries_qs:
-        extra_workloads_by_trainer[entry.trainer_id].append(entry)
+    def keep(trainer) -> bool:
+        if not trainer.is_active:
+            return False
+        if product in (Trainer.PRODUCT_ARGONOS, Trainer.PRODUCT_MERCURE) and trainer.product != product:
+            return False
+        if trainer_id.isdigit() and trainer.id != int(trainer_id):
+            return False
+        return True
 
-    for assignment in task_assignments_qs:
-        assignments_by_trainer[assignment.trainer_id].append(assignment)
-
-    month_working_days = _working_days_between(month_start, month_end)
+    month_working_days = working_days_between(month_start, month_end)
 
     rows = []
 
@@ -2529,99 +2449,37 @@ def trainer_workload_dashboard(request):
     total_absence = Decimal("0.0")
     total_load = Decimal("0.0")
 
-    for trainer in trainers:
-        availability_pct = Decimal(trainer.workload_percent or Decimal("100.00"))
-        theoretical_capacity = (Decimal(month_working_days) * availability_pct) / Decimal("100")
-
-        primary_days = Decimal("0.0")
-        for s in sessions_by_primary.get(trainer.id, []):
-            primary_days += _prorated_days_for_period(
-                s.start_date,
-                s.end_date,
-                s.days_count,
-                month_start,
-                month_end,
-            )
-
-        backup_days = Decimal("0.0")
-        for s in sessions_by_backup.get(trainer.id, []):
-            prorated = _prorated_days_for_period(
-                s.start_date,
-                s.end_date,
-                s.days_count,
-                month_start,
-                month_end,
-            )
-            backup_days += prorated * Decimal("0.5")
-
-        absence_days = Decimal("0.0")
-        for absence in absences_by_trainer.get(trainer.id, []):
-            absence_days += _prorated_days_for_period(
-                absence.start_date,
-                absence.end_date,
-                absence.days_count,
-                month_start,
-                month_end,
-            )
-
-        extra_days = Decimal("0.0")
-        for entry in extra_workloads_by_trainer.get(trainer.id, []):
-            extra_days += _prorated_days_for_period(
-                entry.start_date,
-                entry.end_date,
-                entry.days_count,
-                month_start,
-                month_end,
-            )
-
-        project_days = Decimal("0.0")
-        for assignment in assignments_by_trainer.get(trainer.id, []):
-            project_days += _prorated_days_for_period(
-                assignment.start_date,
-                assignment.end_date,
-                assignment.planned_days,
-                month_start,
-                month_end,
-            )
-
-        net_capacity = theoretical_capacity - absence_days
-        if net_capacity < 0:
-            net_capacity = Decimal("0.0")
-
-        total_planned_load = primary_days + backup_days + extra_days + project_days
-
-        if net_capacity > 0:
-            load_rate = (total_planned_load / net_capacity) * Decimal("100")
-        else:
-            load_rate = Decimal("0.0") if total_planned_load == 0 else Decimal("999.0")
+    for raw in trainer_workload_rows(month_start, month_end):
+        if not keep(raw["trainer"]):
+            continue
 
         rows.append({
-            "trainer": trainer,
-            "capacity_theoretical": round(theoretical_capacity, 1),
-            "absence_days": round(absence_days, 1),
-            "capacity_net": round(net_capacity, 1),
-            "primary_days": round(primary_days, 1),
-            "backup_days": round(backup_days, 1),
-            "extra_days": round(extra_days, 1),
-            "project_days": round(project_days, 1),
-            "total_load": round(total_planned_load, 1),
-            "load_rate": round(load_rate, 1),
-            "status_label": _workload_status_label(load_rate),
-            "primary_sessions_count": len(sessions_by_primary.get(trainer.id, [])),
-            "backup_sessions_count": len(sessions_by_backup.get(trainer.id, [])),
-            "extra_entries_count": len(extra_workloads_by_trainer.get(trainer.id, [])),
-            "project_assignments_count": len(assignments_by_trainer.get(trainer.id, [])),
-            "absences_count": len(absences_by_trainer.get(trainer.id, [])),
+            "trainer": raw["trainer"],
+            "capacity_theoretical": round(raw["capacity_theoretical"], 1),
+            "absence_days": round(raw["absence_days"], 1),
+            "capacity_net": round(raw["capacity_net"], 1),
+            "primary_days": round(raw["primary_days"], 1),
+            "backup_days": round(raw["backup_days"], 1),
+            "extra_days": round(raw["extra_days"], 1),
+            "project_days": round(raw["project_days"], 1),
+            "total_load": round(raw["total_load"], 1),
+            "load_rate": round(raw["load_rate"], 1),
+            "status_label": _workload_status_label(raw["load_rate"]),
+            "primary_sessions_count": raw["primary_sessions_count"],
+            "backup_sessions_count": raw["backup_sessions_count"],
+            "extra_entries_count": raw["extra_entries_count"],
+            "project_assignments_count": raw["project_assignments_count"],
+            "absences_count": raw["absences_count"],
         })
 
-        total_capacity += theoretical_capacity
-        total_capacity_net += net_capacity
-        total_primary += primary_days
-        total_backup += backup_days
-        total_extra += extra_days
-        total_project += project_days
-        total_absence += absence_days
-        total_load += total_planned_load
+        total_capacity += raw["capacity_theoretical"]
+        total_capacity_net += raw["capacity_net"]
+        total_primary += raw["primary_days"]
+        total_backup += raw["backup_days"]
+        total_extra += raw["extra_days"]
+        total_project += raw["project_days"]
+        total_absence += raw["absence_days"]
+        total_load += raw["total_load"]
 
     if total_capacity_net > 0:
         team_load_rate = (total_load / total_capacity_net) * Decimal("100")
@@ -2666,16 +2524,10 @@ def trainer_workload_dashboard(request):
 # Control center
 # =========================
 
-@login_required
-@manager_required
-def control_center_view(request):
-    today = timezone.localdate()
-    week_end = today + timedelta(days=7)
-    month_start, month_end, selected_month = _month_bounds_from_string(None)
+def _compute_control_center_kpis(today: date, month_start: date, month_end: date) -> dict:
+    """KPI du centre de pilotage ne dépendant que des sessions / clients (mis en cache)."""
+    zero_dec = Value(Decimal("0.00"), output_field=DecimalField(max_digits=12, decimal_places=2))
 
-    # =========================
-    # KPI globaux
-    # =========================
     sessions_month = Session.objects.filter(
         start_date__isnull=False,
         start_date__gte=month_start,
@@ -2685,26 +2537,14 @@ def control_center_view(request):
     ca_realise = (
         Session.objects
         .filter(end_date__isnull=False, end_date__lte=today)
-        .aggregate(
-            v=Coalesce(
-                Sum("training_price_ht"),
-                Value(Decimal("0.00")),
-                output_field=DecimalField(max_digits=12, decimal_places=2),
-            )
-        )
+        .aggregate(v=Coalesce(Sum("training_price_ht"), zero_dec))
         .get("v")
     ) or Decimal("0.00")
 
     ca_previsionnel = (
         Session.objects
         .filter(start_date__isnull=False, start_date__gt=today)
-        .aggregate(
-            v=Coalesce(
-                Sum("training_price_ht"),
-                Value(Decimal("0.00")),
-                output_field=DecimalField(max_digits=12, decimal_places=2),
-            )
-        )
+        .aggregate(v=Coalesce(Sum("training_price_ht"), zero_dec))
         .get("v")
     ) or Decimal("0.00")
 
@@ -2720,6 +2560,66 @@ def control_center_view(request):
         .get("v")
     )
 
+    pending = Session.objects.filter(end_date__isnull=False, end_date__lt=today).aggregate(
+        reports=Count("id", filter=Q(report_sent_at__isnull=True)),
+        accounting=Count("id", filter=Q(accounting_sheets_sent_at__isnull=True)),
+    )
+
+    pricing = Session.objects.aggregate(
+        collective=Count("id", filter=Q(
+            billing_mode=SessionBillingMode.COLLECTIVE,
+            training_price_ht=Decimal("0.00"),
+        )),
+        individual=Count("id", filter=Q(
+            billing_mode=SessionBillingMode.INDIVIDUAL,
+            applied_participant_price_ht__isnull=True,
+        )),
+        abroad=Count("id", filter=Q(is_abroad=True, travel_fee_ht=Decimal("0.00"))),
+    )
+
+    partners_active = Client.objects.filter(is_partner=True).count()
+
+    sessions_partners_month = Session.objects.filter(
+        client__is_partner=True,
+        start_date__isnull=False,
+        start_date__gte=month_start,
+        start_date__lte=month_end,
+    ).count()
+
+    return {
+        "sessions_month": sessions_month,
+        "ca_realise": ca_realise,
+        "ca_previsionnel": ca_previsionnel,
+        "satisfaction_avg": round(satisfaction_avg, 1) if satisfaction_avg is not None else None,
+        "pending_reports_count": pending["reports"],
+        "pending_accounting_count": pending["accounting"],
+        "pricing_issues_collective": pricing["collective"],
+        "pricing_issues_individual": pricing["individual"],
+        "abroad_missing_travel": pricing["abroad"],
+        "partners_active": partners_active,
+        "sessions_partners_month": sessions_partners_month,
+    }
+
+
+@login_required
+@manager_required
+def control_center_view(request):
+    today = timezone.localdate()
+    week_end = today + timedelta(days=7)
+    month_start, month_end, selected_month = _month_bounds_from_string(None)
+
+    # =========================
+    # KPI globaux (en cache, invalidés par génération)
+    # =========================
+    kpis = cached_block(
+        "control_center_kpis",
+        lambda: _compute_control_center_kpis(today, month_start, month_end),
+        depends_on=[Session, Client],
+        key_parts=(today, month_start, month_end),
+    )
+    pending_reports_count = kpis["pending_reports_count"]
+    pending_accounting_count = kpis["pending_accounting_count"]
+
     # =========================
     # Sessions / delivery
     # =========================
@@ -2738,161 +2638,14 @@ def control_center_view(request):
         .order_by("start_date")[:6]
     )
 
-    pending_reports_count = Session.objects.filter(
-        end_date__isnull=False,
-        end_date__lt=today,
-        report_sent_at__isnull=True,
-    ).count()
-
-    pending_accounting_count = Session.objects.filter(
-        end_date__isnull=False,
-        end_date__lt=today,
-        accounting_sheets_sent_at__isnull=True,
-    ).count()
-
     # =========================
     # Team control
     # =========================
-    active_trainers = list(
-        Trainer.objects
-        .filter()
-        .order_by("last_name", "first_name")
-    )
-
-    trainer_rows = []
-    total_load_rate = Decimal("0.0")
-    overload_count = 0
-
-    month_working_days = _working_days_between(month_start, month_end)
-
-    session_statuses_included = [
-        SessionStatus.PLANNED,
-        SessionStatus.CONFIRMED,
-        SessionStatus.IN_PROGRESS,
-        SessionStatus.CLOSED,
-    ]
-
-    sessions_qs = (
-        Session.objects
-        .select_related("trainer", "backup_trainer")
-        .filter(
-            status__in=session_statuses_included,
-            start_date__isnull=False,
-            start_date__lte=month_end,
-        )
-        .filter(Q(end_date__isnull=True, start_date__gte=month_start) | Q(end_date__gte=month_start))
+    trainer_rows, team_load_avg, overload_count = _team_load_snapshot(
+        trainer_workload_rows(month_start, month_end),
+        limit=6,
     )
 
-    absences_qs = (
-        TrainerAbsence.objects
-        .select_related("trainer")
-        .filter(start_date__lte=month_end, end_date__gte=month_start)
-    )
-
-    workload_entries_qs = (
-        TrainerWorkloadEntry.objects
-        .select_related("trainer")
-        .exclude(status="CANCELED")
-        .filter(start_date__lte=month_end, end_date__gte=month_start)
-    )
-
-    task_assignments_qs = TaskAssignment.objects.none()
-    if TaskAssignment is not None:
-        task_assignments_qs = (
-            TaskAssignment.objects
-            .select_related("trainer", "task", "task__project")
-            .exclude(status=TaskAssignment.Status.CANCELED)
-            .filter(
-                trainer__isnull=False,
-                start_date__lte=month_end,
-                end_date__gte=month_start,
-            )
-        )
-
-    sessions_by_primary = defaultdict(list)
-    sessions_by_backup = defaultdict(list)
-    absences_by_trainer = defaultdict(list)
-    extra_workloads_by_trainer = defaultdict(list)
-    assignments_by_trainer = defaultdict(list)
-
-    for s in sessions_qs:
-        if s.trainer_id:
-            sessions_by_primary[s.trainer_id].append(s)
-        if s.backup_trainer_id:
-            sessions_by_backup[s.backup_trainer_id].append(s)
-
-    for absence in absences_qs:
-        absences_by_trainer[absence.trainer_id].append(absence)
-
-    for entry in workload_entries_qs:
-        extra_workloads_by_trainer[entry.trainer_id].append(entry)
-
-    for assignment in task_assignments_qs:
-        assignments_by_trainer[assignment.trainer_id].append(assignment)
-
-    for trainer in active_trainers:
-        availability_pct = Decimal(getattr(trainer, "workload_percent", Decimal("100.00")) or Decimal("100.00"))
-        theoretical_capacity = (Decimal(month_working_days) * availability_pct) / Decimal("100")
-
-        primary_days = Decimal("0.0")
-        for s in sessions_by_primary.get(trainer.id, []):
-            primary_days += _prorated_days_for_period(
-                s.start_date, s.end_date, s.days_count, month_start, month_end
-            )
-
-        backup_days = Decimal("0.0")
-        for s in sessions_by_backup.get(trainer.id, []):
-            backup_days += _prorated_days_for_period(
-                s.start_date, s.end_date, s.days_count, month_start, month_end
-            ) * Decimal("0.5")
-
-        absence_days = Decimal("0.0")
-        for a in absences_by_trainer.get(trainer.id, []):
-            absence_days += _prorated_days_for_period(
-                a.start_date, a.end_date, a.days_count, month_start, month_end
-            )
-
-        extra_days = Decimal("0.0")
-        for e in extra_workloads_by_trainer.get(trainer.id, []):
-            extra_days += _prorated_days_for_period(
-                e.start_date, e.end_date, e.days_count, month_start, month_end
-            )
-
-        project_days = Decimal("0.0")
-        for a in assignments_by_trainer.get(trainer.id, []):
-            project_days += _prorated_days_for_period(
-                a.start_date, a.end_date, a.planned_days, month_start, month_end
-            )
-
-        net_capacity = theoretical_capacity - absence_days
-        if net_capacity < 0:
-            net_capacity = Decimal("0.0")
-
-        total_planned = primary_days + backup_days + extra_days + project_days
-        if net_capacity > 0:
-            load_rate = (total_planned / net_capacity) * Decimal("100")
-        else:
-            load_rate = Decimal("0.0") if total_planned == 0 else Decimal("999.0")
-
-        status_label = _workload_status_label(load_rate)
-        if load_rate > Decimal("100"):
-            overload_count += 1
-
-        total_load_rate += load_rate
-
-        trainer_rows.append({
-            "trainer": trainer,
-            "load_rate": round(load_rate, 1),
-            "status_label": status_label,
-            "project_assignments_count": len(assignments_by_trainer.get(trainer.id, [])),
-            "open_objectives_count": OneToOneObjective.objects.filter(trainer=trainer).exclude(
-                status=ObjectiveStatus.DONE
-            ).count(),
-        })
-
-    trainer_rows = sorted(trainer_rows, key=lambda x: x["load_rate"], reverse=True)[:6]
-    team_load_avg = round((total_load_rate / Decimal(len(active_trainers))), 1) if active_trainers else Decimal("0.0")
-
     # =========================
     # Projects control
     # =========================
@@ -2905,51 +2658,33 @@ def control_center_view(request):
         projects_active = Project.objects.filter(is_active=True).count()
 
     if Task is not None:
-        tasks_open = Task.objects.exclude(status=Task.Status.DONE).count()
-        tasks_blocked = Task.objects.filter(status=Task.Status.BLOCKED).count()
+        # compteurs dénormalisés sur Project (projects.services.task_counters)
+        task_totals = Project.objects.aggregate(
+            open=Coalesce(Sum(F("todo_count") + F("doing_count") + F("blocked_count")), 0),
+            blocked=Coalesce(Sum("blocked_count"), 0),
+        )
+        tasks_open = task_totals["open"]
+        tasks_blocked = task_totals["blocked"]
 
         hot_projects = list(
             Project.objects
             .annotate(
-                tasks_total_count=Count("tasks"),
-                tasks_open_count=Count("tasks", filter=~Q(tasks__status=Task.Status.DONE)),
-                tasks_blocked_count=Count("tasks", filter=Q(tasks__status=Task.Status.BLOCKED)),
+                tasks_open_count=F("todo_count") + F("doing_count") + F("blocked_count"),
+                tasks_blocked_count=F("blocked_count"),
+                tasks_total_count=F("todo_count") + F("doing_count") + F("blocked_count") + F("done_count"),
             )
             .filter(is_active=True)
             .order_by("-tasks_open_count", "-tasks_blocked_count", "name")[:5]
         )
 
-    # =========================
-    # Partners / clients
-    # =========================
-    partners_active = Client.objects.filter(is_partner=True).count()
-
-    sessions_partners_month = Session.objects.filter(
-        client__is_partner=True,
-        start_date__isnull=False,
-        start_date__gte=month_start,
-        start_date__lte=month_end,
-    ).count()
-
     # =========================
     # Alerts center
     # =========================
     alert_items = []
 
-    pricing_issues_collective = Session.objects.filter(
-        billing_mode=SessionBillingMode.COLLECTIVE,
-        training_price_ht=Decimal("0.00"),
-    ).count()
-
-    pricing_issues_individual = Session.objects.filter(
-        billing_mode=SessionBillingMode.INDIVIDUAL,
-        applied_participant_price_ht__isnull=True,
-    ).count()
-
-    abroad_missing_travel = Session.objects.filter(
-        is_abroad=True,
-        travel_fee_ht=Decimal("0.00"),
-    ).count()
+    pricing_issues_collective = kpis["pricing_issues_collective"]
+    pricing_issues_individual = kpis["pricing_issues_individual"]
+    abroad_missing_travel = kpis["abroad_missing_travel"]
 
     for s in convocation_alerts[:4]:
         alert_items.append({
@@ -3017,11 +2752,11 @@ def control_center_view(request):
 
     context = {
         "today": today,
-        "sessions_month": sessions_month,
-        "ca_realise": ca_realise,
-        "ca_previsionnel": ca_previsionnel,
+        "sessions_month": kpis["sessions_month"],
+        "ca_realise": kpis["ca_realise"],
+        "ca_previsionnel": kpis["ca_previsionnel"],
         "team_load_avg": team_load_avg,
-        "satisfaction_avg": round(satisfaction_avg, 1) if satisfaction_avg is not None else None,
+        "satisfaction_avg": kpis["satisfaction_avg"],
         "alerts_count": len(alert_items),
 
         "upcoming_sessions": upcoming_sessions,
@@ -3035,8 +2770,8 @@ def control_center_view(request):
         "tasks_blocked": tasks_blocked,
         "hot_projects": hot_projects,
 
-        "partners_active": partners_active,
-        "sessions_partners_month": sessions_partners_month,
+        "partners_active": kpis["partners_active"],
+        "sessions_partners_month": kpis["sessions_partners_month"],
 
         "alert_items": alert_items,
     }
@@ -3078,19 +2813,11 @@ def client_hub(request):
         }
 
     def _session_product_label(session):
+        if session.product:
+            return session.get_product_display()
         if getattr(session, "training_type", None) and getattr(session.training_type, "name", None):
-            raw = (session.training_type.name or "").strip()
-        elif getattr(session, "training", None) and getattr(session.training, "training_type", None):
-            raw = (session.training.training_type.name or "").strip()
-        else:
-            raw = ""
-
-        txt = raw.upper()
-        if "ARGONOS" in txt:
-            return "ArgonOS"
-        if "MERCURE" in txt:
-            return "Mercure"
-        return raw or "Autres"
+            return (session.training_type.name or "").strip() or "Autres"
+        return "Autres"
 
     def _session_training_label(session):
         if getattr(session, "training", None) and getattr(session.training, "title", None):
@@ -3223,13 +2950,9 @@ def client_hub(request):
             mode = "client"
 
     participants_base = Participant.objects.select_related("client", "referrer").all()
-    referrers_base = Referrer.objects.select_related("client").all()
 
     if selected_client:
         participants_base = participants_base.filter(client=selected_client)
-        referrers_base = referrers_base.filter(
-            Q(client=selected_client) | Q(participants__client=selected_client)
-        ).distinct()
 
     if q:
         participant_results = (
@@ -3607,7 +3330,6 @@ def client_hub(request):
         else:
             mode = "client"
 
-    referrer_options = referrers_base.order_by("last_name", "first_name")
     client_options = Client.objects.order_by("name")
 
     context = {
@@ -3618,7 +3340,6 @@ def client_hub(request):
         "selected_participant_id": participant_id,
 
         "client_options": client_options,
-        "referrer_options": referrer_options,
         "participant_results": participant_results,
 
         "selected_client": selected_client,
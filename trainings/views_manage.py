@@ -253,9 +253,7 @@ def session_participant_add(request, session_id):
             )
 
             if created_registration:
-                reg.save()  # force le calcul initial
-                session.recalculate_prices(save=True)
-
+                # Registration.save() a déjà recalculé tarifs + compteurs de la session
                 if created_participant:
                     if force_prerequisite:
                         messages.warning(
@@ -273,7 +271,6 @@ def session_participant_add(request, session_id):
                     else:
                         messages.success(request, "Participant existant réutilisé et ajouté à la session ✅")
             else:
-                session.recalculate_prices(save=True)
                 messages.info(request, "Ce participant est déjà inscrit à cette session.")
 
         else:
@@ -297,7 +294,6 @@ def session_participant_edit(request, session_id, registration_id):
         if p_form.is_valid() and r_form.is_valid():
             p_form.save()
             reg = r_form.save()
-            session.recalculate_prices(save=True)
             messages.success(request, "Participant mis à jour ✅")
             return _redirect_to_manage_home(request, session=session.id)
 
@@ -321,7 +317,6 @@ def session_participant_delete(request, session_id, registration_id):
     session = get_object_or_404(Session, pk=session_id)
     reg = get_object_or_404(Registration, pk=registration_id, session=session)
     reg.delete()
-    session.recalculate_prices(save=True)
     messages.success(request, "Participant retiré de la session ✅")
 
     return _redirect_to_manage_home(request, session=session.id)
@@ -371,8 +366,6 @@ def session_participant_set_status(request, session_id, registration_id):
         reg.canceled_at = None
 
     reg.save()
-    session = reg.session
-    session.recalculate_prices(save=True)
 
     messages.success(request, "Statut mis à jour ✅")
 
@@ -0,0 +1,80 @@
+# trainings/widgets.py
+from __future__ import annotations
+
+from urllib.parse import urlencode
+
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteMixin:
+    """
+    Liste de choix alimentée par un endpoint JSON (trainings/autocomplete.js) :
+    seules les valeurs sélectionnées sont rendues en <option>, le reste est
+    cherché à la frappe. Le <select> reste le champ envoyé au serveur : la
+    validation du formulaire ne change pas.
+
+    `params` : paramètres GET fixes ajoutés à chaque recherche (ex. session_id).
+    `forward` : paramètre GET -> nom d'un autre champ du formulaire, lu au moment
+    de la recherche (ex. {"client_id": "client"}).
+    """
+
+    def __init__(
+        self,
+        url_name: str,
+        params: dict | None = None,
+        forward: dict | None = None,
+        attrs=None,
+        placeholder: str = "Rechercher…",
+    ):
+        super().__init__(attrs=attrs)
+        self.url_name = url_name
+        self.params = dict(params or {})
+        self.forward = dict(forward or {})
+        self.placeholder = placeholder
+
+    def __deepcopy__(self, memo):
+        obj = super().__deepcopy__(memo)
+        obj.params = dict(self.params)
+        return obj
+
+    @property
+    def media(self):
+        return forms.Media(js=["trainings/autocomplete.js"])
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = reverse(self.url_name)
+        attrs["data-autocomplete-placeholder"] = self.placeholder
+        params = {k: v for k, v in self.params.items() if v not in (None, "")}
+        if params:
+            attrs["data-autocomplete-params"] = urlencode(params)
+        if self.forward:
+            attrs["data-autocomplete-forward"] = ",".join(f"{k}:{v}" for k, v in self.forward.items())
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        default = (None, [], 0)
+        groups = [default]
+        field = self.choices.field
+        selected_values = {str(v) for v in value if str(v) not in field.empty_values}
+
+        if not self.allow_multiple_selected:
+            default[1].append(self.create_option(name, "", field.empty_label or "", not selected_values, 0))
+        if not selected_values:
+            return groups
+
+        for obj in self.choices.queryset.filter(pk__in=selected_values):
+            index = len(default[1])
+            default[1].append(
+                self.create_option(name, obj.pk, field.label_from_instance(obj), True, index)
+            )
+        return groups
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass